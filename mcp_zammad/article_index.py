@@ -0,0 +1,213 @@
+"""Local full-text index over ticket titles and article bodies (SQLite FTS5)."""
+
+import contextlib
+import html
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+from collections.abc import Iterable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Ranking weight of a title match relative to a body match
+TITLE_WEIGHT = 5.0
+# Snippets shown per ticket in search results
+SNIPPETS_PER_TICKET = 3
+
+_TAG = re.compile(r"<[^>]+>")
+_BLOCK_TAG = re.compile(r"<\s*(br|/p|/div|/li|/tr|/h\d)\b[^>]*>", re.IGNORECASE)
+_TOKEN = re.compile(r"\w+\*?")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS indexed_tickets (
+    id INTEGER PRIMARY KEY,
+    number TEXT,
+    title TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS article_text USING fts5(
+    title,
+    body,
+    ticket_id UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+
+def plain_text(body: str | None, content_type: str | None = None) -> str:
+    """Reduce an article body to plain text for indexing."""
+    if not body:
+        return ""
+    if content_type and "html" not in content_type.lower():
+        return body
+    text = _BLOCK_TAG.sub("\n", body)
+    text = _TAG.sub(" ", text)
+    return html.unescape(text)
+
+
+def match_query(text: str) -> str | None:
+    """Turn free text into an FTS5 query matching all words (``word*`` matches prefixes).
+
+    Words are quoted, so punctuation and FTS5 operators in user input cannot
+    produce syntax errors. Returns None if the text has no words.
+    """
+    terms = []
+    for token in _TOKEN.findall(text):
+        word = token.rstrip("*")
+        if word:
+            terms.append(f'"{word}"*' if token.endswith("*") else f'"{word}"')
+    return " ".join(terms) or None
+
+
+class ArticleIndex:
+    """FTS5 index of ticket titles and article bodies for offline search.
+
+    Fed from the payloads the client already receives: every ticket seen
+    contributes its title and every article seen (including articles attached
+    to fetched tickets and new articles) its subject and body. Each ticket title
+    and each article is one row keyed by ID, so seeing a record again replaces
+    it rather than duplicating it. Queries rank with BM25, weighting title
+    matches above body matches, and group hits by ticket.
+
+    The observers are called on the event loop by the async client, so they
+    only queue rows; a writer thread applies and commits them. Searches block
+    on SQLite and belong in worker threads. Rows become searchable once the
+    writer has caught up (see :meth:`flush`).
+
+    Configuration through the environment (see :meth:`from_env`):
+
+    - ZAMMAD_ARTICLE_INDEX_PATH: SQLite file holding the index (off when unset)
+    """
+
+    def __init__(self, path: str):
+        """Open (and create) the index at ``path`` (``:memory:`` for a throwaway index)."""
+        self.path = path
+        # Taken by the writer thread and by searches, never by the observers
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        # Row batches waiting for the writer; None stops it
+        self._pending: queue.Queue[tuple[str, list[tuple[Any, ...]]] | None] = queue.Queue()
+        self._writer = threading.Thread(target=self._write_pending, name="article-index-writer", daemon=True)
+        self._writer.start()
+
+    @classmethod
+    def from_env(cls) -> "ArticleIndex | None":
+        """Open the index configured by ZAMMAD_ARTICLE_INDEX_PATH, or return None if it is not set."""
+        path = os.getenv("ZAMMAD_ARTICLE_INDEX_PATH")
+        return cls(path) if path else None
+
+    def observe_tickets(self, tickets: Iterable[dict[str, Any]]) -> None:
+        """Index the titles of ticket payloads."""
+        rows = [
+            (int(ticket["id"]), ticket.get("number"), ticket["title"])
+            for ticket in tickets
+            if ticket.get("id") and ticket.get("title")
+        ]
+        if rows:
+            self._pending.put(("tickets", rows))
+
+    def observe_articles(self, articles: Iterable[dict[str, Any]]) -> None:
+        """Index article payloads by subject and body."""
+        rows = []
+        for article in articles:
+            if not article.get("id") or not article.get("ticket_id"):
+                continue
+            body = plain_text(article.get("body"), article.get("content_type"))
+            text = "\n".join(part for part in (article.get("subject"), body) if part)
+            rows.append((int(article["id"]), text, int(article["ticket_id"])))
+        if rows:
+            self._pending.put(("articles", rows))
+
+    def flush(self) -> None:
+        """Block until every row observed so far has been written."""
+        self._pending.join()
+
+    def _write_pending(self) -> None:
+        """Writer thread: apply queued row batches, committing once per burst."""
+        while True:
+            batches = [self._pending.get()]
+            with contextlib.suppress(queue.Empty):
+                while batches[-1] is not None:
+                    batches.append(self._pending.get_nowait())
+            try:
+                with self._lock:
+                    for batch in batches:
+                        if batch is not None:
+                            self._write(*batch)
+                    self._db.commit()
+            except sqlite3.Error:
+                logger.exception("Failed to update the article index")
+            finally:
+                for _ in batches:
+                    self._pending.task_done()
+            if batches[-1] is None:
+                return
+
+    def _write(self, kind: str, rows: list[tuple[Any, ...]]) -> None:
+        if kind == "tickets":
+            self._db.executemany("INSERT OR REPLACE INTO indexed_tickets VALUES (?, ?, ?)", rows)
+            # Title rows use the negated ticket ID so they never collide with article IDs
+            self._db.executemany("DELETE FROM article_text WHERE rowid = ?", [(-row[0],) for row in rows])
+            self._db.executemany(
+                "INSERT INTO article_text (rowid, title, body, ticket_id) VALUES (?, ?, '', ?)",
+                [(-ticket_id, title, ticket_id) for ticket_id, _, title in rows],
+            )
+        else:
+            self._db.executemany("DELETE FROM article_text WHERE rowid = ?", [(row[0],) for row in rows])
+            self._db.executemany("INSERT INTO article_text (rowid, title, body, ticket_id) VALUES (?, '', ?, ?)", rows)
+
+    def search(self, text: str, limit: int = 10) -> list[dict[str, Any]]:
+        """Find the tickets whose title or articles best match ``text``.
+
+        Returns up to ``limit`` tickets, best first, each with its number, title,
+        BM25 score (lower is better, as in SQLite) and highlighted snippets of its
+        best matching articles.
+        """
+        query = match_query(text)
+        if query is None:
+            return []
+        with self._lock:
+            # Enough rows to fill `limit` tickets even if the best hits cluster in a few tickets
+            rows = self._db.execute(
+                "SELECT article_text.ticket_id, article_text.rowid, "
+                "snippet(article_text, -1, '**', '**', '…', 16), "
+                f"bm25(article_text, {TITLE_WEIGHT}, 1.0) AS score, indexed_tickets.number, indexed_tickets.title "
+                "FROM article_text LEFT JOIN indexed_tickets ON indexed_tickets.id = article_text.ticket_id "
+                "WHERE article_text MATCH ? ORDER BY score LIMIT ?",  # nosec B608
+                (query, max(limit, 1) * SNIPPETS_PER_TICKET * 4),
+            ).fetchall()
+
+        results: dict[int, dict[str, Any]] = {}
+        for ticket_id, rowid, snippet, score, number, title in rows:
+            result = results.get(ticket_id)
+            if result is None:
+                if len(results) >= limit:
+                    continue
+                result = results[ticket_id] = {
+                    "ticket_id": ticket_id,
+                    "number": number,
+                    "title": title,
+                    "score": score,
+                    "snippets": [],
+                }
+            if rowid > 0 and len(result["snippets"]) < SNIPPETS_PER_TICKET:
+                result["snippets"].append({"article_id": rowid, "snippet": snippet})
+        return list(results.values())
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._db.execute("SELECT COUNT(*) FROM article_text WHERE rowid > 0").fetchone()[0])
+
+    def close(self) -> None:
+        """Write the queued rows and close the index."""
+        self._pending.put(None)
+        self._writer.join()
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,544 @@
+"""Async Zammad API client built on a shared, pooled httpx.AsyncClient."""
+
+import asyncio
+import contextlib
+import logging
+import os
+from collections.abc import Iterable
+from typing import Any
+
+import httpx
+
+from .client import SEARCH_ASSETS, USER_BATCH_SIZE, BaseZammadClient
+
+logger = logging.getLogger(__name__)
+
+# Connection pool defaults, overridable through the environment
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+DEFAULT_TIMEOUT = 30.0
+# Page size used when walking list endpoints (groups, states, priorities)
+LIST_PAGE_SIZE = 100
+
+
+def _env_number(name: str, default: float) -> float:
+    """Read a numeric setting from the environment, falling back to the default."""
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid value for {name}: {value!r}")
+        return default
+
+
+class AsyncZammadClient(BaseZammadClient):
+    """Non-blocking Zammad client with the same method surface as ZammadClient.
+
+    All requests go through one shared ``httpx.AsyncClient`` so connections are
+    kept alive and reused across concurrent tool calls. Pool limits can be set
+    through the constructor or the environment:
+
+    - ZAMMAD_MAX_CONNECTIONS: Maximum number of concurrent connections
+    - ZAMMAD_MAX_KEEPALIVE_CONNECTIONS: Maximum number of idle keep-alive connections
+    - ZAMMAD_KEEPALIVE_EXPIRY: Seconds an idle connection is kept open
+    - ZAMMAD_TIMEOUT: Request timeout in seconds
+    """
+
+    def __init__(
+        self,
+        url: str | None = None,
+        username: str | None = None,
+        password: str | None = None,
+        http_token: str | None = None,
+        oauth2_token: str | None = None,
+        *,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float | None = None,
+        timeout: float | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """Initialize the async client and its connection pool."""
+        super().__init__(url, username, password, http_token, oauth2_token)
+
+        self.limits = httpx.Limits(
+            max_connections=max_connections or int(_env_number("ZAMMAD_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+            max_keepalive_connections=max_keepalive_connections
+            or int(_env_number("ZAMMAD_MAX_KEEPALIVE_CONNECTIONS", DEFAULT_MAX_KEEPALIVE_CONNECTIONS)),
+            keepalive_expiry=keepalive_expiry or _env_number("ZAMMAD_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY),
+        )
+
+        headers = {"User-Agent": "Zammad MCP Server"}
+        auth: httpx.BasicAuth | None = None
+        if self.http_token:
+            headers["Authorization"] = f"Token token={self.http_token}"
+        elif self.oauth2_token:
+            headers["Authorization"] = f"Bearer {self.oauth2_token}"
+        elif self.username and self.password:
+            auth = httpx.BasicAuth(self.username, self.password)
+
+        base_url = self.url if self.url and self.url.endswith("/") else f"{self.url}/"
+        self.http = httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            auth=auth,
+            limits=self.limits,
+            timeout=timeout or _env_number("ZAMMAD_TIMEOUT", DEFAULT_TIMEOUT),
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "AsyncZammadClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self.http.aclose()
+        self.ticket_index.close()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        json: Any = None,
+    ) -> Any:
+        """Send a request and return the decoded JSON body (or raw bytes for non-JSON)."""
+        response = await self._send(method, path, params=params, json=json)
+        response.raise_for_status()
+        try:
+            return response.json()
+        except ValueError:
+            return response.content
+
+    async def _send(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
+        """Send a request through the shared pool, recording its latency, status and size."""
+        with self._track_request(method, path) as record:
+            response = await self.http.request(method, path, **kwargs)
+            record(response.status_code, len(response.content))
+        return response
+
+    @staticmethod
+    def _records(data: Any, key: str) -> list[dict[str, Any]]:
+        """Normalize list responses, which may be a bare list or a ``{key: [...]}`` envelope."""
+        if isinstance(data, dict):
+            data = data.get(key, [])
+        return list(data or [])
+
+    async def _get_all(self, path: str) -> list[dict[str, Any]]:
+        """Fetch every record of a list endpoint, one page at a time."""
+        records: list[dict[str, Any]] = []
+        page = 1
+        while True:
+            batch = self._records(
+                await self._request("GET", path, params={"page": page, "per_page": LIST_PAGE_SIZE, "expand": "true"}),
+                path,
+            )
+            records.extend(batch)
+            if len(batch) < LIST_PAGE_SIZE:
+                return records
+            page += 1
+
+    async def search_tickets(
+        self,
+        query: str | None = None,
+        *,
+        state: str | None = None,
+        priority: str | None = None,
+        group: str | None = None,
+        owner: str | None = None,
+        customer: str | None = None,
+        page: int = 1,
+        per_page: int = 25,
+        expand: bool = True,
+        sort_by: str | None = None,
+        order_by: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Search tickets with various filters.
+
+        With ``expand=False`` Zammad skips resolving related objects to names, which
+        makes the response smaller and cheaper to produce; only IDs are returned.
+        ``sort_by``/``order_by`` (``asc`` or ``desc``) override Zammad's default order.
+        """
+        filters: dict[str, Any] = {"page": page, "per_page": per_page}
+        if expand:
+            filters["expand"] = "true"
+        if sort_by:
+            filters.update(sort_by=sort_by, order_by=order_by or "asc")
+        search_query = self._build_ticket_query(
+            query, state=state, priority=priority, group=group, owner=owner, customer=customer
+        )
+
+        logger.info(
+            "search_tickets executing",
+            extra={
+                "search_query": search_query,
+                "filters": filters,
+            },
+        )
+
+        if search_query:
+            result = await self._request("GET", "tickets/search", params={"query": search_query, **filters})
+        else:
+            result = await self._request("GET", "tickets", params=filters)
+
+        tickets = self._unpack_search(result, "tickets", "Ticket")
+        self._observe_tickets(tickets)
+        return tickets
+
+    async def list_updated_since(
+        self, kind: str, since: str | None, page: int = 1, per_page: int = 100
+    ) -> list[dict[str, Any]]:
+        """List tickets, users or organizations updated at or after ``since``, oldest update first.
+
+        Used to mirror records incrementally; ``since`` is an ``updated_at`` value
+        and None lists everything.
+        """
+        params = self._updated_since_params(since, page, per_page)
+        records = self._unpack_search(
+            await self._request("GET", f"{kind}/search", params=params), kind, SEARCH_ASSETS[kind]
+        )
+        if kind == "tickets":
+            self._observe_tickets(records)
+        return records
+
+    async def count_tickets(self, query: str | None = None, group: str | None = None) -> int | None:
+        """Count tickets matching a search without fetching them.
+
+        Returns None when the Zammad version does not report search totals.
+        """
+        search_query = self._build_ticket_query(query, group=group)
+        params = self._count_params(search_query)
+        return self._total_count(await self._request("GET", "tickets/search", params=params))
+
+    async def get_ticket_by_number(
+        self, ticket_number: str, include_articles: bool = True, article_limit: int = 10, article_offset: int = 0
+    ) -> dict[str, Any]:
+        """Get a single ticket by ticket number with optional article pagination."""
+        # Numbers seen before resolve without a search
+        known_id = self.ticket_index.get(ticket_number)
+        if known_id is not None:
+            try:
+                return await self.get_ticket(known_id, include_articles, article_limit, article_offset)
+            except ValueError:
+                # The ticket was deleted or merged away; fall back to searching
+                self.ticket_index.discard(ticket_number)
+
+        search_results = self._records(
+            await self._request("GET", "tickets/search", params={"query": f"number:{ticket_number}", "expand": "true"}),
+            "tickets",
+        )
+        if not search_results:
+            raise ValueError(f"Ticket with number {ticket_number} does not exist")
+
+        ticket_data = next(
+            (result for result in search_results if str(result.get("number")) == str(ticket_number)),
+            search_results[0],
+        )
+        ticket_id = ticket_data.get("id")
+        if not ticket_id:
+            raise ValueError(f"Could not get ID for ticket number {ticket_number}")
+
+        logger.info(f"Found ticket ID {ticket_id} for ticket number {ticket_number}")
+        return await self.get_ticket(int(ticket_id), include_articles, article_limit, article_offset)
+
+    async def get_ticket(
+        self, ticket_id: int, include_articles: bool = True, article_limit: int = 10, article_offset: int = 0
+    ) -> dict[str, Any]:
+        """Get a single ticket by ID with optional article pagination."""
+        variant = (include_articles, article_limit, article_offset)
+        cached = self.cache.get("ticket", ticket_id, variant)
+        if cached is not None:
+            return dict(cached)
+
+        # Reads started after a write must not join a flight that started before it
+        generation = self.cache.generation("ticket", ticket_id)
+        ticket = await self.single_flight.run(
+            ("ticket", int(ticket_id), *variant, generation),
+            self._fetch_ticket,
+            ticket_id,
+            include_articles,
+            article_limit,
+            article_offset,
+        )
+        self.cache.set("ticket", ticket_id, ticket, variant, generation=generation)
+        return dict(ticket)
+
+    async def _fetch_ticket(
+        self, ticket_id: int, include_articles: bool, article_limit: int, article_offset: int
+    ) -> dict[str, Any]:
+        # A full article list doesn't depend on the ticket payload, so fetch both at once
+        articles_task = (
+            asyncio.ensure_future(self._get_all_articles(ticket_id))
+            if include_articles and article_limit == -1
+            else None
+        )
+
+        try:
+            ticket = await self._request("GET", f"tickets/{int(ticket_id)}")
+        except BaseException as e:
+            if articles_task is not None:
+                articles_task.cancel()
+                with contextlib.suppress(BaseException):
+                    await articles_task
+            if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == httpx.codes.NOT_FOUND:
+                raise ValueError(f"Ticket with ID {ticket_id} does not exist") from e
+            raise
+
+        if articles_task is not None:
+            articles_list = await articles_task
+            ticket["articles"] = articles_list
+            ticket.setdefault("article_count", len(articles_list))
+        elif include_articles:
+            ticket["articles"] = await self._get_article_window(ticket, article_limit, article_offset)
+
+        self._observe_tickets([ticket])
+        self._observe_articles(ticket.get("articles") or [])
+        return dict(ticket)
+
+    async def _get_all_articles(self, ticket_id: int) -> list[dict[str, Any]]:
+        """Fetch every article of a ticket in one request."""
+        return self._records(
+            await self._request("GET", f"ticket_articles/by_ticket/{int(ticket_id)}", params={"expand": "true"}),
+            "articles",
+        )
+
+    async def _get_article_window(
+        self, ticket: dict[str, Any], article_limit: int, article_offset: int
+    ) -> list[dict[str, Any]]:
+        """Fetch only the requested articles, by ID, instead of the ticket's full article list."""
+        window = self._article_window(ticket, article_limit, article_offset)
+        if window is None:
+            # Payload without article_ids: fetch everything and slice
+            articles_list = await self._get_all_articles(ticket["id"])
+            ticket.setdefault("article_count", len(articles_list))
+            return articles_list[article_offset : article_offset + article_limit]
+
+        articles = await asyncio.gather(
+            *(self._request("GET", f"ticket_articles/{article_id}", params={"expand": "true"}) for article_id in window)
+        )
+        return [dict(article) for article in articles]
+
+    async def create_ticket(
+        self,
+        title: str,
+        group: str,
+        customer: str,
+        article_body: str,
+        *,
+        state: str = "new",
+        priority: str = "2 normal",
+        article_type: str = "note",
+        article_internal: bool = False,
+    ) -> dict[str, Any]:
+        """Create a new ticket."""
+        ticket_data = {
+            "title": title,
+            "group": group,
+            "customer": customer,
+            "state": state,
+            "priority": priority,
+            "article": {
+                "body": article_body,
+                "type": article_type,
+                "internal": article_internal,
+            },
+        }
+
+        ticket = dict(await self._request("POST", "tickets", json=ticket_data))
+        self._observe_tickets([ticket])
+        return ticket
+
+    async def update_ticket(
+        self,
+        ticket_id: int,
+        *,
+        title: str | None = None,
+        state: str | None = None,
+        priority: str | None = None,
+        owner: str | None = None,
+        group: str | None = None,
+    ) -> dict[str, Any]:
+        """Update an existing ticket."""
+        update_data = {
+            key: value
+            for key, value in {
+                "title": title,
+                "state": state,
+                "priority": priority,
+                "owner": owner,
+                "group": group,
+            }.items()
+            if value is not None
+        }
+
+        ticket = dict(await self._request("PUT", f"tickets/{ticket_id}", json=update_data))
+        self.cache.invalidate("ticket", ticket_id)
+        self._observe_tickets([ticket])
+        return ticket
+
+    async def add_article(
+        self,
+        ticket_id: int,
+        body: str,
+        article_type: str = "note",
+        internal: bool = False,
+        sender: str = "Agent",
+    ) -> dict[str, Any]:
+        """Add an article (comment/note) to a ticket."""
+        article_data = {
+            "ticket_id": ticket_id,
+            "body": body,
+            "type": article_type,
+            "internal": internal,
+            "sender": sender,
+        }
+
+        article = dict(await self._request("POST", "ticket_articles", json=article_data))
+        self.cache.invalidate("ticket", ticket_id)
+        self._observe_articles([article])
+        return article
+
+    async def get_user(self, user_id: int) -> dict[str, Any]:
+        """Get user information by ID."""
+        cached = self.cache.get("user", user_id)
+        if cached is not None:
+            return dict(cached)
+
+        generation = self.cache.generation("user", user_id)
+        user = dict(
+            await self.single_flight.run(("user", int(user_id), generation), self._request, "GET", f"users/{user_id}")
+        )
+        self.cache.set("user", user_id, user, generation=generation)
+        return dict(user)
+
+    async def search_users(
+        self,
+        query: str,
+        page: int = 1,
+        per_page: int = 25,
+        expand: bool = True,
+    ) -> list[dict[str, Any]]:
+        """Search users."""
+        params: dict[str, Any] = {"query": query, "page": page, "per_page": per_page}
+        if expand:
+            params["expand"] = "true"
+        return self._records(await self._request("GET", "users/search", params=params), "users")
+
+    async def get_users(self, user_ids: Iterable[int]) -> dict[int, dict[str, Any]]:
+        """Get several users by ID: cached ones locally, the rest with one search per 100 IDs."""
+        users: dict[int, dict[str, Any]] = {}
+        missing: list[int] = []
+        for user_id in dict.fromkeys(int(user_id) for user_id in user_ids):
+            cached = self.cache.get("user", user_id)
+            if cached is not None:
+                users[user_id] = dict(cached)
+            else:
+                missing.append(user_id)
+
+        generations = {user_id: self.cache.generation("user", user_id) for user_id in missing}
+        batches = [missing[start : start + USER_BATCH_SIZE] for start in range(0, len(missing), USER_BATCH_SIZE)]
+        results = await asyncio.gather(
+            *(
+                self._request(
+                    "GET", "users/search", params={"query": self._user_id_query(batch), "per_page": len(batch)}
+                )
+                for batch in batches
+            )
+        )
+        wanted = set(missing)
+        for result in results:
+            for user in self._records(result, "users"):
+                if user.get("id") in wanted:
+                    self.cache.set("user", user["id"], user, generation=generations[user["id"]])
+                    users[user["id"]] = dict(user)
+
+        # The search index may lag behind; look up stragglers one by one
+        stragglers = [user_id for user_id in missing if user_id not in users]
+        fetched = await asyncio.gather(*(self.get_user(user_id) for user_id in stragglers), return_exceptions=True)
+        for user_id, outcome in zip(stragglers, fetched, strict=True):
+            if isinstance(outcome, BaseException):
+                logger.warning(f"Could not resolve user {user_id}")
+            else:
+                users[user_id] = outcome
+        return users
+
+    async def get_organization(self, org_id: int) -> dict[str, Any]:
+        """Get organization information by ID."""
+        cached = self.cache.get("organization", org_id)
+        if cached is not None:
+            return dict(cached)
+
+        generation = self.cache.generation("organization", org_id)
+        organization = dict(
+            await self.single_flight.run(
+                ("organization", int(org_id), generation), self._request, "GET", f"organizations/{org_id}"
+            )
+        )
+        self.cache.set("organization", org_id, organization, generation=generation)
+        return dict(organization)
+
+    async def search_organizations(
+        self,
+        query: str,
+        page: int = 1,
+        per_page: int = 25,
+        expand: bool = True,
+    ) -> list[dict[str, Any]]:
+        """Search organizations."""
+        params: dict[str, Any] = {"query": query, "page": page, "per_page": per_page}
+        if expand:
+            params["expand"] = "true"
+        return self._records(await self._request("GET", "organizations/search", params=params), "organizations")
+
+    async def get_groups(self) -> list[dict[str, Any]]:
+        """Get all groups."""
+        return await self._get_all("groups")
+
+    async def get_ticket_states(self) -> list[dict[str, Any]]:
+        """Get all ticket states."""
+        return await self._get_all("ticket_states")
+
+    async def get_ticket_priorities(self) -> list[dict[str, Any]]:
+        """Get all ticket priorities."""
+        return await self._get_all("ticket_priorities")
+
+    async def get_current_user(self) -> dict[str, Any]:
+        """Get current authenticated user."""
+        return dict(await self._request("GET", "users/me"))
+
+    async def get_ticket_tags(self, ticket_id: int) -> list[str]:
+        """Get tags for a ticket."""
+        tags = await self._request("GET", "tags", params={"object": "Ticket", "o_id": ticket_id})
+        return list(tags.get("tags", []))
+
+    async def add_ticket_tag(self, ticket_id: int, tag: str) -> dict[str, Any]:
+        """Add a tag to a ticket."""
+        payload = {"o_id": ticket_id, "item": tag, "object": "Ticket"}
+        result = await self._request("POST", "tags/add", json=payload)
+        self.cache.invalidate("ticket", ticket_id)
+        # Zammad answers tag changes with a bare ``true``
+        return dict(result) if isinstance(result, dict) else {"success": bool(result)}
+
+    async def remove_ticket_tag(self, ticket_id: int, tag: str) -> dict[str, Any]:
+        """Remove a tag from a ticket."""
+        payload = {"o_id": ticket_id, "item": tag, "object": "Ticket"}
+        result = await self._request("DELETE", "tags/remove", json=payload)
+        self.cache.invalidate("ticket", ticket_id)
+        return dict(result) if isinstance(result, dict) else {"success": bool(result)}
+
+    async def download_attachment(self, ticket_id: int, article_id: int, attachment_id: int) -> bytes:
+        """Download an attachment from a ticket article."""
+        response = await self._send("GET", f"ticket_attachment/{ticket_id}/{article_id}/{attachment_id}")
+        response.raise_for_status()
+        return response.content
+
+    async def get_article_attachments(self, _ticket_id: int, article_id: int) -> list[dict[str, Any]]:
+        """Get list of attachments for a ticket article."""
+        article = await self._request("GET", f"ticket_articles/{article_id}")
+        return list(article.get("attachments", []))
@@ -0,0 +1,229 @@
+"""Bounded TTL + LRU cache for Zammad entities (users, organizations, tickets)."""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Seconds an entry stays fresh, per entity type; 0 disables caching for the type
+DEFAULT_TTLS: dict[str, float] = {
+    "user": 300.0,
+    "organization": 600.0,
+    "ticket": 30.0,
+}
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+CacheKey = tuple[str, int, Hashable]
+
+
+def _approximate_size(value: Any) -> int:
+    """Estimate the memory footprint of a payload by its JSON length."""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 1024
+
+
+class EntityCache:
+    """Thread-safe entity cache with per-type TTLs and LRU eviction.
+
+    Entries are evicted least recently used first once either ``max_entries``
+    or the approximate ``max_bytes`` budget is exceeded. An entity may be
+    cached under several variants (e.g. a ticket with different article
+    windows); :meth:`invalidate` drops all variants of an entity at once.
+
+    Readers that fetch on a miss take the entity's :meth:`generation` before the
+    fetch and pass it to :meth:`set`. An invalidation in between bumps the
+    generation, so a payload read before a write is not cached after it.
+
+    Configuration through the environment (see :meth:`from_env`):
+
+    - ZAMMAD_CACHE_MAX_ENTRIES: Maximum number of cached entries
+    - ZAMMAD_CACHE_MAX_BYTES: Approximate memory budget in bytes
+    - ZAMMAD_CACHE_TTL_USER, ZAMMAD_CACHE_TTL_ORGANIZATION, ZAMMAD_CACHE_TTL_TICKET:
+      Seconds entries of each type stay fresh (0 disables caching for the type)
+    """
+
+    def __init__(
+        self,
+        ttls: dict[str, float] | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize an empty cache."""
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (expires_at, size, value), in LRU order
+        self._entries: OrderedDict[CacheKey, tuple[float, int, Any]] = OrderedDict()
+        self._variants: dict[tuple[str, int], set[CacheKey]] = {}
+        # Entity -> counter value at its last invalidation, bounded like the entries.
+        # Entities dropped from it report the floor, which only grows, so a set()
+        # racing with the drop is skipped rather than let through.
+        self._counter = 0
+        self._generations: OrderedDict[tuple[str, int], int] = OrderedDict()
+        self._generation_floor = 0
+        self._type_generations: dict[str, int] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    @classmethod
+    def from_env(cls) -> "EntityCache":
+        """Create a cache configured from the ZAMMAD_CACHE_* environment variables."""
+
+        def read(name: str, default: float) -> float:
+            value = os.getenv(name)
+            if not value:
+                return default
+            try:
+                return float(value)
+            except ValueError:
+                logger.warning(f"Ignoring invalid value for {name}: {value!r}")
+                return default
+
+        ttls = {
+            entity_type: read(f"ZAMMAD_CACHE_TTL_{entity_type.upper()}", ttl)
+            for entity_type, ttl in DEFAULT_TTLS.items()
+        }
+        return cls(
+            ttls=ttls,
+            max_entries=int(read("ZAMMAD_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+            max_bytes=int(read("ZAMMAD_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+        )
+
+    def get(self, entity_type: str, entity_id: int, variant: Hashable = None) -> Any | None:
+        """Return the cached value, or None if it is missing or expired."""
+        key = (entity_type, int(entity_id), variant)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry[0] <= self._clock():
+                self._remove(key)
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[2]
+
+    def generation(self, entity_type: str, entity_id: int) -> int:
+        """Return the entity's generation, which changes whenever it is invalidated."""
+        with self._lock:
+            return self._generation((entity_type, int(entity_id)))
+
+    def set(
+        self, entity_type: str, entity_id: int, value: Any, variant: Hashable = None, generation: int | None = None
+    ) -> None:
+        """Store ``value``; a no-op for entity types whose TTL is 0 or that exceed the byte budget.
+
+        With ``generation`` (from :meth:`generation`, taken before fetching
+        ``value``), nothing is stored if the entity was invalidated since.
+        """
+        ttl = self.ttls.get(entity_type, 0)
+        if ttl <= 0:
+            return
+        key = (entity_type, int(entity_id), variant)
+        size = _approximate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generation(key[:2]):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self._clock() + ttl, size, value)
+            self._variants.setdefault(key[:2], set()).add(key)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def invalidate(self, entity_type: str, entity_id: int) -> None:
+        """Drop every cached variant of one entity, e.g. after writing to it."""
+        entity = (entity_type, int(entity_id))
+        with self._lock:
+            self._counter += 1
+            self._generations[entity] = self._counter
+            self._generations.move_to_end(entity)
+            while len(self._generations) > self.max_entries:
+                _, dropped = self._generations.popitem(last=False)
+                self._generation_floor = max(self._generation_floor, dropped)
+            for key in list(self._variants.get(entity, set())):
+                self._remove(key)
+                self._invalidations += 1
+
+    def invalidate_type(self, entity_type: str) -> None:
+        """Drop all cached entities of one type."""
+        with self._lock:
+            self._counter += 1
+            self._type_generations[entity_type] = self._counter
+            for key in [key for key in self._entries if key[0] == entity_type]:
+                self._remove(key)
+                self._invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all entries; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._variants.clear()
+            self._bytes = 0
+            self._counter += 1
+            self._generations.clear()
+            self._generation_floor = self._counter
+
+    def observe_tickets(self, tickets: Iterable[dict[str, Any]]) -> None:
+        """Drop cached tickets that a newer payload (e.g. from a search) shows to be outdated."""
+        with self._lock:
+            for ticket in tickets:
+                if not ticket.get("id"):
+                    continue
+                keys = self._variants.get(("ticket", int(ticket["id"])), set())
+                for key in list(keys):
+                    if self._entries[key][2].get("updated_at") != ticket.get("updated_at"):
+                        self._remove(key)
+                        self._invalidations += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit, miss, eviction and size counters."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": self._hits / lookups if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+    def _generation(self, entity: tuple[str, int]) -> int:
+        # Caller holds the lock
+        return max(self._generations.get(entity, self._generation_floor), self._type_generations.get(entity[0], 0))
+
+    def _remove(self, key: CacheKey) -> None:
+        # Caller holds the lock
+        _expires_at, size, _value = self._entries.pop(key)
+        self._bytes -= size
+        variants = self._variants.get(key[:2])
+        if variants is not None:
+            variants.discard(key)
+            if not variants:
+                del self._variants[key[:2]]
@@ -4,14 +4,16 @@ import argparse
 import logging
 import sys
 
-from .http_server import create_http_server
+from .executor import DEFAULT_BULK_QUEUE, DEFAULT_BULK_WORKERS, DEFAULT_MAX_QUEUE, DEFAULT_MAX_WORKERS
+from .http_server import DEFAULT_BATCH_CONCURRENCY, create_http_server
 from .server import mcp
+from .server import server as zammad_server
 
 logger = logging.getLogger(__name__)
 
 
-def main() -> None:
-    """Main CLI entry point with support for stdio and HTTP/HTTPS modes."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
     parser = argparse.ArgumentParser(description="Zammad MCP Server")
     parser.add_argument(
         "--mode",
@@ -48,14 +50,64 @@ def main() -> None:
         action="store_true",
         help="Generate self-signed certificate if cert/key not provided",
     )
+    parser.add_argument(
+        "--webhook-secret",
+        help="HMAC token of the Zammad webhook posting to /webhooks/zammad "
+        "(default: ZAMMAD_WEBHOOK_SECRET_FILE or ZAMMAD_WEBHOOK_SECRET)",
+    )
+    parser.add_argument(
+        "--batch-concurrency",
+        type=int,
+        default=DEFAULT_BATCH_CONCURRENCY,
+        help=f"Calls of one batched /mcp/call request run at the same time (default: {DEFAULT_BATCH_CONCURRENCY})",
+    )
+    parser.add_argument(
+        "--slow-call-ms",
+        type=float,
+        help="Log MCP calls slower than this many milliseconds with their timing and redacted arguments; "
+        "0 disables the log (default: ZAMMAD_SLOW_CALL_MS or 1000)",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        help="Write Prometheus metrics to this file every ZAMMAD_METRICS_INTERVAL seconds in stdio mode "
+        "(default: ZAMMAD_METRICS_FILE; HTTP mode serves them at /metrics)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_MAX_WORKERS,
+        help=f"Worker threads for blocking Zammad calls (default: {DEFAULT_MAX_WORKERS})",
+    )
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=DEFAULT_MAX_QUEUE,
+        help=f"Blocking calls allowed to wait for a worker before being rejected (default: {DEFAULT_MAX_QUEUE})",
+    )
+    parser.add_argument(
+        "--bulk-workers",
+        type=int,
+        default=DEFAULT_BULK_WORKERS,
+        help=f"Worker threads reserved for long scans like get_ticket_stats (default: {DEFAULT_BULK_WORKERS})",
+    )
+    parser.add_argument(
+        "--bulk-queue",
+        type=int,
+        default=DEFAULT_BULK_QUEUE,
+        help=f"Scan calls allowed to wait for a bulk worker (default: {DEFAULT_BULK_QUEUE})",
+    )
     parser.add_argument(
         "--log-level",
         choices=["DEBUG", "INFO", "WARNING", "ERROR"],
         default="INFO",
         help="Logging level (default: INFO)",
     )
+    return parser
+
 
-    args = parser.parse_args()
+def main() -> None:
+    """Main CLI entry point with support for stdio and HTTP/HTTPS modes."""
+    args = _build_parser().parse_args()
 
     # Configure logging
     logging.basicConfig(
@@ -63,6 +115,13 @@ def main() -> None:
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     )
 
+    pool_options = {
+        "max_workers": args.workers,
+        "max_queue": args.max_queue,
+        "bulk_workers": args.bulk_workers,
+        "bulk_queue": args.bulk_queue,
+    }
+
     if args.mode == "http":
         # Run in HTTP/HTTPS/SSE mode
         ssl_config = None
@@ -89,7 +148,15 @@ def main() -> None:
         logger.info(f"Starting Zammad MCP server in {protocol} mode on {args.host}:{args.port}")
         
         try:
-            http_server = create_http_server(host=args.host, port=args.port, ssl_config=ssl_config)
+            http_server = create_http_server(
+                host=args.host,
+                port=args.port,
+                ssl_config=ssl_config,
+                webhook_secret=args.webhook_secret,
+                batch_concurrency=args.batch_concurrency,
+                slow_call_ms=args.slow_call_ms,
+            )
+            http_server.mcp_server.configure_executors(**pool_options)
             http_server.run()
         except KeyboardInterrupt:
             logger.info("Server stopped by user")
@@ -101,6 +168,8 @@ def main() -> None:
         # Run in stdio mode (default MCP protocol)
         logger.info("Starting Zammad MCP server in stdio mode")
         try:
+            zammad_server.configure_executors(**pool_options)
+            zammad_server.metrics_file = args.metrics_file
             # FastMCP handles its own async loop
             mcp.run()  # type: ignore[func-returns-value]
         except KeyboardInterrupt:
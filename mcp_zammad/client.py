@@ -1,18 +1,36 @@
 """Zammad API client wrapper for the MCP server."""
 
+import contextlib
 import logging
 import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any
 from urllib.parse import urlparse
 
 from zammad_py import ZammadAPI
 from zammad_py.exceptions import ConfigException
 
+from .cache import EntityCache
+from .coalesce import SingleFlight
+from .metrics import Metrics, endpoint_label
+from .ticket_index import TicketNumberIndex
+from .timing import timed
+from .tracing import set_attributes, span
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of user IDs resolved by one search request
+USER_BATCH_SIZE = 100
+
+# Asset table holding the records of each searchable kind in unexpanded results
+SEARCH_ASSETS = {"tickets": "Ticket", "users": "User", "organizations": "Organization"}
+# Threads used to issue independent requests of one call (e.g. ticket + articles) side by side
+PARALLEL_FETCH_WORKERS = 8
 
-class ZammadClient:
-    """Wrapper around zammad_py ZammadAPI with additional functionality."""
+
+class BaseZammadClient:
+    """Credential and URL handling shared by the sync and async Zammad clients."""
 
     def __init__(
         self,
@@ -59,13 +77,88 @@ class ZammadClient:
                 "ZAMMAD_OAUTH2_TOKEN, or both ZAMMAD_USERNAME and ZAMMAD_PASSWORD."
             )
 
-        self.api = ZammadAPI(
-            url=self.url,
-            username=self.username,
-            password=self.password,
-            http_token=self.http_token,
-            oauth2_token=self.oauth2_token,
-        )
+        # Every ticket payload the client receives is passed to these callbacks
+        self.ticket_index = TicketNumberIndex.from_env()
+        self._ticket_observers: list[Callable[[list[dict[str, Any]]], None]] = [self.ticket_index.observe]
+        # Identical reads issued while one is already in flight share its result
+        self.single_flight = SingleFlight()
+        # Recently read users, organizations and tickets; writes through the client invalidate them
+        self.cache = EntityCache.from_env()
+        self._ticket_observers.append(self.cache.observe_tickets)
+        self._article_observers: list[Callable[[list[dict[str, Any]]], None]] = []
+        # Latency, status and size of every Zammad request; the server replaces it with its own
+        self.metrics = Metrics()
+
+    @contextlib.contextmanager
+    def _track_request(self, method: str, url: str) -> Iterator[Callable[[int, int | None], None]]:
+        """Meter and trace one Zammad request; call the yielded function with the status code and body size."""
+        endpoint = endpoint_label(url)
+        attributes = {"http.request.method": method, "url.template": endpoint}
+        with (
+            span(f"{method} {endpoint}", attributes, client=True) as current,
+            self.metrics.track_request(method, url) as record,
+            timed("upstream"),
+        ):
+
+            def done(status: int, size: int | None) -> None:
+                record(status, size)
+                set_attributes(current, {"http.response.status_code": status})
+
+            yield done
+
+    def add_ticket_observer(self, observer: Callable[[list[dict[str, Any]]], None]) -> None:
+        """Register a callback that receives every batch of ticket payloads the client sees."""
+        self._ticket_observers.append(observer)
+
+    def _observe_tickets(self, tickets: Iterable[Any]) -> None:
+        """Pass ticket payloads to the registered observers; observer errors are logged, not raised."""
+        batch = [ticket for ticket in tickets if isinstance(ticket, dict)]
+        if not batch:
+            return
+        for observer in self._ticket_observers:
+            try:
+                observer(batch)
+            except Exception:
+                logger.exception("Ticket observer failed")
+
+    def add_article_observer(self, observer: Callable[[list[dict[str, Any]]], None]) -> None:
+        """Register a callback that receives every batch of article payloads the client sees."""
+        self._article_observers.append(observer)
+
+    def _observe_articles(self, articles: Iterable[Any]) -> None:
+        """Pass article payloads to the registered observers; observer errors are logged, not raised."""
+        batch = [article for article in articles if isinstance(article, dict)]
+        if not batch:
+            return
+        for observer in self._article_observers:
+            try:
+                observer(batch)
+            except Exception:
+                logger.exception("Article observer failed")
+
+    def apply_pushed_changes(
+        self,
+        tickets: Iterable[dict[str, Any]] = (),
+        articles: Iterable[dict[str, Any]] = (),
+        users: Iterable[dict[str, Any]] = (),
+        organizations: Iterable[dict[str, Any]] = (),
+    ) -> None:
+        """Apply records Zammad pushed to us (e.g. through a webhook) as if they had been fetched.
+
+        Cached copies are dropped, since a pushed payload is not the shape the
+        client caches, and the ticket and article observers are notified.
+        """
+        tickets, articles = list(tickets), list(articles)
+        changed_tickets = {int(ticket["id"]) for ticket in tickets if ticket.get("id")}
+        changed_tickets.update(int(article["ticket_id"]) for article in articles if article.get("ticket_id"))
+        for ticket_id in changed_tickets:
+            self.cache.invalidate("ticket", ticket_id)
+        for user in users:
+            self.cache.invalidate("user", int(user["id"]))
+        for organization in organizations:
+            self.cache.invalidate("organization", int(organization["id"]))
+        self._observe_tickets(tickets)
+        self._observe_articles(articles)
 
     def _validate_url(self, url: str) -> None:
         """Validate URL format to prevent SSRF attacks."""
@@ -122,21 +215,17 @@ class ZammadClient:
             logger.warning(f"Failed to read secret for environment variable '{env_var}'.")
             return None
 
-    def search_tickets(
-        self,
+    @staticmethod
+    def _build_ticket_query(
         query: str | None = None,
+        *,
         state: str | None = None,
         priority: str | None = None,
         group: str | None = None,
         owner: str | None = None,
         customer: str | None = None,
-        page: int = 1,
-        per_page: int = 25,
-    ) -> list[dict[str, Any]]:
-        """Search tickets with various filters."""
-        filters = {"page": page, "per_page": per_page, "expand": True}
-
-        # Build search query
+    ) -> str | None:
+        """Build a Zammad search query string from ticket filters."""
         search_parts = []
         if query:
             search_parts.append(query)
@@ -151,7 +240,157 @@ class ZammadClient:
         if customer:
             search_parts.append(f"customer.email:{customer}")
 
-        search_query = " AND ".join(search_parts) if search_parts else None
+        return " AND ".join(search_parts) if search_parts else None
+
+    def _unpack_search(self, data: Any, key: str, asset: str) -> list[dict[str, Any]]:
+        """Turn a search response into a list of records.
+
+        Expanded searches return the records themselves. Unexpanded ticket searches
+        return ``{key: [ids], "assets": {...}}``; the records are taken from the
+        assets, and the users included there are put into the entity cache.
+        """
+        if isinstance(data, dict) and "assets" in data:
+            assets = data.get("assets") or {}
+            for user in (assets.get("User") or {}).values():
+                if user.get("id"):
+                    self.cache.set("user", user["id"], user)
+            table = assets.get(asset) or {}
+            return [dict(table[str(record_id)]) for record_id in data.get(key, []) if str(record_id) in table]
+        if isinstance(data, dict):
+            data = data.get(key, [])
+        return list(data or [])
+
+    @staticmethod
+    def _updated_since_params(since: str | None, page: int, per_page: int) -> dict[str, Any]:
+        """Search parameters listing records updated at or after ``since``, oldest update first."""
+        return {
+            "query": f"updated_at:[{since} TO *]" if since else "*",
+            "sort_by": "updated_at",
+            "order_by": "asc",
+            "page": page,
+            "per_page": per_page,
+            "expand": "true",
+        }
+
+    @staticmethod
+    def _count_params(search_query: str | None) -> dict[str, Any]:
+        """Parameters for a search that only needs the total number of matches."""
+        # only_total_count is honoured by current Zammad; older versions ignore it
+        # and return a single-record page without total_count
+        return {"query": search_query or "*", "only_total_count": "true", "limit": 1, "per_page": 1}
+
+    @staticmethod
+    def _total_count(data: Any) -> int | None:
+        """Read the match count from a search response, or None if it has none.
+
+        Only ``total_count`` is trusted: ``tickets_count`` is the size of the
+        returned page, which is at most 1 for a count query.
+        """
+        value = data.get("total_count") if isinstance(data, dict) else None
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        return None
+
+    @staticmethod
+    def _user_id_query(user_ids: list[int]) -> str:
+        """Build a search query matching all of ``user_ids``."""
+        return "id:(" + " OR ".join(str(user_id) for user_id in user_ids) + ")"
+
+    @staticmethod
+    def _article_window(ticket: dict[str, Any], article_limit: int, article_offset: int) -> list[int] | None:
+        """Pick the article IDs of the requested window from the ticket's ``article_ids``.
+
+        Also records the total as ``article_count``. Returns None when the payload
+        has no ``article_ids``, in which case callers fall back to fetching all
+        articles and slicing.
+        """
+        article_ids = ticket.get("article_ids")
+        if not isinstance(article_ids, list):
+            return None
+        # Article IDs grow with creation time, so sorting gives the thread order
+        ordered = sorted(int(article_id) for article_id in article_ids)
+        ticket.setdefault("article_count", len(ordered))
+        return ordered[article_offset : article_offset + article_limit]
+
+
+class ZammadClient(BaseZammadClient):
+    """Wrapper around zammad_py ZammadAPI with additional functionality."""
+
+    def __init__(
+        self,
+        url: str | None = None,
+        username: str | None = None,
+        password: str | None = None,
+        http_token: str | None = None,
+        oauth2_token: str | None = None,
+    ):
+        """Initialize the blocking zammad_py based client."""
+        super().__init__(url, username, password, http_token, oauth2_token)
+
+        self.api = ZammadAPI(
+            url=self.url,
+            username=self.username,
+            password=self.password,
+            http_token=self.http_token,
+            oauth2_token=self.oauth2_token,
+        )
+        self._instrument_session()
+        self._fetch_pool: ThreadPoolExecutor | None = None
+
+    def _instrument_session(self) -> None:
+        """Record latency, status and size of every request zammad_py sends, and trace it."""
+        session = self.api.session
+        send = session.request
+
+        def request(method: str, url: str, *args: Any, **kwargs: Any) -> Any:
+            with self._track_request(method, url) as record:
+                response = send(method, url, *args, **kwargs)
+                record(response.status_code, len(response.content))
+            return response
+
+        session.request = request
+
+    def _submit(self, func: Any, *args: Any) -> "Future[Any]":
+        """Start ``func`` on the client's side pool so it overlaps with work on the calling thread."""
+        if self._fetch_pool is None:
+            self._fetch_pool = ThreadPoolExecutor(max_workers=PARALLEL_FETCH_WORKERS, thread_name_prefix="zammad-fetch")
+        return self._fetch_pool.submit(func, *args)
+
+    def close(self) -> None:
+        """Stop the threads used for parallel fetches."""
+        if self._fetch_pool is not None:
+            self._fetch_pool.shutdown(wait=False, cancel_futures=True)
+            self._fetch_pool = None
+        self.ticket_index.close()
+
+    def search_tickets(
+        self,
+        query: str | None = None,
+        state: str | None = None,
+        priority: str | None = None,
+        group: str | None = None,
+        owner: str | None = None,
+        customer: str | None = None,
+        page: int = 1,
+        per_page: int = 25,
+        *,
+        expand: bool = True,
+        sort_by: str | None = None,
+        order_by: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Search tickets with various filters.
+
+        With ``expand=False`` Zammad skips resolving related objects to names, which
+        makes the response smaller and cheaper to produce; only IDs are returned.
+        ``sort_by``/``order_by`` (``asc`` or ``desc``) override Zammad's default order.
+        """
+        filters: dict[str, Any] = {"page": page, "per_page": per_page, "expand": expand}
+        if sort_by:
+            filters.update(sort_by=sort_by, order_by=order_by or "asc")
+
+        search_query = self._build_ticket_query(
+            query, state=state, priority=priority, group=group, owner=owner, customer=customer
+        )
 
         logger.info(
             "search_tickets executing",
@@ -161,12 +400,42 @@ class ZammadClient:
             },
         )
 
-        if search_query:
-            result = self.api.ticket.search(search_query, filters=filters)
+        if not expand:
+            # zammad_py can't page through the ID list + assets shape of unexpanded searches
+            if search_query:
+                result = self._get_json("tickets/search", {"query": search_query, **filters})
+            else:
+                result = self._get_json("tickets", filters)
+            tickets = self._unpack_search(result, "tickets", "Ticket")
+        elif search_query:
+            tickets = list(self.api.ticket.search(search_query, filters=filters))
         else:
-            result = self.api.ticket.all(filters=filters)
+            tickets = list(self.api.ticket.all(filters=filters))
 
-        return list(result)
+        self._observe_tickets(tickets)
+        return tickets
+
+    def list_updated_since(
+        self, kind: str, since: str | None, page: int = 1, per_page: int = 100
+    ) -> list[dict[str, Any]]:
+        """List tickets, users or organizations updated at or after ``since``, oldest update first.
+
+        Used to mirror records incrementally; ``since`` is an ``updated_at`` value
+        and None lists everything.
+        """
+        result = self._get_json(f"{kind}/search", self._updated_since_params(since, page, per_page))
+        records = self._unpack_search(result, kind, SEARCH_ASSETS[kind])
+        if kind == "tickets":
+            self._observe_tickets(records)
+        return records
+
+    def count_tickets(self, query: str | None = None, group: str | None = None) -> int | None:
+        """Count tickets matching a search without fetching them.
+
+        Returns None when the Zammad version does not report search totals.
+        """
+        search_query = self._build_ticket_query(query, group=group)
+        return self._total_count(self._get_json("tickets/search", self._count_params(search_query)))
     
     def get_ticket_by_number(
         self, ticket_number: str, include_articles: bool = True, article_limit: int = 10, article_offset: int = 0
@@ -175,7 +444,16 @@ class ZammadClient:
         import logging
         logger = logging.getLogger(__name__)
         logger.info(f"ZammadClient.get_ticket_by_number called with ticket_number={ticket_number}")
-        
+
+        # Numbers seen before resolve without a search
+        known_id = self.ticket_index.get(ticket_number)
+        if known_id is not None:
+            try:
+                return self.get_ticket(known_id, include_articles, article_limit, article_offset)
+            except ValueError:
+                # The ticket was deleted or merged away; fall back to searching
+                self.ticket_index.discard(ticket_number)
+
         # Search for the ticket by number
         search_results = self.api.ticket.search(f"number:{ticket_number}")
         
@@ -211,6 +489,27 @@ class ZammadClient:
         self, ticket_id: int, include_articles: bool = True, article_limit: int = 10, article_offset: int = 0
     ) -> dict[str, Any]:
         """Get a single ticket by ID with optional article pagination."""
+        variant = (include_articles, article_limit, article_offset)
+        cached = self.cache.get("ticket", ticket_id, variant)
+        if cached is not None:
+            return dict(cached)
+
+        # Reads started after a write must not join a flight that started before it
+        generation = self.cache.generation("ticket", ticket_id)
+        ticket = self.single_flight.run_sync(
+            ("ticket", int(ticket_id), *variant, generation),
+            self._fetch_ticket,
+            ticket_id,
+            include_articles,
+            article_limit,
+            article_offset,
+        )
+        self.cache.set("ticket", ticket_id, ticket, variant, generation=generation)
+        return dict(ticket)
+
+    def _fetch_ticket(
+        self, ticket_id: int, include_articles: bool, article_limit: int, article_offset: int
+    ) -> dict[str, Any]:
         # Debug logging
         import logging
         logger = logging.getLogger(__name__)
@@ -224,9 +523,15 @@ class ZammadClient:
                 ticket_id = int(ticket_id)
                 logger.info(f"Converted ticket_id to int: {ticket_id}")
         
+        # A full article list doesn't depend on the ticket payload, so fetch both at once
+        fetch_all = include_articles and article_limit == -1
+        articles_future = self._submit(self.api.ticket.articles, ticket_id) if fetch_all else None
+
         try:
             ticket = self.api.ticket.find(ticket_id)
         except Exception as e:
+            if articles_future is not None:
+                articles_future.cancel()
             logger.error(f"Failed to find ticket {ticket_id}: {e}")
             # Check if it's a 404 not found error
             error_str = str(e)
@@ -235,23 +540,45 @@ class ZammadClient:
             else:
                 raise
 
-        if include_articles:
-            articles = self.api.ticket.articles(ticket_id)
+        if articles_future is not None:
+            articles = articles_future.result()
 
             # Convert to list if needed
             articles_list = list(articles) if not isinstance(articles, list) else articles
+            ticket["articles"] = articles_list
+            ticket.setdefault("article_count", len(articles_list))
+        elif include_articles:
+            ticket["articles"] = self._get_article_window(ticket, article_limit, article_offset)
 
-            # Handle article pagination
-            if article_limit == -1:  # -1 means get all articles
-                ticket["articles"] = articles_list
-            else:
-                # Apply offset and limit
-                start_idx = article_offset
-                end_idx = start_idx + article_limit
-                ticket["articles"] = articles_list[start_idx:end_idx]
-
+        self._observe_tickets([ticket])
+        self._observe_articles(ticket.get("articles") or [])
         return dict(ticket)
 
+    def _get_article_window(
+        self, ticket: dict[str, Any], article_limit: int, article_offset: int
+    ) -> list[dict[str, Any]]:
+        """Fetch only the requested articles, by ID, instead of the ticket's full article list."""
+        window = self._article_window(ticket, article_limit, article_offset)
+        if window is None:
+            # Payload without article_ids: fetch everything and slice
+            articles = self.api.ticket.articles(ticket["id"])
+            articles_list = list(articles) if not isinstance(articles, list) else articles
+            ticket.setdefault("article_count", len(articles_list))
+            return articles_list[article_offset : article_offset + article_limit]
+
+        futures = [self._submit(self._get_article, article_id) for article_id in window]
+        return [future.result() for future in futures]
+
+    def _get_article(self, article_id: int) -> dict[str, Any]:
+        """Fetch a single article with sender and type names expanded, as in the by-ticket listing."""
+        return dict(self._get_json(f"ticket_articles/{article_id}", {"expand": "true"}))
+
+    def _get_json(self, path: str, params: dict[str, Any]) -> Any:
+        """GET a path through zammad_py's authenticated session, for calls it has no helper for."""
+        response = self.api.session.get(f"{self.api.url}{path}", params=params)
+        response.raise_for_status()
+        return response.json()
+
     def create_ticket(
         self,
         title: str,
@@ -277,7 +604,9 @@ class ZammadClient:
             },
         }
 
-        return dict(self.api.ticket.create(ticket_data))
+        ticket = dict(self.api.ticket.create(ticket_data))
+        self._observe_tickets([ticket])
+        return ticket
 
     def update_ticket(
         self,
@@ -301,7 +630,10 @@ class ZammadClient:
         if group is not None:
             update_data["group"] = group
 
-        return dict(self.api.ticket.update(ticket_id, update_data))
+        ticket = dict(self.api.ticket.update(ticket_id, update_data))
+        self.cache.invalidate("ticket", ticket_id)
+        self._observe_tickets([ticket])
+        return ticket
 
     def add_article(
         self,
@@ -320,35 +652,86 @@ class ZammadClient:
             "sender": sender,
         }
 
-        return dict(self.api.ticket_article.create(article_data))
+        article = dict(self.api.ticket_article.create(article_data))
+        self.cache.invalidate("ticket", ticket_id)
+        self._observe_articles([article])
+        return article
 
     def get_user(self, user_id: int) -> dict[str, Any]:
         """Get user information by ID."""
-        return dict(self.api.user.find(user_id))
+        cached = self.cache.get("user", user_id)
+        if cached is not None:
+            return dict(cached)
+
+        generation = self.cache.generation("user", user_id)
+        user = dict(self.single_flight.run_sync(("user", int(user_id), generation), self.api.user.find, user_id))
+        self.cache.set("user", user_id, user, generation=generation)
+        return dict(user)
 
     def search_users(
         self,
         query: str,
         page: int = 1,
         per_page: int = 25,
+        expand: bool = True,
     ) -> list[dict[str, Any]]:
         """Search users."""
-        filters = {"page": page, "per_page": per_page, "expand": True}
+        filters = {"page": page, "per_page": per_page, "expand": expand}
         result = self.api.user.search(query, filters=filters)
         return list(result)
 
+    def get_users(self, user_ids: Iterable[int]) -> dict[int, dict[str, Any]]:
+        """Get several users by ID: cached ones locally, the rest with one search per 100 IDs."""
+        users: dict[int, dict[str, Any]] = {}
+        missing: list[int] = []
+        for user_id in dict.fromkeys(int(user_id) for user_id in user_ids):
+            cached = self.cache.get("user", user_id)
+            if cached is not None:
+                users[user_id] = dict(cached)
+            else:
+                missing.append(user_id)
+
+        generations = {user_id: self.cache.generation("user", user_id) for user_id in missing}
+        for start in range(0, len(missing), USER_BATCH_SIZE):
+            batch = missing[start : start + USER_BATCH_SIZE]
+            found = self.api.user.search(self._user_id_query(batch), filters={"per_page": len(batch)})
+            for user in found:
+                if user.get("id") in batch:
+                    self.cache.set("user", user["id"], user, generation=generations[user["id"]])
+                    users[user["id"]] = dict(user)
+
+        # The search index may lag behind; look up stragglers one by one
+        stragglers = [user_id for user_id in missing if user_id not in users]
+        futures = {user_id: self._submit(self.get_user, user_id) for user_id in stragglers}
+        for user_id, future in futures.items():
+            try:
+                users[user_id] = future.result()
+            except Exception:
+                logger.warning(f"Could not resolve user {user_id}")
+        return users
+
     def get_organization(self, org_id: int) -> dict[str, Any]:
         """Get organization information by ID."""
-        return dict(self.api.organization.find(org_id))
+        cached = self.cache.get("organization", org_id)
+        if cached is not None:
+            return dict(cached)
+
+        generation = self.cache.generation("organization", org_id)
+        organization = dict(
+            self.single_flight.run_sync(("organization", int(org_id), generation), self.api.organization.find, org_id)
+        )
+        self.cache.set("organization", org_id, organization, generation=generation)
+        return dict(organization)
 
     def search_organizations(
         self,
         query: str,
         page: int = 1,
         per_page: int = 25,
+        expand: bool = True,
     ) -> list[dict[str, Any]]:
         """Search organizations."""
-        filters = {"page": page, "per_page": per_page, "expand": True}
+        filters = {"page": page, "per_page": per_page, "expand": expand}
         result = self.api.organization.search(query, filters=filters)
         return list(result)
 
@@ -378,11 +761,15 @@ class ZammadClient:
 
     def add_ticket_tag(self, ticket_id: int, tag: str) -> dict[str, Any]:
         """Add a tag to a ticket."""
-        return dict(self.api.ticket_tag.add(ticket_id, tag))
+        result = dict(self.api.ticket_tag.add(ticket_id, tag))
+        self.cache.invalidate("ticket", ticket_id)
+        return result
 
     def remove_ticket_tag(self, ticket_id: int, tag: str) -> dict[str, Any]:
         """Remove a tag from a ticket."""
-        return dict(self.api.ticket_tag.remove(ticket_id, tag))
+        result = dict(self.api.ticket_tag.remove(ticket_id, tag))
+        self.cache.invalidate("ticket", ticket_id)
+        return result
 
     def download_attachment(self, ticket_id: int, article_id: int, attachment_id: int) -> bytes:
         """Download an attachment from a ticket article."""
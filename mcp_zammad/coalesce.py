@@ -0,0 +1,103 @@
+"""Single-flight coalescing of identical in-flight reads."""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Future
+from typing import Any
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers asking for the same key.
+
+    The first caller for a key (the leader) performs the call; callers arriving
+    while it is still running wait for and receive the leader's result or
+    exception instead of issuing their own request. Once the call finishes the
+    key is released, so later callers trigger a fresh request; this is
+    coalescing, not caching.
+
+    :meth:`run` serves coroutine functions on the event loop and
+    :meth:`run_sync` serves blocking functions called from worker threads.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty flight tables and counters."""
+        self._lock = threading.Lock()
+        self._tasks: dict[Hashable, asyncio.Task[Any]] = {}
+        self._waiters: dict[Hashable, int] = {}
+        self._futures: dict[Hashable, Future[Any]] = {}
+        self._calls = 0
+        self._executions = 0
+        self._coalesced = 0
+
+    async def run(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        """Await ``func(*args, **kwargs)``, joining an identical call already in flight."""
+        with self._lock:
+            self._calls += 1
+            task = self._tasks.get(key)
+            if task is None:
+                self._executions += 1
+                task = asyncio.ensure_future(func(*args, **kwargs))
+                self._tasks[key] = task
+                self._waiters[key] = 0
+                task.add_done_callback(lambda _task: self._release(key, _task))
+            else:
+                self._coalesced += 1
+            self._waiters[key] += 1
+
+        try:
+            # Shielded so one caller being cancelled doesn't cancel the call for the others
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            with self._lock:
+                if key in self._waiters and self._tasks.get(key) is task:
+                    self._waiters[key] -= 1
+                    abandoned = self._waiters[key] == 0
+                else:
+                    abandoned = False
+            if abandoned:
+                task.cancel()
+            raise
+
+    def _release(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        with self._lock:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
+                del self._waiters[key]
+
+    def run_sync(self, key: Hashable, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Call ``func(*args, **kwargs)`` on this thread, or wait for an identical call running on another."""
+        future: Future[Any] = Future()
+        with self._lock:
+            self._calls += 1
+            existing = self._futures.get(key)
+            if existing is None:
+                self._executions += 1
+                self._futures[key] = future
+            else:
+                self._coalesced += 1
+
+        if existing is not None:
+            return existing.result()
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._futures[key]
+
+    def stats(self) -> dict[str, Any]:
+        """Return call counters: total calls, upstream executions, coalesced calls and flights in progress."""
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "executions": self._executions,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._tasks) + len(self._futures),
+            }
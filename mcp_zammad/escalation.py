@@ -0,0 +1,239 @@
+"""Per-group index of ticket escalation deadlines."""
+
+import asyncio
+import bisect
+import contextlib
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from .stats import ESCALATION_FIELDS, ticket_state_name
+
+logger = logging.getLogger(__name__)
+
+# Seconds before the index is reloaded from Zammad in the background
+DEFAULT_REFRESH_INTERVAL = 300.0
+
+Fetcher = Callable[[], Awaitable[list[dict[str, Any]]]]
+
+# Escalation types reported for each deadline field
+ESCALATION_TYPES = {
+    "first_response_escalation_at": "first response",
+    "update_escalation_at": "update",
+    "close_escalation_at": "close",
+}
+
+
+def _refresh_interval_from_env() -> float:
+    """Read the refresh interval from ZAMMAD_ESCALATION_REFRESH_INTERVAL."""
+    value = os.getenv("ZAMMAD_ESCALATION_REFRESH_INTERVAL")
+    if not value:
+        return DEFAULT_REFRESH_INTERVAL
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid value for ZAMMAD_ESCALATION_REFRESH_INTERVAL: {value!r}")
+        return DEFAULT_REFRESH_INTERVAL
+
+
+@dataclass(frozen=True)
+class Escalation:
+    """The earliest escalation deadline of one ticket."""
+
+    deadline: float
+    ticket_id: int
+    group_id: int | None
+    number: str | None
+    title: str | None
+    group: str | None
+    state: str | None
+    owner: str | None
+    escalation_type: str
+
+    @property
+    def deadline_at(self) -> datetime:
+        """The deadline as an aware UTC datetime."""
+        return datetime.fromtimestamp(self.deadline, tz=timezone.utc)
+
+
+def _timestamp(value: Any) -> float | None:
+    if isinstance(value, datetime):
+        return value.timestamp() if value.tzinfo else value.replace(tzinfo=timezone.utc).timestamp()
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _name(value: Any, key: str = "name") -> str | None:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict) and value.get(key):
+        return str(value[key])
+    return None
+
+
+def earliest_escalation(ticket: dict[str, Any]) -> Escalation | None:
+    """Return the ticket's soonest escalation deadline, or None if nothing is due."""
+    if ticket_state_name(ticket) in {"closed", "merged", "removed"}:
+        return None
+    deadlines = [
+        (deadline, field) for field in ESCALATION_FIELDS if (deadline := _timestamp(ticket.get(field))) is not None
+    ]
+    if not deadlines:
+        return None
+    deadline, field = min(deadlines)
+    return Escalation(
+        deadline=deadline,
+        ticket_id=int(ticket["id"]),
+        group_id=int(ticket["group_id"]) if ticket.get("group_id") is not None else None,
+        number=ticket.get("number"),
+        title=ticket.get("title"),
+        group=_name(ticket.get("group")),
+        state=ticket_state_name(ticket) or None,
+        owner=_name(ticket.get("owner"), "login"),
+        escalation_type=ESCALATION_TYPES[field],
+    )
+
+
+class EscalationIndex:
+    """Tickets ordered by their earliest escalation deadline, per group.
+
+    Each group keeps a list sorted by ``(deadline, ticket_id)``, so the K soonest
+    deadlines of one group are a K-element walk from the front and those of all
+    groups a lazy K-way merge of the per-group lists, instead of paging through
+    whole queues. The index is seeded by ``fetch`` (tickets with an escalation
+    deadline) and then kept current by :meth:`observe`, which the server
+    registers as a client ticket observer: a ticket seen again moves to its new
+    deadline, or leaves the index once it is closed or no longer escalates.
+    Like the reference data store, reads never wait for a reload once the index
+    is loaded; a stale index is reloaded in the background.
+    """
+
+    def __init__(
+        self,
+        fetch: Fetcher,
+        refresh_interval: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize an empty index.
+
+        Args:
+            fetch: Coroutine function returning every ticket with an escalation deadline
+            refresh_interval: Seconds before the index is reloaded
+                (default: ZAMMAD_ESCALATION_REFRESH_INTERVAL or 300)
+            clock: Wall-clock time source, also used as "now" for deadlines
+        """
+        self.fetch = fetch
+        self.refresh_interval = refresh_interval if refresh_interval is not None else _refresh_interval_from_env()
+        self._clock = clock
+        # Sync client observers run on worker threads; the lock only guards in-memory state
+        self._lock = threading.Lock()
+        self._load_lock = asyncio.Lock()
+        self._refreshing: asyncio.Task[None] | None = None
+        self._by_group: dict[int | None, list[tuple[float, int]]] = {}
+        self._entries: dict[int, Escalation] = {}
+        self.loaded_at: float | None = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def now(self) -> float:
+        """Current time on the index clock, which deadlines are measured against."""
+        return self._clock()
+
+    def is_stale(self) -> bool:
+        """Whether the index was never loaded or was loaded longer than the refresh interval ago."""
+        return self.loaded_at is None or self._clock() - self.loaded_at >= self.refresh_interval
+
+    async def ensure_loaded(self) -> None:
+        """Load the index on first use, or start a background reload if it is stale."""
+        if self.loaded_at is None:
+            async with self._load_lock:
+                # Another caller may have loaded it while we waited for the lock
+                if self.loaded_at is None:
+                    self.replace(await self.fetch())
+        elif self.is_stale() and (self._refreshing is None or self._refreshing.done()):
+            self._refreshing = asyncio.ensure_future(self._refresh_quietly())
+
+    async def stop(self) -> None:
+        """Cancel a running background reload."""
+        task, self._refreshing = self._refreshing, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(BaseException):
+                await task
+
+    async def _refresh_quietly(self) -> None:
+        try:
+            async with self._load_lock:
+                self.replace(await self.fetch())
+        except Exception:
+            logger.warning("Reloading escalation deadlines failed; serving the previous index", exc_info=True)
+
+    def observe(self, tickets: Iterable[dict[str, Any]]) -> None:
+        """Add, move or drop tickets according to their current escalation deadlines."""
+        with self._lock:
+            for ticket in tickets:
+                if ticket.get("id") and any(field in ticket for field in ESCALATION_FIELDS):
+                    self._put(int(ticket["id"]), earliest_escalation(ticket))
+
+    def replace(self, tickets: Iterable[dict[str, Any]]) -> None:
+        """Rebuild the index from a complete list of escalating tickets."""
+        entries = [entry for ticket in tickets if ticket.get("id") and (entry := earliest_escalation(ticket))]
+        with self._lock:
+            self._by_group = {}
+            self._entries = {}
+            for entry in sorted(entries, key=lambda entry: (entry.deadline, entry.ticket_id)):
+                self._entries[entry.ticket_id] = entry
+                self._by_group.setdefault(entry.group_id, []).append((entry.deadline, entry.ticket_id))
+            self.loaded_at = self._clock()
+        logger.debug(f"Loaded {len(entries)} escalation deadlines")
+
+    def due(
+        self, group_id: int | None = None, within_minutes: float | None = None, limit: int = 20
+    ) -> list[Escalation]:
+        """Return up to ``limit`` tickets with the soonest deadlines, overdue ones first.
+
+        Args:
+            group_id: Only tickets of this group (None for all groups)
+            within_minutes: Only deadlines at most this many minutes from now (None for any)
+            limit: Maximum number of tickets
+        """
+        horizon = float("inf") if within_minutes is None else self._clock() + within_minutes * 60
+        with self._lock:
+            if group_id is not None:
+                candidates: Iterator[tuple[float, int]] = iter(self._by_group.get(group_id, []))
+            else:
+                candidates = heapq.merge(*self._by_group.values())
+            return [
+                self._entries[ticket_id]
+                for _, ticket_id in itertools.islice(
+                    itertools.takewhile(lambda key: key[0] <= horizon, candidates), max(limit, 0)
+                )
+            ]
+
+    def _put(self, ticket_id: int, entry: Escalation | None) -> None:
+        # Caller holds the lock
+        previous = self._entries.pop(ticket_id, None)
+        if previous is not None:
+            keys = self._by_group[previous.group_id]
+            position = bisect.bisect_left(keys, (previous.deadline, ticket_id))
+            if position < len(keys) and keys[position] == (previous.deadline, ticket_id):
+                del keys[position]
+        if entry is not None:
+            self._entries[ticket_id] = entry
+            bisect.insort(self._by_group.setdefault(entry.group_id, []), (entry.deadline, ticket_id))
@@ -0,0 +1,137 @@
+"""Bounded thread pools for running blocking work off the event loop."""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the interactive pool and the pool reserved for long scans
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_QUEUE = 64
+DEFAULT_BULK_WORKERS = 2
+DEFAULT_BULK_QUEUE = 16
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when a pool's queue is full and new work is rejected."""
+
+
+class BoundedExecutor:
+    """A sized ThreadPoolExecutor with a bounded queue and wait-time metrics.
+
+    Work submitted beyond ``max_workers + max_queue`` outstanding items is
+    rejected with ExecutorSaturatedError instead of piling up unbounded.
+    """
+
+    def __init__(self, name: str, max_workers: int = DEFAULT_MAX_WORKERS, max_queue: int = DEFAULT_MAX_QUEUE):
+        """Initialize the pool; threads are started lazily on first use."""
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue must not be negative")
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._peak_queue_depth = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"zammad-{self.name}")
+        return self._pool
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``func`` in the pool and await its result."""
+        with self._lock:
+            if self._queued + self._active >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise ExecutorSaturatedError(
+                    f"Executor pool '{self.name}' is saturated "
+                    f"({self.max_workers} workers busy, {self.max_queue} calls queued)"
+                )
+            self._queued += 1
+            self._submitted += 1
+            self._peak_queue_depth = max(self._peak_queue_depth, self._queued)
+
+        enqueued_at = time.monotonic()
+        # Keep context variables (current trace span, stream sink) across the thread hop
+        context = contextvars.copy_context()
+
+        def _work() -> Any:
+            waited = time.monotonic() - enqueued_at
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+            try:
+                return context.run(func, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+
+        try:
+            future = self._get_pool().submit(_work)
+        except RuntimeError:
+            with self._lock:
+                self._queued -= 1
+            raise
+        future.add_done_callback(self._on_done)
+        return await asyncio.wrap_future(future)
+
+    def _on_done(self, future: "Future[Any]") -> None:
+        # Work cancelled before it started never reaches _work, so release its queue slot here
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of queue depth, utilisation and wait-time metrics."""
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queued,
+                "peak_queue_depth": self._peak_queue_depth,
+                "active": self._active,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_seconds": self._total_wait / started if started else 0.0,
+                "max_wait_seconds": self._max_wait,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the worker threads; the pool is recreated on next use."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+async def run_blocking(executor: BoundedExecutor, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Await ``func`` directly if it is a coroutine function, otherwise run it in ``executor``."""
+    if inspect.iscoroutinefunction(func):
+        return await func(*args, **kwargs)
+    result = await executor.run(functools.partial(func, *args, **kwargs))
+    if inspect.isawaitable(result):
+        return await result
+    return result
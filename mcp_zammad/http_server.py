@@ -4,25 +4,46 @@ import asyncio
 import json
 import logging
 import uuid
-from contextlib import asynccontextmanager
+from collections.abc import Iterator
+from contextlib import asynccontextmanager, contextmanager
 from typing import Any, AsyncIterator
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
+from .metrics import resource_label
 from .server import ZammadMCPServer
+from .streaming import ProgressNotifier, stream_to
+from .timing import log_if_slow, slow_call_ms_from_env, time_call, timed
+from .tracing import server_span, set_attributes, span
+from .webhook import (
+    DELIVERY_HEADER,
+    SIGNATURE_HEADER,
+    DeliveryLog,
+    parse_payload,
+    verify_signature,
+    webhook_secret_from_env,
+)
 
 logger = logging.getLogger(__name__)
 
 
+# Calls of one /mcp/call batch that run at the same time
+DEFAULT_BATCH_CONCURRENCY = 8
+# Largest batch /mcp/call accepts
+MAX_BATCH_SIZE = 100
+
+
 class MCPRequest(BaseModel):
     """MCP request model for HTTP endpoint."""
 
     method: str
     params: dict[str, Any] | None = None
+    # Echoed in the response so batch clients can match results to calls
+    id: str | int | None = None
 
 
 class MCPResponse(BaseModel):
@@ -30,12 +51,41 @@ class MCPResponse(BaseModel):
 
     result: Any | None = None
     error: dict[str, Any] | None = None
+    id: str | int | None = None
+
+
+def _serializable(result: Any) -> Any:
+    """Turn a tool result, or a list of them, into plain data for the SSE ``result`` event."""
+    if hasattr(result, "__dict__"):
+        return result.__dict__
+    if isinstance(result, list) and len(result) > 0:
+        # Handle list of results (like from Claude tools)
+        serializable_result = []
+        for item in result:
+            if hasattr(item, "__dict__"):
+                serializable_result.append(item.__dict__)
+            elif hasattr(item, "model_dump"):
+                serializable_result.append(item.model_dump())
+            else:
+                serializable_result.append(item)
+        return serializable_result
+    return result
 
 
 class HTTPMCPServer:
     """HTTP/HTTPS/SSE wrapper for MCP server."""
 
-    def __init__(self, mcp_server: ZammadMCPServer, host: str = "127.0.0.1", port: int = 8080, ssl_config: dict[str, Any] | None = None):
+    def __init__(
+        self,
+        mcp_server: ZammadMCPServer,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        ssl_config: dict[str, Any] | None = None,
+        *,
+        webhook_secret: str | None = None,
+        batch_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+        slow_call_ms: float | None = None,
+    ):
         """Initialize HTTP/HTTPS MCP server.
 
         Args:
@@ -43,11 +93,20 @@ class HTTPMCPServer:
             host: Host to bind to
             port: Port to bind to
             ssl_config: Optional SSL configuration with 'cert' and 'key' paths
+            webhook_secret: HMAC secret of the Zammad webhook; /webhooks/zammad is disabled without one
+                (default: ZAMMAD_WEBHOOK_SECRET_FILE or ZAMMAD_WEBHOOK_SECRET)
+            batch_concurrency: Calls of one /mcp/call batch that run at the same time
+            slow_call_ms: Log calls slower than this many milliseconds with their timing and arguments;
+                0 disables the log (default: ZAMMAD_SLOW_CALL_MS or 1000)
         """
         self.mcp_server = mcp_server
         self.host = host
         self.port = port
         self.ssl_config = ssl_config
+        self.webhook_secret = webhook_secret
+        self.deliveries = DeliveryLog()
+        self.batch_concurrency = max(batch_concurrency, 1)
+        self.slow_call_ms = slow_call_ms
         
         # Create lifespan context manager
         @asynccontextmanager
@@ -80,6 +139,20 @@ class HTTPMCPServer:
             allow_headers=["*"],
         )
 
+        @self.app.middleware("http")
+        async def trace_requests(request: Request, call_next: Any) -> Any:
+            """Trace and time each request, continuing the caller's trace from its traceparent header."""
+            with (
+                server_span(f"{request.method} {request.url.path}", request.headers) as current,
+                time_call() as timing,
+            ):
+                response = await call_next(request)
+                set_attributes(current, {"http.response.status_code": response.status_code})
+            # Streamed bodies are produced after the headers are sent, so their timing would be empty
+            if not response.headers.get("content-type", "").startswith("text/event-stream"):
+                response.headers["Server-Timing"] = timing.header()
+            return response
+
     def _setup_routes(self) -> None:
         """Setup HTTP routes."""
 
@@ -88,97 +161,47 @@ class HTTPMCPServer:
             """Health check endpoint."""
             return {"status": "healthy"}
 
+        @self.app.get("/metrics")
+        async def metrics() -> PlainTextResponse:
+            """Prometheus metrics: MCP call and Zammad request latencies, cache and worker pool statistics."""
+            return PlainTextResponse(
+                self.mcp_server.metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+            )
+
         @self.app.post("/mcp/call")
-        async def mcp_call(request: MCPRequest) -> MCPResponse:
+        async def mcp_call(request: MCPRequest | list[MCPRequest]) -> MCPResponse | list[MCPResponse]:
             """Execute MCP method call.
 
-            This endpoint handles synchronous MCP calls.
+            This endpoint handles synchronous MCP calls. A JSON array of calls is
+            run as a batch: up to ``batch_concurrency`` calls at a time, answered
+            with an array of responses in request order, each with its own result
+            or error.
             """
-            try:
-                # Get the appropriate handler based on method
-                if request.method == "tools/list":
-                    result = await self._list_tools()
-                elif request.method == "resources/list":
-                    result = await self._list_resources()
-                elif request.method == "prompts/list":
-                    result = await self._list_prompts()
-                elif request.method == "tools/call":
-                    # MCP standard: tools/call with name and arguments in params
-                    params = request.params or {}
-                    tool_name = params.get("name")
-                    if not tool_name:
-                        raise HTTPException(status_code=400, detail="Missing 'name' parameter in tools/call")
-                    tool_arguments = params.get("arguments", {})
-                    result = await self._call_tool(tool_name, tool_arguments)
-                elif request.method.startswith("resources/read/"):
-                    resource_uri = request.method.replace("resources/read/", "")
-                    result = await self._read_resource(resource_uri)
-                elif request.method.startswith("prompts/get/"):
-                    prompt_name = request.method.replace("prompts/get/", "")
-                    result = await self._get_prompt(prompt_name, request.params or {})
-                else:
-                    raise HTTPException(status_code=404, detail=f"Method not found: {request.method}")
-
-                return MCPResponse(result=result)
-
-            except Exception as e:
-                logger.error(f"Error handling MCP call: {e}")
-                return MCPResponse(error={"code": -32603, "message": str(e)})
+            if not isinstance(request, list):
+                return await self._dispatch_call(request)
+            return await self._dispatch_batch(request)
+
+        @self.app.post("/webhooks/zammad")
+        async def zammad_webhook(request: Request) -> dict[str, Any]:
+            """Apply a Zammad webhook delivery to the server's caches, indexes and mirror.
+
+            The body must be signed with the webhook's HMAC token (``X-Hub-Signature``).
+            """
+            return await self._apply_webhook(request)
 
         @self.app.post("/mcp/stream")
         async def mcp_stream(request: MCPRequest) -> StreamingResponse:
             """Execute MCP method call with SSE streaming.
 
             This endpoint handles streaming MCP calls using Server-Sent Events.
+            Tools that page through results (search_tickets, get_ticket_stats)
+            emit ``partial`` and ``progress`` events while pages arrive, before
+            the final ``result`` event. A ``_meta.progressToken`` in the params adds
+            MCP ``notifications/progress`` messages as ``notification`` events.
             """
 
-            async def generate() -> AsyncIterator[str]:
-                """Generate SSE stream."""
-                try:
-                    # Send initial connection event
-                    yield f"event: connected\ndata: {json.dumps({'session_id': str(uuid.uuid4())})}\n\n"
-
-                    # Process the request
-                    if request.method == "tools/call":
-                        # MCP standard: tools/call with name and arguments in params
-                        params = request.params or {}
-                        tool_name = params.get("name")
-                        if not tool_name:
-                            yield f"event: error\ndata: {json.dumps({'error': 'Missing name parameter in tools/call'})}\n\n"
-                            return
-                        tool_arguments = params.get("arguments", {})
-                        # For streaming tools, we might need to handle them differently
-                        result = await self._call_tool(tool_name, tool_arguments)
-                        # Convert to JSON-serializable format
-                        if hasattr(result, '__dict__'):
-                            result = result.__dict__
-                        elif isinstance(result, list) and len(result) > 0:
-                            # Handle list of results (like from Claude tools)
-                            serializable_result = []
-                            for item in result:
-                                if hasattr(item, '__dict__'):
-                                    serializable_result.append(item.__dict__)
-                                elif hasattr(item, 'model_dump'):
-                                    serializable_result.append(item.model_dump())
-                                else:
-                                    serializable_result.append(item)
-                            result = serializable_result
-                        yield f"event: result\ndata: {json.dumps(result, default=str)}\n\n"
-                    else:
-                        # For non-streaming methods, just return the result
-                        result = await self._handle_method(request.method, request.params)
-                        yield f"event: result\ndata: {json.dumps(result)}\n\n"
-
-                    # Send completion event
-                    yield f"event: done\ndata: {json.dumps({'status': 'completed'})}\n\n"
-
-                except Exception as e:
-                    logger.error(f"Error in SSE stream: {e}")
-                    error_data = {"error": {"code": -32603, "message": str(e)}}
-                    yield f"event: error\ndata: {json.dumps(error_data)}\n\n"
-
             return StreamingResponse(
-                generate(),
+                self._stream_events(request),
                 media_type="text/event-stream",
                 headers={
                     "Cache-Control": "no-cache",
@@ -187,6 +210,161 @@ class HTTPMCPServer:
                 },
             )
 
+    async def _stream_events(self, request: MCPRequest) -> AsyncIterator[str]:
+        """Generate the SSE stream of one /mcp/stream request."""
+        try:
+            # Send initial connection event
+            yield f"event: connected\ndata: {json.dumps({'session_id': str(uuid.uuid4())})}\n\n"
+
+            # Process the request
+            if request.method == "tools/call":
+                # MCP standard: tools/call with name and arguments in params
+                params = request.params or {}
+                tool_name = params.get("name")
+                if not tool_name:
+                    yield f"event: error\ndata: {json.dumps({'error': 'Missing name parameter in tools/call'})}\n\n"
+                    return
+                progress_token = (params.get("_meta") or {}).get("progressToken")
+                async for event in self._stream_tool_call(tool_name, params.get("arguments", {}), progress_token):
+                    yield event
+            else:
+                # For non-streaming methods, just return the result
+                result = await self._handle_method(request.method, request.params)
+                yield f"event: result\ndata: {json.dumps(result)}\n\n"
+
+            # Send completion event
+            yield f"event: done\ndata: {json.dumps({'status': 'completed'})}\n\n"
+
+        except Exception as e:
+            logger.exception("Error in SSE stream")
+            error_data = {"error": {"code": -32603, "message": str(e)}}
+            yield f"event: error\ndata: {json.dumps(error_data)}\n\n"
+
+    async def _stream_tool_call(
+        self, tool_name: str, tool_arguments: dict[str, Any], progress_token: Any
+    ) -> AsyncIterator[str]:
+        """Call a tool, relaying the partial results and progress it reports as events before its result."""
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue[tuple[str, dict[str, Any]] | None] = asyncio.Queue()
+
+        def sink(event: str, data: dict[str, Any]) -> None:
+            # Tools may report from worker threads
+            loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+        async def call_tool() -> Any:
+            if progress_token is None:
+                return await self._call_tool(tool_name, tool_arguments)
+
+            # MCP clients that sent a progress token also get notifications/progress
+            async def notify(progress: float, total: float | None, message: str | None) -> None:
+                notification = {
+                    "jsonrpc": "2.0",
+                    "method": "notifications/progress",
+                    "params": {
+                        "progressToken": progress_token,
+                        "progress": progress,
+                        "total": total,
+                        "message": message,
+                    },
+                }
+                events.put_nowait(("notification", notification))
+
+            notifier = ProgressNotifier(notify)
+            with stream_to(notifier):
+                result = await self._call_tool(tool_name, tool_arguments)
+            await notifier.flush()
+            return result
+
+        with stream_to(sink):
+            call = asyncio.ensure_future(call_tool())
+        call.add_done_callback(lambda _: loop.call_soon_threadsafe(events.put_nowait, None))
+        try:
+            while (message := await events.get()) is not None:
+                event, data = message
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+            result = call.result()
+        finally:
+            # The client went away mid-stream: stop the upstream work too
+            call.cancel()
+        # Convert to JSON-serializable format
+        with span("serialize"), timed("serialize"):
+            payload = json.dumps(_serializable(result), default=str)
+        yield f"event: result\ndata: {payload}\n\n"
+
+    async def _dispatch_batch(self, calls: list[MCPRequest]) -> list[MCPResponse]:
+        """Execute a /mcp/call batch, ``batch_concurrency`` calls at a time, answering in request order."""
+        if not calls:
+            raise HTTPException(status_code=400, detail="Empty batch")
+        if len(calls) > MAX_BATCH_SIZE:
+            raise HTTPException(status_code=413, detail=f"Batches are limited to {MAX_BATCH_SIZE} calls")
+
+        slots = asyncio.Semaphore(self.batch_concurrency)
+
+        async def run(call: MCPRequest) -> MCPResponse:
+            async with slots:
+                return await self._dispatch_call(call)
+
+        return list(await asyncio.gather(*(run(call) for call in calls)))
+
+    async def _apply_webhook(self, request: Request) -> dict[str, Any]:
+        """Verify a webhook delivery and apply it once, however often Zammad retries it."""
+        # Read lazily: the environment (.env) is loaded when the MCP server initializes
+        secret = self.webhook_secret or webhook_secret_from_env()
+        if not secret:
+            raise HTTPException(status_code=404, detail="Webhook endpoint not configured")
+        body = await request.body()
+        if not verify_signature(secret, body, request.headers.get(SIGNATURE_HEADER)):
+            raise HTTPException(status_code=401, detail="Invalid webhook signature")
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail="Webhook body is not valid JSON") from e
+
+        delivery = request.headers.get(DELIVERY_HEADER)
+        if delivery and self.deliveries.seen(delivery):
+            return {"status": "duplicate"}
+        try:
+            applied = await self.mcp_server.apply_webhook(parse_payload(payload))
+        except Exception as e:
+            logger.exception("Error applying webhook delivery")
+            raise HTTPException(status_code=503, detail="Webhook could not be applied") from e
+        if delivery:
+            self.deliveries.record(delivery)
+        return {"status": "applied", "applied": applied}
+
+    async def _dispatch_call(self, request: MCPRequest) -> MCPResponse:
+        """Execute one /mcp/call request, reporting failures in the response."""
+        try:
+            # Get the appropriate handler based on method
+            if request.method == "tools/list":
+                result = await self._list_tools()
+            elif request.method == "resources/list":
+                result = await self._list_resources()
+            elif request.method == "prompts/list":
+                result = await self._list_prompts()
+            elif request.method == "tools/call":
+                # MCP standard: tools/call with name and arguments in params
+                params = request.params or {}
+                tool_name = params.get("name")
+                if not tool_name:
+                    raise HTTPException(status_code=400, detail="Missing 'name' parameter in tools/call")
+                tool_arguments = params.get("arguments", {})
+                result = await self._call_tool(tool_name, tool_arguments)
+            elif request.method.startswith("resources/read/"):
+                resource_uri = request.method.replace("resources/read/", "")
+                result = await self._read_resource(resource_uri)
+            elif request.method.startswith("prompts/get/"):
+                prompt_name = request.method.replace("prompts/get/", "")
+                result = await self._get_prompt(prompt_name, request.params or {})
+            else:
+                raise HTTPException(status_code=404, detail=f"Method not found: {request.method}")
+
+            return MCPResponse(result=result, id=request.id)
+
+        except Exception as e:
+            logger.error(f"Error handling MCP call: {e}")
+            return MCPResponse(error={"code": -32603, "message": str(e)}, id=request.id)
+
     async def _handle_method(self, method: str, params: dict[str, Any] | None) -> Any:
         """Handle MCP method call."""
         if method == "tools/list":
@@ -257,13 +435,16 @@ class HTTPMCPServer:
         """Call a tool."""
         # Use the call_tool method from FastMCP
         try:
-            result = await self.mcp_server.mcp.call_tool(tool_name, params)
-            # Convert result to dict if it's a model
-            if hasattr(result, 'model_dump'):
-                return result.model_dump()
-            elif hasattr(result, 'dict'):
-                return result.dict()
-            return result
+            with self._timed_call("tool", tool_name, params):
+                with self.mcp_server.track_call("tool", tool_name):
+                    result = await self.mcp_server.mcp.call_tool(tool_name, params)
+                # Convert result to dict if it's a model
+                with span("serialize"), timed("serialize"):
+                    if hasattr(result, "model_dump"):
+                        return result.model_dump()
+                    elif hasattr(result, "dict"):
+                        return result.dict()
+                    return result
         except Exception as e:
             raise ValueError(f"Error calling tool {tool_name}: {str(e)}")
 
@@ -271,7 +452,11 @@ class HTTPMCPServer:
         """Read a resource."""
         # Use the read_resource method from FastMCP
         try:
-            result = await self.mcp_server.mcp.read_resource(resource_uri)
+            with (
+                self._timed_call("resource", resource_label(resource_uri), {"uri": resource_uri}),
+                self.mcp_server.track_call("resource", resource_label(resource_uri)),
+            ):
+                result = await self.mcp_server.mcp.read_resource(resource_uri)
             return {
                 "contents": [
                     {
@@ -288,16 +473,30 @@ class HTTPMCPServer:
         """Get a prompt."""
         # Use the get_prompt method from FastMCP
         try:
-            result = await self.mcp_server.mcp.get_prompt(prompt_name, params)
-            # Convert result to dict if it's a model
-            if hasattr(result, 'model_dump'):
-                return result.model_dump()
-            elif hasattr(result, 'dict'):
-                return result.dict()
-            return result
+            with self._timed_call("prompt", prompt_name, params):
+                with self.mcp_server.track_call("prompt", prompt_name):
+                    result = await self.mcp_server.mcp.get_prompt(prompt_name, params)
+                # Convert result to dict if it's a model
+                with span("serialize"), timed("serialize"):
+                    if hasattr(result, "model_dump"):
+                        return result.model_dump()
+                    elif hasattr(result, "dict"):
+                        return result.dict()
+                    return result
         except Exception as e:
             raise ValueError(f"Error getting prompt {prompt_name}: {str(e)}")
 
+    @contextmanager
+    def _timed_call(self, kind: str, name: str, arguments: Any) -> Iterator[None]:
+        """Time one MCP call for the Server-Timing header, logging it with its arguments when slow."""
+        with time_call() as timing:
+            try:
+                yield
+            finally:
+                # Read lazily: the environment (.env) is loaded when the MCP server initializes
+                threshold = self.slow_call_ms if self.slow_call_ms is not None else slow_call_ms_from_env()
+                log_if_slow(kind, name, arguments, timing, threshold)
+
     def _matches_pattern(self, uri: str, pattern: str) -> bool:
         """Check if URI matches resource pattern."""
         # Simple pattern matching for now
@@ -339,16 +538,35 @@ class HTTPMCPServer:
             uvicorn.run(self.app, host=self.host, port=self.port)
 
 
-def create_http_server(host: str = "127.0.0.1", port: int = 8080, ssl_config: dict[str, Any] | None = None) -> HTTPMCPServer:
+def create_http_server(
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    ssl_config: dict[str, Any] | None = None,
+    *,
+    webhook_secret: str | None = None,
+    batch_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    slow_call_ms: float | None = None,
+) -> HTTPMCPServer:
     """Create and return an HTTP/HTTPS MCP server instance.
 
     Args:
         host: Host to bind to
         port: Port to bind to
         ssl_config: Optional SSL configuration with 'cert' and 'key' paths
+        webhook_secret: HMAC secret of the Zammad webhook (default: from the environment)
+        batch_concurrency: Calls of one /mcp/call batch that run at the same time
+        slow_call_ms: Log calls slower than this many milliseconds (default: ZAMMAD_SLOW_CALL_MS or 1000)
 
     Returns:
         HTTPMCPServer instance
     """
     mcp_server = ZammadMCPServer()
-    return HTTPMCPServer(mcp_server, host=host, port=port, ssl_config=ssl_config)
\ No newline at end of file
+    return HTTPMCPServer(
+        mcp_server,
+        host=host,
+        port=port,
+        ssl_config=ssl_config,
+        webhook_secret=webhook_secret,
+        batch_concurrency=batch_concurrency,
+        slow_call_ms=slow_call_ms,
+    )
\ No newline at end of file
@@ -0,0 +1,293 @@
+"""Prometheus metrics for MCP calls and Zammad requests.
+
+Metrics are kept in plain counters and fixed-bucket histograms guarded by
+one lock each, and rendered in the Prometheus text exposition format on
+demand, so recording costs a few dictionary updates and no dependency is
+needed. HTTP mode serves them at ``/metrics``; stdio mode can write them to a
+file for node_exporter's textfile collector (see :meth:`Metrics.write_periodically`).
+"""
+
+import asyncio
+import bisect
+import contextlib
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any, NamedTuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+# Seconds between writes of the metrics file in stdio mode
+DEFAULT_WRITE_INTERVAL = 15.0
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+_RESOURCE_KIND = re.compile(r"^([a-z]+://[^/]+)/")
+
+
+class Sample(NamedTuple):
+    """One value reported by a collector at scrape time."""
+
+    name: str
+    help_text: str
+    type: str  # "counter" or "gauge"
+    labels: dict[str, str]
+    value: float
+
+
+def endpoint_label(path: str) -> str:
+    """Reduce a request path or URL to its endpoint, e.g. ``https://x/api/v1/tickets/42`` to ``tickets/:id``."""
+    path = urlsplit(path).path if "://" in path else path
+    path = path.split("/api/v1/", 1)[-1].strip("/")
+    return _ID_SEGMENT.sub("/:id", f"/{path}")[1:]
+
+
+def resource_label(uri: str) -> str:
+    """Reduce a resource URI to its kind, e.g. ``zammad://ticket/42`` to ``zammad://ticket``."""
+    match = _RESOURCE_KIND.match(uri)
+    return match.group(1) if match else uri
+
+
+def result_size(result: Any) -> int | None:
+    """Size in bytes of the text and blobs of an MCP tool or resource result, if it has any."""
+    root = getattr(result, "root", result)
+    items = getattr(root, "content", None) or getattr(root, "contents", None)
+    if not isinstance(items, list):
+        return None
+    size = 0
+    for item in items:
+        data = getattr(item, "text", None) or getattr(item, "blob", None)
+        if isinstance(data, str):
+            size += len(data.encode())
+    return size
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = labels
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.type}"]
+
+
+class Counter(_Metric):
+    """Monotonic count per label combination."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self.header() + [f"{self.name}{_labels(self.label_names, key)} {_number(v)}" for key, v in values]
+
+
+class Gauge(Counter):
+    """Value per label combination that goes up and down."""
+
+    type = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """Observation counts in fixed buckets, plus their sum, per label combination."""
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, help_text: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets
+        # Label values -> per-bucket counts (last slot is +Inf) and sum
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            entry = self._values.get(labels)
+            return sum(entry[0]) if entry else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        lines = self.header()
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip([*map(_number, self.buckets), "+Inf"], counts, strict=True):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class Metrics:
+    """The server's metrics: MCP calls, Zammad requests, and collected cache and pool statistics."""
+
+    def __init__(self) -> None:
+        """Create empty metrics."""
+        self.call_seconds = Histogram(
+            "zammad_mcp_call_duration_seconds",
+            "Duration of MCP tool, resource and prompt calls",
+            ("kind", "name", "outcome"),
+        )
+        self.calls_in_flight = Gauge("zammad_mcp_calls_in_flight", "MCP calls being handled", ("kind",))
+        self.result_bytes = Histogram(
+            "zammad_mcp_result_size_bytes", "Size of MCP tool and resource results", ("kind", "name"), SIZE_BUCKETS
+        )
+        self.upstream_requests = Counter(
+            "zammad_upstream_requests_total", "Requests to the Zammad API", ("method", "endpoint", "status")
+        )
+        self.upstream_seconds = Histogram(
+            "zammad_upstream_request_duration_seconds", "Duration of Zammad API requests", ("method", "endpoint")
+        )
+        self.upstream_in_flight = Gauge("zammad_upstream_requests_in_flight", "Zammad API requests awaiting a response")
+        self.upstream_bytes = Histogram(
+            "zammad_upstream_response_size_bytes",
+            "Size of Zammad API response bodies",
+            ("method", "endpoint"),
+            SIZE_BUCKETS,
+        )
+        self._collectors: list[Callable[[], Iterable[Sample]]] = []
+
+    def add_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Register a callable whose samples are read at every scrape, e.g. from ``stats()`` methods."""
+        self._collectors.append(collector)
+
+    @contextlib.contextmanager
+    def track_call(self, kind: str, name: str) -> Iterator[Callable[[str], None]]:
+        """Time an MCP call of ``kind`` ("tool", "resource" or "prompt").
+
+        Exceptions count as errors; call the yielded function with ``"error"``
+        for failures reported inside a result.
+        """
+        outcomes: list[str] = []
+        self.calls_in_flight.inc(kind)
+        start = time.perf_counter()
+        try:
+            yield outcomes.append
+        except BaseException:
+            outcomes.append("error")
+            raise
+        finally:
+            self.calls_in_flight.dec(kind)
+            self.call_seconds.observe(time.perf_counter() - start, kind, name, outcomes[-1] if outcomes else "ok")
+
+    @contextlib.contextmanager
+    def track_request(self, method: str, url: str) -> Iterator[Callable[[int, int | None], None]]:
+        """Time a Zammad API request; call the yielded function with the status code and body size.
+
+        Requests that fail without a response are counted with status "error".
+        """
+        endpoint = endpoint_label(url)
+        outcome: list[tuple[int | str, int | None]] = []
+        self.upstream_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            yield lambda status, size: outcome.append((status, size))
+        finally:
+            self.upstream_in_flight.dec()
+            self.upstream_seconds.observe(time.perf_counter() - start, method, endpoint)
+            status, size = outcome[-1] if outcome else ("error", None)
+            self.upstream_requests.inc(method, endpoint, str(status))
+            if size is not None:
+                self.upstream_bytes.observe(size, method, endpoint)
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        for metric in (
+            self.call_seconds,
+            self.calls_in_flight,
+            self.result_bytes,
+            self.upstream_requests,
+            self.upstream_seconds,
+            self.upstream_in_flight,
+            self.upstream_bytes,
+        ):
+            lines.extend(metric.render())
+
+        samples: dict[str, list[Sample]] = {}
+        for collector in self._collectors:
+            try:
+                for sample in collector():
+                    samples.setdefault(sample.name, []).append(sample)
+            except Exception:
+                logger.warning("Collecting metrics failed", exc_info=True)
+        for name, group in samples.items():
+            lines.append(f"# HELP {name} {group[0].help_text}")
+            lines.append(f"# TYPE {name} {group[0].type}")
+            for sample in group:
+                keys = tuple(sample.labels)
+                lines.append(f"{name}{_labels(keys, tuple(sample.labels.values()))} {_number(sample.value)}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Write the rendered metrics to ``path``, replacing it atomically."""
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(self.render())
+        os.replace(temporary, path)
+
+    async def write_periodically(self, path: str, interval: float = DEFAULT_WRITE_INTERVAL) -> None:
+        """Rewrite the metrics file every ``interval`` seconds until cancelled, and once more on the way out."""
+        try:
+            while True:
+                try:
+                    self.write(path)
+                except OSError as e:
+                    logger.warning(f"Writing metrics to {path} failed: {e}")
+                await asyncio.sleep(interval)
+        finally:
+            with contextlib.suppress(OSError):
+                self.write(path)
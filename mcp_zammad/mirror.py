@@ -0,0 +1,594 @@
+"""Local SQLite replica of Zammad records, kept current by incremental ``updated_at`` sync."""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+from datetime import datetime, timezone
+from typing import Any
+
+from .stats import ESCALATION_FIELDS, ticket_state_name
+
+logger = logging.getLogger(__name__)
+
+# Record kinds synced incrementally by updated_at, and reference kinds reloaded in full
+INCREMENTAL_KINDS = ("tickets", "users", "organizations")
+REFERENCE_KINDS = ("groups", "states", "priorities")
+
+DEFAULT_SYNC_INTERVAL = 60.0
+DEFAULT_RECONCILE_INTERVAL = 86400.0
+DEFAULT_MAX_AGE = 300.0
+DEFAULT_SYNC_CONCURRENCY = 4
+SYNC_PAGE_SIZE = 100
+
+UpdatedFetcher = Callable[[str, str | None, int, int], Awaitable[list[dict[str, Any]]]]
+ReferenceFetcher = Callable[[], Awaitable[list[dict[str, Any]]]]
+# Runs a blocking function off the event loop, e.g. asyncio.to_thread
+BlockingRunner = Callable[..., Awaitable[Any]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    id INTEGER PRIMARY KEY,
+    number TEXT,
+    group_name TEXT,
+    state_name TEXT,
+    priority_name TEXT,
+    owner TEXT,
+    owner_id INTEGER,
+    customer TEXT,
+    customer_id INTEGER,
+    escalated INTEGER NOT NULL DEFAULT 0,
+    created_ts REAL,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tickets_group ON tickets (group_name, state_name);
+CREATE INDEX IF NOT EXISTS tickets_updated ON tickets (updated_at);
+CREATE INDEX IF NOT EXISTS tickets_created ON tickets (created_ts);
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY,
+    login TEXT,
+    email TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS users_login ON users (login);
+CREATE INDEX IF NOT EXISTS users_email ON users (email);
+CREATE TABLE IF NOT EXISTS organizations (
+    id INTEGER PRIMARY KEY,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reference (
+    kind TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (kind, id)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    kind TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at REAL
+);
+"""
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid value for {name}: {value!r}")
+        return default
+
+
+def _name(value: Any, key: str = "name") -> str | None:
+    """Read a name from an expanded (string) or object value."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        name = value.get(key)
+        return str(name) if name else None
+    return None
+
+
+def _timestamp(value: Any) -> float | None:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+class ZammadMirror:
+    """SQLite replica of tickets, users, organizations and reference data.
+
+    Records are stored as the JSON Zammad returned (expanded, so names are
+    present) next to a few indexed columns used for filtering. The database runs
+    in WAL mode with one writer connection and one read connection per thread,
+    so reads are never blocked by the syncer writing or by each other. All
+    methods block on SQLite; call them from worker threads. Each kind keeps
+    an ``updated_at`` watermark and the time of its last complete sync; readers
+    use :meth:`is_fresh` to decide whether the mirror may answer instead of
+    Zammad.
+
+    Configuration through the environment (see :meth:`from_env`):
+
+    - ZAMMAD_MIRROR_PATH: SQLite file to mirror into (the mirror is off when unset)
+    - ZAMMAD_MIRROR_MAX_AGE: Seconds since the last sync within which reads may
+      be answered from the mirror (default: 300)
+    """
+
+    def __init__(self, path: str, max_age: float = DEFAULT_MAX_AGE, clock: Callable[[], float] = time.time):
+        """Open (and create) the mirror database at ``path``.
+
+        Args:
+            path: SQLite file
+            max_age: Default freshness bound for :meth:`is_fresh`, in seconds
+            clock: Wall-clock time source (sync times survive restarts)
+        """
+        self.path = path
+        self.max_age = max_age
+        self._clock = clock
+        # Writes are serialized on one connection; WAL lets readers run alongside
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+        # Each thread reads through its own connection, opened on first use
+        self._local = threading.local()
+        self._readers: list[sqlite3.Connection] = []
+        self._readers_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ZammadMirror | None":
+        """Open the mirror configured by ZAMMAD_MIRROR_PATH, or return None if it is not set."""
+        path = os.getenv("ZAMMAD_MIRROR_PATH")
+        if not path:
+            return None
+        return cls(path, max_age=_env_float("ZAMMAD_MIRROR_MAX_AGE", DEFAULT_MAX_AGE))
+
+    def upsert(self, kind: str, records: Iterable[dict[str, Any]]) -> int:
+        """Insert or replace records of ``kind``; returns how many were written."""
+        records = [record for record in records if isinstance(record, dict) and record.get("id")]
+        if not records:
+            return 0
+        with self._lock:
+            if kind == "tickets":
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO tickets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            int(ticket["id"]),
+                            ticket.get("number"),
+                            _name(ticket.get("group")),
+                            ticket_state_name(ticket) or None,
+                            _name(ticket.get("priority")),
+                            _name(ticket.get("owner"), "login"),
+                            ticket.get("owner_id"),
+                            _name(ticket.get("customer"), "email"),
+                            ticket.get("customer_id"),
+                            int(any(ticket.get(field) for field in ESCALATION_FIELDS)),
+                            _timestamp(ticket.get("created_at")),
+                            ticket.get("updated_at"),
+                            json.dumps(ticket, default=str),
+                        )
+                        for ticket in records
+                    ],
+                )
+            elif kind == "users":
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO users VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (
+                            int(user["id"]),
+                            user.get("login"),
+                            user.get("email"),
+                            user.get("updated_at"),
+                            json.dumps(user),
+                        )
+                        for user in records
+                    ],
+                )
+            elif kind == "organizations":
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO organizations VALUES (?, ?, ?)",
+                    [(int(org["id"]), org.get("updated_at"), json.dumps(org)) for org in records],
+                )
+            elif kind in REFERENCE_KINDS:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO reference VALUES (?, ?, ?)",
+                    [(kind, int(record["id"]), json.dumps(record)) for record in records],
+                )
+            else:
+                raise ValueError(f"Unknown mirror kind: {kind}")
+            self._db.commit()
+        return len(records)
+
+    def replace_reference(self, kind: str, records: Iterable[dict[str, Any]]) -> None:
+        """Replace all reference records of ``kind``, dropping ones that no longer exist."""
+        rows = [(kind, int(record["id"]), json.dumps(record)) for record in records if record.get("id")]
+        with self._lock:
+            self._db.execute("DELETE FROM reference WHERE kind = ?", (kind,))
+            self._db.executemany("INSERT OR REPLACE INTO reference VALUES (?, ?, ?)", rows)
+            self._db.commit()
+
+    def prune(self, kind: str, keep: Iterable[int], updated_through: str | None) -> int:
+        """Delete records of ``kind`` whose ID is not in ``keep``; returns how many were deleted.
+
+        Records updated after ``updated_through``, the newest ``updated_at`` the
+        listing ``keep`` came from is complete up to, are kept, so ones written
+        meanwhile, e.g. from a webhook, survive.
+        """
+        if kind not in INCREMENTAL_KINDS:
+            raise ValueError(f"Unknown mirror kind: {kind}")
+        with self._lock:
+            self._db.execute("CREATE TEMP TABLE IF NOT EXISTS keep_ids (id INTEGER PRIMARY KEY)")
+            self._db.executemany("INSERT OR IGNORE INTO keep_ids VALUES (?)", ((int(record_id),) for record_id in keep))
+            deleted = self._db.execute(
+                f"DELETE FROM {kind} WHERE id NOT IN (SELECT id FROM keep_ids) "  # nosec B608
+                "AND (updated_at IS NULL OR updated_at <= ?)",
+                (updated_through,),
+            ).rowcount
+            self._db.execute("DELETE FROM keep_ids")
+            self._db.commit()
+        return deleted
+
+    def watermark(self, kind: str) -> str | None:
+        """The newest ``updated_at`` synced for ``kind`` (None before the first sync)."""
+        row = self._reader().execute("SELECT watermark FROM sync_state WHERE kind = ?", (kind,)).fetchone()
+        return row[0] if row else None
+
+    def checkpoint(self, kind: str, watermark: str | None) -> None:
+        """Persist sync progress so an interrupted sync resumes from ``watermark``."""
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO sync_state (kind, watermark) VALUES (?, ?) "
+                "ON CONFLICT(kind) DO UPDATE SET watermark = excluded.watermark",
+                (kind, watermark),
+            )
+            self._db.commit()
+
+    def mark_synced(self, kind: str) -> None:
+        """Record that ``kind`` was fully caught up just now."""
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO sync_state (kind, synced_at) VALUES (?, ?) "
+                "ON CONFLICT(kind) DO UPDATE SET synced_at = excluded.synced_at",
+                (kind, self._clock()),
+            )
+            self._db.commit()
+
+    def synced_at(self, kind: str) -> float | None:
+        """When ``kind`` was last fully caught up (None if never)."""
+        row = self._reader().execute("SELECT synced_at FROM sync_state WHERE kind = ?", (kind,)).fetchone()
+        return row[0] if row else None
+
+    def is_fresh(self, *kinds: str, max_age: float | None = None) -> bool:
+        """Whether every kind was caught up within the last ``max_age`` seconds (default: :attr:`max_age`)."""
+        max_age = self.max_age if max_age is None else max_age
+        now = self._clock()
+        for kind in kinds:
+            synced_at = self.synced_at(kind)
+            if synced_at is None or now - synced_at > max_age:
+                return False
+        return True
+
+    def search_tickets(
+        self,
+        *,
+        state: str | None = None,
+        priority: str | None = None,
+        group: str | None = None,
+        owner: str | None = None,
+        customer: str | None = None,
+        limit: int = 25,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """Filter mirrored tickets like the structured filters of a Zammad search, newest update first."""
+        clauses: list[str] = []
+        params: list[Any] = []
+        for column, value in (("state_name", state), ("priority_name", priority), ("group_name", group)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if owner:
+            clauses.append("(owner = ? OR owner_id IN (SELECT id FROM users WHERE login = ? OR email = ?))")
+            params.extend([owner, owner, owner])
+        if customer:
+            clauses.append("(customer = ? OR customer_id IN (SELECT id FROM users WHERE email = ?))")
+            params.extend([customer, customer])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = (
+            self._reader()
+            .execute(
+                f"SELECT data FROM tickets {where} ORDER BY updated_at DESC, id DESC LIMIT ? OFFSET ?",  # nosec B608
+                [*params, max(limit, 0), max(offset, 0)],
+            )
+            .fetchall()
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    def ticket_counts(
+        self, group: str | None = None, created_from: datetime | None = None, created_to: datetime | None = None
+    ) -> dict[str, int]:
+        """Count tickets by the :func:`~mcp_zammad.stats.bucket_queries` buckets in one query."""
+        where, params = self._ticket_scope(group, created_from, created_to)
+        row = (
+            self._reader()
+            .execute(
+                "SELECT COUNT(*), "
+                "COALESCE(SUM(state_name IN ('new', 'open')), 0), "
+                "COALESCE(SUM(state_name = 'closed'), 0), "
+                "COALESCE(SUM(instr(state_name, 'pending') > 0), 0), "
+                "COALESCE(SUM(escalated), 0) "
+                f"FROM tickets {where}",  # nosec B608
+                params,
+            )
+            .fetchone()
+        )
+        return dict(zip(("total", "open", "closed", "pending", "escalated"), row, strict=True))
+
+    def iter_tickets(
+        self,
+        group: str | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[dict[str, Any]]:
+        """Yield mirrored tickets in ID order, reading ``batch_size`` rows at a time."""
+        where, params = self._ticket_scope(group, created_from, created_to)
+        where = f"{where} AND id > ?" if where else "WHERE id > ?"
+        last_id = 0
+        reader = self._reader()
+        while True:
+            rows = reader.execute(
+                f"SELECT id, data FROM tickets {where} ORDER BY id LIMIT ?",  # nosec B608
+                [*params, last_id, batch_size],
+            ).fetchall()
+            if not rows:
+                return
+            for _, data in rows:
+                yield json.loads(data)
+            last_id = rows[-1][0]
+
+    def reference(self, kind: str) -> list[dict[str, Any]]:
+        """Return the mirrored reference records of ``kind``."""
+        rows = self._reader().execute("SELECT data FROM reference WHERE kind = ? ORDER BY id", (kind,)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._readers_lock:
+            readers, self._readers = self._readers, []
+        for reader in readers:
+            reader.close()
+        with self._lock:
+            self._db.close()
+
+    def _reader(self) -> sqlite3.Connection:
+        """The calling thread's read connection."""
+        reader: sqlite3.Connection | None = getattr(self._local, "reader", None)
+        if reader is None:
+            # Closed only by close(), which may run on another thread
+            reader = sqlite3.connect(self.path, check_same_thread=False)
+            self._local.reader = reader
+            with self._readers_lock:
+                self._readers.append(reader)
+        return reader
+
+    @staticmethod
+    def _ticket_scope(
+        group: str | None, created_from: datetime | None, created_to: datetime | None
+    ) -> tuple[str, list[Any]]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        if group:
+            clauses.append("group_name = ?")
+            params.append(group)
+        if created_from is not None:
+            clauses.append("created_ts >= ?")
+            params.append(created_from.timestamp())
+        if created_to is not None:
+            clauses.append("created_ts < ?")
+            params.append(created_to.timestamp())
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+class MirrorSyncer:
+    """Keeps a :class:`ZammadMirror` current by pulling only what changed.
+
+    Tickets, users and organizations are read in ``updated_at`` order starting at
+    the stored watermark. After every page the watermark moves to the newest
+    record seen and is checkpointed, so an interrupted sync resumes where it
+    stopped; because the next request restarts at page 1 of the remaining range,
+    records updated mid-sync cannot shift past the cursor. Reference kinds are
+    small and reloaded in full. Kinds sync concurrently, with at most
+    ``concurrency`` requests to Zammad in flight. Mirror reads and writes run
+    through ``run_blocking`` so they never block the event loop.
+
+    Deleted records never show up as updates, so every ``reconcile_interval``
+    the syncer lists all IDs of each incremental kind and drops mirrored records
+    Zammad no longer returns. Until then, mirror answers may include records
+    deleted since the last reconciliation.
+
+    Configuration through the environment (see :meth:`from_env`):
+
+    - ZAMMAD_MIRROR_SYNC_INTERVAL: Seconds between sync runs (default: 60)
+    - ZAMMAD_MIRROR_CONCURRENCY: Maximum concurrent sync requests (default: 4)
+    - ZAMMAD_MIRROR_RECONCILE_INTERVAL: Seconds between passes dropping deleted
+      records (default: 86400, 0 disables them)
+    """
+
+    def __init__(
+        self,
+        mirror: ZammadMirror,
+        fetch_updated: UpdatedFetcher,
+        reference_fetchers: dict[str, ReferenceFetcher] | None = None,
+        *,
+        interval: float = DEFAULT_SYNC_INTERVAL,
+        concurrency: int = DEFAULT_SYNC_CONCURRENCY,
+        page_size: int = SYNC_PAGE_SIZE,
+        reconcile_interval: float = DEFAULT_RECONCILE_INTERVAL,
+        run_blocking: BlockingRunner | None = None,
+    ):
+        """Initialize the syncer.
+
+        Args:
+            mirror: Mirror to write into
+            fetch_updated: Coroutine function ``(kind, since, page, per_page)`` returning
+                records of ``kind`` updated at or after ``since`` (all when None),
+                oldest update first
+            reference_fetchers: Coroutine functions returning all records of each reference kind
+            interval: Seconds between sync runs
+            concurrency: Maximum concurrent requests to Zammad
+            page_size: Records requested per page
+            reconcile_interval: Seconds between passes dropping records deleted in Zammad
+                (0 disables them)
+            run_blocking: Coroutine function ``(func, *args)`` running mirror calls off
+                the event loop (default: asyncio.to_thread)
+        """
+        self.mirror = mirror
+        self.fetch_updated = fetch_updated
+        self.reference_fetchers = reference_fetchers or {}
+        self.interval = interval
+        self.page_size = page_size
+        self.reconcile_interval = reconcile_interval
+        self._run = run_blocking or asyncio.to_thread
+        self._semaphore = asyncio.Semaphore(max(concurrency, 1))
+        self._task: asyncio.Task[None] | None = None
+
+    @classmethod
+    def from_env(
+        cls,
+        mirror: ZammadMirror,
+        fetch_updated: UpdatedFetcher,
+        reference_fetchers: dict[str, ReferenceFetcher] | None = None,
+        run_blocking: BlockingRunner | None = None,
+    ) -> "MirrorSyncer":
+        """Create a syncer configured from the ZAMMAD_MIRROR_* sync settings."""
+        return cls(
+            mirror,
+            fetch_updated,
+            reference_fetchers,
+            interval=_env_float("ZAMMAD_MIRROR_SYNC_INTERVAL", DEFAULT_SYNC_INTERVAL),
+            concurrency=int(_env_float("ZAMMAD_MIRROR_CONCURRENCY", DEFAULT_SYNC_CONCURRENCY)),
+            reconcile_interval=_env_float("ZAMMAD_MIRROR_RECONCILE_INTERVAL", DEFAULT_RECONCILE_INTERVAL),
+            run_blocking=run_blocking,
+        )
+
+    async def sync_once(self) -> dict[str, int]:
+        """Run one sync of every kind; returns the number of records written per kind."""
+        kinds = [*INCREMENTAL_KINDS, *self.reference_fetchers]
+        results = await asyncio.gather(*(self._sync_kind(kind) for kind in kinds), return_exceptions=True)
+        written: dict[str, int] = {}
+        for kind, result in zip(kinds, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning(f"Mirror sync of {kind} failed; will resume from its checkpoint", exc_info=result)
+            else:
+                written[kind] = result
+        return written
+
+    async def reconcile(self) -> dict[str, int]:
+        """Drop mirrored records Zammad no longer has; returns the number removed per kind."""
+        results = await asyncio.gather(
+            *(self._reconcile_kind(kind) for kind in INCREMENTAL_KINDS), return_exceptions=True
+        )
+        removed: dict[str, int] = {}
+        for kind, result in zip(INCREMENTAL_KINDS, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.warning(f"Mirror reconciliation of {kind} failed; will retry next pass", exc_info=result)
+            else:
+                removed[kind] = result
+        return removed
+
+    def start(self) -> None:
+        """Start syncing in the background, immediately and then every ``interval`` seconds."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._sync_loop())
+
+    async def stop(self) -> None:
+        """Stop background syncing."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(BaseException):
+                await task
+
+    async def _sync_loop(self) -> None:
+        reconciled_at = time.monotonic()
+        while True:
+            await self.sync_once()
+            if self.reconcile_interval > 0 and time.monotonic() - reconciled_at >= self.reconcile_interval:
+                await self.reconcile()
+                reconciled_at = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+    async def _pages(self, kind: str, since: str | None) -> AsyncIterator[tuple[list[dict[str, Any]], str | None]]:
+        """Yield the pages of ``kind`` updated at or after ``since``, each with the watermark reached."""
+        watermark = since
+        page = 1
+        while True:
+            async with self._semaphore:
+                records = await self.fetch_updated(kind, watermark, page, self.page_size)
+            if not records:
+                return
+
+            newest = max((str(record["updated_at"]) for record in records if record.get("updated_at")), default=None)
+            if newest is not None and (watermark is None or newest > watermark):
+                # Restart just past what we have; records updated meanwhile sort after the cursor
+                watermark = newest
+                page = 1
+            else:
+                # A full page sharing one updated_at; step over it
+                page += 1
+            yield records, watermark
+            if len(records) < self.page_size:
+                return
+
+    async def _sync_kind(self, kind: str) -> int:
+        if kind in self.reference_fetchers:
+            async with self._semaphore:
+                records = await self.reference_fetchers[kind]()
+            await self._run(self.mirror.replace_reference, kind, records)
+            await self._run(self.mirror.mark_synced, kind)
+            return len(records)
+
+        written = 0
+        async for records, watermark in self._pages(kind, await self._run(self.mirror.watermark, kind)):
+            written += await self._run(self.mirror.upsert, kind, records)
+            await self._run(self.mirror.checkpoint, kind, watermark)
+
+        await self._run(self.mirror.mark_synced, kind)
+        if written:
+            logger.debug(f"Mirrored {written} {kind}")
+        return written
+
+    async def _reconcile_kind(self, kind: str) -> int:
+        # Everything up to the sync watermark is mirrored, so anything there the listing lacks is gone
+        newest: str | None = await self._run(self.mirror.watermark, kind)
+        seen: set[int] = set()
+        async for records, watermark in self._pages(kind, None):
+            seen.update(int(record["id"]) for record in records if record.get("id"))
+            if watermark is not None and (newest is None or watermark > newest):
+                newest = watermark
+        if not seen:
+            # An empty listing is more likely a permissions problem than an empty Zammad
+            return 0
+        removed: int = await self._run(self.mirror.prune, kind, seen, newest)
+        if removed:
+            logger.info(f"Dropped {removed} {kind} deleted in Zammad from the mirror")
+        return removed
@@ -310,6 +310,17 @@ class TicketPriority(BaseModel):
     updated_at: datetime
 
 
+class DurationSummary(BaseModel):
+    """Distribution of a duration in minutes across tickets."""
+
+    count: int = Field(description="Number of tickets with a value")
+    mean: float = Field(description="Mean in minutes")
+    stddev: float = Field(description="Sample standard deviation in minutes")
+    p50: float = Field(description="Median in minutes (approximate)")
+    p90: float = Field(description="90th percentile in minutes (approximate)")
+    p99: float = Field(description="99th percentile in minutes (approximate)")
+
+
 class TicketStats(BaseModel):
     """Ticket statistics."""
 
@@ -320,3 +331,5 @@ class TicketStats(BaseModel):
     escalated_count: int = Field(description="Number of escalated tickets")
     avg_first_response_time: float | None = Field(None, description="Average first response time in minutes")
     avg_resolution_time: float | None = Field(None, description="Average resolution time in minutes")
+    first_response_time: DurationSummary | None = Field(None, description="First response time distribution")
+    resolution_time: DurationSummary | None = Field(None, description="Resolution time distribution")
@@ -0,0 +1,94 @@
+"""Pipelined pagination helpers for Zammad list and search endpoints."""
+
+import asyncio
+import contextlib
+import logging
+import math
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Number of pages requested ahead of the page currently being consumed
+DEFAULT_PREFETCH_WINDOW = 4
+
+
+async def fetch_pages(
+    fetch_page: Callable[[int], Awaitable[list[T]]],
+    *,
+    start_page: int = 1,
+    per_page: int = 25,
+    max_pages: int | None = None,
+    max_results: int | None = None,
+    window: int = DEFAULT_PREFETCH_WINDOW,
+) -> AsyncIterator[list[T]]:
+    """Yield pages in order while fetching up to ``window`` pages concurrently.
+
+    Iteration stops, and any outstanding prefetches are cancelled, as soon as a
+    page comes back empty or shorter than ``per_page`` (end of results), once
+    ``max_results`` items have been yielded, or after ``max_pages`` pages.
+
+    Pages beyond what ``max_pages`` and ``max_results`` can use are never
+    requested, so e.g. ``max_results=50`` with 25 per page costs at most two
+    requests whatever the window.
+
+    Args:
+        fetch_page: Coroutine function returning the items of a given page number
+        start_page: First page to fetch
+        per_page: Page size the fetcher uses, needed to detect the last page
+        max_pages: Maximum number of pages to fetch (None for no limit)
+        max_results: Stop after this many items have been yielded (None or 0 for no limit)
+        window: Maximum number of pages in flight at once
+    """
+    window = max(window, 1)
+    last_page = start_page + max_pages - 1 if max_pages else None
+    if max_results:
+        # Pages needed to reach max_results when every page is full
+        needed = start_page + math.ceil(max_results / max(per_page, 1)) - 1
+        last_page = needed if last_page is None else min(last_page, needed)
+    pending: dict[int, asyncio.Task[list[T]]] = {}
+    next_page = start_page
+    yielded = 0
+
+    def schedule() -> None:
+        nonlocal next_page
+        while len(pending) < window and (last_page is None or next_page <= last_page):
+            pending[next_page] = asyncio.ensure_future(fetch_page(next_page))
+            next_page += 1
+
+    try:
+        current = start_page
+        schedule()
+        while current in pending:
+            items = await pending.pop(current)
+            if not items:
+                logger.info("Paginated fetch returned no results", extra={"page": current})
+                return
+
+            yield items
+            yielded += len(items)
+
+            if len(items) < per_page:
+                # No more pages available
+                return
+            if max_results and yielded >= max_results:
+                return
+
+            current += 1
+            schedule()
+    finally:
+        for task in pending.values():
+            task.cancel()
+        for task in pending.values():
+            with contextlib.suppress(BaseException):
+                await task
+
+
+async def collect_pages(fetch_page: Callable[[int], Awaitable[list[T]]], **kwargs: Any) -> list[T]:
+    """Fetch pages with :func:`fetch_pages` and return all items as one list."""
+    items: list[T] = []
+    async for page in fetch_pages(fetch_page, **kwargs):
+        items.extend(page)
+    return items
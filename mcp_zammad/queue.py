@@ -0,0 +1,350 @@
+"""In-memory per-group queue snapshots kept current by delta polling."""
+
+import asyncio
+import contextlib
+import heapq
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from .stats import ticket_state_name
+
+logger = logging.getLogger(__name__)
+
+# Seconds a snapshot is served before the next read polls for changes
+DEFAULT_POLL_INTERVAL = 30.0
+# Seconds between full reloads, which drop tickets that left the group or were deleted
+DEFAULT_RESYNC_INTERVAL = 3600.0
+# Tickets requested per poll page
+POLL_PAGE_SIZE = 100
+# Tickets listed per state
+DEFAULT_TOP_N = 10
+
+# (group, since, page, per_page) -> tickets of the group updated at or after since, oldest update first
+QueueFetcher = Callable[[str, str | None, int, int], Awaitable[list[dict[str, Any]]]]
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid value for {name}: {value!r}")
+        return default
+
+
+def _name(value: Any, key: str) -> str:
+    if isinstance(value, dict):
+        return str(value.get(key, "Unknown"))
+    return str(value) if value else "Unknown"
+
+
+@dataclass(frozen=True)
+class QueueEntry:
+    """The fields of a ticket shown in a queue listing."""
+
+    ticket_id: int
+    number: str
+    title: str
+    state: str
+    priority: str
+    customer: str
+    created_at: str
+    updated_at: str
+
+    @classmethod
+    def from_ticket(cls, ticket: dict[str, Any]) -> "QueueEntry":
+        return cls(
+            ticket_id=int(ticket["id"]),
+            number=str(ticket.get("number", "N/A")),
+            title=str(ticket.get("title") or "No title"),
+            state=ticket_state_name(ticket),
+            priority=_name(ticket.get("priority"), "name"),
+            customer=_name(ticket.get("customer"), "email"),
+            created_at=str(ticket.get("created_at", "Unknown")),
+            updated_at=str(ticket.get("updated_at") or ""),
+        )
+
+
+class QueueSnapshot:
+    """Every ticket of one group, with complete per-state counts.
+
+    Only the fields shown in the queue listing are held. The rendered text is
+    cached until the next change, so repeated reads of an unchanged queue cost
+    nothing.
+    """
+
+    def __init__(self, group: str, top_n: int = DEFAULT_TOP_N):
+        self.group = group
+        self.top_n = top_n
+        # Newest updated_at pulled by polling; tickets applied from elsewhere don't move it
+        self.watermark: str | None = None
+        self.polled_at: float | None = None
+        self.loaded_at: float | None = None
+        self._entries: dict[int, QueueEntry] = {}
+        self._state_counts: Counter[str] = Counter()
+        self._rendered: str | None = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, ticket_id: object) -> bool:
+        return ticket_id in self._entries
+
+    @property
+    def state_counts(self) -> dict[str, int]:
+        """Number of tickets per state name."""
+        return dict(self._state_counts)
+
+    def put(self, entry: QueueEntry) -> None:
+        """Add or update a ticket, ignoring payloads older than the one held."""
+        previous = self._entries.get(entry.ticket_id)
+        if previous is not None:
+            if entry.updated_at and previous.updated_at and entry.updated_at < previous.updated_at:
+                return
+            if previous == entry:
+                return
+            self._state_counts[previous.state] -= 1
+            if not self._state_counts[previous.state]:
+                del self._state_counts[previous.state]
+        self._entries[entry.ticket_id] = entry
+        self._state_counts[entry.state] += 1
+        self._rendered = None
+
+    def discard(self, ticket_id: int) -> None:
+        """Remove a ticket, e.g. because it moved to another group."""
+        previous = self._entries.pop(ticket_id, None)
+        if previous is not None:
+            self._state_counts[previous.state] -= 1
+            if not self._state_counts[previous.state]:
+                del self._state_counts[previous.state]
+            self._rendered = None
+
+    def top(self, state: str) -> list[QueueEntry]:
+        """The most recently updated tickets in ``state``, at most ``top_n``."""
+        return heapq.nlargest(
+            self.top_n,
+            (entry for entry in self._entries.values() if entry.state == state),
+            key=lambda entry: (entry.updated_at, entry.ticket_id),
+        )
+
+    def render(self) -> str:
+        """Format the queue listing of the ``zammad://queue/{group}`` resource."""
+        if self._rendered is not None:
+            return self._rendered
+        if not self._entries:
+            self._rendered = f"Queue for group '{self.group}': No tickets found"
+            return self._rendered
+
+        lines = [
+            f"Queue for Group: {self.group}",
+            f"Total Tickets: {len(self._entries)}",
+            "",
+        ]
+        for state, count in sorted(self._state_counts.items()):
+            lines.append(f"{state.title()} ({count} tickets):")
+            for entry in self.top(state):
+                lines.append(f"  #{entry.number} - {entry.title[:50]}...")
+                lines.append(f"    Priority: {entry.priority}, Customer: {entry.customer}")
+                lines.append(f"    Created: {entry.created_at}")
+            if count > self.top_n:
+                lines.append(f"    ... and {count - self.top_n} more tickets")
+            lines.append("")
+
+        self._rendered = "\n".join(lines)
+        return self._rendered
+
+
+class QueueSnapshots:
+    """Queue snapshots of the groups that have been read, refreshed on demand.
+
+    The first read of a group loads all of its tickets; later reads are served
+    from memory and, once the snapshot is older than ``poll_interval``, first
+    pull only the tickets updated since the newest ``updated_at`` held (keyset
+    paging as in the mirror syncer, so tickets updated mid-poll are not
+    skipped). The bound is inclusive on purpose: Zammad timestamps have
+    second precision, so a ticket updated later in the same second as the
+    newest one held would otherwise be missed. Each poll therefore downloads
+    the tickets at the watermark again; they are unchanged and don't
+    invalidate the rendered listing. Tickets the client sees elsewhere are
+    applied through :meth:`observe`, which also moves tickets between groups. A full reload
+    every ``resync_interval`` runs in the background and drops tickets that
+    were deleted or moved out of view.
+
+    Configuration through the environment (see :meth:`from_env`):
+
+    - ZAMMAD_QUEUE_POLL_INTERVAL: Seconds between delta polls (default: 30)
+    - ZAMMAD_QUEUE_RESYNC_INTERVAL: Seconds between full reloads (default: 3600)
+    """
+
+    def __init__(
+        self,
+        fetch: QueueFetcher,
+        *,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        resync_interval: float = DEFAULT_RESYNC_INTERVAL,
+        page_size: int = POLL_PAGE_SIZE,
+        top_n: int = DEFAULT_TOP_N,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize with no snapshots.
+
+        Args:
+            fetch: Coroutine function ``(group, since, page, per_page)`` returning tickets of
+                the group updated at or after ``since`` (all when None), oldest update first
+            poll_interval: Seconds a snapshot is served before polling for changes
+            resync_interval: Seconds between full reloads of a snapshot
+            page_size: Tickets requested per page
+            top_n: Tickets listed per state
+            clock: Monotonic time source
+        """
+        self.fetch = fetch
+        self.poll_interval = poll_interval
+        self.resync_interval = resync_interval
+        self.page_size = page_size
+        self.top_n = top_n
+        self._clock = clock
+        self._snapshots: dict[str, QueueSnapshot] = {}
+        # Ticket id -> group of the snapshot holding it, so a payload touches at most two snapshots
+        self._groups: dict[int, str] = {}
+        # Sync client observers run on worker threads; the lock only guards in-memory state
+        self._lock = threading.Lock()
+        self._poll_locks: dict[str, asyncio.Lock] = {}
+        self._resyncing: dict[str, asyncio.Task[None]] = {}
+
+    @classmethod
+    def from_env(cls, fetch: QueueFetcher, top_n: int = DEFAULT_TOP_N) -> "QueueSnapshots":
+        """Create snapshots configured from ZAMMAD_QUEUE_POLL_INTERVAL and ZAMMAD_QUEUE_RESYNC_INTERVAL."""
+        return cls(
+            fetch,
+            poll_interval=_env_float("ZAMMAD_QUEUE_POLL_INTERVAL", DEFAULT_POLL_INTERVAL),
+            resync_interval=_env_float("ZAMMAD_QUEUE_RESYNC_INTERVAL", DEFAULT_RESYNC_INTERVAL),
+            top_n=top_n,
+        )
+
+    async def render(self, group: str) -> str:
+        """Return the queue listing of ``group``, loading or polling it first if needed."""
+        snapshot = await self.get(group)
+        with self._lock:
+            return snapshot.render()
+
+    async def get(self, group: str) -> QueueSnapshot:
+        """Return the snapshot of ``group``, loading it on first use and polling it when due."""
+        lock = self._poll_locks.setdefault(group, asyncio.Lock())
+        async with lock:
+            snapshot = self._snapshots.get(group)
+            if snapshot is None:
+                snapshot = QueueSnapshot(group, self.top_n)
+                await self._pull(snapshot)
+                snapshot.loaded_at = snapshot.polled_at
+                with self._lock:
+                    self._snapshots[group] = snapshot
+                return snapshot
+
+            now = self._clock()
+            if snapshot.loaded_at is not None and now - snapshot.loaded_at >= self.resync_interval:
+                self._resync_in_background(group)
+            if snapshot.polled_at is None or now - snapshot.polled_at >= self.poll_interval:
+                try:
+                    await self._pull(snapshot)
+                except Exception:
+                    logger.warning(f"Polling queue {group} failed; serving the previous snapshot", exc_info=True)
+            return snapshot
+
+    def observe(self, tickets: Iterable[dict[str, Any]]) -> None:
+        """Apply ticket payloads seen elsewhere to the snapshots of their groups."""
+        with self._lock:
+            if not self._snapshots:
+                return
+            for ticket in tickets:
+                group = ticket.get("group")
+                if not ticket.get("id") or not isinstance(group, str) or "state" not in ticket:
+                    # Unexpanded or partial payloads don't say which queue the ticket is in
+                    continue
+                entry = QueueEntry.from_ticket(ticket)
+                snapshot = self._snapshots.get(group)
+                if snapshot is not None:
+                    self._place(snapshot, entry)
+                else:
+                    self._remove(entry.ticket_id)
+
+    async def stop(self) -> None:
+        """Cancel running background reloads."""
+        tasks = list(self._resyncing.values())
+        self._resyncing.clear()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(BaseException):
+                await task
+
+    async def _pull(self, snapshot: QueueSnapshot) -> None:
+        # Caller holds the group's poll lock
+        watermark = snapshot.watermark
+        page = 1
+        started = self._clock()
+        while True:
+            tickets = await self.fetch(snapshot.group, watermark, page, self.page_size)
+            if not tickets:
+                break
+            with self._lock:
+                for ticket in tickets:
+                    if ticket.get("id"):
+                        self._place(snapshot, QueueEntry.from_ticket(ticket))
+
+            newest = max((str(ticket["updated_at"]) for ticket in tickets if ticket.get("updated_at")), default=None)
+            if newest is not None and (watermark is None or newest > watermark):
+                # Restart just past what we have; tickets updated meanwhile sort after the cursor
+                watermark = newest
+                page = 1
+            else:
+                # A full page sharing one updated_at; step over it
+                page += 1
+            snapshot.watermark = watermark
+            if len(tickets) < self.page_size:
+                break
+        snapshot.polled_at = started
+
+    def _place(self, snapshot: QueueSnapshot, entry: QueueEntry) -> None:
+        """Put a ticket into ``snapshot`` and out of the snapshot of the group it was in; caller holds the lock."""
+        held = self._groups.get(entry.ticket_id)
+        if held is not None and held != snapshot.group:
+            self._remove(entry.ticket_id)
+        snapshot.put(entry)
+        self._groups[entry.ticket_id] = snapshot.group
+
+    def _remove(self, ticket_id: int) -> None:
+        """Take a ticket out of the snapshot holding it, if any; caller holds the lock."""
+        held = self._groups.pop(ticket_id, None)
+        snapshot = self._snapshots.get(held) if held is not None else None
+        if snapshot is not None:
+            snapshot.discard(ticket_id)
+
+    def _resync_in_background(self, group: str) -> None:
+        task = self._resyncing.get(group)
+        if task is None or task.done():
+            self._resyncing[group] = asyncio.ensure_future(self._resync(group))
+
+    async def _resync(self, group: str) -> None:
+        try:
+            snapshot = QueueSnapshot(group, self.top_n)
+            await self._pull(snapshot)
+            snapshot.loaded_at = snapshot.polled_at
+            async with self._poll_locks[group]:
+                with self._lock:
+                    self._snapshots[group] = snapshot
+                    # Forget tickets that left the group while the previous snapshot held them
+                    for ticket_id in [ticket_id for ticket_id, held in self._groups.items() if held == group]:
+                        if ticket_id not in snapshot:
+                            del self._groups[ticket_id]
+                # Catch up on changes made during the reload before serving it
+                await self._pull(snapshot)
+        except Exception:
+            logger.warning(f"Reloading queue {group} failed; keeping the previous snapshot", exc_info=True)
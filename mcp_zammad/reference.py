@@ -0,0 +1,152 @@
+"""Reference data (groups, ticket states, priorities) with background refresh."""
+
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Seconds before reference data is considered stale and refreshed
+DEFAULT_REFRESH_INTERVAL = 300.0
+
+Fetcher = Callable[[], Awaitable[list[dict[str, Any]]]]
+
+
+def _refresh_interval_from_env() -> float:
+    """Read the refresh interval from ZAMMAD_REFERENCE_REFRESH_INTERVAL."""
+    value = os.getenv("ZAMMAD_REFERENCE_REFRESH_INTERVAL")
+    if not value:
+        return DEFAULT_REFRESH_INTERVAL
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid value for ZAMMAD_REFERENCE_REFRESH_INTERVAL: {value!r}")
+        return DEFAULT_REFRESH_INTERVAL
+
+
+class ReferenceDataStore:
+    """Holds rarely changing lists such as groups, states and priorities.
+
+    All kinds are loaded concurrently by :meth:`load`. Reads never wait for a
+    refresh once data is present: stale data is returned while a background
+    refresh runs (stale-while-revalidate). A per-kind lock makes sure concurrent
+    first reads trigger only one fetch. :meth:`start` additionally refreshes all
+    kinds on a fixed interval so reads rarely see stale data at all.
+    """
+
+    def __init__(
+        self,
+        fetchers: dict[str, Fetcher],
+        refresh_interval: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the store.
+
+        Args:
+            fetchers: Coroutine functions returning the records of each kind
+            refresh_interval: Seconds before data is refreshed
+                (default: ZAMMAD_REFERENCE_REFRESH_INTERVAL or 300)
+            clock: Monotonic time source
+        """
+        self.fetchers = fetchers
+        self.refresh_interval = refresh_interval if refresh_interval is not None else _refresh_interval_from_env()
+        self._clock = clock
+        self._records: dict[str, list[dict[str, Any]]] = {}
+        self._id_to_name: dict[str, dict[int, str]] = {}
+        self._name_to_id: dict[str, dict[str, int]] = {}
+        self._loaded_at: dict[str, float] = {}
+        self._locks = {kind: asyncio.Lock() for kind in fetchers}
+        self._refreshing: dict[str, asyncio.Task[None]] = {}
+        self._refresh_task: asyncio.Task[None] | None = None
+
+    async def load(self) -> None:
+        """Fetch every kind concurrently, replacing what is held."""
+        await asyncio.gather(*(self._refresh(kind) for kind in self.fetchers))
+
+    async def get(self, kind: str) -> list[dict[str, Any]]:
+        """Return the records of ``kind``, fetching them on first use."""
+        if kind not in self._records:
+            async with self._locks[kind]:
+                # Another caller may have loaded it while we waited for the lock
+                if kind not in self._records:
+                    await self._fetch(kind)
+        elif self.is_stale(kind):
+            self._refresh_in_background(kind)
+        return self._records[kind]
+
+    def peek(self, kind: str) -> list[dict[str, Any]] | None:
+        """Return the records of ``kind`` if loaded, without fetching or refreshing."""
+        return self._records.get(kind)
+
+    def is_stale(self, kind: str) -> bool:
+        """Whether ``kind`` is missing or older than the refresh interval."""
+        loaded_at = self._loaded_at.get(kind)
+        return loaded_at is None or self._clock() - loaded_at >= self.refresh_interval
+
+    def id_to_name(self, kind: str) -> dict[int, str]:
+        """Map record IDs to names for ``kind`` (empty until loaded)."""
+        return self._id_to_name.get(kind, {})
+
+    def name_to_id(self, kind: str) -> dict[str, int]:
+        """Map record names to IDs for ``kind`` (empty until loaded)."""
+        return self._name_to_id.get(kind, {})
+
+    def clear(self) -> None:
+        """Forget all data; the next read fetches again."""
+        self._records.clear()
+        self._id_to_name.clear()
+        self._name_to_id.clear()
+        self._loaded_at.clear()
+
+    def start(self) -> None:
+        """Start refreshing every kind in the background on the refresh interval."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop background refreshing."""
+        tasks = [task for task in [self._refresh_task, *self._refreshing.values()] if task is not None]
+        self._refresh_task = None
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(BaseException):
+                await task
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.load()
+            except Exception:
+                logger.warning("Reference data refresh failed; keeping previous data", exc_info=True)
+
+    def _refresh_in_background(self, kind: str) -> None:
+        task = self._refreshing.get(kind)
+        if task is None or task.done():
+            self._refreshing[kind] = asyncio.ensure_future(self._refresh_quietly(kind))
+
+    async def _refresh_quietly(self, kind: str) -> None:
+        try:
+            await self._refresh(kind)
+        except Exception:
+            logger.warning(f"Refreshing {kind} failed; serving stale data", exc_info=True)
+
+    async def _refresh(self, kind: str) -> None:
+        async with self._locks[kind]:
+            await self._fetch(kind)
+
+    async def _fetch(self, kind: str) -> None:
+        # Caller holds the kind's lock
+        records = list(await self.fetchers[kind]())
+        self._records[kind] = records
+        self._id_to_name[kind] = {
+            int(record["id"]): str(record["name"]) for record in records if "id" in record and "name" in record
+        }
+        self._name_to_id[kind] = {name: record_id for record_id, name in self._id_to_name[kind].items()}
+        self._loaded_at[kind] = self._clock()
+        logger.debug(f"Loaded {len(records)} {kind}")
@@ -0,0 +1,73 @@
+"""Local ID to name resolution for unexpanded Zammad records."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from .reference import ReferenceDataStore
+
+UserFetcher = Callable[[list[int]], Awaitable[dict[int, dict[str, Any]]]]
+
+# Ticket fields filled from reference data: (name field, ID field, reference kind)
+REFERENCE_FIELDS = (
+    ("group", "group_id", "groups"),
+    ("state", "state_id", "states"),
+    ("priority", "priority_id", "priorities"),
+)
+USER_FIELDS = (
+    ("owner", "owner_id"),
+    ("customer", "customer_id"),
+)
+
+
+def _user_label(user: dict[str, Any] | None) -> str | None:
+    """Render a user the way Zammad's expand=true does (login, falling back to email)."""
+    if not user:
+        return None
+    return user.get("login") or user.get("email")
+
+
+class NameResolver:
+    """Fills in the names that ``expand=true`` would have added, without asking Zammad.
+
+    Group, state and priority names come from the reference data store; owner and
+    customer logins come from a batch user lookup (served from the entity cache
+    where possible). Fields that already carry a name are left untouched.
+    """
+
+    def __init__(self, reference: ReferenceDataStore, get_users: UserFetcher):
+        """Initialize the resolver.
+
+        Args:
+            reference: Store holding groups, states and priorities
+            get_users: Coroutine function returning users by ID for a list of IDs
+        """
+        self.reference = reference
+        self.get_users = get_users
+
+    async def resolve_tickets(self, tickets: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Add group, state, priority, owner and customer names to unexpanded tickets in place."""
+        tickets = list(tickets)
+        if not tickets:
+            return tickets
+
+        user_ids = sorted(
+            {int(ticket[id_field]) for ticket in tickets for _, id_field in USER_FIELDS if ticket.get(id_field)}
+        )
+        # Make sure reference data is loaded while the users are being fetched
+        users_lookup = asyncio.ensure_future(self.get_users(user_ids))
+        try:
+            await asyncio.gather(*(self.reference.get(kind) for _, _, kind in REFERENCE_FIELDS))
+        except BaseException:
+            users_lookup.cancel()
+            raise
+        users: dict[int, dict[str, Any]] = await users_lookup
+
+        for ticket in tickets:
+            for name_field, id_field, kind in REFERENCE_FIELDS:
+                if ticket.get(name_field) is None and ticket.get(id_field) is not None:
+                    ticket[name_field] = self.reference.id_to_name(kind).get(int(ticket[id_field]))
+            for name_field, id_field in USER_FIELDS:
+                if ticket.get(name_field) is None and ticket.get(id_field):
+                    ticket[name_field] = _user_label(users.get(int(ticket[id_field])))
+        return tickets
@@ -1,17 +1,35 @@
 """Zammad MCP Server implementation."""
 
+import asyncio
 import base64
+import contextlib
 import logging
 import os
-from collections.abc import AsyncIterator
+import shlex
+from collections.abc import AsyncIterator, Callable, Iterator
 from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 from dotenv import load_dotenv
-from mcp.server.fastmcp import FastMCP
+from mcp import types
+from mcp.server.fastmcp import Context, FastMCP
+from pydantic import BaseModel
 
+from .article_index import ArticleIndex
+from .async_client import AsyncZammadClient
 from .client import ZammadClient
+from .escalation import EscalationIndex
+from .executor import (
+    DEFAULT_BULK_QUEUE,
+    DEFAULT_BULK_WORKERS,
+    DEFAULT_MAX_QUEUE,
+    DEFAULT_MAX_WORKERS,
+    BoundedExecutor,
+    run_blocking,
+)
+from .metrics import DEFAULT_WRITE_INTERVAL, Metrics, Sample, resource_label, result_size
+from .mirror import MirrorSyncer, ZammadMirror
 from .models import (
     Article,
     Attachment,
@@ -23,27 +41,185 @@ from .models import (
     TicketStats,
     User,
 )
+from .pagination import DEFAULT_PREFETCH_WINDOW, fetch_pages
+from .queue import QueueSnapshots
+from .reference import ReferenceDataStore
+from .resolve import NameResolver
+from .stats import (
+    DEFAULT_STATE_NAMES,
+    TicketStatsAccumulator,
+    bucket_queries,
+    combine_queries,
+    count_ticket_stats,
+    created_at_bounds,
+    created_at_range,
+    split_created_at_range,
+)
+from .streaming import ProgressNotifier, report_partial, report_progress, stream_to
+from .subscriptions import ResourceSubscriptions
+from .timing import timed
+from .tracing import configure_tracing, span
+from .webhook import WebhookChange
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
 # Constants
 MAX_TICKETS_FOR_MEMORY_SCAN = 1000
 MAX_TICKETS_PER_STATE_IN_QUEUE = 10
+# Pages of 100 escalating tickets loaded into the escalation index; the soonest deadlines come first
+MAX_ESCALATION_SEED_PAGES = 50
+
+
+def _prefetch_window_from_env() -> int:
+    """Read the search prefetch window from ZAMMAD_PREFETCH_WINDOW."""
+    value = os.getenv("ZAMMAD_PREFETCH_WINDOW")
+    if not value:
+        return DEFAULT_PREFETCH_WINDOW
+    try:
+        return max(int(value), 1)
+    except ValueError:
+        logger.warning(f"Ignoring invalid value for ZAMMAD_PREFETCH_WINDOW: {value!r}")
+        return DEFAULT_PREFETCH_WINDOW
+
+
+def _metrics_interval_from_env() -> float:
+    """Read the seconds between metrics file writes from ZAMMAD_METRICS_INTERVAL."""
+    value = os.getenv("ZAMMAD_METRICS_INTERVAL")
+    if not value:
+        return DEFAULT_WRITE_INTERVAL
+    try:
+        return max(float(value), 1.0)
+    except ValueError:
+        logger.warning(f"Ignoring invalid value for ZAMMAD_METRICS_INTERVAL: {value!r}")
+        return DEFAULT_WRITE_INTERVAL
+
+
+def _validate(model: type[ModelT], data: dict[str, Any]) -> ModelT:
+    """Build a response model, traced and timed so slow validation of large payloads shows up."""
+    with span(f"validate {model.__name__}"), timed("validate"):
+        return model(**data)
+
+
+def _split_inline_assignments(params: dict[str, Any]) -> None:
+    """Move ``key=value`` tokens found in a string parameter to their own parameters, in place.
+
+    A state of ``open priority="2 normal"`` sets the priority and leaves ``open``
+    as the state.
+    """
+    for key in list(params.keys()):
+        value = params[key]
+        if isinstance(value, str) and "=" in value and " " in value:
+            explicit_value = None
+            for token in shlex.split(value):
+                if "=" in token:
+                    assign_key, assign_value = token.split("=", 1)
+                    if assign_key.strip() in params:
+                        params[assign_key.strip()] = assign_value.strip()
+                elif explicit_value is None:
+                    explicit_value = token.strip()
+            if explicit_value is not None:
+                params[key] = explicit_value
+
+
+def _int_param(value: Any, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _ticket_summary(position: int, ticket: Ticket) -> str:
+    """Format one search_tickets result."""
+    return "\n".join(
+        [
+            f"{position}. Ticket #{ticket.number or ticket.id}",
+            f"Title: {ticket.title}",
+            f"State: {ticket.state}",
+            f"Priority: {ticket.priority}",
+            f"Customer: {ticket.customer}",
+            f"Owner: {ticket.owner or '-'}",
+            f"Group: {ticket.group}",
+            f"Created: {ticket.created_at}",
+            f"Updated: {ticket.updated_at}",
+            f"Articles: {ticket.article_count}",
+        ]
+    )
+
+
+def _env_flag(name: str) -> bool:
+    """Read a boolean setting such as ``true``/``1``/``yes`` from the environment."""
+    return os.getenv(name, "").strip().lower() in {"1", "true", "yes", "on"}
 
 
 class ZammadMCPServer:
     """Zammad MCP Server with proper client lifecycle management."""
 
-    def __init__(self) -> None:
-        """Initialize the server."""
-        self.client: ZammadClient | None = None
+    def __init__(
+        self,
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        bulk_workers: int = DEFAULT_BULK_WORKERS,
+        bulk_queue: int = DEFAULT_BULK_QUEUE,
+        prefetch_window: int | None = None,
+        local_name_resolution: bool | None = None,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            max_workers: Threads available for blocking client calls
+            max_queue: Blocking calls allowed to wait for a free thread
+            bulk_workers: Threads reserved for long scans such as get_ticket_stats
+            bulk_queue: Scan calls allowed to wait for a free bulk thread
+            prefetch_window: Search result pages fetched concurrently
+                (default: ZAMMAD_PREFETCH_WINDOW or 4)
+            local_name_resolution: Request unexpanded search results and resolve
+                IDs to names locally (default: ZAMMAD_LOCAL_NAME_RESOLUTION)
+        """
+        self.client: AsyncZammadClient | ZammadClient | None = None
+        self.prefetch_window = prefetch_window or _prefetch_window_from_env()
+        self.reference = ReferenceDataStore(
+            {
+                "groups": lambda: self._call(self.get_client().get_groups),
+                "states": lambda: self._call(self.get_client().get_ticket_states),
+                "priorities": lambda: self._call(self.get_client().get_ticket_priorities),
+            }
+        )
+        self.local_name_resolution = (
+            local_name_resolution if local_name_resolution is not None else _env_flag("ZAMMAD_LOCAL_NAME_RESOLUTION")
+        )
+        self.resolver = NameResolver(self.reference, lambda user_ids: self._call(self.get_client().get_users, user_ids))
+        # Local replica and article index, opened in initialize() once the environment is loaded
+        self.mirror: ZammadMirror | None = None
+        self.article_index: ArticleIndex | None = None
+        self.mirror_syncer: MirrorSyncer | None = None
+        # Escalation deadlines, seeded on first use and kept current by the client's ticket observer
+        self.escalations = EscalationIndex(self._fetch_escalating_tickets)
+        # Queue resource snapshots, loaded per group on first read and delta-polled afterwards
+        self.queues = QueueSnapshots.from_env(self._fetch_queue_page, top_n=MAX_TICKETS_PER_STATE_IN_QUEUE)
+        # resources/subscribe state, with one change feed shared by every subscription
+        self.subscriptions = ResourceSubscriptions.from_env(
+            lambda kind, since, page, per_page: self._call_bulk(
+                self.get_client().list_updated_since, kind, since, page, per_page
+            )
+        )
+        self.executor = BoundedExecutor("default", max_workers, max_queue)
+        self.bulk_executor = BoundedExecutor("bulk", bulk_workers, bulk_queue)
+        # Prometheus metrics, served at /metrics in HTTP mode and written to metrics_file in stdio mode
+        self.metrics = Metrics()
+        self.metrics.add_collector(self._metric_samples)
+        self.metrics_file: str | None = None
         # Create FastMCP with lifespan configured
         self.mcp = FastMCP("Zammad MCP Server", lifespan=self._create_lifespan())
         self._setup_tools()
         self._setup_resources()
+        self._setup_subscriptions()
         self._setup_prompts()
+        self._setup_metrics()
 
     def _create_lifespan(self) -> Any:
         """Create the lifespan context manager for the server."""
@@ -52,21 +228,139 @@ class ZammadMCPServer:
         async def lifespan(_app: FastMCP) -> AsyncIterator[None]:
             """Initialize resources on startup and cleanup on shutdown."""
             await self.initialize()
+            metrics_file = self.metrics_file or os.getenv("ZAMMAD_METRICS_FILE")
+            metrics_writer = (
+                asyncio.ensure_future(self.metrics.write_periodically(metrics_file, _metrics_interval_from_env()))
+                if metrics_file
+                else None
+            )
             try:
                 yield
             finally:
+                if metrics_writer is not None:
+                    metrics_writer.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await metrics_writer
+                await self.reference.stop()
+                await self.escalations.stop()
+                await self.queues.stop()
+                await self.subscriptions.stop()
+                if self.mirror_syncer is not None:
+                    await self.mirror_syncer.stop()
+                    self.mirror_syncer = None
+                if self.mirror is not None:
+                    self.mirror.close()
+                    self.mirror = None
+                if self.article_index is not None:
+                    # Waits for the writer thread to commit the queued rows
+                    await self._call(self.article_index.close)
+                    self.article_index = None
                 if self.client is not None:
+                    if isinstance(self.client, AsyncZammadClient):
+                        await self.client.aclose()
+                    else:
+                        self.client.close()
                     self.client = None
                     logger.info("Zammad client cleaned up")
+                self.executor.shutdown()
+                self.bulk_executor.shutdown()
 
         return lifespan
 
-    def get_client(self) -> ZammadClient:
+    def get_client(self) -> AsyncZammadClient | ZammadClient:
         """Get the Zammad client, ensuring it's initialized."""
         if not self.client:
             raise RuntimeError("Zammad client not initialized")
         return self.client
 
+    def configure_executors(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        bulk_workers: int = DEFAULT_BULK_WORKERS,
+        bulk_queue: int = DEFAULT_BULK_QUEUE,
+    ) -> None:
+        """Resize the worker pools. Call before the server starts handling requests."""
+        self.executor.shutdown()
+        self.bulk_executor.shutdown()
+        self.executor = BoundedExecutor("default", max_workers, max_queue)
+        self.bulk_executor = BoundedExecutor("bulk", bulk_workers, bulk_queue)
+
+    def executor_stats(self) -> list[dict[str, Any]]:
+        """Return queue-depth and wait-time metrics for each worker pool."""
+        return [self.executor.stats(), self.bulk_executor.stats()]
+
+    def _metric_samples(self) -> list[Sample]:
+        """Worker pool, entity cache and single-flight statistics for the metrics endpoint."""
+        samples: list[Sample] = []
+        for pool in self.executor_stats():
+            samples.extend(
+                Sample(name, help_text, kind, {"pool": pool["name"]}, pool[key])
+                for name, help_text, kind, key in (
+                    ("zammad_executor_queue_depth", "Calls waiting for a worker", "gauge", "queue_depth"),
+                    ("zammad_executor_active", "Calls running on a worker", "gauge", "active"),
+                    ("zammad_executor_completed_total", "Calls completed", "counter", "completed"),
+                    ("zammad_executor_rejected_total", "Calls rejected by a full queue", "counter", "rejected"),
+                    ("zammad_executor_peak_queue_depth", "Most calls waiting at once", "gauge", "peak_queue_depth"),
+                    ("zammad_executor_wait_seconds_avg", "Mean wait for a worker", "gauge", "avg_wait_seconds"),
+                    ("zammad_executor_wait_seconds_max", "Longest wait for a worker", "gauge", "max_wait_seconds"),
+                )
+            )
+        if self.client is not None:
+            cache = self.client.cache.stats()
+            samples.extend(
+                Sample(name, help_text, kind, {}, cache[key])
+                for name, help_text, kind, key in (
+                    ("zammad_cache_hits_total", "Entity cache hits", "counter", "hits"),
+                    ("zammad_cache_misses_total", "Entity cache misses", "counter", "misses"),
+                    ("zammad_cache_hit_ratio", "Entity cache hits per lookup", "gauge", "hit_ratio"),
+                    ("zammad_cache_entries", "Entries in the entity cache", "gauge", "entries"),
+                    ("zammad_cache_bytes", "Approximate size of the entity cache", "gauge", "bytes"),
+                )
+            )
+            flights = self.client.single_flight.stats()
+            samples.extend(
+                Sample(name, help_text, "counter", {}, flights[key])
+                for name, help_text, key in (
+                    ("zammad_single_flight_calls_total", "Coalescable reads", "calls"),
+                    ("zammad_single_flight_coalesced_total", "Reads that joined one already in flight", "coalesced"),
+                )
+            )
+        return samples
+
+    async def _call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Invoke a client method without blocking the event loop.
+
+        Async client methods are awaited directly; blocking ones run in the default pool.
+        """
+        return await run_blocking(self.executor, func, *args, **kwargs)
+
+    async def _call_bulk(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Like _call, but uses the bulk pool so long scans cannot starve interactive calls."""
+        return await run_blocking(self.bulk_executor, func, *args, **kwargs)
+
+    @asynccontextmanager
+    async def _progress_notifications(self, ctx: Context | None) -> AsyncIterator[None]:
+        """Send progress reported inside the block as MCP ``notifications/progress``.
+
+        Only requests that carry a progress token get notifications. Calls made
+        through the HTTP endpoints have no MCP request context and receive their
+        progress as SSE events from ``/mcp/stream`` instead.
+        """
+        progress_token = None
+        if ctx is not None:
+            with contextlib.suppress(ValueError):
+                meta = ctx.request_context.meta
+                progress_token = meta.progressToken if meta is not None else None
+        if ctx is None or progress_token is None:
+            yield
+            return
+
+        notifier = ProgressNotifier(ctx.report_progress)
+        with stream_to(notifier):
+            yield
+        await notifier.flush()
+
     async def initialize(self) -> None:
         """Initialize the Zammad client on server startup."""
         # Load environment variables from .env files
@@ -87,28 +381,322 @@ class ZammadMCPServer:
         # Also support loading from parent directories (for when running from subdirs)
         load_dotenv()
 
+        # Optional OpenTelemetry export, configured by ZAMMAD_TRACE_EXPORTER
+        configure_tracing()
+
         try:
-            self.client = ZammadClient()
+            # ZAMMAD_CLIENT_BACKEND=sync falls back to the blocking zammad_py client
+            if os.getenv("ZAMMAD_CLIENT_BACKEND", "async").lower() == "sync":
+                self.client = ZammadClient()
+            else:
+                self.client = AsyncZammadClient()
+            self.client.metrics = self.metrics
             logger.info("Zammad client initialized successfully")
 
             # Test connection
-            current_user = self.client.get_current_user()
+            current_user = await self._call(self.client.get_current_user)
             logger.info(f"Connected as: {current_user.get('email', 'Unknown')}")
         except Exception:
             logger.exception("Failed to initialize Zammad client")
             raise
 
+        # Warm groups, states and priorities up front so the first caller doesn't pay for them
+        try:
+            await self.reference.load()
+        except Exception:
+            logger.warning("Failed to preload reference data; it will be fetched on first use", exc_info=True)
+        self.reference.start()
+
+        # Optional local replica; reads use it only once a sync has completed recently enough
+        self.mirror = ZammadMirror.from_env()
+        if self.mirror is not None:
+            self.mirror_syncer = MirrorSyncer.from_env(
+                self.mirror,
+                lambda kind, since, page, per_page: self._call_bulk(
+                    self.get_client().list_updated_since, kind, since, page, per_page
+                ),
+                self.reference.fetchers,
+                run_blocking=self._call_bulk,
+            )
+            self.mirror_syncer.start()
+            logger.info(f"Mirroring Zammad into {self.mirror.path}")
+
+        # Full-text index fed from every ticket and article payload the client sees
+        self.article_index = ArticleIndex.from_env()
+        if self.article_index is not None:
+            self.client.add_ticket_observer(self.article_index.observe_tickets)
+            self.client.add_article_observer(self.article_index.observe_articles)
+
+        self.client.add_ticket_observer(self.escalations.observe)
+        self.client.add_ticket_observer(self.queues.observe)
+        self.client.add_ticket_observer(self.subscriptions.observe_tickets)
+
+    async def _fresh_mirror(self, *kinds: str) -> ZammadMirror | None:
+        """Return the mirror if it may answer reads of ``kinds`` under its freshness bound."""
+        mirror = self.mirror
+        if mirror is not None and await self._call(mirror.is_fresh, *kinds):
+            return mirror
+        return None
+
+    async def apply_webhook(self, change: WebhookChange) -> dict[str, int]:
+        """Apply the records of a Zammad webhook delivery to caches, indexes and the mirror.
+
+        Returns the number of records applied per kind.
+        """
+        client = self.get_client()
+        await self._call(
+            client.apply_pushed_changes, change.tickets, change.articles, change.users, change.organizations
+        )
+        self.subscriptions.observe("users", change.users)
+        self.subscriptions.observe("organizations", change.organizations)
+        if self.mirror is not None:
+            for kind, records in (
+                ("tickets", change.tickets),
+                ("users", change.users),
+                ("organizations", change.organizations),
+            ):
+                if records:
+                    await self._call(self.mirror.upsert, kind, records)
+        return {
+            "tickets": len(change.tickets),
+            "articles": len(change.articles),
+            "users": len(change.users),
+            "organizations": len(change.organizations),
+        }
+
+    async def _fetch_escalating_tickets(self) -> list[dict[str, Any]]:
+        """Fetch every ticket with an escalation deadline, to seed the escalation index."""
+        client = self.get_client()
+        query = bucket_queries(DEFAULT_STATE_NAMES)["escalated"]
+
+        async def fetch_page(page: int) -> list[dict[str, Any]]:
+            result: list[dict[str, Any]] = await self._call_bulk(
+                client.search_tickets,
+                query=query,
+                page=page,
+                per_page=100,
+                sort_by="escalation_at",
+                order_by="asc",
+            )
+            return result
+
+        tickets: list[dict[str, Any]] = []
+        async for page in fetch_pages(
+            fetch_page, per_page=100, max_pages=MAX_ESCALATION_SEED_PAGES, window=self.prefetch_window
+        ):
+            tickets.extend(page)
+        if len(tickets) >= MAX_ESCALATION_SEED_PAGES * 100:
+            logger.warning(
+                f"Escalation index seeded with the first {len(tickets)} escalating tickets only; "
+                "later deadlines are added as tickets are seen"
+            )
+        else:
+            logger.info(f"Escalation index seeded with {len(tickets)} escalating tickets")
+        return tickets
+
+    async def _fetch_queue_page(self, group: str, since: str | None, page: int, per_page: int) -> list[dict[str, Any]]:
+        """Fetch a page of a group's tickets updated at or after ``since``, oldest update first."""
+        client = self.get_client()
+        result: list[dict[str, Any]] = await self._call_bulk(
+            client.search_tickets,
+            query=f"updated_at:[{since} TO *]" if since else None,
+            group=group,
+            page=page,
+            per_page=per_page,
+            sort_by="updated_at",
+            order_by="asc",
+        )
+        return result
+
+    async def _search_tickets(
+        self,
+        *,
+        query: str | None,
+        state: str | None,
+        priority: str | None,
+        group: str | None,
+        owner: str | None,
+        customer: str | None,
+        page: int,
+        per_page: int,
+        max_pages: int,
+        max_results: int,
+        ctx: Context | None,
+    ) -> list[str]:
+        """Search tickets through the mirror or Zammad and summarize them, streaming each page as it arrives."""
+        client = self.get_client()
+
+        logger.info(
+            "search_tickets called",
+            extra={
+                "query": query,
+                "state": state,
+                "priority": priority,
+                "group": group,
+                "owner": owner,
+                "customer": customer,
+                "page": page,
+                "per_page": per_page,
+                "max_pages": max_pages,
+                "max_results": max_results,
+            },
+        )
+
+        params: dict[str, Any] = {
+            "query": query,
+            "state": state,
+            "priority": priority,
+            "group": group,
+            "owner": owner,
+            "customer": customer,
+            "page": page,
+            "per_page": per_page,
+        }
+
+        _split_inline_assignments(params)
+
+        query = params["query"]
+        state = params["state"]
+        priority = params["priority"]
+        group = params["group"]
+        owner = params["owner"]
+        customer = params["customer"]
+        page = _int_param(params["page"], 1)
+        per_page = _int_param(params["per_page"], 25)
+
+        search_filters: dict[str, Any] = {
+            "query": query,
+            "state": state,
+            "priority": priority,
+            "group": group,
+            "owner": owner,
+            "customer": customer,
+        }
+        if self.local_name_resolution:
+            search_filters["expand"] = False
+
+        # Structured filters can be answered by the mirror; free text needs Zammad's search engine
+        mirror = None if query else await self._fresh_mirror("tickets")
+
+        async def fetch_page(page_number: int) -> list[dict[str, Any]]:
+            result: list[dict[str, Any]] = await self._call(
+                client.search_tickets, **search_filters, page=page_number, per_page=per_page
+            )
+            if self.local_name_resolution:
+                result = await self.resolver.resolve_tickets(result)
+            return result
+
+        tickets: list[Ticket] = []
+        summaries: list[str] = []
+        pages_read = 0
+
+        def add_page(tickets_data: list[dict[str, Any]]) -> None:
+            """Summarize a page as it arrives and stream the summaries to listening clients."""
+            nonlocal pages_read
+            pages_read += 1
+            first = len(summaries)
+            for ticket_data in tickets_data:
+                ticket = _validate(Ticket, ticket_data)
+                tickets.append(ticket)
+                if not max_results or len(summaries) < max_results:
+                    summaries.append(_ticket_summary(len(tickets), ticket))
+            report_partial(summaries[first:], pages=pages_read, tickets=len(summaries))
+
+        async with self._progress_notifications(ctx):
+            if mirror is not None:
+                limit = per_page * max(max_pages, 1)
+                if max_results:
+                    limit = min(limit, max_results)
+                mirrored = await self._call(
+                    mirror.search_tickets,
+                    state=state,
+                    priority=priority,
+                    group=group,
+                    owner=owner,
+                    customer=customer,
+                    limit=limit,
+                    offset=(max(page, 1) - 1) * per_page,
+                )
+                add_page(mirrored)
+            else:
+                async for tickets_data in fetch_pages(
+                    fetch_page,
+                    start_page=max(page, 1),
+                    per_page=per_page,
+                    max_pages=max(max_pages, 1),
+                    max_results=max_results,
+                    window=self.prefetch_window,
+                ):
+                    add_page(tickets_data)
+
+        if len(tickets) > len(summaries):
+            summaries.append(f"... {len(tickets) - len(summaries)} additional tickets truncated")
+
+        logger.info("search_tickets returning summaries", extra={"tickets_returned": len(summaries)})
+
+        return summaries
+
+    async def _search_articles(self, query: str, limit: int) -> list[str]:
+        """Summarize the best article index matches, one per ticket."""
+        if self.article_index is None:
+            raise RuntimeError("Article index not enabled. Set ZAMMAD_ARTICLE_INDEX_PATH to use search_articles")
+
+        results = await self._call(self.article_index.search, query, limit)
+        summaries: list[str] = []
+        for idx, result in enumerate(results, start=1):
+            lines = [
+                f"{idx}. Ticket #{result['number'] or result['ticket_id']}",
+                f"Title: {result['title'] or '-'}",
+                f"Relevance: {-result['score']:.2f}",
+            ]
+            lines.extend(f"Article {snippet['article_id']}: {snippet['snippet']}" for snippet in result["snippets"])
+            summaries.append("\n".join(lines))
+        return summaries
+
+    async def _list_escalations(self, group: str | None, within_minutes: int, limit: int) -> list[str]:
+        """Summarize the soonest escalation deadlines from the escalation index."""
+        await self.escalations.ensure_loaded()
+        group_id = None
+        if group is not None:
+            await self.reference.get("groups")
+            group_id = self.reference.name_to_id("groups").get(group)
+            if group_id is None:
+                raise ValueError(f"Unknown group: {group}")
+
+        now = self.escalations.now()
+        due = self.escalations.due(group_id, None if within_minutes < 0 else within_minutes, limit)
+        summaries: list[str] = []
+        for idx, entry in enumerate(due, start=1):
+            minutes = round((entry.deadline - now) / 60)
+            when = f"in {minutes} min" if minutes >= 0 else f"overdue by {-minutes} min"
+            summaries.append(
+                "\n".join(
+                    [
+                        f"{idx}. Ticket #{entry.number or entry.ticket_id}",
+                        f"Title: {entry.title or '-'}",
+                        f"Group: {entry.group or '-'}",
+                        f"State: {entry.state or '-'}",
+                        f"Owner: {entry.owner or '-'}",
+                        (
+                            f"Escalation: {entry.escalation_type} at "
+                            f"{entry.deadline_at.strftime('%Y-%m-%d %H:%M UTC')} ({when})"
+                        ),
+                    ]
+                )
+            )
+        return summaries
+
     def _setup_tools(self) -> None:
         """Register all tools with the MCP server."""
         self._setup_ticket_tools()
         self._setup_user_org_tools()
         self._setup_system_tools()
 
-    def _setup_ticket_tools(self) -> None:
-        """Register ticket-related tools."""
+    def _setup_ticket_search_tools(self) -> None:
+        """Register the ticket search and listing tools."""
 
         @self.mcp.tool()
-        def search_tickets(
+        async def search_tickets(
             query: str | None = None,
             state: str | None = None,
             priority: str | None = None,
@@ -119,6 +707,8 @@ class ZammadMCPServer:
             per_page: int = 25,
             max_pages: int = 4,
             max_results: int = 50,
+            *,
+            ctx: Context | None = None,
         ) -> list[str]:
             """Search for tickets with various filters.
 
@@ -132,139 +722,70 @@ class ZammadMCPServer:
                 page: Page number (default: 1)
                 per_page: Results per page (default: 25)
                 max_pages: Number of pages to retrieve (default: 4, set to 1 to disable pagination)
+                max_results: Stop once this many tickets have been collected (default: 50)
 
             Returns:
                 List of tickets matching the search criteria
-            """
-            client = self.get_client()
 
-            logger.info(
-                "search_tickets called",
-                extra={
-                    "query": query,
-                    "state": state,
-                    "priority": priority,
-                    "group": group,
-                    "owner": owner,
-                    "customer": customer,
-                    "page": page,
-                    "per_page": per_page,
-                    "max_pages": max_pages,
-                    "max_results": max_results,
-                },
+            Note: Each page read is reported as progress (pages and tickets so far)
+            when the request carries a progress token.
+            """
+            return await self._search_tickets(
+                query=query,
+                state=state,
+                priority=priority,
+                group=group,
+                owner=owner,
+                customer=customer,
+                page=page,
+                per_page=per_page,
+                max_pages=max_pages,
+                max_results=max_results,
+                ctx=ctx,
             )
 
-            params: dict[str, Any] = {
-                "query": query,
-                "state": state,
-                "priority": priority,
-                "group": group,
-                "owner": owner,
-                "customer": customer,
-                "page": page,
-                "per_page": per_page,
-            }
-
-            for key in list(params.keys()):
-                value = params[key]
-                if isinstance(value, str) and "=" in value and " " in value:
-                    tokens = shlex.split(value)
-                    explicit_value = None
-                    for token in tokens:
-                        if "=" in token:
-                            assign_key, assign_value = token.split("=", 1)
-                            assign_key = assign_key.strip()
-                            assign_value = assign_value.strip()
-                            if assign_key in params:
-                                params[assign_key] = assign_value
-                        else:
-                            if explicit_value is None:
-                                explicit_value = token.strip()
-                    if explicit_value is not None:
-                        params[key] = explicit_value
-
-            query = params["query"]
-            state = params["state"]
-            priority = params["priority"]
-            group = params["group"]
-            owner = params["owner"]
-            customer = params["customer"]
-            try:
-                page = int(params["page"])
-            except (TypeError, ValueError):
-                page = 1
-            try:
-                per_page = int(params["per_page"])
-            except (TypeError, ValueError):
-                per_page = 25
-
-            tickets: list[Ticket] = []
-            current_page = max(page, 1)
-            pages_remaining = max(max_pages, 1)
-
-            while pages_remaining > 0:
-                tickets_data = client.search_tickets(
-                    query=query,
-                    state=state,
-                    priority=priority,
-                    group=group,
-                    owner=owner,
-                    customer=customer,
-                    page=current_page,
-                    per_page=per_page,
-                )
-
-                if not tickets_data:
-                    logger.info("search_tickets page returned no results", extra={"page": current_page})
-                    break
+        @self.mcp.tool()
+        async def search_articles(query: str, limit: int = 10) -> list[str]:
+            """Full-text search over ticket titles and article bodies in the local index.
 
-                tickets.extend(Ticket(**ticket) for ticket in tickets_data)
+            Answers from an index of the tickets and articles this server has seen or
+            mirrored, without querying Zammad. Results are ranked with BM25 (title
+            matches weigh more) and grouped by ticket, with highlighted snippets.
 
-                if len(tickets_data) < per_page:
-                    # No more pages available
-                    break
+            Args:
+                query: Words to search for; all must match, ``word*`` matches prefixes
+                limit: Maximum number of tickets to return (default: 10)
 
-                if max_results and len(tickets) >= max_results:
-                    break
+            Returns:
+                One summary per matching ticket, best match first
+            """
+            return await self._search_articles(query, limit)
 
-                current_page += 1
-                pages_remaining -= 1
+        @self.mcp.tool()
+        async def list_escalations(group: str | None = None, within_minutes: int = 60, limit: int = 20) -> list[str]:
+            """List the tickets whose escalation deadlines come soonest, overdue ones first.
 
-            summaries: list[str] = []
-            for idx, ticket in enumerate(tickets, start=1):
-                if max_results and len(summaries) >= max_results:
-                    break
-                summaries.append(
-                    "\n".join(
-                        [
-                            f"{idx}. Ticket #{ticket.number or ticket.id}",
-                            f"Title: {ticket.title}",
-                            f"State: {ticket.state}",
-                            f"Priority: {ticket.priority}",
-                            f"Customer: {ticket.customer}",
-                            f"Owner: {ticket.owner or '-'}",
-                            f"Group: {ticket.group}",
-                            f"Created: {ticket.created_at}",
-                            f"Updated: {ticket.updated_at}",
-                            f"Articles: {ticket.article_count}",
-                        ]
-                    )
-                )
+            Reads a local index of escalation deadlines ordered per group, so the soonest
+            deadlines are found without paging through whole queues. Each ticket is listed
+            once, under the earliest of its first response, update and close deadlines.
 
-            if len(tickets) > len(summaries):
-                summaries.append(
-                    f"... {len(tickets) - len(summaries)} additional tickets truncated"
-                )
+            Args:
+                group: Only tickets of this group (name)
+                within_minutes: Only deadlines at most this many minutes from now, including
+                    overdue ones (default: 60, use -1 for any deadline)
+                limit: Maximum number of tickets to return (default: 20)
 
-            logger.info(
-                "search_tickets returning summaries",
-                extra={"tickets_returned": len(summaries)}
-            )
+            Returns:
+                One summary per ticket, soonest deadline first
+            """
+            return await self._list_escalations(group, within_minutes, limit)
 
-            return summaries
+    def _setup_ticket_tools(self) -> None:
+        """Register ticket-related tools."""
+        self._setup_ticket_search_tools()
 
         @self.mcp.tool()
-        def get_ticket(
+        async def get_ticket(
             ticket_id: int, include_articles: bool = True, article_limit: int = 10, article_offset: int = 0
         ) -> Ticket:
             """Get detailed information about a specific ticket.
@@ -304,14 +825,18 @@ class ZammadMCPServer:
             # Zammad ticket IDs are typically small integers, while ticket numbers are large
             if ticket_id > 1000:
                 logger.info(f"Large ticket_id {ticket_id} detected, treating as ticket number")
-                ticket_data = client.get_ticket_by_number(str(ticket_id), include_articles, article_limit, article_offset)
+                ticket_data = await self._call(
+                    client.get_ticket_by_number, str(ticket_id), include_articles, article_limit, article_offset
+                )
             else:
-                ticket_data = client.get_ticket(ticket_id, include_articles, article_limit, article_offset)
+                ticket_data = await self._call(
+                    client.get_ticket, ticket_id, include_articles, article_limit, article_offset
+                )
             
-            return Ticket(**ticket_data)
+            return _validate(Ticket, ticket_data)
 
         @self.mcp.tool()
-        def create_ticket(
+        async def create_ticket(
             title: str,
             group: str,
             customer: str,
@@ -337,7 +862,8 @@ class ZammadMCPServer:
                 The created ticket
             """
             client = self.get_client()
-            ticket_data = client.create_ticket(
+            ticket_data = await self._call(
+                client.create_ticket,
                 title=title,
                 group=group,
                 customer=customer,
@@ -348,10 +874,10 @@ class ZammadMCPServer:
                 article_internal=article_internal,
             )
 
-            return Ticket(**ticket_data)
+            return _validate(Ticket, ticket_data)
 
         @self.mcp.tool()
-        def update_ticket(
+        async def update_ticket(
             ticket_id: int,
             title: str | None = None,
             state: str | None = None,
@@ -373,7 +899,8 @@ class ZammadMCPServer:
                 The updated ticket
             """
             client = self.get_client()
-            ticket_data = client.update_ticket(
+            ticket_data = await self._call(
+                client.update_ticket,
                 ticket_id=ticket_id,
                 title=title,
                 state=state,
@@ -382,10 +909,10 @@ class ZammadMCPServer:
                 group=group,
             )
 
-            return Ticket(**ticket_data)
+            return _validate(Ticket, ticket_data)
 
         @self.mcp.tool()
-        def add_article(
+        async def add_article(
             ticket_id: int,
             body: str,
             article_type: str = "note",
@@ -405,7 +932,8 @@ class ZammadMCPServer:
                 The created article
             """
             client = self.get_client()
-            article_data = client.add_article(
+            article_data = await self._call(
+                client.add_article,
                 ticket_id=ticket_id,
                 body=body,
                 article_type=article_type,
@@ -413,10 +941,10 @@ class ZammadMCPServer:
                 sender=sender,
             )
 
-            return Article(**article_data)
+            return _validate(Article, article_data)
 
         @self.mcp.tool()
-        def get_article_attachments(ticket_id: int, article_id: int) -> list[Attachment]:
+        async def get_article_attachments(ticket_id: int, article_id: int) -> list[Attachment]:
             """Get list of attachments for a ticket article.
 
             Args:
@@ -427,11 +955,11 @@ class ZammadMCPServer:
                 List of attachment information
             """
             client = self.get_client()
-            attachments_data = client.get_article_attachments(ticket_id, article_id)
+            attachments_data = await self._call(client.get_article_attachments, ticket_id, article_id)
             return [Attachment(**attachment) for attachment in attachments_data]
 
         @self.mcp.tool()
-        def download_attachment(ticket_id: int, article_id: int, attachment_id: int) -> str:
+        async def download_attachment(ticket_id: int, article_id: int, attachment_id: int) -> str:
             """Download an attachment from a ticket article.
 
             Args:
@@ -444,14 +972,14 @@ class ZammadMCPServer:
             """
             client = self.get_client()
             try:
-                attachment_data = client.download_attachment(ticket_id, article_id, attachment_id)
+                attachment_data = await self._call(client.download_attachment, ticket_id, article_id, attachment_id)
                 # Convert bytes to base64 string for transmission
                 return base64.b64encode(attachment_data).decode("utf-8")
             except Exception as e:
                 return f"Error downloading attachment: {e!s}"
 
         @self.mcp.tool()
-        def add_ticket_tag(ticket_id: int, tag: str) -> dict[str, Any]:
+        async def add_ticket_tag(ticket_id: int, tag: str) -> dict[str, Any]:
             """Add a tag to a ticket.
 
             Args:
@@ -462,10 +990,11 @@ class ZammadMCPServer:
                 Operation result
             """
             client = self.get_client()
-            return client.add_ticket_tag(ticket_id, tag)
+            result: dict[str, Any] = await self._call(client.add_ticket_tag, ticket_id, tag)
+            return result
 
         @self.mcp.tool()
-        def remove_ticket_tag(ticket_id: int, tag: str) -> dict[str, Any]:
+        async def remove_ticket_tag(ticket_id: int, tag: str) -> dict[str, Any]:
             """Remove a tag from a ticket.
 
             Args:
@@ -476,13 +1005,14 @@ class ZammadMCPServer:
                 Operation result
             """
             client = self.get_client()
-            return client.remove_ticket_tag(ticket_id, tag)
+            result: dict[str, Any] = await self._call(client.remove_ticket_tag, ticket_id, tag)
+            return result
 
     def _setup_user_org_tools(self) -> None:
         """Register user and organization tools."""
 
         @self.mcp.tool()
-        def get_user(user_id: int) -> User:
+        async def get_user(user_id: int) -> User:
             """Get user information by ID.
 
             Args:
@@ -492,11 +1022,11 @@ class ZammadMCPServer:
                 User details
             """
             client = self.get_client()
-            user_data = client.get_user(user_id)
-            return User(**user_data)
+            user_data = await self._call(client.get_user, user_id)
+            return _validate(User, user_data)
 
         @self.mcp.tool()
-        def search_users(query: str, page: int = 1, per_page: int = 25) -> list[User]:
+        async def search_users(query: str, page: int = 1, per_page: int = 25) -> list[User]:
             """Search for users.
 
             Args:
@@ -508,11 +1038,14 @@ class ZammadMCPServer:
                 List of users matching the query
             """
             client = self.get_client()
-            users_data = client.search_users(query, page, per_page)
+            if self.local_name_resolution:
+                users_data = await self._call(client.search_users, query, page, per_page, expand=False)
+            else:
+                users_data = await self._call(client.search_users, query, page, per_page)
             return [User(**user) for user in users_data]
 
         @self.mcp.tool()
-        def get_organization(org_id: int) -> Organization:
+        async def get_organization(org_id: int) -> Organization:
             """Get organization information by ID.
 
             Args:
@@ -522,11 +1055,11 @@ class ZammadMCPServer:
                 Organization details
             """
             client = self.get_client()
-            org_data = client.get_organization(org_id)
-            return Organization(**org_data)
+            org_data = await self._call(client.get_organization, org_id)
+            return _validate(Organization, org_data)
 
         @self.mcp.tool()
-        def search_organizations(query: str, page: int = 1, per_page: int = 25) -> list[Organization]:
+        async def search_organizations(query: str, page: int = 1, per_page: int = 25) -> list[Organization]:
             """Search for organizations.
 
             Args:
@@ -538,171 +1071,290 @@ class ZammadMCPServer:
                 List of organizations matching the query
             """
             client = self.get_client()
-            orgs_data = client.search_organizations(query, page, per_page)
+            if self.local_name_resolution:
+                orgs_data = await self._call(client.search_organizations, query, page, per_page, expand=False)
+            else:
+                orgs_data = await self._call(client.search_organizations, query, page, per_page)
             return [Organization(**org) for org in orgs_data]
 
         @self.mcp.tool()
-        def get_current_user() -> User:
+        async def get_current_user() -> User:
             """Get information about the currently authenticated user.
 
             Returns:
                 Current user details
             """
             client = self.get_client()
-            user_data = client.get_current_user()
-            return User(**user_data)
+            user_data = await self._call(client.get_current_user)
+            return _validate(User, user_data)
 
-    def _get_cached_groups(self) -> list[Group]:
+    async def _get_cached_groups(self) -> list[Group]:
         """Get cached list of groups."""
-        if not hasattr(self, "_groups_cache"):
-            client = self.get_client()
-            groups_data = client.get_groups()
-            self._groups_cache = [Group(**group) for group in groups_data]
-        return self._groups_cache
+        return [Group(**group) for group in await self.reference.get("groups")]
 
-    def _get_cached_states(self) -> list[TicketState]:
+    async def _get_cached_states(self) -> list[TicketState]:
         """Get cached list of ticket states."""
-        if not hasattr(self, "_states_cache"):
-            client = self.get_client()
-            states_data = client.get_ticket_states()
-            self._states_cache = [TicketState(**state) for state in states_data]
-        return self._states_cache
+        return [TicketState(**state) for state in await self.reference.get("states")]
 
-    def _get_cached_priorities(self) -> list[TicketPriority]:
+    async def _get_cached_priorities(self) -> list[TicketPriority]:
         """Get cached list of ticket priorities."""
-        if not hasattr(self, "_priorities_cache"):
-            client = self.get_client()
-            priorities_data = client.get_ticket_priorities()
-            self._priorities_cache = [TicketPriority(**priority) for priority in priorities_data]
-        return self._priorities_cache
+        return [TicketPriority(**priority) for priority in await self.reference.get("priorities")]
 
     def clear_caches(self) -> None:
         """Clear all cached data."""
-        if hasattr(self, "_groups_cache"):
-            del self._groups_cache
-        if hasattr(self, "_states_cache"):
-            del self._states_cache
-        if hasattr(self, "_priorities_cache"):
-            del self._priorities_cache
+        self.reference.clear()
+
+    async def _count_ticket_stats(
+        self, client: ZammadClient | AsyncZammadClient, group: str | None, scope: str | None = None
+    ) -> TicketStats | None:
+        """Ticket statistics from concurrent count queries, or None if counts are unavailable.
+
+        ``scope`` is ANDed into every count query, e.g. a created_at range.
+        """
+        states = self.reference.peek("states") or []
+        state_names = [str(state["name"]) for state in states if "name" in state] or DEFAULT_STATE_NAMES
+        try:
+            return await count_ticket_stats(
+                lambda query: self._call(client.count_tickets, query=combine_queries(scope, query), group=group),
+                state_names,
+            )
+        except Exception as e:
+            logger.warning(f"Count queries failed, falling back to a ticket scan: {e}")
+            return None
+
+    async def _scan_ticket_stats(
+        self,
+        client: ZammadClient | AsyncZammadClient,
+        group: str | None,
+        windows: list[str | None] | None = None,
+        prefetch: bool = False,
+        known_total: Callable[[], int | None] | None = None,
+    ) -> TicketStats:
+        """Ticket statistics, including SLA metrics, from paging through every ticket.
+
+        Each created_at window in ``windows`` is scanned concurrently and the
+        partial results are merged. With ``prefetch``, the pages of a window are
+        also fetched concurrently; otherwise they are read one at a time until an
+        empty page. Pages are folded into constant-size accumulators and dropped,
+        so memory stays flat however many tickets match. Progress is reported after
+        every page for streaming clients, with the total from ``known_total`` if it
+        returns one, else an estimate: the tickets scanned so far plus one more
+        page for every window that may still hold tickets.
+        """
+        per_page = 100
+        windows = windows or [None]
+        pages_read = tickets_scanned = 0
+        # Tickets each window may still hold: one more page until a short or empty page ends it
+        remaining = dict.fromkeys(range(len(windows)), per_page)
+
+        def report() -> None:
+            estimated_total = known_total() if known_total is not None else None
+            if estimated_total is None:
+                estimated_total = tickets_scanned + sum(remaining.values())
+            report_progress(pages=pages_read, tickets_scanned=tickets_scanned, estimated_total=estimated_total)
+
+        def add_page(index: int, accumulator: TicketStatsAccumulator, tickets: list[dict[str, Any]]) -> None:
+            nonlocal pages_read, tickets_scanned
+            accumulator.add_page(tickets)
+            pages_read += 1
+            tickets_scanned += len(tickets)
+            remaining[index] = per_page if len(tickets) >= per_page else 0
+            report()
+
+        def finish(index: int, accumulator: TicketStatsAccumulator) -> TicketStatsAccumulator:
+            if remaining[index]:
+                remaining[index] = 0
+                report()
+            return accumulator
+
+        async def scan(index: int, window: str | None) -> TicketStatsAccumulator:
+            accumulator = TicketStatsAccumulator()
+            filters: dict[str, Any] = {"group": group}
+            if window:
+                filters["query"] = window
+
+            async def fetch_page(page: int) -> list[dict[str, Any]]:
+                result: list[dict[str, Any]] = await self._call_bulk(
+                    client.search_tickets, **filters, page=page, per_page=per_page
+                )
+                return result
+
+            if prefetch:
+                async for tickets in fetch_pages(
+                    fetch_page, per_page=per_page, max_pages=MAX_TICKETS_FOR_MEMORY_SCAN, window=self.prefetch_window
+                ):
+                    add_page(index, accumulator, tickets)
+                return finish(index, accumulator)
+
+            page = 1
+            while True:
+                tickets = await fetch_page(page)
+                if not tickets:
+                    break
+
+                add_page(index, accumulator, tickets)
+
+                page += 1
+                # Safety check to prevent infinite loops
+                if page > MAX_TICKETS_FOR_MEMORY_SCAN:
+                    logger.warning("Reached maximum page limit, some tickets may not be counted")
+                    break
+            return finish(index, accumulator)
+
+        total = TicketStatsAccumulator()
+        for partial in await asyncio.gather(*(scan(index, window) for index, window in enumerate(windows))):
+            total.merge(partial)
+        return total.result()
+
+    async def _mirror_ticket_stats(
+        self,
+        mirror: ZammadMirror,
+        group: str | None,
+        start_date: str | None,
+        end_date: str | None,
+        include_sla_metrics: bool,
+    ) -> TicketStats:
+        """Ticket statistics computed from the local mirror."""
+        created_from, created_to = created_at_bounds(start_date, end_date)
+        if include_sla_metrics:
+
+            def scan() -> TicketStats:
+                accumulator = TicketStatsAccumulator()
+                accumulator.add_page(mirror.iter_tickets(group, created_from, created_to))
+                return accumulator.result()
+
+            stats: TicketStats = await self._call_bulk(scan)
+            return stats
+
+        counts: dict[str, int] = await self._call_bulk(mirror.ticket_counts, group, created_from, created_to)
+        return TicketStats(
+            total_count=counts["total"],
+            open_count=counts["open"],
+            closed_count=counts["closed"],
+            pending_count=counts["pending"],
+            escalated_count=counts["escalated"],
+            avg_first_response_time=None,
+            avg_resolution_time=None,
+            first_response_time=None,
+            resolution_time=None,
+        )
+
+    async def _ticket_stats(
+        self, group: str | None, start_date: str | None, end_date: str | None, include_sla_metrics: bool
+    ) -> TicketStats:
+        """Ticket statistics from the mirror, count queries or a ticket scan, whichever is cheapest."""
+        client = self.get_client()
+        mirror = await self._fresh_mirror("tickets")
+        if mirror is not None:
+            return await self._mirror_ticket_stats(mirror, group, start_date, end_date, include_sla_metrics)
+
+        # The range is filtered by Zammad; scans split it into windows read in parallel
+        scope = created_at_range(start_date, end_date)
+        windows = split_created_at_range(start_date, end_date, self.prefetch_window)
+
+        if not include_sla_metrics:
+            stats = await self._count_ticket_stats(client, group, scope)
+            if stats is not None:
+                return stats
+            return await self._scan_ticket_stats(client, group, windows)
+
+        counted: list[TicketStats] = []
+
+        async def count() -> TicketStats | None:
+            # The counts are ready long before the scan; stream them ahead of the SLA metrics
+            stats = await self._count_ticket_stats(client, group, scope)
+            if stats is not None:
+                counted.append(stats)
+                report_partial([stats.model_dump()], stage="counts", estimated_total=stats.total_count)
+            return stats
+
+        counts, scanned = await asyncio.gather(
+            count(),
+            self._scan_ticket_stats(
+                client,
+                group,
+                windows,
+                prefetch=True,
+                # Once counted, the exact total replaces the scan's own estimate
+                known_total=lambda: counted[0].total_count if counted else None,
+            ),
+        )
+        if counts is None:
+            return scanned
+        # Counts are exact even if the scan stopped at its page limit
+        return counts.model_copy(
+            update={
+                "avg_first_response_time": scanned.avg_first_response_time,
+                "avg_resolution_time": scanned.avg_resolution_time,
+                "first_response_time": scanned.first_response_time,
+                "resolution_time": scanned.resolution_time,
+            }
+        )
 
     def _setup_system_tools(self) -> None:
         """Register system information tools."""
 
         @self.mcp.tool()
-        def get_ticket_stats(
+        async def get_ticket_stats(
             group: str | None = None,
             start_date: str | None = None,
             end_date: str | None = None,
+            include_sla_metrics: bool = False,
+            *,
+            ctx: Context | None = None,
         ) -> TicketStats:
-            """Get ticket statistics using pagination for better performance.
+            """Get ticket statistics.
 
             Args:
                 group: Filter by group name
-                start_date: Start date (ISO format) - NOT YET IMPLEMENTED
-                end_date: End date (ISO format) - NOT YET IMPLEMENTED
+                start_date: Only count tickets created on or after this date (ISO format)
+                end_date: Only count tickets created up to this date (ISO format, a date
+                    without time includes the whole day)
+                include_sla_metrics: Also report first response and resolution times
+                    (mean, standard deviation, p50/p90/p99); this reads every matching ticket
 
             Returns:
                 Ticket statistics
 
-            Note: This implementation uses pagination to avoid loading all tickets
-            into memory at once, improving performance for large datasets.
+            Note: Each figure is a single count-only search, so the cost does not grow
+            with the number of tickets. Zammad versions that do not report search
+            totals fall back to paging through the tickets, which also yields SLA metrics.
+            Ticket scans report their progress (pages, tickets scanned and the estimated
+            total) when the request carries a progress token, and stop when cancelled.
             """
-            client = self.get_client()
-            # TODO: Implement date filtering when the API supports it
-            if start_date or end_date:
-                logger.warning("Date filtering not yet implemented - ignoring date parameters")
-
-            # Initialize counters
-            total_count = 0
-            open_count = 0
-            closed_count = 0
-            pending_count = 0
-            escalated_count = 0
-
-            # Process tickets in batches
-            page = 1
-            per_page = 100
-
-            while True:
-                # Get a batch of tickets
-                tickets = client.search_tickets(group=group, page=page, per_page=per_page)
-
-                if not tickets:
-                    # No more tickets
-                    break
-
-                # Process this batch
-                for ticket in tickets:
-                    total_count += 1
-
-                    # Handle both expanded (string) and non-expanded (object) state formats
-                    state = ticket.get("state")
-                    state_name = ""
-                    if isinstance(state, str):
-                        state_name = state
-                    elif isinstance(state, dict):
-                        state_name = str(state.get("name", ""))
-
-                    # Count by state
-                    if state_name in ["new", "open"]:
-                        open_count += 1
-                    elif state_name == "closed":
-                        closed_count += 1
-                    elif "pending" in state_name:
-                        pending_count += 1
-
-                    # Check for escalation
-                    if (
-                        ticket.get("first_response_escalation_at")
-                        or ticket.get("close_escalation_at")
-                        or ticket.get("update_escalation_at")
-                    ):
-                        escalated_count += 1
-
-                # Move to next page
-                page += 1
-
-                # Safety check to prevent infinite loops
-                if page > MAX_TICKETS_FOR_MEMORY_SCAN:  # Safety limit to prevent infinite loops
-                    logger.warning("Reached maximum page limit, some tickets may not be counted")
-                    break
-
-            return TicketStats(
-                total_count=total_count,
-                open_count=open_count,
-                closed_count=closed_count,
-                pending_count=pending_count,
-                escalated_count=escalated_count,
-                avg_first_response_time=None,  # TODO: Calculate from ticket data
-                avg_resolution_time=None,  # TODO: Calculate from ticket data
-            )
+            try:
+                async with self._progress_notifications(ctx):
+                    return await self._ticket_stats(group, start_date, end_date, include_sla_metrics)
+            except asyncio.CancelledError:
+                logger.info("get_ticket_stats cancelled by the client")
+                raise
 
         @self.mcp.tool()
-        def list_groups() -> list[Group]:
+        async def list_groups() -> list[Group]:
             """Get all available groups (cached).
 
             Returns:
                 List of all groups
             """
-            return self._get_cached_groups()
+            return await self._get_cached_groups()
 
         @self.mcp.tool()
-        def list_ticket_states() -> list[TicketState]:
+        async def list_ticket_states() -> list[TicketState]:
             """Get all available ticket states (cached).
 
             Returns:
                 List of all ticket states
             """
-            return self._get_cached_states()
+            return await self._get_cached_states()
 
         @self.mcp.tool()
-        def list_ticket_priorities() -> list[TicketPriority]:
+        async def list_ticket_priorities() -> list[TicketPriority]:
             """Get all available ticket priorities (cached).
 
             Returns:
                 List of all ticket priorities
             """
-            return self._get_cached_priorities()
+            return await self._get_cached_priorities()
 
     def _setup_resources(self) -> None:
         """Register all resources with the MCP server."""
@@ -711,16 +1363,77 @@ class ZammadMCPServer:
         self._setup_organization_resource()
         self._setup_queue_resource()
 
+    def _setup_metrics(self) -> None:
+        """Time the MCP tools/call, resources/read and prompts/get handlers and measure their results."""
+        handlers = self.mcp._mcp_server.request_handlers
+        labelled: list[tuple[type, str, Callable[[Any], str]]] = [
+            (types.CallToolRequest, "tool", lambda request: str(request.params.name)),
+            (types.ReadResourceRequest, "resource", lambda request: resource_label(str(request.params.uri))),
+            (types.GetPromptRequest, "prompt", lambda request: str(request.params.name)),
+        ]
+        for request_type, kind, name_of in labelled:
+            if request_type in handlers:
+                handlers[request_type] = self._timed_handler(handlers[request_type], kind, name_of)
+
+    @contextlib.contextmanager
+    def track_call(self, kind: str, name: str) -> Iterator[Callable[[str], None]]:
+        """Meter and trace one MCP call; see :meth:`Metrics.track_call` for the yielded function."""
+        with (
+            span(f"{kind} {name}", {"mcp.kind": kind, "mcp.name": name}),
+            self.metrics.track_call(kind, name) as set_outcome,
+        ):
+            yield set_outcome
+
+    def _timed_handler(
+        self, handler: Callable[[Any], Any], kind: str, name_of: Callable[[Any], str]
+    ) -> Callable[[Any], Any]:
+        async def timed(request: Any) -> Any:
+            name = name_of(request)
+            with self.track_call(kind, name) as set_outcome:
+                result = await handler(request)
+                # Tool failures come back as results flagged isError
+                if getattr(getattr(result, "root", None), "isError", False):
+                    set_outcome("error")
+            size = result_size(result)
+            if size is not None:
+                self.metrics.result_bytes.observe(size, kind, name)
+            return result
+
+        return timed
+
+    def _setup_subscriptions(self) -> None:
+        """Register resources/subscribe and resources/unsubscribe and advertise subscription support."""
+        low_level = self.mcp._mcp_server
+
+        @low_level.subscribe_resource()
+        async def subscribe_resource(uri: Any) -> None:
+            await self.subscriptions.subscribe(str(uri), low_level.request_context.session)
+
+        @low_level.unsubscribe_resource()
+        async def unsubscribe_resource(uri: Any) -> None:
+            await self.subscriptions.unsubscribe(str(uri), low_level.request_context.session)
+
+        # The SDK always reports subscribe=False; report what the handlers above provide
+        get_capabilities = low_level.get_capabilities
+
+        def get_capabilities_with_subscribe(*args: Any, **kwargs: Any) -> Any:
+            capabilities = get_capabilities(*args, **kwargs)
+            if capabilities.resources is not None:
+                capabilities.resources.subscribe = True
+            return capabilities
+
+        low_level.get_capabilities = get_capabilities_with_subscribe  # type: ignore[method-assign]
+
     def _setup_ticket_resource(self) -> None:
         """Register ticket resource."""
 
         @self.mcp.resource("zammad://ticket/{ticket_id}")
-        def get_ticket_resource(ticket_id: str) -> str:
+        async def get_ticket_resource(ticket_id: str) -> str:
             """Get a ticket as a resource."""
             client = self.get_client()
             try:
                 # Use a reasonable limit for resources to avoid huge responses
-                ticket = client.get_ticket(int(ticket_id), include_articles=True, article_limit=20)
+                ticket = await self._call(client.get_ticket, int(ticket_id), include_articles=True, article_limit=20)
 
                 # Format ticket data as readable text
                 lines = [
@@ -751,11 +1464,11 @@ class ZammadMCPServer:
         """Register user resource."""
 
         @self.mcp.resource("zammad://user/{user_id}")
-        def get_user_resource(user_id: str) -> str:
+        async def get_user_resource(user_id: str) -> str:
             """Get a user as a resource."""
             client = self.get_client()
             try:
-                user = client.get_user(int(user_id))
+                user = await self._call(client.get_user, int(user_id))
 
                 lines = [
                     f"User: {user.get('firstname', '')} {user.get('lastname', '')}",
@@ -775,11 +1488,11 @@ class ZammadMCPServer:
         """Register organization resource."""
 
         @self.mcp.resource("zammad://organization/{org_id}")
-        def get_organization_resource(org_id: str) -> str:
+        async def get_organization_resource(org_id: str) -> str:
             """Get an organization as a resource."""
             client = self.get_client()
             try:
-                org = client.get_organization(int(org_id))
+                org = await self._call(client.get_organization, int(org_id))
 
                 lines = [
                     f"Organization: {org.get('name', '')}",
@@ -797,56 +1510,11 @@ class ZammadMCPServer:
         """Register queue resource."""
 
         @self.mcp.resource("zammad://queue/{group}")
-        def get_queue_resource(group: str) -> str:
+        async def get_queue_resource(group: str) -> str:
             """Get ticket queue for a specific group as a resource."""
-            client = self.get_client()
             try:
-                # Search for tickets in the specified group with various states
-                tickets = client.search_tickets(group=group, per_page=50)
-
-                if not tickets:
-                    return f"Queue for group '{group}': No tickets found"
-
-                # Organize tickets by state
-                ticket_states: dict[str, list[dict[str, Any]]] = {}
-                for ticket in tickets:
-                    state = ticket.get("state")
-                    state_name = ""
-                    if isinstance(state, str):
-                        state_name = state
-                    elif isinstance(state, dict):
-                        state_name = str(state.get("name", ""))
-
-                    if state_name not in ticket_states:
-                        ticket_states[state_name] = []
-                    ticket_states[state_name].append(ticket)
-
-                lines = [
-                    f"Queue for Group: {group}",
-                    f"Total Tickets: {len(tickets)}",
-                    "",
-                ]
-
-                # Add summary by state
-                for state, state_tickets in sorted(ticket_states.items()):
-                    lines.append(f"{state.title()} ({len(state_tickets)} tickets):")
-                    for ticket in state_tickets[:MAX_TICKETS_PER_STATE_IN_QUEUE]:  # Show first N tickets per state
-                        priority = ticket.get("priority", {})
-                        priority_name = priority.get("name", "Unknown") if isinstance(priority, dict) else str(priority)
-                        customer = ticket.get("customer", {})
-                        customer_email = (
-                            customer.get("email", "Unknown") if isinstance(customer, dict) else str(customer)
-                        )
-
-                        lines.append(f"  #{ticket.get('number', 'N/A')} - {ticket.get('title', 'No title')[:50]}...")
-                        lines.append(f"    Priority: {priority_name}, Customer: {customer_email}")
-                        lines.append(f"    Created: {ticket.get('created_at', 'Unknown')}")
-
-                    if len(state_tickets) > MAX_TICKETS_PER_STATE_IN_QUEUE:
-                        lines.append(f"    ... and {len(state_tickets) - MAX_TICKETS_PER_STATE_IN_QUEUE} more tickets")
-                    lines.append("")
-
-                return "\n".join(lines)
+                # Complete per-state counts, rendered from a snapshot that is only delta-polled
+                return await self.queues.render(group)
             except Exception as e:
                 return f"Error retrieving queue for group {group}: {e!s}"
 
@@ -883,9 +1551,12 @@ After drafting, you can use add_article to add the response to the ticket if app
         def escalation_summary(group: str | None = None) -> str:
             """Generate a prompt to summarize escalated tickets."""
             group_filter = f" for group '{group}'" if group else ""
+            group_argument = f" with group='{group}'" if group else ""
             return f"""Please provide a summary of escalated tickets{group_filter}.
 
-Use search_tickets to find tickets with escalation times set. For each escalated ticket:
+Use list_escalations{group_argument} to find the tickets whose escalation deadlines are \
+soonest (use within_minutes=-1 to see every deadline), and search_tickets or get_ticket for further details. \
+For each escalated ticket:
 1. Ticket number and title
 2. Escalation type (first response, update, or close)
 3. Time until escalation
@@ -913,7 +1584,7 @@ async def initialize() -> None:
     globals()["zammad_client"] = server.client
 
 
-def search_tickets(
+async def search_tickets(
     query: str | None = None,
     state: str | None = None,
     priority: str | None = None,
@@ -926,7 +1597,8 @@ def search_tickets(
     """Search for tickets (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
-    tickets_data = zammad_client.search_tickets(
+    tickets_data = await server._call(
+        zammad_client.search_tickets,
         query=query,
         state=state,
         priority=priority,
@@ -939,7 +1611,7 @@ def search_tickets(
     return [Ticket(**ticket) for ticket in tickets_data]
 
 
-def get_ticket(
+async def get_ticket(
     ticket_id: int,
     include_articles: bool = False,
     article_limit: int = 10,
@@ -948,11 +1620,13 @@ def get_ticket(
     """Get a ticket by ID (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
-    ticket_data = zammad_client.get_ticket(ticket_id, include_articles, article_limit, article_offset)
+    ticket_data = await server._call(
+        zammad_client.get_ticket, ticket_id, include_articles, article_limit, article_offset
+    )
     return Ticket(**ticket_data)
 
 
-def create_ticket(
+async def create_ticket(
     title: str,
     group: str,
     customer: str,
@@ -965,7 +1639,8 @@ def create_ticket(
     """Create a new ticket (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
-    ticket_data = zammad_client.create_ticket(
+    ticket_data = await server._call(
+        zammad_client.create_ticket,
         title=title,
         group=group,
         customer=customer,
@@ -978,7 +1653,7 @@ def create_ticket(
     return Ticket(**ticket_data)
 
 
-def add_article(
+async def add_article(
     ticket_id: int,
     body: str,
     article_type: str = "note",
@@ -988,7 +1663,8 @@ def add_article(
     """Add an article to a ticket (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
-    article_data = zammad_client.add_article(
+    article_data = await server._call(
+        zammad_client.add_article,
         ticket_id=ticket_id,
         body=body,
         article_type=article_type,
@@ -998,49 +1674,49 @@ def add_article(
     return Article(**article_data)
 
 
-def get_article_attachments(ticket_id: int, article_id: int) -> list[Attachment]:
+async def get_article_attachments(ticket_id: int, article_id: int) -> list[Attachment]:
     """Get list of attachments for a ticket article (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
-    attachments_data = zammad_client.get_article_attachments(ticket_id, article_id)
+    attachments_data = await server._call(zammad_client.get_article_attachments, ticket_id, article_id)
     return [Attachment(**attachment) for attachment in attachments_data]
 
 
-def download_attachment(ticket_id: int, article_id: int, attachment_id: int) -> str:
+async def download_attachment(ticket_id: int, article_id: int, attachment_id: int) -> str:
     """Download an attachment from a ticket article (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
     try:
-        attachment_data = zammad_client.download_attachment(ticket_id, article_id, attachment_id)
+        attachment_data = await server._call(zammad_client.download_attachment, ticket_id, article_id, attachment_id)
         # Convert bytes to base64 string for transmission
         return base64.b64encode(attachment_data).decode("utf-8")
     except Exception as e:
         return f"Error downloading attachment: {e!s}"
 
 
-def get_user(user_id: int) -> User:
+async def get_user(user_id: int) -> User:
     """Get a user by ID (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
-    user_data = zammad_client.get_user(user_id)
+    user_data = await server._call(zammad_client.get_user, user_id)
     return User(**user_data)
 
 
-def add_ticket_tag(ticket_id: int, tag: str) -> dict[str, Any]:
+async def add_ticket_tag(ticket_id: int, tag: str) -> dict[str, Any]:
     """Add a tag to a ticket (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
-    return zammad_client.add_ticket_tag(ticket_id, tag)
+    return await server._call(zammad_client.add_ticket_tag, ticket_id, tag)
 
 
-def remove_ticket_tag(ticket_id: int, tag: str) -> dict[str, Any]:
+async def remove_ticket_tag(ticket_id: int, tag: str) -> dict[str, Any]:
     """Remove a tag from a ticket (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
-    return zammad_client.remove_ticket_tag(ticket_id, tag)
+    return await server._call(zammad_client.remove_ticket_tag, ticket_id, tag)
 
 
-def update_ticket(
+async def update_ticket(
     ticket_id: int,
     title: str | None = None,
     state: str | None = None,
@@ -1051,7 +1727,8 @@ def update_ticket(
     """Update a ticket (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
-    ticket_data = zammad_client.update_ticket(
+    ticket_data = await server._call(
+        zammad_client.update_ticket,
         ticket_id,
         title=title,
         state=state,
@@ -1062,15 +1739,15 @@ def update_ticket(
     return Ticket(**ticket_data)
 
 
-def get_organization(org_id: int) -> Organization:
+async def get_organization(org_id: int) -> Organization:
     """Get organization by ID (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
-    org_data = zammad_client.get_organization(org_id)
+    org_data = await server._call(zammad_client.get_organization, org_id)
     return Organization(**org_data)
 
 
-def search_organizations(
+async def search_organizations(
     query: str,
     page: int = 1,
     per_page: int = 25,
@@ -1078,43 +1755,49 @@ def search_organizations(
     """Search organizations (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
-    results = zammad_client.search_organizations(query=query, page=page, per_page=per_page)
+    results = await server._call(zammad_client.search_organizations, query=query, page=page, per_page=per_page)
     return [Organization(**org) for org in results]
 
 
-def list_groups() -> list[Group]:
+async def list_groups() -> list[Group]:
     """List all groups (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
-    groups = zammad_client.get_groups()
+    groups = server.reference.peek("groups")
+    if groups is None:
+        groups = await server._call(zammad_client.get_groups)
     return [Group(**g) for g in groups]
 
 
-def list_ticket_states() -> list[TicketState]:
+async def list_ticket_states() -> list[TicketState]:
     """List all ticket states (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
-    states = zammad_client.get_ticket_states()
+    states = server.reference.peek("states")
+    if states is None:
+        states = await server._call(zammad_client.get_ticket_states)
     return [TicketState(**s) for s in states]
 
 
-def list_ticket_priorities() -> list[TicketPriority]:
+async def list_ticket_priorities() -> list[TicketPriority]:
     """List all ticket priorities (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
-    priorities = zammad_client.get_ticket_priorities()
+    priorities = server.reference.peek("priorities")
+    if priorities is None:
+        priorities = await server._call(zammad_client.get_ticket_priorities)
     return [TicketPriority(**p) for p in priorities]
 
 
-def get_current_user() -> User:
+async def get_current_user() -> User:
     """Get current user (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
-    user_data = zammad_client.get_current_user()
+    user_data = await server._call(zammad_client.get_current_user)
     return User(**user_data)
 
 
-def search_users(
+async def search_users(
     query: str,
     page: int = 1,
     per_page: int = 25,
@@ -1122,11 +1805,11 @@ def search_users(
     """Search users (legacy wrapper for test compatibility)."""
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
-    results = zammad_client.search_users(query=query, page=page, per_page=per_page)
+    results = await server._call(zammad_client.search_users, query=query, page=page, per_page=per_page)
     return [User(**user) for user in results]
 
 
-def get_ticket_stats(
+async def get_ticket_stats(
     group: str | None = None,
     start_date: str | None = None,
     end_date: str | None = None,
@@ -1135,11 +1818,11 @@ def get_ticket_stats(
     if zammad_client is None:
         raise RuntimeError("Zammad client not initialized")
 
-    # This implementation matches the tool implementation
-    if start_date or end_date:
-        logger.warning("Date filtering not yet implemented - ignoring date parameters")
-
-    all_tickets = zammad_client.search_tickets(group=group, per_page=100)
+    date_range = created_at_range(start_date, end_date)
+    if date_range:
+        all_tickets = await server._call(zammad_client.search_tickets, query=date_range, group=group, per_page=100)
+    else:
+        all_tickets = await server._call(zammad_client.search_tickets, group=group, per_page=100)
 
     def get_state_name(ticket: dict[str, Any]) -> str:
         state = ticket.get("state")
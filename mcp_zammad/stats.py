@@ -0,0 +1,392 @@
+"""Ticket statistics from count-only searches, with a scanning fallback."""
+
+import asyncio
+import itertools
+import math
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from .models import DurationSummary, TicketStats
+
+# Fields whose presence marks a ticket as escalated
+ESCALATION_FIELDS = ("first_response_escalation_at", "close_escalation_at", "update_escalation_at")
+
+# Used when the instance's ticket states are not known yet
+DEFAULT_STATE_NAMES = ("new", "open", "closed", "pending reminder", "pending close")
+
+# Shortest created_at window a date range is split into for parallel scans
+MIN_DATE_WINDOW = timedelta(days=1)
+
+# Relative error of quantile estimates, and the bucket limit that bounds sketch memory
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BUCKETS = 2048
+
+Counter = Callable[[str | None], Awaitable[int | None]]
+
+
+def ticket_state_name(ticket: dict[str, Any]) -> str:
+    """Return a ticket's state name for both expanded (string) and object state formats."""
+    state = ticket.get("state")
+    if isinstance(state, str):
+        return state
+    if isinstance(state, dict):
+        return str(state.get("name", "") or "")
+    return ""
+
+
+def combine_queries(*parts: str | None) -> str | None:
+    """AND together the non-empty query parts (None if there are none)."""
+    return " AND ".join(part for part in parts if part) or None
+
+
+def _parse_bound(value: str, end: bool = False) -> datetime:
+    """Parse an ISO date or datetime as UTC; a date-only end bound covers that whole day."""
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError as e:
+        raise ValueError(f"Invalid date {value!r}, expected ISO format (YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS)") from e
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    if end and len(value.strip()) == len("YYYY-MM-DD"):
+        parsed += timedelta(days=1)
+    return parsed.astimezone(timezone.utc)
+
+
+def _format_bound(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def created_at_bounds(start_date: str | None, end_date: str | None) -> tuple[datetime | None, datetime | None]:
+    """Parse a date range into an inclusive start and exclusive end in UTC (None for open ends).
+
+    A date-only end includes the whole day, so ``2024-01-01`` to ``2024-01-31``
+    covers January.
+    """
+    lower = _parse_bound(start_date) if start_date else None
+    upper = _parse_bound(end_date, end=True) if end_date else None
+    return lower, upper
+
+
+def created_at_range(start_date: str | None, end_date: str | None) -> str | None:
+    """Build a ``created_at`` range clause for a search query (None without dates)."""
+    if not start_date and not end_date:
+        return None
+    lower, upper = created_at_bounds(start_date, end_date)
+    start = _format_bound(lower) if lower else "*"
+    if upper is None:
+        return f"created_at:[{start} TO *]"
+    return f"created_at:[{start} TO {_format_bound(upper)}}}"
+
+
+def split_created_at_range(start_date: str | None, end_date: str | None, parts: int) -> list[str | None]:
+    """Split a date range into up to ``parts`` adjacent ``created_at`` clauses.
+
+    Windows are at least :data:`MIN_DATE_WINDOW` long and together match exactly
+    the tickets :func:`created_at_range` matches. Open-ended ranges cannot be
+    split and yield a single clause.
+    """
+    lower, upper = created_at_bounds(start_date, end_date)
+    if lower is None or upper is None:
+        return [created_at_range(start_date, end_date)]
+    if upper <= lower:
+        raise ValueError("end_date must not be before start_date")
+    parts = max(1, min(parts, int((upper - lower) / MIN_DATE_WINDOW)))
+    step = (upper - lower) / parts
+    bounds = [_format_bound(lower + step * index) for index in range(parts)] + [_format_bound(upper)]
+    return [f"created_at:[{start} TO {end}}}" for start, end in itertools.pairwise(bounds)]
+
+
+def _any_of(field: str, values: Iterable[str]) -> str:
+    quoted = " OR ".join(f'"{value}"' for value in values)
+    return f"{field}:({quoted})"
+
+
+def bucket_queries(state_names: Iterable[str]) -> dict[str, str | None]:
+    """Build one search query per statistic.
+
+    The buckets mirror :class:`TicketStatsAccumulator`: new and open tickets count
+    as open, every state with "pending" in its name counts as pending, and a
+    ticket is escalated if any escalation timestamp is set. ``None`` matches all
+    tickets.
+    """
+    pending = sorted({name for name in state_names if "pending" in name}) or ["pending reminder", "pending close"]
+    escalation = " OR ".join(f"_exists_:{field}" for field in ESCALATION_FIELDS)
+    return {
+        "total": None,
+        "open": _any_of("state.name", ["new", "open"]),
+        "closed": _any_of("state.name", ["closed"]),
+        "pending": _any_of("state.name", pending),
+        "escalated": f"({escalation})",
+    }
+
+
+async def count_ticket_stats(count: Counter, state_names: Iterable[str] = DEFAULT_STATE_NAMES) -> TicketStats | None:
+    """Compute ticket statistics with one concurrent count query per bucket.
+
+    Args:
+        count: Coroutine function returning the number of tickets matching a
+            query, or None if the server cannot report totals
+        state_names: Ticket state names known on the instance
+
+    Returns:
+        The statistics, or None if any count was unavailable
+    """
+    queries = bucket_queries(state_names)
+    results = await asyncio.gather(*(count(query) for query in queries.values()))
+    counts: dict[str, int] = {}
+    for bucket, value in zip(queries, results, strict=True):
+        if not isinstance(value, int) or isinstance(value, bool):
+            return None
+        counts[bucket] = value
+    return TicketStats(
+        total_count=counts["total"],
+        open_count=counts["open"],
+        closed_count=counts["closed"],
+        pending_count=counts["pending"],
+        escalated_count=counts["escalated"],
+        avg_first_response_time=None,
+        avg_resolution_time=None,
+        first_response_time=None,
+        resolution_time=None,
+    )
+
+
+class RunningStats:
+    """Count, mean and variance in constant memory (Welford's algorithm).
+
+    Two instances built from disjoint data can be combined with :meth:`merge`
+    (Chan et al.'s parallel update), giving the same result as a single pass.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty statistics."""
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        """Add one observation."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def merge(self, other: "RunningStats") -> None:
+        """Fold the observations of ``other`` into this instance."""
+        if other.count == 0:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 for fewer than two observations)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch:
+    """Mergeable quantile estimates for non-negative values in bounded memory.
+
+    Values are counted in logarithmic buckets (as in DDSketch), so every estimate
+    is within ``relative_accuracy`` of a true quantile. Memory is at most
+    ``max_buckets`` counters regardless of how many values are added; past that,
+    the lowest buckets are folded together, trading accuracy at the bottom of the
+    range, which p50/p90/p99 do not look at. Sketches with the same accuracy merge
+    by adding their bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, max_buckets: int = DEFAULT_MAX_BUCKETS):
+        """Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of estimates, between 0 and 1
+            max_buckets: Maximum number of buckets kept
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max(max_buckets, 1)
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Add one observation; negative values count as zero."""
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[key] = self._buckets.get(key, 0) + 1
+        if len(self._buckets) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Fold the observations of ``other`` into this sketch."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other._buckets.items():
+            self._buckets[key] = self._buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if len(self._buckets) > self.max_buckets:
+            self._collapse()
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the ``q`` quantile (0 <= q <= 1), or None if the sketch is empty."""
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if rank < seen:
+                # Midpoint of (gamma^(key-1), gamma^key] in relative terms
+                return 2 * self._gamma**key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._buckets) / (self._gamma + 1)
+
+    def _collapse(self) -> None:
+        # Fold the lowest buckets into the lowest one that is kept
+        keys = sorted(self._buckets)
+        target = keys[len(keys) - self.max_buckets]
+        for key in keys[: len(keys) - self.max_buckets]:
+            self._buckets[target] += self._buckets.pop(key)
+
+
+class DurationAccumulator:
+    """Mean, variance and quantiles of a duration, mergeable across pages."""
+
+    def __init__(self) -> None:
+        """Initialize an empty accumulator."""
+        self.running = RunningStats()
+        self.sketch = QuantileSketch()
+
+    def add(self, minutes: float) -> None:
+        """Add one duration in minutes."""
+        self.running.add(minutes)
+        self.sketch.add(minutes)
+
+    def merge(self, other: "DurationAccumulator") -> None:
+        """Fold the durations of ``other`` into this accumulator."""
+        self.running.merge(other.running)
+        self.sketch.merge(other.sketch)
+
+    def summary(self) -> DurationSummary | None:
+        """Summarize the durations, or None if there were none."""
+        if self.running.count == 0:
+            return None
+        return DurationSummary(
+            count=self.running.count,
+            mean=self.running.mean,
+            stddev=self.running.stddev,
+            p50=self.sketch.quantile(0.5) or 0.0,
+            p90=self.sketch.quantile(0.9) or 0.0,
+            p99=self.sketch.quantile(0.99) or 0.0,
+        )
+
+
+def _parse_time(value: Any) -> datetime | None:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return None
+
+
+def _minutes(ticket: dict[str, Any], field: str, reached_at: str) -> float | None:
+    """Read Zammad's ``*_in_min`` value, or derive it from ``created_at`` and the timestamp."""
+    value = ticket.get(field)
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return float(value)
+    start = _parse_time(ticket.get("created_at"))
+    end = _parse_time(ticket.get(reached_at))
+    if start is None or end is None:
+        return None
+    return (end - start).total_seconds() / 60
+
+
+class TicketStatsAccumulator:
+    """Builds ticket statistics one ticket at a time, for scanning search results.
+
+    Everything is kept in constant memory, and accumulators built from different
+    pages can be combined with :meth:`merge`.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty counters."""
+        self.total_count = 0
+        self.open_count = 0
+        self.closed_count = 0
+        self.pending_count = 0
+        self.escalated_count = 0
+        self.first_response = DurationAccumulator()
+        self.resolution = DurationAccumulator()
+
+    def add(self, ticket: dict[str, Any]) -> None:
+        """Count one ticket."""
+        self.total_count += 1
+
+        state_name = ticket_state_name(ticket)
+        if state_name in ["new", "open"]:
+            self.open_count += 1
+        elif state_name == "closed":
+            self.closed_count += 1
+        elif "pending" in state_name:
+            self.pending_count += 1
+
+        if any(ticket.get(field) for field in ESCALATION_FIELDS):
+            self.escalated_count += 1
+
+        first_response = _minutes(ticket, "first_response_in_min", "first_response_at")
+        if first_response is not None:
+            self.first_response.add(first_response)
+        resolution = _minutes(ticket, "close_in_min", "close_at")
+        if resolution is not None:
+            self.resolution.add(resolution)
+
+    def add_page(self, tickets: Iterable[dict[str, Any]]) -> None:
+        """Count every ticket of a page."""
+        for ticket in tickets:
+            self.add(ticket)
+
+    def merge(self, other: "TicketStatsAccumulator") -> None:
+        """Fold the statistics of ``other`` into this accumulator."""
+        self.total_count += other.total_count
+        self.open_count += other.open_count
+        self.closed_count += other.closed_count
+        self.pending_count += other.pending_count
+        self.escalated_count += other.escalated_count
+        self.first_response.merge(other.first_response)
+        self.resolution.merge(other.resolution)
+
+    def result(self) -> TicketStats:
+        """Return the statistics gathered so far."""
+        first_response = self.first_response.summary()
+        resolution = self.resolution.summary()
+        return TicketStats(
+            total_count=self.total_count,
+            open_count=self.open_count,
+            closed_count=self.closed_count,
+            pending_count=self.pending_count,
+            escalated_count=self.escalated_count,
+            avg_first_response_time=first_response.mean if first_response else None,
+            avg_resolution_time=resolution.mean if resolution else None,
+            first_response_time=first_response,
+            resolution_time=resolution,
+        )
@@ -0,0 +1,123 @@
+"""Partial results and progress reported by tools while they run."""
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Receives (event, data) pairs; event is "partial" or "progress"
+StreamSink = Callable[[str, dict[str, Any]], None]
+
+_sink: ContextVar[StreamSink | None] = ContextVar("zammad_stream_sink", default=None)
+
+
+@contextmanager
+def stream_to(sink: StreamSink) -> Iterator[None]:
+    """Send partial results and progress reported in this context (and tasks created in it) to ``sink``.
+
+    Sinks nest: reports also reach the sinks of enclosing ``stream_to`` blocks.
+    """
+    outer = _sink.get()
+    token = _sink.set(sink if outer is None else _tee(sink, outer))
+    try:
+        yield
+    finally:
+        _sink.reset(token)
+
+
+def _tee(first: StreamSink, second: StreamSink) -> StreamSink:
+    def sink(event: str, data: dict[str, Any]) -> None:
+        first(event, data)
+        second(event, data)
+
+    return sink
+
+
+def streaming() -> bool:
+    """Whether anyone is listening for partial results in this context."""
+    return _sink.get() is not None
+
+
+def report_partial(items: list[Any], **progress: Any) -> None:
+    """Report items of the final result that are ready now, with progress counts.
+
+    A no-op unless the caller runs under :func:`stream_to`, so tools can report
+    unconditionally.
+    """
+    sink = _sink.get()
+    if sink is not None:
+        sink("partial", {"items": items, **progress})
+
+
+def report_progress(**progress: Any) -> None:
+    """Report progress counts, e.g. ``pages=3, tickets_scanned=300``."""
+    sink = _sink.get()
+    if sink is not None:
+        sink("progress", progress)
+
+
+# Count reported as the progress value, in order of preference
+_PROGRESS_KEYS = ("tickets_scanned", "tickets", "pages")
+
+
+class ProgressNotifier:
+    """Stream sink that turns reported counts into MCP ``notifications/progress``.
+
+    The progress value is the first of ``tickets_scanned``, ``tickets`` and
+    ``pages`` present in a report, the total is the latest ``estimated_total``
+    reported (if any), and the message lists every count. Notifications are sent
+    in report order by ``send(progress, total, message)``, e.g. FastMCP's
+    ``Context.report_progress``; await :meth:`flush` before the tool returns so
+    none arrive after the result.
+    """
+
+    def __init__(self, send: Callable[[float, float | None, str | None], Awaitable[None]]):
+        """Initialize with the coroutine function that sends one notification."""
+        self._send = send
+        self._loop = asyncio.get_running_loop()
+        self._progress: float | None = None
+        self._total: float | None = None
+        self._last: asyncio.Future[None] | None = None
+
+    def __call__(self, _event: str, data: dict[str, Any]) -> None:
+        if "estimated_total" in data:
+            self._total = float(data["estimated_total"])
+        progress = next((float(data[key]) for key in _PROGRESS_KEYS if isinstance(data.get(key), int | float)), None)
+        if progress is not None:
+            self._progress = progress
+        elif "estimated_total" not in data or self._progress is None:
+            return
+        counts = [
+            f"{value} {key.replace('_', ' ')}"
+            for key, value in data.items()
+            if key != "estimated_total" and isinstance(value, int) and not isinstance(value, bool)
+        ]
+        args = (self._progress, self._total, ", ".join(counts) or None)
+        # Tools may report from worker threads
+        self._loop.call_soon_threadsafe(self._chain, args)
+
+    def _chain(self, args: tuple[float, float | None, str | None]) -> None:
+        self._last = asyncio.ensure_future(self._notify(self._last, *args))
+
+    async def _notify(
+        self, previous: "asyncio.Future[None] | None", progress: float, total: float | None, message: str | None
+    ) -> None:
+        if previous is not None:
+            await previous
+        try:
+            await self._send(progress, total, message)
+        except Exception:
+            logger.debug("Sending a progress notification failed", exc_info=True)
+
+    async def flush(self) -> None:
+        """Wait until every notification reported so far has been sent."""
+        # Let reports scheduled from other threads reach _chain first
+        await asyncio.sleep(0)
+        if self._last is not None:
+            with contextlib.suppress(Exception):
+                await self._last
@@ -0,0 +1,310 @@
+"""MCP resource subscriptions fed by one shared change feed."""
+
+import asyncio
+import contextlib
+import logging
+import os
+import re
+import threading
+import time
+import weakref
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from typing import Any, Protocol
+from urllib.parse import quote, unquote
+
+from .mirror import UpdatedFetcher
+
+logger = logging.getLogger(__name__)
+
+# Seconds between polls of the shared change feed; 0 relies on webhooks and other traffic alone
+DEFAULT_POLL_INTERVAL = 10.0
+# Records requested per poll page
+POLL_PAGE_SIZE = 100
+# Changes up to this many seconds before the first subscription count as new (clock skew allowance)
+CLOCK_SKEW = 60.0
+
+# Resource URI kinds and the record kind that drives them
+_URI = re.compile(r"^zammad://(ticket|user|organization|queue)/(.+)$")
+_RECORD_KINDS = {"ticket": "tickets", "queue": "tickets", "user": "users", "organization": "organizations"}
+
+
+class Session(Protocol):
+    """The part of an MCP server session used to deliver notifications."""
+
+    async def send_resource_updated(self, uri: Any) -> None: ...
+
+
+def _timestamp(value: Any) -> float | None:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def resource_key(uri: str) -> str:
+    """Normalize a resource URI so ``zammad://queue/2nd%20Level`` and ``zammad://queue/2nd Level`` match."""
+    return unquote(str(uri))
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid value for {name}: {value!r}")
+        return default
+
+
+class ResourceSubscriptions:
+    """Tracks which sessions subscribe to which resources and notifies them of changes.
+
+    Change detection is shared by all subscriptions: every record payload the
+    server sees (client ticket observers, webhook deliveries and the feed's own
+    poll) is compared with the last ``updated_at`` seen for that record, and a
+    changed ticket marks its ``zammad://ticket/{id}`` resource and the queues of
+    its current and previous group. Versions are only kept for records a
+    subscription can be affected by (subscribed records and tickets in
+    subscribed queues), so memory follows the subscriptions, not the traffic.
+    While anything is subscribed, one loop
+    polls each needed record kind for updates since its watermark, so upstream
+    traffic does not grow with the number of subscriptions. Notifications are
+    coalesced: a burst of changes to one resource sends one
+    ``notifications/resources/updated`` per subscribed session.
+
+    Configuration through the environment (see :meth:`from_env`):
+
+    - ZAMMAD_SUBSCRIPTION_POLL_INTERVAL: Seconds between change feed polls (default: 10, 0 disables)
+    """
+
+    def __init__(
+        self,
+        fetch_updated: UpdatedFetcher,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        page_size: int = POLL_PAGE_SIZE,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize with no subscriptions.
+
+        Args:
+            fetch_updated: Coroutine function ``(kind, since, page, per_page)`` returning
+                records of ``kind`` updated at or after ``since``, oldest update first
+            poll_interval: Seconds between polls of the change feed (0 disables polling)
+            page_size: Records requested per poll page
+            clock: Wall-clock time source
+        """
+        self.fetch_updated = fetch_updated
+        self.poll_interval = poll_interval
+        self.page_size = page_size
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Resource key -> subscribed sessions and the URI each one used
+        self._subscribers: dict[str, weakref.WeakKeyDictionary[Any, str]] = {}
+        # For records affecting a subscription: (kind, record id) -> last updated_at
+        # timestamp seen, and ticket id -> last group seen
+        self._versions: dict[tuple[str, int], float] = {}
+        self._ticket_groups: dict[int, str] = {}
+        self._watermarks: dict[str, str] = {}
+        self._since: float | None = None
+        self._pending: set[str] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._dispatching: asyncio.Task[None] | None = None
+        self._poll_task: asyncio.Task[None] | None = None
+
+    @classmethod
+    def from_env(cls, fetch_updated: UpdatedFetcher) -> "ResourceSubscriptions":
+        """Create subscriptions configured from ZAMMAD_SUBSCRIPTION_POLL_INTERVAL."""
+        return cls(fetch_updated, poll_interval=_env_float("ZAMMAD_SUBSCRIPTION_POLL_INTERVAL", DEFAULT_POLL_INTERVAL))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(sessions) for sessions in self._subscribers.values())
+
+    async def subscribe(self, uri: str, session: Session) -> None:
+        """Subscribe ``session`` to ``uri`` and make sure the change feed is running."""
+        key = resource_key(uri)
+        if not _URI.match(key):
+            raise ValueError(f"Resource does not support subscriptions: {uri}")
+        with self._lock:
+            self._subscribers.setdefault(key, weakref.WeakKeyDictionary())[session] = str(uri)
+            if self._since is None:
+                self._since = self._clock() - CLOCK_SKEW
+        self._loop = asyncio.get_running_loop()
+        if self.poll_interval > 0 and (self._poll_task is None or self._poll_task.done()):
+            self._poll_task = asyncio.ensure_future(self._poll_loop())
+
+    async def unsubscribe(self, uri: str, session: Session) -> None:
+        """Remove the subscription of ``session`` to ``uri``."""
+        key = resource_key(uri)
+        with self._lock:
+            sessions = self._subscribers.get(key)
+            if sessions is not None:
+                sessions.pop(session, None)
+                if not sessions:
+                    del self._subscribers[key]
+                    self._forget(key)
+
+    def observe_tickets(self, tickets: Iterable[dict[str, Any]]) -> None:
+        """Client ticket observer: detect changed tickets."""
+        self.observe("tickets", tickets)
+
+    def observe(self, kind: str, records: Iterable[dict[str, Any]]) -> None:
+        """Compare record payloads with the versions seen before and notify subscribers of changes."""
+        changed: set[str] = set()
+        with self._lock:
+            if not self._subscribers or self._since is None:
+                return
+            for record in records:
+                if not record.get("id"):
+                    continue
+                record_id = int(record["id"])
+                updated = _timestamp(record.get("updated_at"))
+                if updated is None:
+                    continue
+                old_group = self._ticket_groups.get(record_id) if kind == "tickets" else None
+                group = record.get("group") if kind == "tickets" else None
+                affected = self._resources(kind, record_id, group, old_group) & self._subscribers.keys()
+                if not affected:
+                    # Nobody can be notified about this record; don't keep its version either
+                    self._versions.pop((kind, record_id), None)
+                    if kind == "tickets":
+                        self._ticket_groups.pop(record_id, None)
+                    continue
+                previous = self._versions.get((kind, record_id))
+                if previous is not None and updated <= previous:
+                    # Seen before, or an older payload arriving late
+                    continue
+                self._versions[(kind, record_id)] = updated
+                if isinstance(group, str):
+                    self._ticket_groups[record_id] = group
+                if previous is None and updated < self._since:
+                    # First sight of a record that last changed before anyone subscribed
+                    continue
+                changed |= affected
+        if changed:
+            self._notify(changed)
+
+    @staticmethod
+    def _resources(kind: str, record_id: int, group: Any, old_group: Any) -> set[str]:
+        """Resource keys a change to a record touches."""
+        if kind == "tickets":
+            # A ticket moving between groups changes both queues
+            queues = {f"zammad://queue/{name}" for name in (group, old_group) if isinstance(name, str)}
+            return {f"zammad://ticket/{record_id}", *queues}
+        if kind == "users":
+            return {f"zammad://user/{record_id}"}
+        if kind == "organizations":
+            return {f"zammad://organization/{record_id}"}
+        return set()
+
+    def _forget(self, key: str) -> None:
+        """Drop the versions kept only for the now unsubscribed resource ``key``; caller holds the lock."""
+        match = _URI.match(key)
+        if match is None:
+            return
+        uri_kind, value = match.groups()
+        kind = _RECORD_KINDS[uri_kind]
+        if uri_kind == "queue":
+            record_ids = [ticket_id for ticket_id, group in self._ticket_groups.items() if group == value]
+        elif value.isdigit():
+            record_ids = [int(value)]
+        else:
+            return
+        for record_id in record_ids:
+            group = self._ticket_groups.get(record_id) if kind == "tickets" else None
+            if self._resources(kind, record_id, group, None) & self._subscribers.keys():
+                continue
+            self._versions.pop((kind, record_id), None)
+            if kind == "tickets":
+                self._ticket_groups.pop(record_id, None)
+
+    async def stop(self) -> None:
+        """Stop polling and drop pending notifications."""
+        tasks = [task for task in (self._poll_task, self._dispatching) if task is not None]
+        self._poll_task = self._dispatching = None
+        self._pending.clear()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(BaseException):
+                await task
+
+    def _notify(self, keys: set[str]) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._schedule(keys)
+        else:
+            # Sync client observers run on worker threads
+            loop.call_soon_threadsafe(self._schedule, keys)
+
+    def _schedule(self, keys: set[str]) -> None:
+        # Runs on the event loop
+        self._pending |= keys
+        if self._dispatching is None or self._dispatching.done():
+            self._dispatching = asyncio.ensure_future(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        while self._pending:
+            keys, self._pending = self._pending, set()
+            for key in keys:
+                with self._lock:
+                    targets = list(self._subscribers.get(key, {}).items())
+                for session, uri in targets:
+                    try:
+                        await session.send_resource_updated(quote(uri, safe=":/%"))
+                    except Exception:
+                        logger.debug(f"Dropping subscription to {uri} of a closed session", exc_info=True)
+                        await self.unsubscribe(uri, session)
+
+    def _kinds(self) -> list[str]:
+        with self._lock:
+            kinds = {_RECORD_KINDS[match.group(1)] for key in self._subscribers if (match := _URI.match(key))}
+        return sorted(kinds)
+
+    async def _poll_loop(self) -> None:
+        while True:
+            kinds = self._kinds()
+            if not kinds:
+                # Nothing subscribed any more; the next subscription restarts the loop
+                self._poll_task = None
+                return
+            for kind in kinds:
+                try:
+                    await self._poll(kind)
+                except Exception:
+                    logger.warning(f"Polling {kind} for subscribed changes failed", exc_info=True)
+            await asyncio.sleep(self.poll_interval)
+
+    async def _poll(self, kind: str) -> None:
+        watermark = self._watermarks.get(kind)
+        if watermark is None:
+            since = self._since if self._since is not None else self._clock()
+            watermark = datetime.fromtimestamp(since, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        page = 1
+        while True:
+            records = await self.fetch_updated(kind, watermark, page, self.page_size)
+            if not records:
+                break
+            self.observe(kind, records)
+            newest = max((str(record["updated_at"]) for record in records if record.get("updated_at")), default=None)
+            if newest is not None and newest > watermark:
+                watermark = newest
+                page = 1
+            else:
+                page += 1
+            if len(records) < self.page_size:
+                break
+        self._watermarks[kind] = watermark
@@ -0,0 +1,176 @@
+"""Ticket number to ID index used to skip the search round trip of number lookups."""
+
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class TicketNumberIndex:
+    """Bounded LRU map of ticket numbers to ticket IDs, optionally backed by SQLite.
+
+    Ticket numbers never change once assigned, so entries do not expire. The
+    in-memory map holds at most ``max_entries`` numbers; when ``path`` is set,
+    every mapping is also written to a local SQLite file so it survives restarts
+    and numbers evicted from memory can still be resolved without a search.
+    Changes are written by a background thread, so recording a mapping never
+    waits for a commit; :meth:`flush` waits for the writer to catch up.
+
+    Configuration through the environment (see :meth:`from_env`):
+
+    - ZAMMAD_TICKET_INDEX_PATH: SQLite file to persist the index to
+    - ZAMMAD_TICKET_INDEX_SIZE: Maximum number of entries kept in memory
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, path: str | None = None):
+        """Initialize the index, opening (and creating) the SQLite file if a path is given."""
+        self.max_entries = max(max_entries, 1)
+        self.path = path
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        # The async client calls into the index on the event loop, so the lock
+        # is never held while writing SQLite: a writer thread persists changes
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        # Changes not yet written (number -> ticket ID, or None for a deletion),
+        # and the batch the writer thread is committing
+        self._pending: dict[str, int | None] = {}
+        self._in_flight: dict[str, int | None] = {}
+        self._closing = False
+        self._db: sqlite3.Connection | None = None
+        self._writer: threading.Thread | None = None
+        if path:
+            writer_db = sqlite3.connect(path, check_same_thread=False)
+            writer_db.execute("PRAGMA journal_mode=WAL")
+            writer_db.execute(
+                "CREATE TABLE IF NOT EXISTS ticket_numbers (number TEXT PRIMARY KEY, ticket_id INTEGER NOT NULL)"
+            )
+            writer_db.commit()
+            # Lookups read through their own connection, which WAL never blocks on the writer
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._writer = threading.Thread(
+                target=self._write_pending, args=(writer_db,), name="ticket-index-writer", daemon=True
+            )
+            self._writer.start()
+
+    @classmethod
+    def from_env(cls) -> "TicketNumberIndex":
+        """Create an index configured from ZAMMAD_TICKET_INDEX_PATH and ZAMMAD_TICKET_INDEX_SIZE."""
+        max_entries = DEFAULT_MAX_ENTRIES
+        size = os.getenv("ZAMMAD_TICKET_INDEX_SIZE")
+        if size:
+            try:
+                max_entries = int(size)
+            except ValueError:
+                logger.warning(f"Ignoring invalid value for ZAMMAD_TICKET_INDEX_SIZE: {size!r}")
+        return cls(max_entries=max_entries, path=os.getenv("ZAMMAD_TICKET_INDEX_PATH") or None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, number: str) -> int | None:
+        """Return the ticket ID for ``number``, or None if it has not been seen."""
+        number = str(number)
+        with self._lock:
+            ticket_id = self._entries.get(number)
+            if ticket_id is not None:
+                self._entries.move_to_end(number)
+                return ticket_id
+            if self._db is None:
+                return None
+            if number in self._pending or number in self._in_flight:
+                ticket_id = self._pending[number] if number in self._pending else self._in_flight[number]
+            else:
+                row = self._db.execute("SELECT ticket_id FROM ticket_numbers WHERE number = ?", (number,)).fetchone()
+                ticket_id = None if row is None else int(row[0])
+            if ticket_id is not None:
+                self._remember(number, ticket_id)
+            return ticket_id
+
+    def put(self, number: str, ticket_id: int) -> None:
+        """Record that ticket ``number`` has ID ``ticket_id``."""
+        self.update([(str(number), int(ticket_id))])
+
+    def update(self, pairs: Iterable[tuple[str, int]]) -> None:
+        """Record several number/ID pairs at once."""
+        with self._lock:
+            for number, ticket_id in pairs:
+                if self._db is not None and self._entries.get(number) != ticket_id:
+                    self._pending[number] = ticket_id
+                self._remember(number, ticket_id)
+            if self._pending:
+                self._changed.notify()
+
+    def observe(self, tickets: Iterable[dict[str, Any]]) -> None:
+        """Index every ticket payload that carries both a number and an ID."""
+        self.update(
+            (str(ticket["number"]), int(ticket["id"]))
+            for ticket in tickets
+            if isinstance(ticket, dict) and ticket.get("number") and ticket.get("id")
+        )
+
+    def discard(self, number: str) -> None:
+        """Forget ``number``, e.g. after its ticket turned out to be deleted."""
+        number = str(number)
+        with self._lock:
+            self._entries.pop(number, None)
+            if self._db is not None:
+                self._pending[number] = None
+                self._changed.notify()
+
+    def flush(self) -> None:
+        """Block until every change made so far has been written to the SQLite file."""
+        with self._lock:
+            self._changed.wait_for(lambda: not (self._pending or self._in_flight) or self._writer is None)
+
+    def close(self) -> None:
+        """Write pending changes and close the SQLite file, if any."""
+        with self._lock:
+            self._closing = True
+            self._changed.notify_all()
+        if self._writer is not None:
+            self._writer.join()
+        with self._lock:
+            self._writer = None
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _write_pending(self, db: sqlite3.Connection) -> None:
+        """Writer thread: persist pending changes in batches until the index is closed."""
+        while True:
+            with self._lock:
+                self._in_flight = {}
+                self._changed.notify_all()
+                self._changed.wait_for(lambda: self._pending or self._closing)
+                if not self._pending:
+                    break
+                changes = self._in_flight = self._pending
+                self._pending = {}
+            try:
+                db.executemany(
+                    "INSERT OR REPLACE INTO ticket_numbers VALUES (?, ?)",
+                    [(number, ticket_id) for number, ticket_id in changes.items() if ticket_id is not None],
+                )
+                db.executemany(
+                    "DELETE FROM ticket_numbers WHERE number = ?",
+                    [(number,) for number, ticket_id in changes.items() if ticket_id is None],
+                )
+                db.commit()
+            except sqlite3.Error:
+                logger.exception("Failed to persist the ticket number index")
+        db.close()
+
+    def _remember(self, number: str, ticket_id: int) -> None:
+        # Caller holds the lock
+        self._entries[number] = ticket_id
+        self._entries.move_to_end(number)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,151 @@
+"""Per-call timing breakdown for ``Server-Timing`` headers and the slow-call log.
+
+HTTP mode opens a :class:`CallTiming` per request and per MCP call with
+:func:`time_call`; Zammad requests, model validation and response
+serialization add their durations to it through :func:`timed`. Outside such
+a call :func:`timed` only looks up a context variable, so stdio mode pays
+next to nothing.
+
+Configuration through the environment:
+
+- ZAMMAD_SLOW_CALL_MS: Log MCP calls slower than this many milliseconds with
+  their timing and arguments (default: 1000; 0 disables the log)
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+logger = logging.getLogger(__name__)
+# Slow calls get their own logger so they can be routed to a separate handler
+slow_call_logger = logging.getLogger("mcp_zammad.slow_calls")
+
+# Phases reported in Server-Timing, in header order
+PHASES = ("upstream", "validate", "serialize")
+DEFAULT_SLOW_CALL_MS = 1000.0
+REDACTED = "[REDACTED]"
+
+# What the spans of each phase are, for the header's descriptions
+_UNITS = {"upstream": "requests", "validate": "models", "serialize": "results"}
+_SECRET_KEY = re.compile(r"passw(or)?d|secret|token|api.?key|authorization|cookie|credential|signature", re.IGNORECASE)
+
+_current: ContextVar["CallTiming | None"] = ContextVar("zammad_call_timing", default=None)
+
+
+class CallTiming:
+    """Time spent per phase during one request or MCP call.
+
+    Phases running concurrently (e.g. prefetched pages) add up, so a phase can
+    exceed the wall-clock time of the call. Durations also count towards the
+    enclosing timing, if any, so a request's totals cover all of its calls.
+    """
+
+    def __init__(self, parent: "CallTiming | None" = None):
+        """Start timing now, reporting to ``parent`` as well."""
+        self.parent = parent
+        self.start = time.perf_counter()
+        self._lock = threading.Lock()
+        # Phase -> [seconds, count]
+        self._phases: dict[str, list[float]] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Add one timed span of ``phase``; safe to call from worker threads."""
+        with self._lock:
+            entry = self._phases.setdefault(phase, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+        if self.parent is not None:
+            self.parent.add(phase, seconds)
+
+    def elapsed(self) -> float:
+        """Seconds since the timing started."""
+        return time.perf_counter() - self.start
+
+    def phases(self) -> dict[str, dict[str, float]]:
+        """Milliseconds and span count per phase, e.g. ``{"upstream": {"ms": 12.5, "count": 2}}``."""
+        with self._lock:
+            return {
+                phase: {"ms": round(seconds * 1000, 3), "count": int(count)}
+                for phase, (seconds, count) in self._phases.items()
+            }
+
+    def header(self) -> str:
+        """Render a ``Server-Timing`` header value with every phase and the total so far."""
+        phases = self.phases()
+        metrics = []
+        for phase in PHASES:
+            entry = phases.get(phase, {"ms": 0.0, "count": 0})
+            metrics.append(f'{phase};dur={entry["ms"]:.1f};desc="{int(entry["count"])} {_UNITS[phase]}"')
+        metrics.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+@contextmanager
+def time_call() -> Iterator[CallTiming]:
+    """Collect the phase durations of the enclosed code (and tasks and workers started in it)."""
+    timing = CallTiming(_current.get())
+    token = _current.set(timing)
+    try:
+        yield timing
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the duration of the enclosed code to ``phase`` of the current call, if one is being timed."""
+    timing = _current.get()
+    if timing is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(phase, time.perf_counter() - start)
+
+
+def redact(value: Any) -> Any:
+    """Copy call arguments with the values of secret-looking keys (tokens, passwords, ...) replaced."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if isinstance(key, str) and _SECRET_KEY.search(key) else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list | tuple):
+        return [redact(item) for item in value]
+    return value
+
+
+def slow_call_ms_from_env() -> float:
+    """Read the slow-call threshold in milliseconds from ZAMMAD_SLOW_CALL_MS."""
+    value = os.getenv("ZAMMAD_SLOW_CALL_MS")
+    if not value:
+        return DEFAULT_SLOW_CALL_MS
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        logger.warning(f"Ignoring invalid value for ZAMMAD_SLOW_CALL_MS: {value!r}")
+        return DEFAULT_SLOW_CALL_MS
+
+
+def log_if_slow(kind: str, name: str, arguments: Any, timing: CallTiming, threshold_ms: float) -> None:
+    """Log a call that took longer than ``threshold_ms`` (0 disables) with its timing and redacted arguments."""
+    elapsed_ms = timing.elapsed() * 1000
+    if not threshold_ms or elapsed_ms < threshold_ms:
+        return
+    detail = {
+        "kind": kind,
+        "name": name,
+        "duration_ms": round(elapsed_ms, 3),
+        "phases": timing.phases(),
+        "arguments": redact(arguments),
+    }
+    slow_call_logger.warning(f"Slow {kind} call {name} took {elapsed_ms:.0f} ms: {json.dumps(detail, default=str)}")
@@ -0,0 +1,139 @@
+"""Optional OpenTelemetry tracing of MCP calls, Zammad requests, validation and serialization.
+
+Spans are only recorded once :func:`configure_tracing` has installed an
+exporter, which needs the ``opentelemetry-sdk`` package (``pip install
+mcp-zammad[tracing]``). Until then every helper here returns a shared no-op
+context manager, so the instrumentation costs one attribute check per call.
+
+Configuration through the environment:
+
+- ZAMMAD_TRACE_EXPORTER: ``otlp`` (endpoint and headers from the standard
+  OTEL_EXPORTER_OTLP_* variables) or ``file``; unset disables tracing
+- ZAMMAD_TRACE_FILE: File the ``file`` exporter appends JSON spans to, one
+  per line (default: zammad-traces.jsonl)
+"""
+
+import contextlib
+import importlib
+import logging
+import os
+from collections.abc import Mapping
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACE_FILE = "zammad-traces.jsonl"
+
+_NO_SPAN: AbstractContextManager[Any] = contextlib.nullcontext()
+
+
+@dataclass
+class _Tracing:
+    """The installed tracer and the OpenTelemetry API the span helpers need; set by :func:`configure_tracing`."""
+
+    tracer: Any = None
+    span_kind: Any = None
+    extract: Any = None
+
+
+_state = _Tracing()
+
+
+def _import(*modules: str) -> list[Any] | None:
+    """Import optional OpenTelemetry modules on first use; None if any of them isn't installed."""
+    try:
+        return [importlib.import_module(module) for module in modules]
+    except ImportError:
+        return None
+
+
+def configure_tracing(exporter: str | None = None, path: str | None = None) -> bool:
+    """Install a tracer provider exporting to OTLP or a local file; return whether tracing is on.
+
+    Args:
+        exporter: ``otlp`` or ``file`` (default: ZAMMAD_TRACE_EXPORTER)
+        path: Output file of the ``file`` exporter (default: ZAMMAD_TRACE_FILE or zammad-traces.jsonl)
+    """
+    if _state.tracer is not None:
+        return True
+    exporter = (exporter or os.getenv("ZAMMAD_TRACE_EXPORTER") or "").strip().lower()
+    if exporter in {"", "none"}:
+        return False
+
+    sdk = _import(
+        "opentelemetry.trace",
+        "opentelemetry.propagate",
+        "opentelemetry.sdk.resources",
+        "opentelemetry.sdk.trace",
+        "opentelemetry.sdk.trace.export",
+    )
+    if sdk is None:
+        logger.error("opentelemetry-sdk not installed, tracing disabled. Install with: pip install mcp-zammad[tracing]")
+        return False
+    trace, propagate, resources, sdk_trace, export = sdk
+
+    span_exporter: Any
+    if exporter == "otlp":
+        otlp = _import("opentelemetry.exporter.otlp.proto.http.trace_exporter")
+        if otlp is None:
+            logger.error("opentelemetry-exporter-otlp not installed, tracing disabled")
+            return False
+        span_exporter = otlp[0].OTLPSpanExporter()
+    elif exporter == "file":
+        trace_file = path or os.getenv("ZAMMAD_TRACE_FILE") or DEFAULT_TRACE_FILE
+        # Line buffered, so spans survive a crash once the batch processor has exported them
+        output = open(trace_file, "a", buffering=1, encoding="utf-8")  # noqa: SIM115
+        span_exporter = export.ConsoleSpanExporter(out=output, formatter=lambda span: span.to_json(indent=None) + "\n")
+    else:
+        logger.warning(f"Ignoring unknown ZAMMAD_TRACE_EXPORTER: {exporter!r}")
+        return False
+
+    provider = sdk_trace.TracerProvider(resource=resources.Resource.create({"service.name": "mcp-zammad"}))
+    provider.add_span_processor(export.BatchSpanProcessor(span_exporter))
+    trace.set_tracer_provider(provider)
+    _state.span_kind = trace.SpanKind
+    _state.extract = propagate.extract
+    _state.tracer = provider.get_tracer("mcp_zammad")
+    logger.info(f"Tracing enabled with the {exporter} exporter")
+    return True
+
+
+def tracing_enabled() -> bool:
+    """Whether spans are being recorded."""
+    return _state.tracer is not None
+
+
+def span(name: str, attributes: Mapping[str, Any] | None = None, client: bool = False) -> AbstractContextManager[Any]:
+    """Start a span as a child of the current one; yields the span, or None while tracing is off.
+
+    ``client`` marks spans around outgoing requests. Exceptions leaving the
+    block are recorded on the span and set its status to error.
+    """
+    if _state.tracer is None:
+        return _NO_SPAN
+    started: AbstractContextManager[Any] = _state.tracer.start_as_current_span(
+        name,
+        attributes={key: value for key, value in (attributes or {}).items() if value is not None},
+        kind=_state.span_kind.CLIENT if client else _state.span_kind.INTERNAL,
+    )
+    return started
+
+
+def server_span(name: str, headers: Mapping[str, str]) -> AbstractContextManager[Any]:
+    """Start the span of an incoming HTTP request, continuing the trace of its ``traceparent`` header."""
+    if _state.tracer is None:
+        return _NO_SPAN
+    started: AbstractContextManager[Any] = _state.tracer.start_as_current_span(
+        name, context=_state.extract(headers), kind=_state.span_kind.SERVER
+    )
+    return started
+
+
+def set_attributes(current: Any, attributes: Mapping[str, Any]) -> None:
+    """Set attributes on a span yielded by :func:`span`; does nothing while tracing is off."""
+    if current is not None:
+        for key, value in attributes.items():
+            if value is not None:
+                current.set_attribute(key, value)
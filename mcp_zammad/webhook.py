@@ -0,0 +1,130 @@
+"""Parsing and verification of Zammad webhook deliveries."""
+
+import hashlib
+import hmac
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Header carrying the HMAC-SHA1 signature of the request body ("sha1=<hex digest>")
+SIGNATURE_HEADER = "X-Hub-Signature"
+# Header carrying Zammad's unique ID of a delivery; retries reuse it
+DELIVERY_HEADER = "X-Zammad-Delivery"
+# Delivery IDs remembered to drop retried deliveries
+MAX_REMEMBERED_DELIVERIES = 1024
+
+# Nested objects flattened to names, as in an expanded ticket search
+_NAME_FIELDS = {
+    "group": "name",
+    "state": "name",
+    "priority": "name",
+    "organization": "name",
+    "customer": "login",
+    "owner": "login",
+    "created_by": "login",
+    "updated_by": "login",
+}
+
+
+def webhook_secret_from_env() -> str | None:
+    """Read the webhook signing secret from ZAMMAD_WEBHOOK_SECRET_FILE or ZAMMAD_WEBHOOK_SECRET."""
+    secret_file = os.getenv("ZAMMAD_WEBHOOK_SECRET_FILE")
+    if secret_file:
+        try:
+            with open(secret_file) as f:
+                return f.read().strip() or None
+        except OSError:
+            logger.warning("Failed to read secret for environment variable 'ZAMMAD_WEBHOOK_SECRET_FILE'.")
+    return os.getenv("ZAMMAD_WEBHOOK_SECRET") or None
+
+
+def sign(secret: str, body: bytes) -> str:
+    """Return the ``X-Hub-Signature`` value Zammad sends for ``body``."""
+    return "sha1=" + hmac.new(secret.encode(), body, hashlib.sha1).hexdigest()
+
+
+def verify_signature(secret: str, body: bytes, signature: str | None) -> bool:
+    """Check an ``X-Hub-Signature`` header against the body, in constant time."""
+    if not signature:
+        return False
+    return hmac.compare_digest(sign(secret, body), signature.strip())
+
+
+@dataclass
+class WebhookChange:
+    """The records carried by one webhook delivery, in the shape the client returns them."""
+
+    tickets: list[dict[str, Any]] = field(default_factory=list)
+    articles: list[dict[str, Any]] = field(default_factory=list)
+    users: list[dict[str, Any]] = field(default_factory=list)
+    organizations: list[dict[str, Any]] = field(default_factory=list)
+
+
+def parse_payload(payload: Any) -> WebhookChange:
+    """Extract tickets, articles, users and organizations from a webhook payload.
+
+    Zammad's default trigger payload is ``{"ticket": {...}, "article": {...}}``
+    with related records nested as objects. Tickets are flattened to the
+    expanded search shape (``group``, ``state``, ``owner`` etc. as names) that
+    caches, indexes and the mirror already consume; nested customers, owners and
+    organizations that are complete records are returned separately.
+    """
+    change = WebhookChange()
+    if not isinstance(payload, dict):
+        return change
+
+    ticket = payload.get("ticket")
+    if isinstance(ticket, dict) and ticket.get("id"):
+        flat = dict(ticket)
+        for key, name_key in _NAME_FIELDS.items():
+            value = ticket.get(key)
+            if isinstance(value, dict):
+                flat[key] = value.get(name_key) or value.get("email") or value.get("name")
+                if value.get("id") and value.get("updated_at"):
+                    if key == "organization":
+                        change.organizations.append(value)
+                    elif name_key == "login":
+                        change.users.append(value)
+        # Zammad embeds the ticket's articles on some payloads; keep them separate like the API does
+        articles = flat.pop("articles", None)
+        if isinstance(articles, list):
+            change.articles.extend(article for article in articles if isinstance(article, dict))
+        change.tickets.append(flat)
+
+    article = payload.get("article")
+    if isinstance(article, dict) and article.get("id"):
+        article = dict(article)
+        if not article.get("ticket_id") and change.tickets:
+            article["ticket_id"] = change.tickets[0]["id"]
+        change.articles.append(article)
+
+    # Deduplicate nested users (e.g. customer == created_by)
+    change.users = list({int(user["id"]): user for user in change.users}.values())
+    return change
+
+
+class DeliveryLog:
+    """Remembers recent delivery IDs so a retried delivery is applied only once."""
+
+    def __init__(self, max_entries: int = MAX_REMEMBERED_DELIVERIES):
+        self.max_entries = max_entries
+        self._seen: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def seen(self, delivery_id: str) -> bool:
+        """Whether ``delivery_id`` was already applied."""
+        with self._lock:
+            return delivery_id in self._seen
+
+    def record(self, delivery_id: str) -> None:
+        """Remember that ``delivery_id`` was applied, forgetting the oldest beyond the limit."""
+        with self._lock:
+            self._seen[delivery_id] = None
+            self._seen.move_to_end(delivery_id)
+            if len(self._seen) > self.max_entries:
+                self._seen.popitem(last=False)
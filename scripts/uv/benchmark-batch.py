@@ -0,0 +1,114 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# dependencies = [
+#   "click>=8.0.0",
+#   "rich>=13.0.0",
+#   "httpx>=0.25.0",
+# ]
+# requires-python = ">=3.10"
+# ///
+"""
+Compare sequential /mcp/call requests with one batched request.
+
+Sends the same get_ticket and get_user calls to a running HTTP-mode MCP
+server (``mcp-zammad --mode http``), first one request per call and then as
+a single JSON array, and reports the wall-clock time of each variant.
+
+Usage:
+    ./benchmark-batch.py --ticket-id 1 --ticket-id 2 --user-id 3
+    ./benchmark-batch.py --ticket-id 1 --ticket-id 2 --repeat 10 --rounds 5
+    ./benchmark-batch.py --server http://127.0.0.1:9090 --ticket-id 42
+"""
+
+import statistics
+import sys
+import time
+from typing import Any
+
+import click
+import httpx
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+
+def build_calls(ticket_ids: tuple[int, ...], user_ids: tuple[int, ...], repeat: int) -> list[dict[str, Any]]:
+    """The calls of one orchestrator turn, repeated ``repeat`` times."""
+    calls: list[dict[str, Any]] = []
+    for _ in range(repeat):
+        calls.extend(
+            {"method": "tools/call", "params": {"name": "get_ticket", "arguments": {"ticket_id": ticket_id}}}
+            for ticket_id in ticket_ids
+        )
+        calls.extend(
+            {"method": "tools/call", "params": {"name": "get_user", "arguments": {"user_id": user_id}}}
+            for user_id in user_ids
+        )
+    return [{**call, "id": index} for index, call in enumerate(calls)]
+
+
+def run_sequential(client: httpx.Client, calls: list[dict[str, Any]]) -> tuple[float, int]:
+    """Return the elapsed milliseconds and the number of failed calls."""
+    failed = 0
+    start = time.perf_counter()
+    for call in calls:
+        response = client.post("/mcp/call", json=call)
+        response.raise_for_status()
+        failed += response.json().get("error") is not None
+    return (time.perf_counter() - start) * 1000, failed
+
+
+def run_batch(client: httpx.Client, calls: list[dict[str, Any]]) -> tuple[float, int]:
+    """Return the elapsed milliseconds and the number of failed calls."""
+    start = time.perf_counter()
+    response = client.post("/mcp/call", json=calls)
+    response.raise_for_status()
+    failed = sum(item.get("error") is not None for item in response.json())
+    return (time.perf_counter() - start) * 1000, failed
+
+
+@click.command()
+@click.option("--server", default="http://127.0.0.1:8080", show_default=True, help="MCP HTTP server URL")
+@click.option("--ticket-id", "ticket_ids", type=int, multiple=True, help="Ticket to fetch (repeatable)")
+@click.option("--user-id", "user_ids", type=int, multiple=True, help="User to fetch (repeatable)")
+@click.option("--repeat", default=1, show_default=True, help="Repeat the call list this many times per turn")
+@click.option("--rounds", default=5, show_default=True, help="Turns per variant")
+def main(server: str, ticket_ids: tuple[int, ...], user_ids: tuple[int, ...], repeat: int, rounds: int) -> None:
+    """Benchmark sequential vs. batched /mcp/call requests."""
+    calls = build_calls(ticket_ids, user_ids, repeat)
+    if not calls:
+        console.print("[red]Error:[/red] Pass at least one --ticket-id or --user-id")
+        sys.exit(1)
+
+    results: dict[str, list[float]] = {"sequential": [], "batch": []}
+    failures = 0
+    with httpx.Client(base_url=server, timeout=120) as client:
+        try:
+            # Warm up connections and the server's caches before measuring
+            run_batch(client, calls)
+            for _ in range(rounds):
+                for variant, run in (("sequential", run_sequential), ("batch", run_batch)):
+                    elapsed, failed = run(client, calls)
+                    results[variant].append(elapsed)
+                    failures += failed
+        except httpx.HTTPError as e:
+            console.print(f"[red]Error:[/red] Request to {server} failed: {e}")
+            sys.exit(1)
+
+    table = Table(title=f"{len(calls)} calls per turn, {rounds} rounds")
+    table.add_column("Variant", style="cyan")
+    table.add_column("Median", justify="right")
+    table.add_column("Fastest", justify="right")
+    for variant, timings in results.items():
+        table.add_row(variant, f"{statistics.median(timings):.0f} ms", f"{min(timings):.0f} ms")
+    console.print(table)
+
+    speedup = statistics.median(results["sequential"]) / statistics.median(results["batch"])
+    console.print(f"Batch speedup: [green]{speedup:.1f}x[/green]")
+    if failures:
+        console.print(f"[yellow]Warning:[/yellow] {failures} calls returned errors; check the IDs")
+
+
+if __name__ == "__main__":
+    main()
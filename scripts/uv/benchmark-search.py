@@ -0,0 +1,114 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# dependencies = [
+#   "click>=8.0.0",
+#   "rich>=13.0.0",
+#   "python-dotenv>=1.0.0",
+#   "httpx>=0.25.0",
+# ]
+# requires-python = ">=3.10"
+# ///
+"""
+Compare expanded and unexpanded ticket search pages.
+
+Fetches the same page of ticket search results with and without
+``expand=true`` and reports response size and latency. The unexpanded
+variant is what the MCP server requests when ZAMMAD_LOCAL_NAME_RESOLUTION
+is enabled; names are then filled in from cached reference data and users.
+
+Usage:
+    ./benchmark-search.py                         # 100-ticket pages, 10 rounds
+    ./benchmark-search.py --query "state.name:open" --per-page 100 --rounds 20
+    ./benchmark-search.py --env-file prod.env
+"""
+
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import click
+import httpx
+from dotenv import load_dotenv
+from rich.console import Console
+from rich.table import Table
+from utils import normalize_zammad_url
+
+console = Console()
+
+
+def build_client(url: str) -> httpx.Client:
+    """Create an authenticated client from the usual ZAMMAD_* variables."""
+    headers = {"User-Agent": "Zammad MCP search benchmark"}
+    auth = None
+    if token := os.getenv("ZAMMAD_HTTP_TOKEN"):
+        headers["Authorization"] = f"Token token={token}"
+    elif token := os.getenv("ZAMMAD_OAUTH2_TOKEN"):
+        headers["Authorization"] = f"Bearer {token}"
+    elif os.getenv("ZAMMAD_USERNAME") and os.getenv("ZAMMAD_PASSWORD"):
+        auth = (os.environ["ZAMMAD_USERNAME"], os.environ["ZAMMAD_PASSWORD"])
+    else:
+        console.print("[red]Error:[/red] No authentication credentials configured")
+        sys.exit(1)
+    return httpx.Client(base_url=f"{url}/", headers=headers, auth=auth, timeout=60)
+
+
+def measure(client: httpx.Client, params: dict[str, str | int], rounds: int) -> tuple[list[float], int]:
+    """Return per-round latencies in milliseconds and the response size of the last round."""
+    latencies: list[float] = []
+    size = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        response = client.get("tickets/search", params=params)
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+        size = len(response.content)
+    return latencies, size
+
+
+@click.command()
+@click.option("--query", default="*", show_default=True, help="Ticket search query")
+@click.option("--per-page", default=100, show_default=True, help="Tickets per page")
+@click.option("--rounds", default=10, show_default=True, help="Requests per variant")
+@click.option("--env-file", type=click.Path(path_type=Path), default=Path(".env"), help="Environment file")
+def main(query: str, per_page: int, rounds: int, env_file: Path) -> None:
+    """Benchmark expanded vs. unexpanded ticket search."""
+    if env_file.exists():
+        load_dotenv(env_file)
+
+    try:
+        url = normalize_zammad_url(os.getenv("ZAMMAD_URL", ""))
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] Invalid ZAMMAD_URL: {e}")
+        sys.exit(1)
+
+    base_params: dict[str, str | int] = {"query": query, "page": 1, "per_page": per_page}
+    with build_client(url) as client:
+        # Warm up connections and Zammad's caches before measuring
+        client.get("tickets/search", params=base_params)
+        results = {
+            "expand=true": measure(client, {**base_params, "expand": "true"}, rounds),
+            "unexpanded": measure(client, base_params, rounds),
+        }
+
+    table = Table(title=f"tickets/search, {per_page} per page, {rounds} rounds")
+    table.add_column("Variant", style="cyan")
+    table.add_column("Payload", justify="right")
+    table.add_column("Median", justify="right")
+    table.add_column("p90", justify="right")
+    for variant, (latencies, size) in results.items():
+        p90 = statistics.quantiles(latencies, n=10)[-1] if len(latencies) > 1 else latencies[0]
+        table.add_row(variant, f"{size / 1024:.1f} KiB", f"{statistics.median(latencies):.0f} ms", f"{p90:.0f} ms")
+    console.print(table)
+
+    (expanded, expanded_size), (unexpanded, unexpanded_size) = results.values()
+    if expanded_size:
+        console.print(
+            f"Payload reduction: [green]{1 - unexpanded_size / expanded_size:.0%}[/green], "
+            f"median latency change: [green]{statistics.median(unexpanded) - statistics.median(expanded):+.0f} ms[/green]"
+        )
+
+
+if __name__ == "__main__":
+    main()
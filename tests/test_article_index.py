@@ -0,0 +1,115 @@
+"""Tests for the local full-text article index."""
+
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from mcp_zammad.article_index import ArticleIndex, match_query, plain_text
+from mcp_zammad.async_client import AsyncZammadClient
+from mcp_zammad.server import ZammadMCPServer
+
+BASE_URL = "https://test.zammad.com/api/v1"
+
+
+@pytest.fixture
+def index() -> ArticleIndex:
+    index = ArticleIndex(":memory:")
+    index.observe_tickets(
+        [
+            {"id": 1, "number": "79001", "title": "Printer on fire"},
+            {"id": 2, "number": "79002", "title": "VPN disconnects"},
+        ]
+    )
+    index.observe_articles(
+        [
+            {"id": 10, "ticket_id": 1, "body": "<p>The printer in room 4 is smoking.</p>", "content_type": "text/html"},
+            {"id": 11, "ticket_id": 1, "body": "Printer replaced, closing.", "content_type": "text/plain"},
+            {"id": 20, "ticket_id": 2, "subject": "VPN", "body": "Cannot reach the printer share over VPN"},
+        ]
+    )
+    index.flush()
+    return index
+
+
+def test_search_ranks_and_groups_by_ticket(index: ArticleIndex) -> None:
+    """Test BM25 ranking with title boost, grouping and highlighted snippets."""
+    results = index.search("printer")
+
+    assert [result["number"] for result in results] == ["79001", "79002"]
+    assert [snippet["article_id"] for snippet in results[0]["snippets"]] == [11, 10]
+    assert "**printer**" in results[0]["snippets"][1]["snippet"].lower()
+    assert "<p>" not in results[0]["snippets"][1]["snippet"]
+    assert index.search("printer", limit=1)[0]["ticket_id"] == 1
+
+
+def test_reindexing_replaces_rows(index: ArticleIndex) -> None:
+    """Test that seeing an article or title again replaces it instead of duplicating it."""
+    index.observe_articles([{"id": 20, "ticket_id": 2, "body": "Resolved by reinstalling the client"}])
+    index.observe_tickets([{"id": 2, "number": "79002", "title": "VPN client broken"}])
+    index.flush()
+
+    assert len(index) == 3
+    assert [result["ticket_id"] for result in index.search("printer")] == [1]
+    assert index.search("broken")[0]["title"] == "VPN client broken"
+    assert index.search("reinst*")[0]["ticket_id"] == 2
+
+
+def test_user_input_cannot_break_query_syntax(index: ArticleIndex) -> None:
+    """Test that operators and punctuation are treated as plain words."""
+    assert match_query('printer" OR (fire') == '"printer" "OR" "fire"'
+    assert match_query("?!") is None
+    assert index.search('printer" AND (') == index.search("printer and")
+    assert plain_text("a&amp;b<br>c", "text/html") == "a&b\nc"
+
+
+def test_observers_only_queue_rows(tmp_path: Path) -> None:
+    """Test that observing never waits on SQLite and that close writes what was queued."""
+    path = str(tmp_path / "articles.db")
+    index = ArticleIndex(path)
+    with index._lock:
+        index.observe_articles([{"id": 30, "ticket_id": 3, "body": "Monitor flickers"}])
+    index.close()
+
+    reopened = ArticleIndex(path)
+    assert len(reopened) == 1
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_fetched_tickets_feed_the_index() -> None:
+    """Test that articles fetched through the client end up in the index."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/ticket_articles/by_ticket/5"):
+            return httpx.Response(200, json=[{"id": 50, "ticket_id": 5, "body": "Keyboard sticky after coffee"}])
+        return httpx.Response(200, json={"id": 5, "number": "79005", "title": "Keyboard", "updated_at": "2024-01-01"})
+
+    index = ArticleIndex(":memory:")
+    client = AsyncZammadClient(url=BASE_URL, http_token="test-token", transport=httpx.MockTransport(handler))
+    client.add_ticket_observer(index.observe_tickets)
+    client.add_article_observer(index.observe_articles)
+    async with client:
+        await client.get_ticket(5, include_articles=True, article_limit=-1)
+    index.flush()
+
+    assert index.search("coffee")[0]["number"] == "79005"
+
+
+@pytest.mark.asyncio
+async def test_search_articles_tool(index: ArticleIndex) -> None:
+    """Test the tool output and the error when the index is disabled."""
+    server = ZammadMCPServer()
+    tools: dict[str, Any] = {}
+    server.mcp.tool = lambda name=None: lambda func: tools.setdefault(name or func.__name__, func)  # type: ignore[method-assign, assignment, misc]
+    server._setup_ticket_tools()
+
+    with pytest.raises(RuntimeError, match="ZAMMAD_ARTICLE_INDEX_PATH"):
+        await tools["search_articles"](query="printer")
+
+    server.article_index = index
+    result = await tools["search_articles"](query="smoking")
+
+    assert result[0].startswith("1. Ticket #79001\nTitle: Printer on fire")
+    assert "Article 10:" in result[0]
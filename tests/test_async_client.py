@@ -0,0 +1,241 @@
+"""Tests for the httpx based AsyncZammadClient."""
+
+import asyncio
+import json
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+import pytest
+
+from mcp_zammad.async_client import AsyncZammadClient
+from mcp_zammad.client import ConfigException
+
+BASE_URL = "https://test.zammad.com/api/v1"
+
+Handler = Callable[[httpx.Request], httpx.Response]
+
+
+def make_client(handler: Handler, **kwargs: Any) -> AsyncZammadClient:
+    """Create a client whose requests are answered by ``handler``."""
+    return AsyncZammadClient(url=BASE_URL, http_token="test-token", transport=httpx.MockTransport(handler), **kwargs)
+
+
+def test_requires_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the async client shares the URL validation of the sync client."""
+    monkeypatch.delenv("ZAMMAD_URL", raising=False)
+    with pytest.raises(ConfigException, match="Zammad URL is required"):
+        AsyncZammadClient(http_token="test-token")
+
+
+def test_pool_limits_from_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that connection limits can be configured through the environment."""
+    monkeypatch.setenv("ZAMMAD_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("ZAMMAD_MAX_KEEPALIVE_CONNECTIONS", "3")
+    client = AsyncZammadClient(url=BASE_URL, http_token="test-token")
+
+    assert client.limits.max_connections == 7
+    assert client.limits.max_keepalive_connections == 3
+
+
+@pytest.mark.asyncio
+async def test_auth_header_and_search() -> None:
+    """Test token auth and that filters become a single search query."""
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json=[{"id": 1, "title": "Test"}])
+
+    async with make_client(handler) as client:
+        result = await client.search_tickets(state="open", group="Support", page=2, per_page=10)
+
+    assert result == [{"id": 1, "title": "Test"}]
+    request = seen[0]
+    assert request.headers["Authorization"] == "Token token=test-token"
+    assert request.url.path == "/api/v1/tickets/search"
+    assert request.url.params["query"] == "state.name:open AND group.name:Support"
+    assert request.url.params["page"] == "2"
+    assert request.url.params["per_page"] == "10"
+
+
+@pytest.mark.asyncio
+async def test_search_without_query_lists_tickets() -> None:
+    """Test that an empty search falls back to the ticket list endpoint."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/api/v1/tickets"
+        return httpx.Response(200, json=[{"id": 1}])
+
+    async with make_client(handler) as client:
+        assert await client.search_tickets() == [{"id": 1}]
+
+
+@pytest.mark.asyncio
+async def test_get_ticket_with_article_window() -> None:
+    """Test get_ticket applies article offset and limit."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/v1/tickets/1":
+            return httpx.Response(200, json={"id": 1, "title": "Test"})
+        assert request.url.path == "/api/v1/ticket_articles/by_ticket/1"
+        return httpx.Response(200, json=[{"id": i, "body": f"Article {i}"} for i in range(1, 6)])
+
+    async with make_client(handler) as client:
+        result = await client.get_ticket(1, article_limit=2, article_offset=1)
+
+    assert [article["id"] for article in result["articles"]] == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_get_ticket_not_found() -> None:
+    """Test that a 404 is reported as a missing ticket."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(404, json={"error": "Couldn't find Ticket"})
+
+    async with make_client(handler) as client:
+        with pytest.raises(ValueError, match="Ticket with ID 99 does not exist"):
+            await client.get_ticket(99)
+
+
+@pytest.mark.asyncio
+async def test_get_ticket_fetches_article_window_by_id() -> None:
+    """Test that only the requested articles are transferred when article_ids are known."""
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        if request.url.path == "/api/v1/tickets/1":
+            return httpx.Response(200, json={"id": 1, "article_ids": list(range(100, 3100))})
+        assert request.url.params["expand"] == "true"
+        return httpx.Response(200, json={"id": int(request.url.path.rsplit("/", 1)[1])})
+
+    async with make_client(handler) as client:
+        result = await client.get_ticket(1, article_limit=3, article_offset=2)
+
+    assert [article["id"] for article in result["articles"]] == [102, 103, 104]
+    assert result["article_count"] == 3000
+    assert "/api/v1/ticket_articles/by_ticket/1" not in seen
+    assert len(seen) == 4
+
+
+@pytest.mark.asyncio
+async def test_get_ticket_fetches_articles_concurrently() -> None:
+    """Test that the ticket and full article list requests are in flight together."""
+    articles_started = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/v1/tickets/1":
+            # Sequential fetching would never start the article request while this one waits
+            await asyncio.wait_for(articles_started.wait(), timeout=2)
+            return httpx.Response(200, json={"id": 1})
+        articles_started.set()
+        return httpx.Response(200, json=[{"id": 1}])
+
+    async with make_client(handler) as client:
+        result = await client.get_ticket(1, article_limit=-1)
+
+    assert result["articles"] == [{"id": 1}]
+    assert result["article_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_ticket_not_found_cancels_articles() -> None:
+    """Test that a 404 on the ticket cancels the still-running article request."""
+    articles_started = asyncio.Event()
+    articles_cancelled = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/v1/tickets/99":
+            await asyncio.wait_for(articles_started.wait(), timeout=2)
+            return httpx.Response(404, json={"error": "Couldn't find Ticket"})
+        articles_started.set()
+        try:
+            await asyncio.sleep(2)
+        except asyncio.CancelledError:
+            articles_cancelled.set()
+            raise
+        return httpx.Response(200, json=[])
+
+    async with make_client(handler) as client:
+        with pytest.raises(ValueError, match="Ticket with ID 99 does not exist"):
+            await client.get_ticket(99, article_limit=-1)
+
+    assert articles_cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_get_ticket_by_number() -> None:
+    """Test lookup by ticket number resolves the ID before fetching the ticket."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/v1/tickets/search":
+            return httpx.Response(200, json=[{"id": 7, "number": "79004"}])
+        return httpx.Response(200, json={"id": 7, "number": "79004"})
+
+    async with make_client(handler) as client:
+        result = await client.get_ticket_by_number("79004", include_articles=False)
+
+    assert result["id"] == 7
+
+
+@pytest.mark.asyncio
+async def test_write_methods_send_json() -> None:
+    """Test create, update and tag operations send the expected payloads."""
+    seen: list[tuple[str, str, Any]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content) if request.content else None
+        seen.append((request.method, request.url.path, body))
+        if request.url.path.startswith("/api/v1/tags"):
+            return httpx.Response(200, json=True)
+        return httpx.Response(200, json={"id": 1})
+
+    async with make_client(handler) as client:
+        await client.create_ticket(title="T", group="Support", customer="c@example.com", article_body="Body")
+        await client.update_ticket(1, state="closed")
+        assert await client.add_ticket_tag(1, "urgent") == {"success": True}
+        await client.remove_ticket_tag(1, "urgent")
+
+    assert seen[0][0:2] == ("POST", "/api/v1/tickets")
+    assert seen[0][2]["article"]["body"] == "Body"
+    assert seen[1] == ("PUT", "/api/v1/tickets/1", {"state": "closed"})
+    assert seen[2] == ("POST", "/api/v1/tags/add", {"o_id": 1, "item": "urgent", "object": "Ticket"})
+    assert seen[3][0:2] == ("DELETE", "/api/v1/tags/remove")
+
+
+@pytest.mark.asyncio
+async def test_get_groups_walks_all_pages() -> None:
+    """Test list endpoints are fetched until a short page is returned."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        size = 100 if page == 1 else 5
+        return httpx.Response(200, json=[{"id": page * 1000 + i} for i in range(size)])
+
+    async with make_client(handler) as client:
+        groups = await client.get_groups()
+
+    assert len(groups) == 105
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_overlap() -> None:
+    """Test that concurrent calls share the pool instead of running one after another."""
+    active = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return httpx.Response(200, json={"id": 1})
+
+    client = AsyncZammadClient(url=BASE_URL, http_token="test-token", transport=httpx.MockTransport(handler))
+    async with client:
+        await asyncio.gather(*(client.get_user(i) for i in range(10)))
+
+    assert peak == 10
@@ -0,0 +1,179 @@
+"""Tests for the entity cache."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from mcp_zammad.async_client import AsyncZammadClient
+from mcp_zammad.cache import EntityCache
+
+BASE_URL = "https://test.zammad.com/api/v1"
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_after_ttl() -> None:
+    """Test that entries are served until their per-type TTL runs out."""
+    clock = FakeClock()
+    cache = EntityCache(ttls={"user": 10, "organization": 100}, clock=clock)
+    cache.set("user", 1, {"id": 1})
+    cache.set("organization", 1, {"id": 1})
+
+    clock.now = 11
+    assert cache.get("user", 1) is None
+    assert cache.get("organization", 1) == {"id": 1}
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+
+
+def test_zero_ttl_disables_type() -> None:
+    """Test that a TTL of 0 turns caching off for that entity type."""
+    cache = EntityCache(ttls={"ticket": 0})
+    cache.set("ticket", 1, {"id": 1})
+    assert cache.get("ticket", 1) is None
+
+
+def test_lru_eviction_by_count_and_bytes() -> None:
+    """Test that the least recently used entries go first when either bound is exceeded."""
+    cache = EntityCache(max_entries=2)
+    cache.set("user", 1, {"id": 1})
+    cache.set("user", 2, {"id": 2})
+    cache.get("user", 1)
+    cache.set("user", 3, {"id": 3})
+    assert cache.get("user", 2) is None
+    assert cache.get("user", 1) == {"id": 1}
+
+    small = EntityCache(max_bytes=100)
+    small.set("user", 1, {"id": 1, "note": "x" * 40})
+    small.set("user", 2, {"id": 2, "note": "x" * 40})
+    assert small.get("user", 1) is None
+    assert small.get("user", 2) is not None
+    assert small.stats()["bytes"] <= 100
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_drops_all_variants() -> None:
+    """Test that invalidating a ticket drops every cached article window."""
+    cache = EntityCache()
+    cache.set("ticket", 1, {"id": 1}, variant=(True, 10, 0))
+    cache.set("ticket", 1, {"id": 1}, variant=(False, 10, 0))
+    cache.set("ticket", 2, {"id": 2}, variant=(True, 10, 0))
+
+    cache.invalidate("ticket", 1)
+
+    assert cache.get("ticket", 1, (True, 10, 0)) is None
+    assert cache.get("ticket", 1, (False, 10, 0)) is None
+    assert cache.get("ticket", 2, (True, 10, 0)) == {"id": 2}
+
+
+def test_set_after_invalidate_is_skipped() -> None:
+    """Test that a payload fetched before an invalidation is not cached after it."""
+    cache = EntityCache(max_entries=1)
+    stale = cache.generation("ticket", 1)
+    cache.invalidate("ticket", 1)
+    # Pushes ticket 1 out of the bounded generation table
+    cache.invalidate("ticket", 2)
+
+    cache.set("ticket", 1, {"id": 1}, generation=stale)
+    assert cache.get("ticket", 1) is None
+
+    cache.set("ticket", 1, {"id": 1}, generation=cache.generation("ticket", 1))
+    assert cache.get("ticket", 1) == {"id": 1}
+
+
+def test_newer_ticket_payload_invalidates() -> None:
+    """Test that a search result with a different updated_at evicts the cached ticket."""
+    cache = EntityCache()
+    cache.set("ticket", 1, {"id": 1, "updated_at": "2024-01-01T00:00:00Z"}, variant=(True, 10, 0))
+
+    cache.observe_tickets([{"id": 1, "updated_at": "2024-01-01T00:00:00Z"}])
+    assert cache.get("ticket", 1, (True, 10, 0)) is not None
+
+    cache.observe_tickets([{"id": 1, "updated_at": "2024-01-02T00:00:00Z"}])
+    assert cache.get("ticket", 1, (True, 10, 0)) is None
+
+
+def test_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test configuration through the ZAMMAD_CACHE_* variables."""
+    monkeypatch.setenv("ZAMMAD_CACHE_TTL_USER", "5")
+    monkeypatch.setenv("ZAMMAD_CACHE_MAX_ENTRIES", "10")
+    cache = EntityCache.from_env()
+
+    assert cache.ttls["user"] == 5
+    assert cache.max_entries == 10
+
+
+@pytest.mark.asyncio
+async def test_client_reads_are_cached_and_writes_invalidate() -> None:
+    """Test that repeated reads are served locally until a write touches the ticket."""
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(f"{request.method} {request.url.path}")
+        if request.url.path.startswith("/api/v1/tags"):
+            return httpx.Response(200, json=True)
+        return httpx.Response(200, json={"id": 1, "login": "agent", "updated_at": "2024-01-01T00:00:00Z"})
+
+    client = AsyncZammadClient(url=BASE_URL, http_token="test-token", transport=httpx.MockTransport(handler))
+    async with client:
+        await client.get_user(1)
+        await client.get_user(1)
+        await client.get_ticket(1, include_articles=False)
+        await client.get_ticket(1, include_articles=False)
+        await client.add_ticket_tag(1, "urgent")
+        await client.get_ticket(1, include_articles=False)
+
+    assert requests == [
+        "GET /api/v1/users/1",
+        "GET /api/v1/tickets/1",
+        "POST /api/v1/tags/add",
+        "GET /api/v1/tickets/1",
+    ]
+    assert client.cache.stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_read_in_flight_during_write_is_not_cached() -> None:
+    """Test that a read racing a write neither caches its old payload nor is joined by later reads."""
+    started = asyncio.Event()
+    release = asyncio.Event()
+    versions: list[str] = []
+    current = {"version": "before"}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.startswith("/api/v1/tags"):
+            current["version"] = "after"
+            return httpx.Response(200, json=True)
+        version = current["version"]
+        versions.append(version)
+        if version == "before":
+            started.set()
+            await release.wait()
+        return httpx.Response(200, json={"id": 1, "updated_at": version})
+
+    client = AsyncZammadClient(url=BASE_URL, http_token="test-token", transport=httpx.MockTransport(handler))
+    async with client:
+        stale = asyncio.ensure_future(client.get_ticket(1, include_articles=False))
+        await started.wait()
+        await client.add_ticket_tag(1, "urgent")
+
+        fresh = await client.get_ticket(1, include_articles=False)
+        release.set()
+        await stale
+
+        cached = await client.get_ticket(1, include_articles=False)
+
+    assert fresh["updated_at"] == "after"
+    assert cached["updated_at"] == "after"
+    # The later read got its own request instead of joining the one started before the write
+    assert versions[:2] == ["before", "after"]
@@ -2,7 +2,9 @@
 
 import os
 import pathlib
+import threading
 from collections.abc import Generator
+from typing import Any
 from unittest.mock import Mock, patch
 
 import pytest
@@ -312,6 +314,77 @@ class TestZammadClientMethods:
 
         assert len(result["articles"]) == 2
 
+    def test_get_ticket_fetches_articles_concurrently(self, mock_zammad_api: Mock) -> None:
+        """Test that the ticket and its full article list are requested at the same time."""
+        both_started = threading.Barrier(2, timeout=2)
+
+        def find(_ticket_id: int) -> dict[str, Any]:
+            both_started.wait()
+            return {"id": 1, "title": "Test Ticket"}
+
+        def articles(_ticket_id: int) -> list[dict[str, Any]]:
+            both_started.wait()
+            return [{"id": 1, "body": "Article 1"}]
+
+        mock_instance = Mock()
+        mock_instance.ticket.find.side_effect = find
+        mock_instance.ticket.articles.side_effect = articles
+        mock_zammad_api.return_value = mock_instance
+
+        client = ZammadClient(url="https://test.zammad.com/api/v1", http_token="test-token")
+        try:
+            # Sequential fetching would leave the barrier waiting and time out
+            result = client.get_ticket(1, article_limit=-1)
+        finally:
+            client.close()
+
+        assert result["articles"] == [{"id": 1, "body": "Article 1"}]
+
+    def test_get_ticket_not_found_skips_articles(self, mock_zammad_api: Mock) -> None:
+        """Test that a missing ticket is reported without waiting for its articles."""
+        release = threading.Event()
+        mock_instance = Mock()
+        mock_instance.ticket.find.side_effect = Exception("404 Couldn't find Ticket")
+        mock_instance.ticket.articles.side_effect = lambda _ticket_id: release.wait(2) and []
+        mock_zammad_api.return_value = mock_instance
+
+        client = ZammadClient(url="https://test.zammad.com/api/v1", http_token="test-token")
+        try:
+            with pytest.raises(ValueError, match="Ticket with ID 99 does not exist"):
+                client.get_ticket(99, article_limit=-1)
+        finally:
+            release.set()
+            client.close()
+
+    def test_get_ticket_fetches_article_window_by_id(self, mock_zammad_api: Mock) -> None:
+        """Test that only the requested articles are downloaded when article_ids are known."""
+        mock_instance = Mock()
+        mock_instance.url = "https://test.zammad.com/api/v1/"
+        mock_instance.ticket.find.return_value = {"id": 1, "title": "Test Ticket", "article_ids": [14, 12, 11, 13]}
+
+        def get(url: str, params: dict[str, str]) -> Mock:
+            response = Mock()
+            response.json.return_value = {"id": int(url.rsplit("/", 1)[1]), "body": "Article"}
+            return response
+
+        mock_instance.session.get.side_effect = get
+        mock_zammad_api.return_value = mock_instance
+
+        client = ZammadClient(url="https://test.zammad.com/api/v1", http_token="test-token")
+        try:
+            result = client.get_ticket(1, article_limit=2, article_offset=1)
+        finally:
+            client.close()
+
+        assert [article["id"] for article in result["articles"]] == [12, 13]
+        assert result["article_count"] == 4
+        mock_instance.ticket.articles.assert_not_called()
+        requested = sorted(call.args[0] for call in mock_instance.session.get.call_args_list)
+        assert requested == [
+            "https://test.zammad.com/api/v1/ticket_articles/12",
+            "https://test.zammad.com/api/v1/ticket_articles/13",
+        ]
+
     def test_create_ticket(self, mock_zammad_api: Mock) -> None:
         """Test create_ticket method."""
         mock_instance = Mock()
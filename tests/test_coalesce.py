@@ -0,0 +1,108 @@
+"""Tests for single-flight request coalescing."""
+
+import asyncio
+import threading
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from mcp_zammad.async_client import AsyncZammadClient
+from mcp_zammad.client import ZammadClient
+from mcp_zammad.coalesce import SingleFlight
+
+BASE_URL = "https://test.zammad.com/api/v1"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_share_one_request() -> None:
+    """Test that identical concurrent reads are answered by a single upstream request."""
+    requests = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal requests
+        requests += 1
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"id": 5, "login": "agent"})
+
+    client = AsyncZammadClient(url=BASE_URL, http_token="test-token", transport=httpx.MockTransport(handler))
+    async with client:
+        results = await asyncio.gather(*(client.get_user(5) for _ in range(10)))
+        # Once the flight has landed (and the cached copy is dropped), the next read goes upstream again
+        client.cache.invalidate("user", 5)
+        await client.get_user(5)
+
+    assert requests == 2
+    assert all(result == {"id": 5, "login": "agent"} for result in results)
+    # Each caller gets its own copy
+    assert len({id(result) for result in results}) == 10
+    assert client.single_flight.stats() == {"calls": 11, "executions": 2, "coalesced": 9, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared() -> None:
+    """Test that every waiter of a failed flight receives the error."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fail() -> None:
+        await release.wait()
+        raise ValueError("Ticket with ID 1 does not exist")
+
+    waiters = [asyncio.ensure_future(flight.run("ticket:1", fail)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flight.stats()["executions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_others() -> None:
+    """Test that cancelling one caller leaves the shared call running for the rest."""
+    flight = SingleFlight()
+    release = asyncio.Event()
+    started = 0
+
+    async def slow() -> str:
+        nonlocal started
+        started += 1
+        await release.wait()
+        return "done"
+
+    first = asyncio.ensure_future(flight.run("key", slow))
+    second = asyncio.ensure_future(flight.run("key", slow))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == "done"
+    assert first.cancelled()
+    assert started == 1
+
+
+def test_run_sync_coalesces_threads() -> None:
+    """Test that blocking reads from several worker threads share one call."""
+    with patch("mcp_zammad.client.ZammadAPI") as mock_api:
+        mock_api.return_value = Mock()
+        client = ZammadClient(url=BASE_URL, http_token="test-token")
+
+    release = threading.Event()
+    client.api.organization.find.side_effect = lambda _org_id: release.wait(2) and {"id": 3, "name": "ACME"}
+
+    results: list[dict] = []
+    threads = [threading.Thread(target=lambda: results.append(client.get_organization(3))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    # Let every thread join the flight before the leader's call returns
+    while client.single_flight.stats()["calls"] < 5:
+        threading.Event().wait(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [{"id": 3, "name": "ACME"}] * 5
+    client.api.organization.find.assert_called_once_with(3)
+    assert client.single_flight.stats()["coalesced"] == 4
@@ -0,0 +1,168 @@
+"""Tests for the escalation deadline index and the list_escalations tool."""
+
+from datetime import datetime, timezone
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+
+from mcp_zammad import server as server_module
+from mcp_zammad.escalation import EscalationIndex, earliest_escalation
+from mcp_zammad.server import ZammadMCPServer
+
+# 2024-01-01T12:00:00Z
+NOW = datetime(2024, 1, 1, 12, tzinfo=timezone.utc).timestamp()
+
+
+def make_ticket(ticket_id: int, group_id: int = 1, **fields: Any) -> dict[str, Any]:
+    ticket = {
+        "id": ticket_id,
+        "number": str(79000 + ticket_id),
+        "title": f"Ticket {ticket_id}",
+        "group_id": group_id,
+        "group": {1: "Support", 2: "Sales"}[group_id],
+        "state": "open",
+        "owner": "agent",
+        "first_response_escalation_at": None,
+        "update_escalation_at": None,
+        "close_escalation_at": None,
+    }
+    ticket.update(fields)
+    return ticket
+
+
+def make_index(tickets: list[dict[str, Any]]) -> EscalationIndex:
+    index = EscalationIndex(AsyncMock(return_value=tickets), refresh_interval=300, clock=lambda: NOW)
+    index.replace(tickets)
+    return index
+
+
+def test_earliest_escalation_picks_soonest_deadline() -> None:
+    """Test that the earliest deadline wins and closed tickets are skipped."""
+    entry = earliest_escalation(
+        make_ticket(
+            1,
+            first_response_escalation_at="2024-01-01T14:00:00Z",
+            update_escalation_at="2024-01-01T13:00:00Z",
+            close_escalation_at="2024-01-02T00:00:00Z",
+        )
+    )
+
+    assert entry is not None
+    assert entry.escalation_type == "update"
+    assert entry.deadline_at == datetime(2024, 1, 1, 13, tzinfo=timezone.utc)
+    assert earliest_escalation(make_ticket(2, state="closed", close_escalation_at="2024-01-01T13:00:00Z")) is None
+    assert earliest_escalation(make_ticket(3)) is None
+
+
+def test_due_orders_by_deadline_across_groups() -> None:
+    """Test per-group lookups, the cross-group merge, the time window and the limit."""
+    index = make_index(
+        [
+            make_ticket(1, close_escalation_at="2024-01-01T15:00:00Z"),
+            make_ticket(2, group_id=2, first_response_escalation_at="2024-01-01T12:30:00Z"),
+            make_ticket(3, update_escalation_at="2024-01-01T11:00:00Z"),
+            make_ticket(4, group_id=2, update_escalation_at="2024-01-01T12:45:00Z"),
+            make_ticket(5),
+        ]
+    )
+
+    assert [entry.ticket_id for entry in index.due()] == [3, 2, 4, 1]
+    assert [entry.ticket_id for entry in index.due(within_minutes=60)] == [3, 2, 4]
+    assert [entry.ticket_id for entry in index.due(group_id=2, limit=1)] == [2]
+    assert [entry.ticket_id for entry in index.due(group_id=3)] == []
+
+
+def test_observe_moves_and_drops_tickets() -> None:
+    """Test that observed updates reorder the index and closed tickets leave it."""
+    index = make_index(
+        [
+            make_ticket(1, close_escalation_at="2024-01-01T15:00:00Z"),
+            make_ticket(2, close_escalation_at="2024-01-01T13:00:00Z"),
+        ]
+    )
+
+    index.observe([make_ticket(1, update_escalation_at="2024-01-01T12:10:00Z")])
+    assert [entry.ticket_id for entry in index.due()] == [1, 2]
+
+    index.observe([make_ticket(1, group_id=2, update_escalation_at="2024-01-01T12:10:00Z")])
+    assert [entry.ticket_id for entry in index.due(group_id=1)] == [2]
+    assert [entry.ticket_id for entry in index.due(group_id=2)] == [1]
+
+    index.observe([make_ticket(2, state="closed", close_escalation_at="2024-01-01T13:00:00Z")])
+    # Payloads without escalation fields (e.g. partial updates) leave the entry untouched
+    index.observe([{"id": 1, "title": "Renamed"}])
+    assert [entry.ticket_id for entry in index.due()] == [1]
+    assert len(index) == 1
+
+
+@pytest.mark.asyncio
+async def test_ensure_loaded_fetches_once_then_refreshes_in_background() -> None:
+    """Test the first load and the stale-while-revalidate reload."""
+    now = [NOW]
+    fetch = AsyncMock(return_value=[make_ticket(1, close_escalation_at="2024-01-01T13:00:00Z")])
+    index = EscalationIndex(fetch, refresh_interval=60, clock=lambda: now[0])
+
+    await index.ensure_loaded()
+    await index.ensure_loaded()
+    assert fetch.await_count == 1
+    assert len(index) == 1
+
+    fetch.return_value = []
+    now[0] += 120
+    await index.ensure_loaded()
+    # The stale index is still served while the reload runs
+    assert len(index) == 1
+    assert index._refreshing is not None
+    await index._refreshing
+    assert len(index) == 0
+    assert fetch.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_list_escalations_tool() -> None:
+    """Test the tool output, group filter and seeding search."""
+    server = ZammadMCPServer()
+    server.escalations._clock = lambda: NOW
+    client = AsyncMock()
+    client.search_tickets.return_value = [
+        make_ticket(1, close_escalation_at="2024-01-01T13:00:00Z"),
+        make_ticket(2, group_id=2, update_escalation_at="2024-01-01T11:30:00Z"),
+    ]
+    client.get_groups.return_value = [{"id": 1, "name": "Support"}, {"id": 2, "name": "Sales"}]
+    server.client = client
+
+    tools: dict[str, Any] = {}
+    server.mcp.tool = lambda name=None: lambda func: tools.setdefault(name or func.__name__, func)  # type: ignore[method-assign, assignment, misc]
+    server._setup_ticket_tools()
+
+    result = await tools["list_escalations"](within_minutes=-1)
+    assert len(result) == 2
+    assert result[0].startswith("1. Ticket #79002")
+    assert "Escalation: update at 2024-01-01 11:30 UTC (overdue by 30 min)" in result[0]
+    assert "Escalation: close at 2024-01-01 13:00 UTC (in 60 min)" in result[1]
+    assert "_exists_:close_escalation_at" in client.search_tickets.await_args.kwargs["query"]
+
+    result = await tools["list_escalations"](group="Support", within_minutes=120)
+    assert len(result) == 1
+    assert "Group: Support" in result[0]
+
+    with pytest.raises(ValueError, match="Unknown group"):
+        await tools["list_escalations"](group="Nope")
+
+
+@pytest.mark.asyncio
+async def test_seed_fetch_is_capped(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture) -> None:
+    """Test that the seeding search stops after MAX_ESCALATION_SEED_PAGES, soonest deadlines first."""
+    monkeypatch.setattr(server_module, "MAX_ESCALATION_SEED_PAGES", 3)
+    server = ZammadMCPServer()
+    client = AsyncMock()
+    client.search_tickets.return_value = [make_ticket(1)] * 100
+    server.client = client
+
+    tickets = await server._fetch_escalating_tickets()
+
+    assert len(tickets) == 300
+    assert client.search_tickets.await_count == 3
+    assert client.search_tickets.await_args.kwargs["sort_by"] == "escalation_at"
+    assert "first 300 escalating tickets only" in caplog.text
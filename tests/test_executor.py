@@ -0,0 +1,116 @@
+"""Tests for the bounded worker pools."""
+
+import asyncio
+import contextvars
+import threading
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from mcp_zammad.executor import BoundedExecutor, ExecutorSaturatedError, run_blocking
+from mcp_zammad.server import ZammadMCPServer
+
+
+@pytest.mark.asyncio
+async def test_run_uses_worker_thread() -> None:
+    """Test that blocking work runs on a pool thread, not the event loop thread."""
+    executor = BoundedExecutor("test", max_workers=2, max_queue=2)
+    try:
+        thread_name = await executor.run(lambda: threading.current_thread().name)
+    finally:
+        executor.shutdown()
+
+    assert thread_name.startswith("zammad-test")
+    assert executor.stats()["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_rejects_work() -> None:
+    """Test that work beyond workers + queue is rejected instead of queued."""
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    try:
+        first = asyncio.ensure_future(executor.run(release.wait))
+        second = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+
+        stats = executor.stats()
+        assert stats["active"] == 1
+        assert stats["queue_depth"] == 1
+
+        with pytest.raises(ExecutorSaturatedError, match="'test' is saturated"):
+            await executor.run(release.wait)
+
+        release.set()
+        await asyncio.gather(first, second)
+    finally:
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["peak_queue_depth"] >= 1
+    assert stats["max_wait_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_awaits_coroutine_functions() -> None:
+    """Test that async callables bypass the pool entirely."""
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0)
+    func = AsyncMock(return_value=42)
+
+    assert await run_blocking(executor, func, 1, key="value") == 42
+    func.assert_awaited_once_with(1, key="value")
+    assert executor.stats()["submitted"] == 0
+
+
+@pytest.mark.asyncio
+async def test_blocking_client_does_not_stall_event_loop() -> None:
+    """Test that a slow sync client call leaves the loop free for other work."""
+    server = ZammadMCPServer(max_workers=2, max_queue=2)
+    client = Mock()
+    client.search_tickets.side_effect = lambda **_: time.sleep(0.2) or []
+    server.client = client
+
+    ticks = 0
+
+    async def ticker() -> None:
+        nonlocal ticks
+        for _ in range(10):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    try:
+        await asyncio.gather(server._call_bulk(client.search_tickets, page=1), ticker())
+    finally:
+        server.executor.shutdown()
+        server.bulk_executor.shutdown()
+
+    assert ticks == 10
+    assert server.executor_stats()[1]["completed"] == 1
+
+
+def test_configure_executors_resizes_pools() -> None:
+    """Test that pool sizes can be changed after construction (e.g. from the CLI)."""
+    server = ZammadMCPServer()
+    server.configure_executors(max_workers=3, max_queue=5, bulk_workers=1, bulk_queue=2)
+
+    default, bulk = server.executor_stats()
+    assert (default["max_workers"], default["max_queue"]) == (3, 5)
+    assert (bulk["max_workers"], bulk["max_queue"]) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_run_propagates_context_variables() -> None:
+    """Test that work sees the caller's context variables, e.g. the current trace span."""
+    variable: contextvars.ContextVar[str] = contextvars.ContextVar("variable", default="unset")
+    variable.set("caller")
+    executor = BoundedExecutor("test", max_workers=1, max_queue=1)
+    try:
+        value = await executor.run(variable.get)
+    finally:
+        executor.shutdown()
+
+    assert value == "caller"
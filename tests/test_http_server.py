@@ -1,12 +1,13 @@
 """Tests for HTTP/SSE server."""
 
+import asyncio
 import json
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
-from mcp_zammad.http_server import HTTPMCPServer, create_http_server
+from mcp_zammad.http_server import MAX_BATCH_SIZE, HTTPMCPServer, create_http_server
 
 
 @pytest.fixture
@@ -134,4 +135,44 @@ def test_create_http_server():
         
         assert isinstance(server, HTTPMCPServer)
         assert server.host == "0.0.0.0"
-        assert server.port == 9090
\ No newline at end of file
+        assert server.port == 9090
+
+
+def test_batch_call_runs_concurrently_in_request_order(mock_mcp_server):
+    """Test that a batch answers in request order, with per-item errors and a concurrency cap."""
+    running = 0
+    peak = 0
+
+    async def call_tool(name, arguments):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        # Later calls finish first, so ordering cannot come from completion order
+        await asyncio.sleep(0.01 * (10 - arguments["ticket_id"]))
+        running -= 1
+        if arguments["ticket_id"] == 3:
+            raise ValueError("Ticket not found")
+        return {"id": arguments["ticket_id"]}
+
+    mock_mcp_server.mcp.call_tool = call_tool
+    client = TestClient(HTTPMCPServer(mock_mcp_server, batch_concurrency=4).app)
+    batch = [
+        {"id": index, "method": "tools/call", "params": {"name": "get_ticket", "arguments": {"ticket_id": index}}}
+        for index in range(10)
+    ]
+
+    response = client.post("/mcp/call", json=batch)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["id"] for item in data] == list(range(10))
+    assert [item["result"] for item in data if item["id"] != 3] == [{"id": index} for index in range(10) if index != 3]
+    assert "Ticket not found" in data[3]["error"]["message"]
+    assert peak == 4
+
+
+def test_batch_call_limits(test_client):
+    """Test that empty and oversized batches are rejected."""
+    assert test_client.post("/mcp/call", json=[]).status_code == 400
+    oversized = [{"method": "tools/list"}] * (MAX_BATCH_SIZE + 1)
+    assert test_client.post("/mcp/call", json=oversized).status_code == 413
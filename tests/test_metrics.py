@@ -0,0 +1,102 @@
+"""Tests for Prometheus metrics."""
+
+from typing import Any
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from mcp import types
+
+from mcp_zammad.async_client import AsyncZammadClient
+from mcp_zammad.http_server import HTTPMCPServer
+from mcp_zammad.metrics import Histogram, endpoint_label, resource_label
+from mcp_zammad.server import ZammadMCPServer
+
+BASE_URL = "https://test.zammad.com/api/v1"
+
+
+def test_labels_keep_cardinality_low() -> None:
+    """Test that IDs are stripped from endpoints and resource URIs."""
+    assert endpoint_label("tickets/42") == "tickets/:id"
+    assert endpoint_label(f"{BASE_URL}/ticket_attachment/1/2/3") == "ticket_attachment/:id/:id/:id"
+    assert endpoint_label("tickets/search") == "tickets/search"
+    assert resource_label("zammad://queue/2nd%20Level") == "zammad://queue"
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    """Test the text exposition format of a histogram."""
+    histogram = Histogram("latency_seconds", "Latency", ("name",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "get_ticket")
+
+    assert histogram.render() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{name="get_ticket",le="0.1"} 2',
+        'latency_seconds_bucket{name="get_ticket",le="1"} 3',
+        'latency_seconds_bucket{name="get_ticket",le="+Inf"} 4',
+        'latency_seconds_sum{name="get_ticket"} 3.65',
+        'latency_seconds_count{name="get_ticket"} 4',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_async_client_records_upstream_requests() -> None:
+    """Test per-endpoint counts, status codes, sizes and the in-flight gauge."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/tickets/404"):
+            return httpx.Response(404, json={"error": "not found"})
+        return httpx.Response(200, json={"id": 1, "number": "79001"})
+
+    client = AsyncZammadClient(url=BASE_URL, http_token="test-token", transport=httpx.MockTransport(handler))
+    await client._request("GET", "tickets/1")
+    with pytest.raises(httpx.HTTPStatusError):
+        await client._request("GET", "tickets/404")
+    await client.aclose()
+
+    metrics = client.metrics
+    assert metrics.upstream_requests.value("GET", "tickets/:id", "200") == 1
+    assert metrics.upstream_requests.value("GET", "tickets/:id", "404") == 1
+    assert metrics.upstream_seconds.count("GET", "tickets/:id") == 2
+    assert metrics.upstream_bytes.count("GET", "tickets/:id") == 2
+    assert metrics.upstream_in_flight.value() == 0
+
+
+@pytest.mark.asyncio
+async def test_stdio_handlers_are_timed() -> None:
+    """Test that tools/call is timed per tool, with failed tools counted as errors."""
+    server = ZammadMCPServer()
+    handler = server.mcp._mcp_server.request_handlers[types.CallToolRequest]
+
+    await handler(types.CallToolRequest(params=types.CallToolRequestParams(name="missing_tool", arguments={})))
+
+    assert server.metrics.call_seconds.count("tool", "missing_tool", "error") == 1
+    assert server.metrics.result_bytes.count("tool", "missing_tool") == 1
+    assert server.metrics.calls_in_flight.value("tool") == 0
+
+
+def test_metrics_endpoint_and_file(tmp_path: Any) -> None:
+    """Test that /metrics and the metrics file expose calls, pools and cache statistics."""
+    server = ZammadMCPServer()
+    server.client = AsyncZammadClient(
+        url=BASE_URL, http_token="test-token", transport=httpx.MockTransport(lambda _: httpx.Response(500))
+    )
+    with server.metrics.track_call("tool", "get_ticket"):
+        pass
+    client = TestClient(HTTPMCPServer(server).app)
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'zammad_mcp_call_duration_seconds_count{kind="tool",name="get_ticket",outcome="ok"} 1' in body
+    assert 'zammad_executor_queue_depth{pool="bulk"} 0' in body
+    assert 'zammad_executor_wait_seconds_max{pool="default"} 0' in body
+    assert "# TYPE zammad_executor_peak_queue_depth gauge" in body
+    assert "# TYPE zammad_cache_hit_ratio gauge" in body
+
+    path = tmp_path / "zammad.prom"
+    server.metrics.write(str(path))
+    assert path.read_text().startswith("# HELP zammad_mcp_call_duration_seconds")
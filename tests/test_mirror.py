@@ -0,0 +1,211 @@
+"""Tests for the local SQLite mirror and its incremental syncer."""
+
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from mcp_zammad.async_client import AsyncZammadClient
+from mcp_zammad.mirror import MirrorSyncer, ZammadMirror
+from mcp_zammad.server import ZammadMCPServer
+
+BASE_URL = "https://test.zammad.com/api/v1"
+
+
+def make_ticket(ticket_id: int, updated_at: str, **fields: Any) -> dict[str, Any]:
+    ticket = {
+        "id": ticket_id,
+        "number": str(79000 + ticket_id),
+        "title": f"Ticket {ticket_id}",
+        "group_id": 1,
+        "state_id": 1,
+        "priority_id": 2,
+        "customer_id": 10,
+        "created_by_id": 1,
+        "updated_by_id": 1,
+        "group": "Support",
+        "state": "open",
+        "priority": "2 normal",
+        "customer": "customer@example.com",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": updated_at,
+    }
+    ticket.update(fields)
+    return ticket
+
+
+class FakeZammad:
+    """Serves records of each kind in updated_at order, like a sorted Zammad search."""
+
+    def __init__(self) -> None:
+        self.records: dict[str, dict[int, dict[str, Any]]] = {"tickets": {}, "users": {}, "organizations": {}}
+        self.calls: list[tuple[str, str | None, int]] = []
+        self.fail_on_ticket_call: int | None = None
+
+    async def fetch(self, kind: str, since: str | None, page: int, per_page: int) -> list[dict[str, Any]]:
+        self.calls.append((kind, since, page))
+        ticket_calls = sum(1 for call in self.calls if call[0] == "tickets")
+        if kind == "tickets" and ticket_calls == self.fail_on_ticket_call:
+            raise httpx.ConnectError("Zammad unavailable")
+        matching = sorted(
+            (record for record in self.records[kind].values() if since is None or record["updated_at"] >= since),
+            key=lambda record: (record["updated_at"], record["id"]),
+        )
+        return matching[(page - 1) * per_page : page * per_page]
+
+
+@pytest.fixture
+def mirror(tmp_path: Path) -> Iterator[ZammadMirror]:
+    mirror = ZammadMirror(str(tmp_path / "mirror.db"))
+    yield mirror
+    mirror.close()
+
+
+def test_mirror_filters_and_counts(mirror: ZammadMirror) -> None:
+    """Test structured filters and bucket counts over mirrored tickets."""
+    mirror.upsert(
+        "tickets",
+        [
+            make_ticket(1, "2024-01-02T00:00:00Z"),
+            make_ticket(2, "2024-01-03T00:00:00Z", state="closed"),
+            make_ticket(3, "2024-01-04T00:00:00Z", state="pending reminder", group="Sales"),
+            make_ticket(4, "2024-01-05T00:00:00Z", close_escalation_at="2024-01-06T00:00:00Z"),
+        ],
+    )
+
+    assert [ticket["id"] for ticket in mirror.search_tickets(state="open")] == [4, 1]
+    assert [ticket["id"] for ticket in mirror.search_tickets(group="Support", limit=1, offset=1)] == [2]
+    assert mirror.ticket_counts() == {"total": 4, "open": 2, "closed": 1, "pending": 1, "escalated": 1}
+    assert mirror.ticket_counts(group="Sales")["total"] == 1
+    assert mirror._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_reads_do_not_wait_for_writes(mirror: ZammadMirror) -> None:
+    """Test that reads on another thread proceed while a write holds the writer connection."""
+    mirror.upsert("tickets", [make_ticket(1, "2024-01-02T00:00:00Z")])
+    mirror.mark_synced("tickets")
+
+    with mirror._lock, ThreadPoolExecutor(max_workers=1) as pool:
+        counts = pool.submit(mirror.ticket_counts).result(timeout=5)
+        fresh = pool.submit(mirror.is_fresh, "tickets").result(timeout=5)
+
+    assert counts["total"] == 1
+    assert fresh
+
+
+@pytest.mark.asyncio
+async def test_sync_pulls_only_updates_after_watermark(mirror: ZammadMirror) -> None:
+    """Test that a second sync starts at the stored watermark and picks up changes."""
+    zammad = FakeZammad()
+    for ticket_id in range(1, 6):
+        zammad.records["tickets"][ticket_id] = make_ticket(ticket_id, f"2024-01-0{ticket_id}T00:00:00Z")
+    syncer = MirrorSyncer(mirror, zammad.fetch, page_size=2)
+
+    await syncer.sync_once()
+
+    assert mirror.ticket_counts()["total"] == 5
+    assert mirror.watermark("tickets") == "2024-01-05T00:00:00Z"
+    assert mirror.is_fresh("tickets", "users", "organizations")
+
+    zammad.calls.clear()
+    zammad.records["tickets"][2] = make_ticket(2, "2024-01-09T00:00:00Z", state="closed")
+    await syncer.sync_once()
+
+    ticket_calls = [call for call in zammad.calls if call[0] == "tickets"]
+    assert ticket_calls[0] == ("tickets", "2024-01-05T00:00:00Z", 1)
+    assert mirror.search_tickets(state="closed")[0]["id"] == 2
+    assert mirror.ticket_counts()["total"] == 5
+
+
+@pytest.mark.asyncio
+async def test_interrupted_sync_resumes_from_checkpoint(mirror: ZammadMirror) -> None:
+    """Test that a failed sync keeps its progress and the kind is not marked fresh."""
+    zammad = FakeZammad()
+    for ticket_id in range(1, 6):
+        zammad.records["tickets"][ticket_id] = make_ticket(ticket_id, f"2024-01-0{ticket_id}T00:00:00Z")
+    syncer = MirrorSyncer(mirror, zammad.fetch, page_size=2)
+    zammad.fail_on_ticket_call = 2
+
+    await syncer.sync_once()
+
+    assert mirror.watermark("tickets") == "2024-01-02T00:00:00Z"
+    assert not mirror.is_fresh("tickets")
+
+    zammad.fail_on_ticket_call = None
+    zammad.calls.clear()
+    await syncer.sync_once()
+
+    assert next(call for call in zammad.calls if call[0] == "tickets") == ("tickets", "2024-01-02T00:00:00Z", 1)
+    assert mirror.ticket_counts()["total"] == 5
+    assert mirror.is_fresh("tickets")
+
+
+@pytest.mark.asyncio
+async def test_reconcile_drops_deleted_records(mirror: ZammadMirror) -> None:
+    """Test that reconciliation removes records Zammad no longer returns but keeps newer local writes."""
+    zammad = FakeZammad()
+    for ticket_id in range(1, 6):
+        zammad.records["tickets"][ticket_id] = make_ticket(ticket_id, f"2024-01-0{ticket_id}T00:00:00Z")
+    syncer = MirrorSyncer(mirror, zammad.fetch, page_size=2)
+    await syncer.sync_once()
+
+    del zammad.records["tickets"][2]
+    del zammad.records["tickets"][5]
+    # Written after the listing's newest update, e.g. from a webhook
+    mirror.upsert("tickets", [make_ticket(6, "2024-01-09T00:00:00Z")])
+
+    assert await syncer.reconcile() == {"tickets": 2, "users": 0, "organizations": 0}
+    assert sorted(ticket["id"] for ticket in mirror.search_tickets()) == [1, 3, 4, 6]
+
+
+@pytest.mark.asyncio
+async def test_search_tool_answers_from_fresh_mirror(mirror: ZammadMirror) -> None:
+    """Test that structured searches use a fresh mirror and fall back to Zammad when stale."""
+    mirror.upsert("tickets", [make_ticket(1, "2024-01-02T00:00:00Z")])
+    server = ZammadMCPServer()
+    server.mirror = mirror
+    client = AsyncMock()
+    client.search_tickets.return_value = []
+    server.client = client
+
+    tools: dict[str, Any] = {}
+    server.mcp.tool = lambda name=None: lambda func: tools.setdefault(name or func.__name__, func)  # type: ignore[method-assign, assignment, misc]
+    server._setup_ticket_tools()
+
+    # Never synced, so the mirror is not trusted yet
+    await tools["search_tickets"](group="Support")
+    assert client.search_tickets.await_count > 0
+
+    client.search_tickets.reset_mock()
+    mirror.mark_synced("tickets")
+    result = await tools["search_tickets"](group="Support")
+    assert "Ticket #79001" in result[0]
+    client.search_tickets.assert_not_called()
+
+    # Free-text queries still go to Zammad
+    await tools["search_tickets"](query="printer")
+    assert client.search_tickets.await_count > 0
+
+
+@pytest.mark.asyncio
+async def test_list_updated_since_sorts_by_updated_at() -> None:
+    """Test the search parameters used by the syncer."""
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json=[{"id": 1, "login": "agent", "updated_at": "2024-01-02T00:00:00Z"}])
+
+    client = AsyncZammadClient(url=BASE_URL, http_token="test-token", transport=httpx.MockTransport(handler))
+    async with client:
+        users = await client.list_updated_since("users", "2024-01-01T00:00:00Z", page=2, per_page=50)
+
+    params = seen[0].url.params
+    assert seen[0].url.path == "/api/v1/users/search"
+    assert params["query"] == "updated_at:[2024-01-01T00:00:00Z TO *]"
+    assert (params["sort_by"], params["order_by"], params["page"]) == ("updated_at", "asc", "2")
+    assert users[0]["login"] == "agent"
@@ -0,0 +1,148 @@
+"""Tests for the pipelined paginator."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from mcp_zammad.pagination import collect_pages, fetch_pages
+from mcp_zammad.server import ZammadMCPServer
+
+TICKET = {
+    "id": 1,
+    "number": "12345",
+    "title": "Test Ticket",
+    "group_id": 1,
+    "state_id": 1,
+    "priority_id": 2,
+    "customer_id": 1,
+    "created_by_id": 1,
+    "updated_by_id": 1,
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-01T00:00:00Z",
+}
+
+
+def make_fetcher(total: int, per_page: int, delay: float = 0.0, later_first: bool = True):
+    """Return a page fetcher over ``total`` items plus a record of what it was asked for."""
+    state = {"requested": [], "cancelled": [], "active": 0, "peak": 0}
+
+    async def fetch_page(page: int) -> list[int]:
+        state["requested"].append(page)
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        try:
+            # By default later pages answer first to prove results are still yielded in order
+            await asyncio.sleep(delay / page if later_first else delay * page)
+            start = (page - 1) * per_page
+            return list(range(start, min(start + per_page, total)))
+        except asyncio.CancelledError:
+            state["cancelled"].append(page)
+            raise
+        finally:
+            state["active"] -= 1
+
+    return fetch_page, state
+
+
+@pytest.mark.asyncio
+async def test_pages_fetched_concurrently_in_order() -> None:
+    """Test that the window of pages is in flight at once and yielded in page order."""
+    fetch_page, state = make_fetcher(total=100, per_page=10, delay=0.05)
+
+    pages = [page async for page in fetch_pages(fetch_page, per_page=10, max_pages=4, window=4)]
+
+    assert [page[0] for page in pages] == [0, 10, 20, 30]
+    assert state["peak"] == 4
+    assert state["requested"] == [1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_short_page_cancels_prefetches() -> None:
+    """Test that reaching the end of results cancels pages fetched ahead."""
+    fetch_page, state = make_fetcher(total=5, per_page=10, delay=0.05, later_first=False)
+
+    items = await collect_pages(fetch_page, per_page=10, max_pages=4, window=4)
+
+    assert items == [0, 1, 2, 3, 4]
+    # Page 1 answers first, so the others are still waiting when it returns short
+    assert set(state["cancelled"]) == {2, 3, 4}
+    assert state["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_max_results_stops_fetching() -> None:
+    """Test that no further pages are requested once max_results is reached."""
+    fetch_page, state = make_fetcher(total=1000, per_page=10)
+
+    items = await collect_pages(fetch_page, per_page=10, max_results=25, window=2)
+
+    assert len(items) == 30
+    assert max(state["requested"]) <= 4
+    assert state["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_max_results_caps_prefetch() -> None:
+    """Test that pages max_results cannot use are never requested, even within the window."""
+    fetch_page, state = make_fetcher(total=1000, per_page=25, delay=0.01)
+
+    items = await collect_pages(fetch_page, start_page=3, per_page=25, max_pages=4, max_results=50, window=4)
+
+    assert len(items) == 50
+    assert state["requested"] == [3, 4]
+
+
+@pytest.mark.asyncio
+async def test_window_bounds_in_flight_requests() -> None:
+    """Test that a window of one degrades to sequential fetching."""
+    fetch_page, state = make_fetcher(total=50, per_page=10, delay=0.01)
+
+    items = await collect_pages(fetch_page, start_page=2, per_page=10, window=1)
+
+    assert items == list(range(10, 50))
+    assert state["peak"] == 1
+
+
+@pytest.mark.asyncio
+async def test_search_tickets_tool_prefetches_pages() -> None:
+    """Test that the search_tickets tool requests its pages concurrently."""
+    server = ZammadMCPServer(prefetch_window=3)
+    test_tools = {}
+
+    def capture_tool(name=None):
+        def decorator(func):
+            test_tools[name or func.__name__] = func
+            return func
+
+        return decorator
+
+    server.mcp.tool = capture_tool  # type: ignore[method-assign, assignment]
+    server._setup_tools()
+
+    in_flight = 0
+    peak = 0
+
+    async def search(**kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return [{**TICKET, "id": kwargs["page"] * 10 + i} for i in range(2)]
+
+    server.client = AsyncMock()
+    server.client.search_tickets.side_effect = search
+
+    result = await test_tools["search_tickets"](per_page=2, max_pages=3, max_results=0)
+
+    assert peak == 3
+    assert len(result) == 6
+    pages = [call.kwargs["page"] for call in server.client.search_tickets.await_args_list]
+    assert sorted(pages) == [1, 2, 3]
+
+
+def test_prefetch_window_from_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that the prefetch window can be configured through the environment."""
+    monkeypatch.setenv("ZAMMAD_PREFETCH_WINDOW", "6")
+    assert ZammadMCPServer().prefetch_window == 6
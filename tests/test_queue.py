@@ -0,0 +1,150 @@
+"""Tests for the delta-polled queue snapshots behind zammad://queue/{group}."""
+
+from typing import Any
+
+import pytest
+
+from mcp_zammad.queue import QueueSnapshots
+
+
+def make_ticket(ticket_id: int, updated_at: str, state: str = "open", group: str = "Support") -> dict[str, Any]:
+    return {
+        "id": ticket_id,
+        "number": str(79000 + ticket_id),
+        "title": f"Ticket {ticket_id}",
+        "group": group,
+        "state": state,
+        "priority": "2 normal",
+        "customer": "customer@example.com",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": updated_at,
+    }
+
+
+class FakeZammad:
+    """Serves a group's tickets in updated_at order, like a sorted Zammad search."""
+
+    def __init__(self) -> None:
+        self.tickets: dict[int, dict[str, Any]] = {}
+        self.calls: list[tuple[str, str | None, int]] = []
+
+    async def fetch(self, group: str, since: str | None, page: int, per_page: int) -> list[dict[str, Any]]:
+        self.calls.append((group, since, page))
+        matching = sorted(
+            (
+                ticket
+                for ticket in self.tickets.values()
+                if ticket["group"] == group and (since is None or ticket["updated_at"] >= since)
+            ),
+            key=lambda ticket: (ticket["updated_at"], ticket["id"]),
+        )
+        return matching[(page - 1) * per_page : page * per_page]
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_complete_beyond_one_page() -> None:
+    """Test that counts cover every ticket and each state lists its newest tickets."""
+    zammad = FakeZammad()
+    for ticket_id in range(1, 31):
+        state = "closed" if ticket_id % 3 == 0 else "open"
+        zammad.tickets[ticket_id] = make_ticket(ticket_id, f"2024-01-01T00:{ticket_id:02d}:00Z", state)
+    queues = QueueSnapshots(zammad.fetch, page_size=8, top_n=3)
+
+    result = await queues.render("Support")
+
+    assert "Total Tickets: 30" in result
+    assert "Open (20 tickets):" in result
+    assert "Closed (10 tickets):" in result
+    assert "... and 17 more tickets" in result
+    assert result.index("#79029") < result.index("#79028") < result.index("#79026")
+    assert "#79025" not in result
+
+
+@pytest.mark.asyncio
+async def test_reads_poll_only_changes_after_the_interval() -> None:
+    """Test memory-only reads within the poll interval and delta polls after it."""
+    zammad = FakeZammad()
+    for ticket_id in range(1, 4):
+        zammad.tickets[ticket_id] = make_ticket(ticket_id, f"2024-01-0{ticket_id}T00:00:00Z")
+    clock = Clock()
+    queues = QueueSnapshots(zammad.fetch, poll_interval=30, clock=clock)
+    await queues.render("Support")
+
+    zammad.calls.clear()
+    zammad.tickets[1] = make_ticket(1, "2024-01-05T00:00:00Z", state="closed")
+    assert "Open (3 tickets):" in await queues.render("Support")
+    assert zammad.calls == []
+
+    clock.now = 31
+    result = await queues.render("Support")
+    assert zammad.calls == [("Support", "2024-01-03T00:00:00Z", 1)]
+    assert "Open (2 tickets):" in result
+    assert "Closed (1 tickets):" in result
+    assert "Total Tickets: 3" in result
+
+
+@pytest.mark.asyncio
+async def test_observed_tickets_move_between_groups() -> None:
+    """Test that observed payloads update snapshots without polling."""
+    zammad = FakeZammad()
+    zammad.tickets[1] = make_ticket(1, "2024-01-01T00:00:00Z")
+    zammad.tickets[2] = make_ticket(2, "2024-01-01T00:00:00Z", group="Sales")
+    queues = QueueSnapshots(zammad.fetch)
+    await queues.render("Support")
+    await queues.render("Sales")
+
+    queues.observe([make_ticket(1, "2024-01-02T00:00:00Z", group="Sales")])
+    # Stale and partial payloads are ignored
+    queues.observe([make_ticket(2, "2023-12-31T00:00:00Z", state="closed", group="Sales"), {"id": 2, "title": "x"}])
+
+    assert "No tickets found" in await queues.render("Support")
+    sales = await queues.render("Sales")
+    assert "Total Tickets: 2" in sales
+    assert "Open (2 tickets):" in sales
+
+
+@pytest.mark.asyncio
+async def test_tickets_are_held_by_one_snapshot() -> None:
+    """Test that polled and observed tickets leave the snapshot of the group they moved out of."""
+    zammad = FakeZammad()
+    zammad.tickets[1] = make_ticket(1, "2024-01-01T00:00:00Z")
+    zammad.tickets[2] = make_ticket(2, "2024-01-01T00:00:00Z")
+    clock = Clock()
+    queues = QueueSnapshots(zammad.fetch, poll_interval=30, clock=clock)
+    await queues.render("Support")
+    await queues.render("Sales")
+
+    zammad.tickets[1] = make_ticket(1, "2024-01-02T00:00:00Z", group="Sales")
+    clock.now = 31
+    assert "Total Tickets: 1" in await queues.render("Sales")
+    # Moving to a group nobody has read drops the ticket as well
+    zammad.tickets[2] = make_ticket(2, "2024-01-02T00:00:00Z", group="Billing")
+    queues.observe([zammad.tickets[2]])
+
+    assert "No tickets found" in await queues.render("Support")
+    assert queues._groups == {1: "Sales"}
+
+
+@pytest.mark.asyncio
+async def test_failed_poll_serves_previous_snapshot() -> None:
+    """Test that a failing delta poll keeps the last snapshot."""
+    zammad = FakeZammad()
+    zammad.tickets[1] = make_ticket(1, "2024-01-01T00:00:00Z")
+    clock = Clock()
+    queues = QueueSnapshots(zammad.fetch, poll_interval=30, clock=clock)
+    await queues.render("Support")
+
+    async def broken(group: str, since: str | None, page: int, per_page: int) -> list[dict[str, Any]]:
+        raise ConnectionError("Zammad unavailable")
+
+    queues.fetch = broken
+    clock.now = 60
+    assert "Total Tickets: 1" in await queues.render("Support")
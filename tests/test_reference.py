@@ -0,0 +1,136 @@
+"""Tests for the reference data store."""
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from mcp_zammad.async_client import AsyncZammadClient
+from mcp_zammad.reference import ReferenceDataStore
+from mcp_zammad.server import ZammadMCPServer
+
+TIMESTAMPS = {"created_at": "2024-01-01T00:00:00Z", "updated_at": "2024-01-01T00:00:00Z"}
+GROUPS = [{"id": 1, "name": "Users", **TIMESTAMPS}, {"id": 2, "name": "Support", **TIMESTAMPS}]
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def counting_fetcher(records: list[dict[str, Any]], delay: float = 0.0):
+    """Return a fetcher that records how often and how concurrently it runs."""
+    state = {"calls": 0, "active": 0, "peak": 0}
+
+    async def fetch() -> list[dict[str, Any]]:
+        state["calls"] += 1
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(delay)
+        state["active"] -= 1
+        return records
+
+    return fetch, state
+
+
+@pytest.mark.asyncio
+async def test_load_fetches_kinds_concurrently() -> None:
+    """Test that load() fetches every kind at once and builds the name maps."""
+    active = 0
+    peak = 0
+
+    def fetcher(records: list[dict[str, Any]]):
+        async def fetch() -> list[dict[str, Any]]:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return records
+
+        return fetch
+
+    store = ReferenceDataStore(
+        {"groups": fetcher(GROUPS), "states": fetcher([{"id": 1, "name": "open"}]), "priorities": fetcher([])}
+    )
+    await store.load()
+
+    assert peak == 3
+    assert store.id_to_name("groups") == {1: "Users", 2: "Support"}
+    assert store.name_to_id("states") == {"open": 1}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_reads_fetch_once() -> None:
+    """Test that callers racing on an empty store share one fetch."""
+    fetch, state = counting_fetcher(GROUPS, delay=0.01)
+    store = ReferenceDataStore({"groups": fetch})
+
+    results = await asyncio.gather(*(store.get("groups") for _ in range(5)))
+
+    assert state["calls"] == 1
+    assert all(result == GROUPS for result in results)
+
+
+@pytest.mark.asyncio
+async def test_stale_data_is_served_while_refreshing() -> None:
+    """Test stale-while-revalidate: reads return immediately and a refresh runs in the background."""
+    clock = FakeClock()
+    fetch = AsyncMock(side_effect=[GROUPS, [{"id": 3, "name": "Sales"}]])
+    store = ReferenceDataStore({"groups": fetch}, refresh_interval=60, clock=clock)
+
+    await store.get("groups")
+    clock.now = 61
+    assert await store.get("groups") == GROUPS
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert store.peek("groups") == [{"id": 3, "name": "Sales"}]
+    assert store.name_to_id("groups") == {"Sales": 3}
+    assert not store.is_stale("groups")
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_previous_data() -> None:
+    """Test that a failing background refresh leaves the stale data in place."""
+    clock = FakeClock()
+    fetch = AsyncMock(side_effect=[GROUPS, RuntimeError("Zammad unavailable")])
+    store = ReferenceDataStore({"groups": fetch}, refresh_interval=60, clock=clock)
+
+    await store.get("groups")
+    clock.now = 61
+    await store.get("groups")
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert fetch.await_count == 2
+    assert await store.get("groups") == GROUPS
+
+
+@pytest.mark.asyncio
+async def test_initialize_preloads_reference_data() -> None:
+    """Test that server start-up loads groups, states and priorities before the first request."""
+    server = ZammadMCPServer()
+    # Observer registration is synchronous; only the request methods are AsyncMocks
+    client = Mock(spec=AsyncZammadClient)
+    client.get_current_user.return_value = {"email": "agent@example.com"}
+    client.get_groups.return_value = GROUPS
+    client.get_ticket_states.return_value = []
+    client.get_ticket_priorities.return_value = []
+
+    with patch("mcp_zammad.server.AsyncZammadClient", return_value=client):
+        await server.initialize()
+    try:
+        groups = await server._get_cached_groups()
+    finally:
+        await server.reference.stop()
+
+    assert [group.name for group in groups] == ["Users", "Support"]
+    client.get_groups.assert_awaited_once()
+    client.get_ticket_states.assert_awaited_once()
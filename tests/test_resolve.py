@@ -0,0 +1,133 @@
+"""Tests for local ID to name resolution of unexpanded search results."""
+
+from typing import Any
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from mcp_zammad.async_client import AsyncZammadClient
+from mcp_zammad.reference import ReferenceDataStore
+from mcp_zammad.resolve import NameResolver
+from mcp_zammad.server import ZammadMCPServer
+
+BASE_URL = "https://test.zammad.com/api/v1"
+
+TICKET = {
+    "id": 1,
+    "number": "79001",
+    "title": "Printer on fire",
+    "group_id": 2,
+    "state_id": 1,
+    "priority_id": 3,
+    "customer_id": 10,
+    "owner_id": 11,
+    "created_by_id": 1,
+    "updated_by_id": 1,
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-01T00:00:00Z",
+}
+
+
+def make_reference() -> ReferenceDataStore:
+    return ReferenceDataStore(
+        {
+            "groups": AsyncMock(return_value=[{"id": 2, "name": "Support"}]),
+            "states": AsyncMock(return_value=[{"id": 1, "name": "open"}]),
+            "priorities": AsyncMock(return_value=[{"id": 3, "name": "3 high"}]),
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_resolver_fills_names_from_local_data() -> None:
+    """Test that IDs are resolved through reference data and one batched user lookup."""
+    get_users = AsyncMock(
+        return_value={10: {"id": 10, "login": "customer@example.com"}, 11: {"id": 11, "login": "agent"}}
+    )
+    resolver = NameResolver(make_reference(), get_users)
+
+    tickets = await resolver.resolve_tickets([dict(TICKET), {**TICKET, "id": 2, "state": "closed"}])
+
+    assert tickets[0]["group"] == "Support"
+    assert tickets[0]["state"] == "open"
+    assert tickets[0]["priority"] == "3 high"
+    assert tickets[0]["customer"] == "customer@example.com"
+    assert tickets[0]["owner"] == "agent"
+    # Names that are already present are kept
+    assert tickets[1]["state"] == "closed"
+    get_users.assert_awaited_once_with([10, 11])
+
+
+@pytest.mark.asyncio
+async def test_unexpanded_search_reads_assets_and_caches_users() -> None:
+    """Test that ID-only search results are rebuilt from their assets."""
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(
+            200,
+            json={
+                "tickets": [1],
+                "tickets_count": 1,
+                "assets": {
+                    "Ticket": {"1": TICKET},
+                    "User": {"10": {"id": 10, "login": "customer@example.com"}},
+                },
+            },
+        )
+
+    client = AsyncZammadClient(url=BASE_URL, http_token="test-token", transport=httpx.MockTransport(handler))
+    async with client:
+        tickets = await client.search_tickets(query="printer", expand=False)
+        users = await client.get_users([10])
+
+    assert "expand" not in seen[0].url.params
+    assert tickets == [TICKET]
+    # The user came with the search assets, so no further request was needed
+    assert users == {10: {"id": 10, "login": "customer@example.com"}}
+    assert len(seen) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_users_batches_missing_ids() -> None:
+    """Test that uncached users are fetched with one search, falling back to single lookups."""
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        if request.url.path == "/api/v1/users/search":
+            assert request.url.params["query"] == "id:(1 OR 2 OR 3)"
+            return httpx.Response(200, json=[{"id": 1, "login": "a"}, {"id": 2, "login": "b"}])
+        return httpx.Response(200, json={"id": 3, "login": "c"})
+
+    client = AsyncZammadClient(url=BASE_URL, http_token="test-token", transport=httpx.MockTransport(handler))
+    async with client:
+        users = await client.get_users([1, 2, 3, 2])
+
+    assert sorted(users) == [1, 2, 3]
+    assert seen == ["/api/v1/users/search", "/api/v1/users/3"]
+
+
+@pytest.mark.asyncio
+async def test_search_tickets_tool_resolves_locally() -> None:
+    """Test that the tool asks for unexpanded results and still reports names."""
+    server = ZammadMCPServer(local_name_resolution=True)
+    server.reference = make_reference()
+    server.resolver.reference = server.reference
+    client = AsyncMock()
+    client.search_tickets.return_value = [dict(TICKET)]
+    client.get_users.return_value = {10: {"id": 10, "login": "customer@example.com"}, 11: {"id": 11, "login": "agent"}}
+    server.client = client
+
+    tools: dict[str, Any] = {}
+    server.mcp.tool = lambda name=None: lambda func: tools.setdefault(name or func.__name__, func)  # type: ignore[method-assign, assignment, misc]
+    server._setup_tools()
+
+    result = await tools["search_tickets"](query="printer", max_pages=1)
+
+    assert client.search_tickets.await_args.kwargs["expand"] is False
+    assert "State: open" in result[0]
+    assert "Group: Support" in result[0]
+    assert "Customer: customer@example.com" in result[0]
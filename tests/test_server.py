@@ -10,6 +10,8 @@ from unittest.mock import AsyncMock, MagicMock, Mock, patch
 import pytest
 
 from mcp_zammad import server
+from mcp_zammad.async_client import AsyncZammadClient
+from mcp_zammad.client import ZammadClient
 from mcp_zammad.models import Attachment
 from mcp_zammad.server import (
     _UNINITIALIZED,
@@ -51,8 +53,8 @@ def reset_client():
 @pytest.fixture
 def mock_zammad_client():
     """Fixture that provides a properly initialized mock client."""
-    with patch("mcp_zammad.server.ZammadClient") as mock_client_class:
-        mock_instance = Mock()
+    with patch("mcp_zammad.server.AsyncZammadClient") as mock_client_class:
+        mock_instance = Mock(spec=AsyncZammadClient)
         mock_instance.get_current_user.return_value = {
             "email": "test@example.com",
             "id": 1,
@@ -64,11 +66,10 @@ def mock_zammad_client():
 
 
 @pytest.fixture
-def server_instance(mock_zammad_client):
-    """Fixture that provides an initialized ZammadMCPServer instance."""
-    mock_instance, _ = mock_zammad_client
+def server_instance():
+    """Fixture that provides a ZammadMCPServer instance with a mocked sync client."""
     server_inst = ZammadMCPServer()
-    server_inst.client = mock_instance
+    server_inst.client = Mock(spec=ZammadClient)
     return server_inst
 
 
@@ -220,7 +221,7 @@ async def test_prompts():
 @pytest.mark.asyncio
 async def test_initialization_failure():
     """Test that initialization handles failures gracefully."""
-    with patch("mcp_zammad.server.ZammadClient") as mock_client_class:
+    with patch("mcp_zammad.server.AsyncZammadClient") as mock_client_class:
         # Make the client initialization fail
         mock_client_class.side_effect = Exception("Connection failed")
 
@@ -229,7 +230,8 @@ async def test_initialization_failure():
             await initialize()
 
 
-def test_tool_without_client():
+@pytest.mark.asyncio
+async def test_tool_without_client():
     """Test that tools fail gracefully when client is not initialized."""
     # Save the original client
     original_client = server.zammad_client
@@ -240,7 +242,7 @@ def test_tool_without_client():
 
         # Should raise RuntimeError when client is not initialized
         with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-            search_tickets()
+            await search_tickets()
     finally:
         # Restore the original client
         server.zammad_client = original_client
@@ -291,7 +293,7 @@ async def test_search_tickets_with_filters(mock_zammad_client, ticket_factory, s
 
     server.zammad_client = mock_instance
 
-    result = search_tickets(state=state, priority=priority)
+    result = await search_tickets(state=state, priority=priority)
 
     assert len(result) == expected_count
 
@@ -316,7 +318,7 @@ async def test_search_tickets_pagination(mock_zammad_client, sample_ticket_data,
 
     server.zammad_client = mock_instance
 
-    search_tickets(page=page, per_page=per_page)
+    await search_tickets(page=page, per_page=per_page)
 
     # Verify pagination parameters were passed correctly
     mock_instance.search_tickets.assert_called_once()
@@ -341,7 +343,7 @@ async def test_get_ticket_with_invalid_id(mock_zammad_client):
     server.zammad_client = mock_instance
 
     with pytest.raises(Exception, match="Ticket not found"):
-        get_ticket(ticket_id=99999)
+        await get_ticket(ticket_id=99999)
 
 
 @pytest.mark.asyncio
@@ -357,7 +359,7 @@ async def test_create_ticket_with_invalid_data(mock_zammad_client):
     server.zammad_client = mock_instance
 
     with pytest.raises(ValueError, match="Invalid customer email"):
-        create_ticket(title="Test", group="InvalidGroup", customer="not-an-email", article_body="Test")
+        await create_ticket(title="Test", group="InvalidGroup", customer="not-an-email", article_body="Test")
 
 
 @pytest.mark.asyncio
@@ -382,7 +384,7 @@ async def test_search_with_malformed_response(mock_zammad_client):
     # Using a more specific exception would be better, but we're catching the general Exception
     # that gets raised when Pydantic validation fails
     with pytest.raises((ValueError, TypeError)):  # More specific than general Exception
-        search_tickets()
+        await search_tickets()
 
 
 # ==================== TOOL SPECIFIC TESTS ====================
@@ -402,7 +404,7 @@ async def test_search_tickets_tool(mock_zammad_client, sample_ticket_data):
     # Ensure we're using the mocked client
     server.zammad_client = mock_instance
 
-    result = search_tickets(state="open")
+    result = await search_tickets(state="open")
 
     # Verify the result
     assert len(result) == 1
@@ -429,7 +431,7 @@ async def test_get_ticket_tool(mock_zammad_client, sample_ticket_data, sample_ar
 
     server.zammad_client = mock_instance
 
-    result = get_ticket(ticket_id=1, include_articles=True)
+    result = await get_ticket(ticket_id=1, include_articles=True)
 
     # Verify the result
     assert result.id == 1
@@ -461,7 +463,7 @@ async def test_create_ticket_tool(mock_zammad_client, ticket_factory):
 
     server.zammad_client = mock_instance
 
-    result = create_ticket(
+    result = await create_ticket(
         title="New Test Ticket", group="Support", customer="customer@example.com", article_body="Test article body"
     )
 
@@ -493,7 +495,7 @@ async def test_add_article_tool(mock_zammad_client, sample_article_data):
 
     server.zammad_client = mock_instance
 
-    result = add_article(ticket_id=1, body="New comment", article_type="note", internal=False)
+    result = await add_article(ticket_id=1, body="New comment", article_type="note", internal=False)
 
     assert result.body == "Test article"
     assert result.type == "note"
@@ -514,7 +516,7 @@ async def test_get_user_tool(mock_zammad_client, sample_user_data):
 
     server.zammad_client = mock_instance
 
-    result = get_user(user_id=1)
+    result = await get_user(user_id=1)
 
     assert result.id == 1
     assert result.email == "test@example.com"
@@ -535,12 +537,12 @@ async def test_tag_operations(mock_zammad_client):
     server.zammad_client = mock_instance
 
     # Test adding tag
-    add_result = add_ticket_tag(ticket_id=1, tag="urgent")
+    add_result = await add_ticket_tag(ticket_id=1, tag="urgent")
     assert add_result["success"] is True
     mock_instance.add_ticket_tag.assert_called_once_with(1, "urgent")
 
     # Test removing tag
-    remove_result = remove_ticket_tag(ticket_id=1, tag="urgent")
+    remove_result = await remove_ticket_tag(ticket_id=1, tag="urgent")
     assert remove_result["success"] is True
     mock_instance.remove_ticket_tag.assert_called_once_with(1, "urgent")
 
@@ -562,7 +564,7 @@ async def test_update_ticket_tool(mock_zammad_client, sample_ticket_data):
     server.zammad_client = mock_instance
 
     # Test updating multiple fields
-    result = update_ticket(
+    result = await update_ticket(
         ticket_id=1, title="Updated Title", state="open", priority="3 high", owner="agent@example.com", group="Support"
     )
 
@@ -585,7 +587,7 @@ async def test_get_organization_tool(mock_zammad_client, sample_organization_dat
     await initialize()
     server.zammad_client = mock_instance
 
-    result = get_organization(org_id=1)
+    result = await get_organization(org_id=1)
 
     assert result.id == 1
     assert result.name == "Test Organization"
@@ -605,7 +607,7 @@ async def test_search_organizations_tool(mock_zammad_client, sample_organization
     server.zammad_client = mock_instance
 
     # Test basic search
-    results = search_organizations(query="test")
+    results = await search_organizations(query="test")
 
     assert len(results) == 1
     assert results[0].name == "Test Organization"
@@ -614,7 +616,7 @@ async def test_search_organizations_tool(mock_zammad_client, sample_organization
 
     # Test with pagination
     mock_instance.reset_mock()
-    search_organizations(query="test", page=2, per_page=50)
+    await search_organizations(query="test", page=2, per_page=50)
 
     mock_instance.search_organizations.assert_called_once_with(query="test", page=2, per_page=50)
 
@@ -653,7 +655,7 @@ async def test_list_groups_tool(mock_zammad_client):
     await initialize()
     server.zammad_client = mock_instance
 
-    results = list_groups()
+    results = await list_groups()
 
     assert len(results) == 3
     assert results[0].name == "Users"
@@ -697,7 +699,7 @@ async def test_list_ticket_states_tool(mock_zammad_client):
     await initialize()
     server.zammad_client = mock_instance
 
-    results = list_ticket_states()
+    results = await list_ticket_states()
 
     assert len(results) == 3
     assert results[0].name == "new"
@@ -741,7 +743,7 @@ async def test_list_ticket_priorities_tool(mock_zammad_client):
     await initialize()
     server.zammad_client = mock_instance
 
-    results = list_ticket_priorities()
+    results = await list_ticket_priorities()
 
     assert len(results) == 3
     assert results[0].name == "1 low"
@@ -762,7 +764,7 @@ async def test_get_current_user_tool(mock_zammad_client, sample_user_data):
     await initialize()
     server.zammad_client = mock_instance
 
-    result = get_current_user()
+    result = await get_current_user()
 
     assert result.id == 1
     assert result.email == "test@example.com"
@@ -784,7 +786,7 @@ async def test_search_users_tool(mock_zammad_client, sample_user_data):
     server.zammad_client = mock_instance
 
     # Test basic search
-    results = search_users(query="test@example.com")
+    results = await search_users(query="test@example.com")
 
     assert len(results) == 1
     assert results[0].email == "test@example.com"
@@ -794,7 +796,7 @@ async def test_search_users_tool(mock_zammad_client, sample_user_data):
 
     # Test with pagination
     mock_instance.reset_mock()
-    search_users(query="test", page=3, per_page=10)
+    await search_users(query="test", page=3, per_page=10)
 
     mock_instance.search_users.assert_called_once_with(query="test", page=3, per_page=10)
 
@@ -820,7 +822,7 @@ async def test_get_ticket_stats_tool(mock_zammad_client):
     server.zammad_client = mock_instance
 
     # Test basic stats
-    stats = get_ticket_stats()
+    stats = await get_ticket_stats()
 
     assert stats.total_count == 6
     assert stats.open_count == 4  # new + open tickets
@@ -834,24 +836,27 @@ async def test_get_ticket_stats_tool(mock_zammad_client):
     mock_instance.reset_mock()
     mock_instance.search_tickets.return_value = mock_tickets[:3]
 
-    stats = get_ticket_stats(group="Support")
+    stats = await get_ticket_stats(group="Support")
 
     assert stats.total_count == 3
     assert stats.open_count == 3
 
     mock_instance.search_tickets.assert_called_once_with(group="Support", per_page=100)
 
-    # Test with date filters (should log warning but still work)
+    # Test with date filters (pushed into the search query)
     mock_instance.reset_mock()
     mock_instance.search_tickets.return_value = mock_tickets
 
-    stats = get_ticket_stats(start_date="2024-01-01", end_date="2024-12-31")
+    stats = await get_ticket_stats(start_date="2024-01-01", end_date="2024-12-31")
 
     assert stats.total_count == 6
-    mock_instance.search_tickets.assert_called_once_with(group=None, per_page=100)
+    mock_instance.search_tickets.assert_called_once_with(
+        query="created_at:[2024-01-01T00:00:00Z TO 2025-01-01T00:00:00Z}", group=None, per_page=100
+    )
 
 
-def test_resource_handlers():
+@pytest.mark.asyncio
+async def test_resource_handlers():
     """Test resource handler registration and execution."""
     server = ZammadMCPServer()
     server.client = Mock()
@@ -897,7 +902,7 @@ def test_resource_handlers():
     server._setup_resources()
 
     # Now test the captured resource handlers
-    result = test_resources["zammad://ticket/{ticket_id}"](ticket_id="1")
+    result = await test_resources["zammad://ticket/{ticket_id}"](ticket_id="1")
 
     assert "Ticket #12345 - Test Issue" in result
     assert "State: open" in result
@@ -918,7 +923,7 @@ def test_resource_handlers():
         "created_at": "2024-01-01T00:00:00Z",
     }
 
-    result = test_resources["zammad://user/{user_id}"](user_id="1")
+    result = await test_resources["zammad://user/{user_id}"](user_id="1")
 
     assert "User: John Doe" in result
     assert "Email: john.doe@example.com" in result
@@ -934,7 +939,7 @@ def test_resource_handlers():
         "created_at": "2024-01-01T00:00:00Z",
     }
 
-    result = test_resources["zammad://organization/{org_id}"](org_id="1")
+    result = await test_resources["zammad://organization/{org_id}"](org_id="1")
 
     assert "Organization: Test Corporation" in result
     assert "Domain: testcorp.com" in result
@@ -962,7 +967,7 @@ def test_resource_handlers():
         },
     ]
 
-    result = test_resources["zammad://queue/{group}"](group="Support")
+    result = await test_resources["zammad://queue/{group}"](group="Support")
 
     assert "Queue for Group: Support" in result
     assert "Total Tickets: 2" in result
@@ -974,11 +979,12 @@ def test_resource_handlers():
     # Test empty queue resource
     server.client.search_tickets.return_value = []
 
-    result = test_resources["zammad://queue/{group}"](group="EmptyGroup")
+    result = await test_resources["zammad://queue/{group}"](group="EmptyGroup")
     assert "Queue for group 'EmptyGroup': No tickets found" in result
 
 
-def test_resource_error_handling():
+@pytest.mark.asyncio
+async def test_resource_error_handling():
     """Test resource error handling."""
     server = ZammadMCPServer()
     server.client = Mock()
@@ -1002,25 +1008,25 @@ def test_resource_error_handling():
     # Test ticket resource error
     server.client.get_ticket.side_effect = Exception("API Error")
 
-    result = test_resources["zammad://ticket/{ticket_id}"](ticket_id="999")
+    result = await test_resources["zammad://ticket/{ticket_id}"](ticket_id="999")
     assert "Error retrieving ticket 999: API Error" in result
 
     # Test user resource error
     server.client.get_user.side_effect = Exception("User not found")
 
-    result = test_resources["zammad://user/{user_id}"](user_id="999")
+    result = await test_resources["zammad://user/{user_id}"](user_id="999")
     assert "Error retrieving user 999: User not found" in result
 
     # Test org resource error
     server.client.get_organization.side_effect = Exception("Org not found")
 
-    result = test_resources["zammad://organization/{org_id}"](org_id="999")
+    result = await test_resources["zammad://organization/{org_id}"](org_id="999")
     assert "Error retrieving organization 999: Org not found" in result
 
     # Test queue resource error
     server.client.search_tickets.side_effect = Exception("Queue not found")
 
-    result = test_resources["zammad://queue/{group}"](group="nonexistent")
+    result = await test_resources["zammad://queue/{group}"](group="nonexistent")
     assert "Error retrieving queue for group nonexistent: Queue not found" in result
 
 
@@ -1097,7 +1103,7 @@ async def test_initialize_with_dotenv():
         with patch("mcp_zammad.server.Path.cwd") as mock_cwd:
             mock_cwd.return_value = pathlib.Path(temp_env_path).parent
 
-            with patch("mcp_zammad.server.ZammadClient") as mock_client_class:
+            with patch("mcp_zammad.server.AsyncZammadClient") as mock_client_class:
                 mock_client = MagicMock()
                 mock_client.get_current_user.return_value = {"email": "test@example.com"}
                 mock_client_class.return_value = mock_client
@@ -1132,7 +1138,7 @@ async def test_initialize_with_envrc_warning():
             with (
                 patch.dict(os.environ, {}, clear=True),
                 patch("mcp_zammad.server.logger") as mock_logger,
-                patch("mcp_zammad.server.ZammadClient") as mock_client_class,
+                patch("mcp_zammad.server.AsyncZammadClient") as mock_client_class,
             ):
                 # Patch ZammadClient to avoid the ConfigException
                 mock_client_class.side_effect = RuntimeError("No authentication method provided")
@@ -1168,7 +1174,8 @@ async def test_lifespan_context_manager():
         assert result is None
 
 
-def test_tool_implementations_are_called():
+@pytest.mark.asyncio
+async def test_tool_implementations_are_called():
     """Test that tool implementations are actually executed."""
     server = ZammadMCPServer()
     server.client = Mock()
@@ -1254,12 +1261,14 @@ def test_tool_implementations_are_called():
             break
 
     assert search_tickets_tool is not None
-    result = search_tickets_tool(query="test")
+    result = await search_tickets_tool(query="test")
     assert len(result) == 1
-    server.client.search_tickets.assert_called_once()
+    # Later pages are prefetched concurrently and discarded once page 1 comes back short
+    assert server.client.search_tickets.call_args_list[0].kwargs["page"] == 1
 
 
-def test_get_ticket_stats_pagination():
+@pytest.mark.asyncio
+async def test_get_ticket_stats_pagination():
     """Test that get_ticket_stats tool uses pagination correctly."""
     server = ZammadMCPServer()
     server.client = Mock()
@@ -1296,7 +1305,7 @@ def test_get_ticket_stats_pagination():
 
     # Get the captured tool and call it
     assert "get_ticket_stats" in test_tools
-    result = test_tools["get_ticket_stats"]()
+    result = await test_tools["get_ticket_stats"]()
 
     # Verify pagination calls
     assert server.client.search_tickets.call_count == 3
@@ -1312,8 +1321,9 @@ def test_get_ticket_stats_pagination():
     assert result.escalated_count == 1
 
 
-def test_get_ticket_stats_with_date_warning():
-    """Test get_ticket_stats with date parameters shows warning."""
+@pytest.mark.asyncio
+async def test_get_ticket_stats_with_date_range():
+    """Test get_ticket_stats scans a date range in parallel created_at windows."""
     server = ZammadMCPServer()
     server.client = Mock()
 
@@ -1336,151 +1346,170 @@ def test_get_ticket_stats_with_date_warning():
     # Mock search results
     server.client.search_tickets.return_value = []
 
-    with patch("mcp_zammad.server.logger") as mock_logger:
-        # Get the captured tool
-        assert "get_ticket_stats" in test_tools
-        stats = test_tools["get_ticket_stats"](start_date="2024-01-01", end_date="2024-12-31")
+    assert "get_ticket_stats" in test_tools
+    stats = await test_tools["get_ticket_stats"](start_date="2024-01-01", end_date="2024-12-31")
 
-        assert stats.total_count == 0
-        mock_logger.warning.assert_called_with("Date filtering not yet implemented - ignoring date parameters")
+    assert stats.total_count == 0
+    # One scan per window, together covering exactly the requested year
+    queries = [call.kwargs["query"] for call in server.client.search_tickets.call_args_list]
+    assert len(queries) == server.prefetch_window
+    assert queries[0].startswith("created_at:[2024-01-01T00:00:00Z TO ")
+    assert queries[-1].endswith(" TO 2025-01-01T00:00:00Z}")
 
 
 # ==================== LEGACY WRAPPER TESTS ====================
 
 
-def test_legacy_search_tickets_without_client():
+@pytest.mark.asyncio
+async def test_legacy_search_tickets_without_client():
     """Test legacy search_tickets wrapper when client not initialized."""
     # Reset the global client
     server.zammad_client = None
 
     with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-        search_tickets()
+        await search_tickets()
 
 
-def test_legacy_get_ticket_without_client():
+@pytest.mark.asyncio
+async def test_legacy_get_ticket_without_client():
     """Test legacy get_ticket wrapper when client not initialized."""
     server.zammad_client = None
 
     with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-        get_ticket(1)
+        await get_ticket(1)
 
 
-def test_legacy_create_ticket_without_client():
+@pytest.mark.asyncio
+async def test_legacy_create_ticket_without_client():
     """Test legacy create_ticket wrapper when client not initialized."""
     server.zammad_client = None
 
     with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-        create_ticket("Test", "Group", "customer@example.com", "Body")
+        await create_ticket("Test", "Group", "customer@example.com", "Body")
 
 
-def test_legacy_add_article_without_client():
+@pytest.mark.asyncio
+async def test_legacy_add_article_without_client():
     """Test legacy add_article wrapper when client not initialized."""
     server.zammad_client = None
 
     with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-        add_article(1, "Body")
+        await add_article(1, "Body")
 
 
-def test_legacy_get_user_without_client():
+@pytest.mark.asyncio
+async def test_legacy_get_user_without_client():
     """Test legacy get_user wrapper when client not initialized."""
     server.zammad_client = None
 
     with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-        get_user(1)
+        await get_user(1)
 
 
-def test_legacy_add_ticket_tag_without_client():
+@pytest.mark.asyncio
+async def test_legacy_add_ticket_tag_without_client():
     """Test legacy add_ticket_tag wrapper when client not initialized."""
     server.zammad_client = None
 
     with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-        add_ticket_tag(1, "tag")
+        await add_ticket_tag(1, "tag")
 
 
-def test_legacy_remove_ticket_tag_without_client():
+@pytest.mark.asyncio
+async def test_legacy_remove_ticket_tag_without_client():
     """Test legacy remove_ticket_tag wrapper when client not initialized."""
     server.zammad_client = None
 
     with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-        remove_ticket_tag(1, "tag")
+        await remove_ticket_tag(1, "tag")
 
 
-def test_legacy_update_ticket_without_client():
+@pytest.mark.asyncio
+async def test_legacy_update_ticket_without_client():
     """Test legacy update_ticket wrapper when client not initialized."""
     server.zammad_client = None
 
     with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-        update_ticket(1, title="New Title")
+        await update_ticket(1, title="New Title")
 
 
-def test_legacy_get_organization_without_client():
+@pytest.mark.asyncio
+async def test_legacy_get_organization_without_client():
     """Test legacy get_organization wrapper when client not initialized."""
     server.zammad_client = None
 
     with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-        get_organization(1)
+        await get_organization(1)
 
 
-def test_legacy_search_organizations_without_client():
+@pytest.mark.asyncio
+async def test_legacy_search_organizations_without_client():
     """Test legacy search_organizations wrapper when client not initialized."""
     server.zammad_client = None
 
     with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-        search_organizations("test")
+        await search_organizations("test")
 
 
-def test_legacy_list_groups_without_client():
+@pytest.mark.asyncio
+async def test_legacy_list_groups_without_client():
     """Test legacy list_groups wrapper when client not initialized."""
     server.zammad_client = None
 
     with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-        list_groups()
+        await list_groups()
 
 
-def test_legacy_list_ticket_states_without_client():
+@pytest.mark.asyncio
+async def test_legacy_list_ticket_states_without_client():
     """Test legacy list_ticket_states wrapper when client not initialized."""
     server.zammad_client = None
 
     with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-        list_ticket_states()
+        await list_ticket_states()
 
 
-def test_legacy_list_ticket_priorities_without_client():
+@pytest.mark.asyncio
+async def test_legacy_list_ticket_priorities_without_client():
     """Test legacy list_ticket_priorities wrapper when client not initialized."""
     server.zammad_client = None
 
     with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-        list_ticket_priorities()
+        await list_ticket_priorities()
 
 
-def test_legacy_get_current_user_without_client():
+@pytest.mark.asyncio
+async def test_legacy_get_current_user_without_client():
     """Test legacy get_current_user wrapper when client not initialized."""
     server.zammad_client = None
 
     with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-        get_current_user()
+        await get_current_user()
 
 
-def test_legacy_search_users_without_client():
+@pytest.mark.asyncio
+async def test_legacy_search_users_without_client():
     """Test legacy search_users wrapper when client not initialized."""
     server.zammad_client = None
 
     with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-        search_users("test")
+        await search_users("test")
 
 
-def test_legacy_get_ticket_stats_without_client():
+@pytest.mark.asyncio
+async def test_legacy_get_ticket_stats_without_client():
     """Test legacy get_ticket_stats wrapper when client not initialized."""
     server.zammad_client = None
 
     with pytest.raises(RuntimeError, match="Zammad client not initialized"):
-        get_ticket_stats()
+        await get_ticket_stats()
 
 
 class TestCachingMethods:
     """Test the caching functionality."""
 
-    def test_cached_groups(self) -> None:
+    @pytest.mark.asyncio
+    async def test_cached_groups(self) -> None:
         """Test that groups are cached properly."""
         # Create server instance with mocked client
         server = ZammadMCPServer()
@@ -1510,18 +1539,19 @@ class TestCachingMethods:
         server.client.get_groups.return_value = groups_data
 
         # First call should hit the API
-        result1 = server._get_cached_groups()
+        result1 = await server._get_cached_groups()
         assert len(result1) == 2
         assert result1[0].name == "Users"
         server.client.get_groups.assert_called_once()
 
         # Second call should use cache
-        result2 = server._get_cached_groups()
+        result2 = await server._get_cached_groups()
         assert result1 == result2
         # Still only called once
         server.client.get_groups.assert_called_once()
 
-    def test_cached_states(self) -> None:
+    @pytest.mark.asyncio
+    async def test_cached_states(self) -> None:
         """Test that ticket states are cached properly."""
         # Create server instance with mocked client
         server = ZammadMCPServer()
@@ -1552,17 +1582,18 @@ class TestCachingMethods:
         server.client.get_ticket_states.return_value = states_data
 
         # First call
-        result1 = server._get_cached_states()
+        result1 = await server._get_cached_states()
         assert len(result1) == 2
         assert result1[0].name == "new"
         server.client.get_ticket_states.assert_called_once()
 
         # Second call uses cache
-        result2 = server._get_cached_states()
+        result2 = await server._get_cached_states()
         assert result1 == result2
         server.client.get_ticket_states.assert_called_once()
 
-    def test_cached_priorities(self) -> None:
+    @pytest.mark.asyncio
+    async def test_cached_priorities(self) -> None:
         """Test that ticket priorities are cached properly."""
         # Create server instance with mocked client
         server = ZammadMCPServer()
@@ -1591,17 +1622,18 @@ class TestCachingMethods:
         server.client.get_ticket_priorities.return_value = priorities_data
 
         # First call
-        result1 = server._get_cached_priorities()
+        result1 = await server._get_cached_priorities()
         assert len(result1) == 2
         assert result1[0].name == "1 low"
         server.client.get_ticket_priorities.assert_called_once()
 
         # Second call uses cache
-        result2 = server._get_cached_priorities()
+        result2 = await server._get_cached_priorities()
         assert result1 == result2
         server.client.get_ticket_priorities.assert_called_once()
 
-    def test_clear_caches(self) -> None:
+    @pytest.mark.asyncio
+    async def test_clear_caches(self) -> None:
         """Test that clear_caches clears all caches."""
         # Create server instance with mocked client
         server = ZammadMCPServer()
@@ -1648,9 +1680,9 @@ class TestCachingMethods:
         server.client.get_ticket_priorities.return_value = priorities_data
 
         # Populate caches
-        server._get_cached_groups()
-        server._get_cached_states()
-        server._get_cached_priorities()
+        await server._get_cached_groups()
+        await server._get_cached_states()
+        await server._get_cached_priorities()
 
         # Verify APIs were called
         assert server.client.get_groups.call_count == 1
@@ -1661,9 +1693,9 @@ class TestCachingMethods:
         server.clear_caches()
 
         # Next calls should hit API again
-        server._get_cached_groups()
-        server._get_cached_states()
-        server._get_cached_priorities()
+        await server._get_cached_groups()
+        await server._get_cached_states()
+        await server._get_cached_priorities()
 
         # APIs should be called twice now
         assert server.client.get_groups.call_count == 2
@@ -1890,8 +1922,9 @@ class TestAttachmentSupport:
     @pytest.mark.asyncio
     async def test_get_article_attachments_legacy_function(self) -> None:
         """Test legacy get_article_attachments function."""
-        with patch("mcp_zammad.server.ZammadClient") as mock_client_class:
-            mock_instance = mock_client_class.return_value
+        with patch("mcp_zammad.server.AsyncZammadClient") as mock_client_class:
+            mock_instance = mock_client_class.return_value = Mock(spec=AsyncZammadClient)
+            mock_instance.get_current_user.return_value = {"email": "test@example.com"}
             mock_instance.get_article_attachments.return_value = [
                 {"id": 1, "filename": "test.pdf", "created_at": "2024-01-01T00:00:00Z"}
             ]
@@ -1899,7 +1932,7 @@ class TestAttachmentSupport:
             await initialize()
             server.zammad_client = mock_instance
 
-            result = get_article_attachments(123, 456)
+            result = await get_article_attachments(123, 456)
 
             assert len(result) == 1
             assert result[0].filename == "test.pdf"
@@ -1908,14 +1941,15 @@ class TestAttachmentSupport:
     @pytest.mark.asyncio
     async def test_download_attachment_legacy_function(self) -> None:
         """Test legacy download_attachment function."""
-        with patch("mcp_zammad.server.ZammadClient") as mock_client_class:
-            mock_instance = mock_client_class.return_value
+        with patch("mcp_zammad.server.AsyncZammadClient") as mock_client_class:
+            mock_instance = mock_client_class.return_value = Mock(spec=AsyncZammadClient)
+            mock_instance.get_current_user.return_value = {"email": "test@example.com"}
             mock_instance.download_attachment.return_value = b"file content"
 
             await initialize()
             server.zammad_client = mock_instance
 
-            result = download_attachment(123, 456, 789)
+            result = await download_attachment(123, 456, 789)
 
             expected = base64.b64encode(b"file content").decode("utf-8")
             assert result == expected
@@ -0,0 +1,244 @@
+"""Tests for count-query based ticket statistics."""
+
+import asyncio
+import itertools
+import random
+import statistics
+from typing import Any
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from mcp_zammad.async_client import AsyncZammadClient
+from mcp_zammad.server import ZammadMCPServer
+from mcp_zammad.stats import (
+    QuantileSketch,
+    RunningStats,
+    TicketStatsAccumulator,
+    bucket_queries,
+    count_ticket_stats,
+    created_at_range,
+    split_created_at_range,
+)
+
+BASE_URL = "https://test.zammad.com/api/v1"
+
+
+def setup_tools(server: ZammadMCPServer) -> dict[str, Any]:
+    tools: dict[str, Any] = {}
+    server.mcp.tool = lambda name=None: lambda func: tools.setdefault(name or func.__name__, func)  # type: ignore[method-assign, assignment, misc]
+    server._setup_system_tools()
+    return tools
+
+
+def test_bucket_queries_use_known_pending_states() -> None:
+    """Test that every state with "pending" in its name lands in the pending bucket."""
+    queries = bucket_queries(["new", "open", "closed", "pending reminder", "pending customer feedback"])
+
+    assert queries["total"] is None
+    assert queries["pending"] == 'state.name:("pending customer feedback" OR "pending reminder")'
+    assert queries["escalated"].startswith("(_exists_:first_response_escalation_at OR ")
+
+
+@pytest.mark.asyncio
+async def test_counts_run_concurrently() -> None:
+    """Test that all buckets are counted at once."""
+    active = 0
+    peak = 0
+    counts = {None: 40, 'state.name:("new" OR "open")': 25, 'state.name:("closed")': 10}
+
+    async def count(query: str | None) -> int:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return counts.get(query, 5)
+
+    stats = await count_ticket_stats(count)
+
+    assert peak == 5
+    assert stats is not None
+    assert (stats.total_count, stats.open_count, stats.closed_count) == (40, 25, 10)
+    assert (stats.pending_count, stats.escalated_count) == (5, 5)
+
+
+@pytest.mark.asyncio
+async def test_tool_uses_counts_instead_of_scanning() -> None:
+    """Test that the tool issues one count per bucket and never pages through tickets."""
+    server = ZammadMCPServer()
+    client = AsyncMock()
+    client.count_tickets.return_value = 3
+    server.client = client
+
+    stats = await setup_tools(server)["get_ticket_stats"](group="Support")
+
+    assert stats.total_count == 3
+    assert client.count_tickets.await_count == 5
+    assert all(call.kwargs["group"] == "Support" for call in client.count_tickets.await_args_list)
+    client.search_tickets.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_tool_falls_back_to_scan_without_counts() -> None:
+    """Test that instances without search totals are still counted by scanning."""
+    server = ZammadMCPServer()
+    client = AsyncMock()
+    client.count_tickets.return_value = None
+    client.search_tickets.side_effect = [[{"id": 1, "state": "open"}, {"id": 2, "state": "closed"}], []]
+    server.client = client
+
+    stats = await setup_tools(server)["get_ticket_stats"]()
+
+    assert (stats.total_count, stats.open_count, stats.closed_count) == (2, 1, 1)
+    assert client.search_tickets.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_count_tickets_reads_total() -> None:
+    """Test that count_tickets asks for a single record and reads the total."""
+    seen: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"tickets": [7], "tickets_count": 1, "total_count": 1234})
+
+    client = AsyncZammadClient(url=BASE_URL, http_token="test-token", transport=httpx.MockTransport(handler))
+    async with client:
+        total = await client.count_tickets('state.name:("closed")', group="Support")
+
+    assert total == 1234
+    assert seen[0].url.params["query"] == 'state.name:("closed") AND group.name:Support'
+    assert seen[0].url.params["limit"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_count_tickets_ignores_page_size() -> None:
+    """Test that servers ignoring only_total_count report no total instead of the page size."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"tickets": [7], "tickets_count": 1})
+
+    client = AsyncZammadClient(url=BASE_URL, http_token="test-token", transport=httpx.MockTransport(handler))
+    async with client:
+        assert await client.count_tickets("state.name:open") is None
+
+
+def test_running_stats_merge_matches_single_pass() -> None:
+    """Test that merged Welford partials equal the statistics of all values."""
+    rng = random.Random(0)
+    values = [rng.uniform(0, 500) for _ in range(1000)]
+    left, right = RunningStats(), RunningStats()
+    for value in values[:300]:
+        left.add(value)
+    for value in values[300:]:
+        right.add(value)
+    left.merge(right)
+
+    assert left.count == 1000
+    assert left.mean == pytest.approx(statistics.fmean(values))
+    assert left.stddev == pytest.approx(statistics.stdev(values))
+
+
+def test_quantile_sketch_accuracy_and_bounded_size() -> None:
+    """Test that estimates stay within the relative accuracy and memory stays bounded."""
+    rng = random.Random(0)
+    values = sorted(rng.lognormvariate(4, 1.5) for _ in range(20000))
+    sketches = [QuantileSketch(), QuantileSketch()]
+    for index, value in enumerate(values):
+        sketches[index % 2].add(value)
+    sketch = sketches[0]
+    sketch.merge(sketches[1])
+
+    for q in (0.5, 0.9, 0.99):
+        exact = values[int(q * (len(values) - 1))]
+        assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+
+    # Folding the low end keeps the tail quantiles accurate
+    small = QuantileSketch(max_buckets=200)
+    for value in values:
+        small.add(value)
+    assert len(small._buckets) <= 200
+    assert small.quantile(0.99) == pytest.approx(values[int(0.99 * (len(values) - 1))], rel=0.02)
+
+
+def test_accumulator_computes_sla_metrics() -> None:
+    """Test first response and resolution times from *_in_min fields and timestamps."""
+    accumulator = TicketStatsAccumulator()
+    accumulator.add_page(
+        [
+            {"id": 1, "state": "closed", "first_response_in_min": 10, "close_in_min": 60},
+            {"id": 2, "state": "open", "first_response_in_min": 30},
+        ]
+    )
+    other = TicketStatsAccumulator()
+    other.add(
+        {
+            "id": 3,
+            "state": "closed",
+            "created_at": "2024-01-01T00:00:00Z",
+            "first_response_at": "2024-01-01T00:20:00Z",
+            "close_at": "2024-01-01T02:00:00Z",
+        }
+    )
+    accumulator.merge(other)
+    stats = accumulator.result()
+
+    assert stats.total_count == 3
+    assert stats.avg_first_response_time == pytest.approx(20)
+    assert stats.avg_resolution_time == pytest.approx(90)
+    assert stats.first_response_time is not None
+    assert stats.first_response_time.count == 3
+    assert stats.first_response_time.p50 == pytest.approx(20, rel=0.02)
+
+
+@pytest.mark.asyncio
+async def test_tool_combines_counts_with_sla_scan() -> None:
+    """Test that SLA metrics come from the scan while counts still come from count queries."""
+    server = ZammadMCPServer()
+    client = AsyncMock()
+    client.count_tickets.return_value = 1000
+    client.search_tickets.side_effect = [[{"id": 1, "state": "open", "first_response_in_min": 15}], []]
+    server.client = client
+
+    stats = await setup_tools(server)["get_ticket_stats"](include_sla_metrics=True)
+
+    assert stats.total_count == 1000
+    assert stats.avg_first_response_time == pytest.approx(15)
+    assert stats.resolution_time is None
+
+
+def test_date_range_clause_and_windows() -> None:
+    """Test created_at clauses and that windows tile the range without gaps."""
+    assert created_at_range(None, None) is None
+    assert created_at_range("2024-03-01", None) == "created_at:[2024-03-01T00:00:00Z TO *]"
+    assert created_at_range(None, "2024-03-07") == "created_at:[* TO 2024-03-08T00:00:00Z}"
+
+    windows = split_created_at_range("2024-03-01", "2024-03-07", 4)
+    assert len(windows) == 4
+    bounds = [window.removeprefix("created_at:[").removesuffix("}").split(" TO ") for window in windows]  # type: ignore[union-attr]
+    assert bounds[0][0] == "2024-03-01T00:00:00Z"
+    assert bounds[-1][1] == "2024-03-08T00:00:00Z"
+    assert all(previous[1] == following[0] for previous, following in itertools.pairwise(bounds))
+
+    # Windows are never shorter than a day
+    assert len(split_created_at_range("2024-03-01T08:00:00Z", "2024-03-01T18:00:00Z", 4)) == 1
+    with pytest.raises(ValueError, match="Invalid date"):
+        created_at_range("last week", None)
+
+
+@pytest.mark.asyncio
+async def test_tool_scopes_counts_to_date_range() -> None:
+    """Test that every count query carries the created_at range."""
+    server = ZammadMCPServer()
+    client = AsyncMock()
+    client.count_tickets.return_value = 7
+    server.client = client
+
+    stats = await setup_tools(server)["get_ticket_stats"](start_date="2024-03-01", end_date="2024-03-07")
+
+    assert stats.total_count == 7
+    queries = [call.kwargs["query"] for call in client.count_tickets.await_args_list]
+    assert queries[0] == "created_at:[2024-03-01T00:00:00Z TO 2024-03-08T00:00:00Z}"
+    assert all(query.startswith("created_at:[2024-03-01T00:00:00Z TO 2024-03-08T00:00:00Z} ") for query in queries[1:])
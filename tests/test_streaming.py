@@ -0,0 +1,256 @@
+"""Tests for streamed partial results and the SSE endpoint."""
+
+import asyncio
+import json
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_zammad.http_server import HTTPMCPServer
+from mcp_zammad.server import ZammadMCPServer
+from mcp_zammad.streaming import ProgressNotifier, report_partial, report_progress, stream_to
+
+
+def make_ticket(ticket_id: int) -> dict[str, Any]:
+    return {
+        "id": ticket_id,
+        "number": str(79000 + ticket_id),
+        "title": f"Ticket {ticket_id}",
+        "group_id": 1,
+        "state_id": 1,
+        "priority_id": 2,
+        "customer_id": 5,
+        "created_by_id": 5,
+        "updated_by_id": 4,
+        "group": "Support",
+        "state": "open",
+        "priority": "2 normal",
+        "customer": "nicole@example.com",
+        "created_at": "2024-01-01T00:00:00Z",
+        "updated_at": "2024-01-01T00:00:00Z",
+    }
+
+
+def parse_sse(text: str) -> list[tuple[str, Any]]:
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_reports_without_listener_are_dropped() -> None:
+    """Test that reporting is a no-op outside stream_to and reaches the sink inside it."""
+    report_partial(["ignored"], pages=1)
+
+    received: list[tuple[str, dict[str, Any]]] = []
+    with stream_to(lambda event, data: received.append((event, data))):
+        report_partial(["a"], pages=1)
+        report_progress(tickets_scanned=100)
+    report_progress(tickets_scanned=200)
+
+    assert received == [("partial", {"items": ["a"], "pages": 1}), ("progress", {"tickets_scanned": 100})]
+
+
+@pytest.mark.asyncio
+async def test_search_tickets_streams_each_page() -> None:
+    """Test that summaries are reported page by page, numbered as in the final result."""
+    server = ZammadMCPServer()
+    client = AsyncMock()
+    client.search_tickets.side_effect = [[make_ticket(1), make_ticket(2)], [make_ticket(3)]]
+    server.client = client
+
+    tools: dict[str, Any] = {}
+    server.mcp.tool = lambda name=None: lambda func: tools.setdefault(name or func.__name__, func)  # type: ignore[method-assign, assignment, misc]
+    server._setup_ticket_tools()
+
+    received: list[tuple[str, dict[str, Any]]] = []
+    with stream_to(lambda event, data: received.append((event, data))):
+        result = await tools["search_tickets"](per_page=2, max_pages=3)
+
+    assert [(event, data["pages"], data["tickets"]) for event, data in received] == [
+        ("partial", 1, 2),
+        ("partial", 2, 3),
+    ]
+    assert [item for _, data in received for item in data["items"]] == result
+    assert result[2].startswith("3. Ticket #79003")
+
+
+def test_sse_endpoint_relays_partials_before_result() -> None:
+    """Test that /mcp/stream emits partial and progress events as the tool reports them."""
+    release = asyncio.Event()
+
+    async def call_tool(name: str, arguments: dict[str, Any]) -> list[str]:
+        report_partial(["first"], pages=1, tickets=1)
+        report_progress(pages=1)
+        release.set()
+        await asyncio.sleep(0)
+        report_partial(["second"], pages=2, tickets=2)
+        return ["first", "second"]
+
+    mcp_server = MagicMock()
+    mcp_server.initialize = AsyncMock()
+    mcp_server.mcp.call_tool = call_tool
+    client = TestClient(HTTPMCPServer(mcp_server).app)
+
+    response = client.post("/mcp/stream", json={"method": "tools/call", "params": {"name": "search_tickets"}})
+
+    events = parse_sse(response.text)
+    assert [event for event, _ in events] == ["connected", "partial", "progress", "partial", "result", "done"]
+    assert events[1][1] == {"items": ["first"], "pages": 1, "tickets": 1}
+    assert events[4][1] == ["first", "second"]
+    assert release.is_set()
+
+
+@pytest.mark.asyncio
+async def test_progress_notifier_sends_counts_in_order() -> None:
+    """Test the progress value, remembered estimated total and message of each notification."""
+    sent: list[tuple[float, float | None, str | None]] = []
+
+    async def send(progress: float, total: float | None, message: str | None) -> None:
+        await asyncio.sleep(0)
+        sent.append((progress, total, message))
+
+    notifier = ProgressNotifier(send)
+    notifier("progress", {"pages": 1, "tickets_scanned": 100})
+    notifier("partial", {"items": [{}], "stage": "counts", "estimated_total": 250})
+    notifier("progress", {"pages": 2, "tickets_scanned": 200})
+    await notifier.flush()
+
+    assert sent == [
+        (100.0, None, "1 pages, 100 tickets scanned"),
+        (100.0, 250.0, None),
+        (200.0, 250.0, "2 pages, 200 tickets scanned"),
+    ]
+
+
+def stats_tools(client: Any) -> dict[str, Any]:
+    server = ZammadMCPServer()
+    server.client = client
+    tools: dict[str, Any] = {}
+    server.mcp.tool = lambda name=None: lambda func: tools.setdefault(name or func.__name__, func)  # type: ignore[method-assign, assignment, misc]
+    server._setup_system_tools()
+    return tools
+
+
+@pytest.mark.asyncio
+async def test_get_ticket_stats_sends_progress_notifications() -> None:
+    """Test that a request with a progress token gets one notification per scanned page."""
+    client = AsyncMock()
+    client.count_tickets.return_value = 150
+    client.search_tickets.side_effect = lambda page, **_: (
+        [make_ticket(i) for i in range(100)] if page == 1 else [make_ticket(i) for i in range(50)] if page == 2 else []
+    )
+    ctx = MagicMock()
+    ctx.request_context.meta.progressToken = "token-1"
+    ctx.report_progress = AsyncMock()
+
+    stats = await stats_tools(client)["get_ticket_stats"](include_sla_metrics=True, ctx=ctx)
+
+    assert stats.total_count == 150
+    calls = [call.args for call in ctx.report_progress.await_args_list]
+    assert [progress for progress, _, _ in calls] == sorted(progress for progress, _, _ in calls)
+    assert calls[-1][0] == 150.0
+    assert calls[-1][1] == 150.0
+    assert "150 tickets scanned" in calls[-1][2]
+
+
+@pytest.mark.asyncio
+async def test_fallback_scan_reports_an_estimated_total() -> None:
+    """Test that a scan without count totals estimates the total from the pages read so far."""
+    client = AsyncMock()
+    client.count_tickets.return_value = None
+    client.search_tickets.side_effect = lambda page, **_: (
+        [make_ticket(i) for i in range(100)] if page == 1 else [make_ticket(i) for i in range(50)] if page == 2 else []
+    )
+    ctx = MagicMock()
+    ctx.request_context.meta.progressToken = "token-1"
+    ctx.report_progress = AsyncMock()
+
+    stats = await stats_tools(client)["get_ticket_stats"](ctx=ctx)
+
+    assert stats.total_count == 150
+    calls = [call.args for call in ctx.report_progress.await_args_list]
+    assert [(progress, total) for progress, total, _ in calls] == [(100.0, 200.0), (150.0, 150.0)]
+
+
+@pytest.mark.asyncio
+async def test_search_tickets_sends_progress_notifications() -> None:
+    """Test that search_tickets reports each page read to a request with a progress token."""
+    client = AsyncMock()
+    client.search_tickets.side_effect = lambda page, **_: [make_ticket(page * 10 + i) for i in range(2)]
+    server = ZammadMCPServer()
+    server.client = client
+    tools: dict[str, Any] = {}
+    server.mcp.tool = lambda name=None: lambda func: tools.setdefault(name or func.__name__, func)  # type: ignore[method-assign, assignment, misc]
+    server._setup_ticket_tools()
+    ctx = MagicMock()
+    ctx.request_context.meta.progressToken = "token-1"
+    ctx.report_progress = AsyncMock()
+
+    result = await tools["search_tickets"](per_page=2, max_pages=2, ctx=ctx)
+
+    assert len(result) == 4
+    calls = [call.args for call in ctx.report_progress.await_args_list]
+    assert [(progress, message) for progress, _, message in calls] == [
+        (2.0, "1 pages, 2 tickets"),
+        (4.0, "2 pages, 4 tickets"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_scan_stops_requesting_pages() -> None:
+    """Test that cancelling get_ticket_stats mid-scan stops the upstream requests."""
+    requested: list[int] = []
+    blocked = asyncio.Event()
+
+    async def search_tickets(page: int, **kwargs: Any) -> list[dict[str, Any]]:
+        requested.append(page)
+        if page == 1:
+            return [make_ticket(i) for i in range(100)]
+        blocked.set()
+        await asyncio.Event().wait()
+        return []
+
+    client = AsyncMock()
+    client.count_tickets.side_effect = RuntimeError("no totals")
+    client.search_tickets = search_tickets
+
+    call = asyncio.ensure_future(stats_tools(client)["get_ticket_stats"]())
+    await blocked.wait()
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+
+    await asyncio.sleep(0)
+    assert requested == [1, 2]
+
+
+def test_sse_endpoint_sends_progress_notifications_for_a_token() -> None:
+    """Test that /mcp/stream adds notifications/progress events when the call carries a progress token."""
+
+    async def call_tool(name: str, arguments: dict[str, Any]) -> list[str]:
+        report_progress(pages=1, tickets_scanned=100)
+        return []
+
+    mcp_server = MagicMock()
+    mcp_server.initialize = AsyncMock()
+    mcp_server.mcp.call_tool = call_tool
+    client = TestClient(HTTPMCPServer(mcp_server).app)
+
+    response = client.post(
+        "/mcp/stream",
+        json={"method": "tools/call", "params": {"name": "get_ticket_stats", "_meta": {"progressToken": 7}}},
+    )
+
+    events = parse_sse(response.text)
+    assert [event for event, _ in events] == ["connected", "progress", "notification", "result", "done"]
+    assert events[2][1]["method"] == "notifications/progress"
+    assert events[2][1]["params"] == {
+        "progressToken": 7,
+        "progress": 100.0,
+        "total": None,
+        "message": "1 pages, 100 tickets scanned",
+    }
@@ -0,0 +1,148 @@
+"""Tests for MCP resource subscriptions and the shared change feed."""
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+from mcp import types
+from mcp.server.lowlevel import NotificationOptions
+
+from mcp_zammad.server import ZammadMCPServer
+from mcp_zammad.subscriptions import ResourceSubscriptions
+
+# 2024-01-01T12:00:00Z
+NOW = datetime(2024, 1, 1, 12, tzinfo=timezone.utc).timestamp()
+
+
+class FakeSession:
+    def __init__(self, fail: bool = False) -> None:
+        self.updated: list[str] = []
+        self.fail = fail
+
+    async def send_resource_updated(self, uri: Any) -> None:
+        if self.fail:
+            raise ConnectionError("session closed")
+        self.updated.append(str(uri))
+
+
+def make_ticket(ticket_id: int, updated_at: str, group: str = "Support") -> dict[str, Any]:
+    return {"id": ticket_id, "number": str(79000 + ticket_id), "group": group, "updated_at": updated_at}
+
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def make_subscriptions(fetch: Any = None) -> ResourceSubscriptions:
+    async def no_updates(kind: str, since: str | None, page: int, per_page: int) -> list[dict[str, Any]]:
+        return []
+
+    return ResourceSubscriptions(fetch or no_updates, poll_interval=0, clock=lambda: NOW)
+
+
+@pytest.mark.asyncio
+async def test_changed_tickets_notify_ticket_and_queue_subscribers() -> None:
+    """Test change detection against seen versions, group moves and coalescing."""
+    subscriptions = make_subscriptions()
+    ticket_session, queue_session, other = FakeSession(), FakeSession(), FakeSession()
+    await subscriptions.subscribe("zammad://ticket/1", ticket_session)
+    await subscriptions.subscribe("zammad://queue/2nd%20Level", queue_session)
+    await subscriptions.subscribe("zammad://ticket/2", other)
+
+    # Last changed long before the subscription: nothing to report
+    subscriptions.observe_tickets([make_ticket(1, "2023-12-01T00:00:00Z")])
+    await settle()
+    assert ticket_session.updated == []
+
+    subscriptions.observe_tickets([make_ticket(1, "2024-01-01T12:05:00Z", group="2nd Level")])
+    subscriptions.observe_tickets([make_ticket(1, "2024-01-01T12:05:00Z", group="2nd Level")])
+    await settle()
+    assert ticket_session.updated == ["zammad://ticket/1"]
+    assert queue_session.updated == ["zammad://queue/2nd%20Level"]
+    assert other.updated == []
+
+    # Moving out of the group changes the queue it left
+    subscriptions.observe_tickets([make_ticket(1, "2024-01-01T12:10:00Z", group="Sales")])
+    await settle()
+    assert queue_session.updated == ["zammad://queue/2nd%20Level"] * 2
+
+
+@pytest.mark.asyncio
+async def test_unsubscribe_and_closed_sessions() -> None:
+    """Test that unsubscribed and failing sessions stop receiving notifications."""
+    subscriptions = make_subscriptions()
+    kept, left, closed = FakeSession(), FakeSession(), FakeSession(fail=True)
+    for session in (kept, left, closed):
+        await subscriptions.subscribe("zammad://user/5", session)
+    await subscriptions.unsubscribe("zammad://user/5", left)
+
+    subscriptions.observe("users", [{"id": 5, "updated_at": "2024-01-01T12:01:00Z"}])
+    await settle()
+
+    assert kept.updated == ["zammad://user/5"]
+    assert left.updated == []
+    assert len(subscriptions) == 1
+
+    with pytest.raises(ValueError, match="does not support subscriptions"):
+        await subscriptions.subscribe("zammad://unknown/1", kept)
+
+
+@pytest.mark.asyncio
+async def test_one_poll_serves_many_subscriptions() -> None:
+    """Test that a thousand subscriptions share one upstream request per kind."""
+    calls: list[tuple[str, str | None, int]] = []
+
+    async def fetch(kind: str, since: str | None, page: int, per_page: int) -> list[dict[str, Any]]:
+        calls.append((kind, since, page))
+        return [make_ticket(42, "2024-01-01T12:00:30Z")] if kind == "tickets" else []
+
+    subscriptions = make_subscriptions(fetch)
+    sessions = [FakeSession() for _ in range(1000)]
+    for index, session in enumerate(sessions):
+        await subscriptions.subscribe(f"zammad://ticket/{index}", session)
+
+    await subscriptions._poll("tickets")
+    await settle()
+
+    assert calls == [("tickets", "2024-01-01T11:59:00Z", 1)]
+    assert sessions[42].updated == ["zammad://ticket/42"]
+    assert sum(len(session.updated) for session in sessions) == 1
+    assert subscriptions._kinds() == ["tickets"]
+    await subscriptions.stop()
+
+
+@pytest.mark.asyncio
+async def test_versions_are_kept_only_for_subscribed_resources() -> None:
+    """Test that unrelated records aren't tracked and unsubscribing forgets the records it covered."""
+    subscriptions = make_subscriptions()
+    session = FakeSession()
+    await subscriptions.subscribe("zammad://ticket/1", session)
+    await subscriptions.subscribe("zammad://queue/Sales", session)
+
+    subscriptions.observe_tickets(
+        [make_ticket(1, "2024-01-01T12:05:00Z"), make_ticket(2, "2024-01-01T12:05:00Z", group="Sales")]
+        + [make_ticket(ticket_id, "2024-01-01T12:05:00Z") for ticket_id in range(3, 100)]
+    )
+    subscriptions.observe("users", [{"id": 7, "updated_at": "2024-01-01T12:05:00Z"}])
+    assert set(subscriptions._versions) == {("tickets", 1), ("tickets", 2)}
+    assert subscriptions._ticket_groups == {1: "Support", 2: "Sales"}
+
+    await subscriptions.unsubscribe("zammad://queue/Sales", session)
+    assert set(subscriptions._versions) == {("tickets", 1)}
+    await subscriptions.unsubscribe("zammad://ticket/1", session)
+    assert subscriptions._versions == {}
+    assert subscriptions._ticket_groups == {}
+
+
+def test_server_advertises_subscriptions() -> None:
+    """Test that the subscribe handlers are registered and the capability is reported."""
+    server = ZammadMCPServer()
+    low_level = server.mcp._mcp_server
+
+    assert types.SubscribeRequest in low_level.request_handlers
+    assert types.UnsubscribeRequest in low_level.request_handlers
+    capabilities = low_level.get_capabilities(NotificationOptions(), {})
+    assert capabilities.resources is not None
+    assert capabilities.resources.subscribe is True
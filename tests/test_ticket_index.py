@@ -0,0 +1,120 @@
+"""Tests for the ticket number to ID index."""
+
+import pathlib
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mcp_zammad.client import ZammadClient
+from mcp_zammad.ticket_index import TicketNumberIndex
+
+
+def test_lru_eviction() -> None:
+    """Test that the least recently used number is evicted once the index is full."""
+    index = TicketNumberIndex(max_entries=2)
+    index.put("1001", 1)
+    index.put("1002", 2)
+    assert index.get("1001") == 1  # 1001 is now most recently used
+    index.put("1003", 3)
+
+    assert len(index) == 2
+    assert index.get("1002") is None
+    assert index.get("1001") == 1
+    assert index.get("1003") == 3
+
+
+def test_observe_ignores_incomplete_payloads() -> None:
+    """Test that only payloads with both a number and an ID are indexed."""
+    index = TicketNumberIndex()
+    index.observe([{"id": 1, "number": "1001"}, {"id": 2}, {"number": "1003"}, "not a ticket"])  # type: ignore[list-item]
+
+    assert len(index) == 1
+    assert index.get(1001) == 1  # type: ignore[arg-type]
+
+
+def test_sqlite_persistence(tmp_path: pathlib.Path) -> None:
+    """Test that mappings survive a restart and numbers evicted from memory still resolve."""
+    path = str(tmp_path / "index.db")
+    index = TicketNumberIndex(max_entries=1, path=path)
+    index.put("1001", 1)
+    index.put("1002", 2)
+    index.discard("1002")
+    assert index.get("1001") == 1  # evicted from memory, read back from disk
+    index.close()
+
+    reopened = TicketNumberIndex(path=path)
+    assert reopened.get("1001") == 1
+    assert reopened.get("1002") is None
+    reopened.close()
+
+
+def test_unwritten_changes_are_visible(tmp_path: pathlib.Path) -> None:
+    """Test that lookups see queued changes before the writer thread has committed them."""
+    index = TicketNumberIndex(max_entries=1, path=str(tmp_path / "index.db"))
+    index.put("1001", 1)
+    index.put("1002", 2)  # evicts 1001 from memory, possibly before it reached the file
+    index.discard("1002")
+
+    assert index.get("1001") == 1
+    assert index.get("1002") is None
+    index.flush()
+    assert index._db is not None
+    assert index._db.execute("SELECT number, ticket_id FROM ticket_numbers").fetchall() == [("1001", 1)]
+    index.close()
+
+
+def test_from_env(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> None:
+    """Test configuration through ZAMMAD_TICKET_INDEX_PATH and ZAMMAD_TICKET_INDEX_SIZE."""
+    monkeypatch.setenv("ZAMMAD_TICKET_INDEX_PATH", str(tmp_path / "index.db"))
+    monkeypatch.setenv("ZAMMAD_TICKET_INDEX_SIZE", "5")
+    index = TicketNumberIndex.from_env()
+
+    assert index.max_entries == 5
+    assert index.path == str(tmp_path / "index.db")
+    index.close()
+
+
+class TestClientNumberLookup:
+    """Test that ZammadClient consults the index before searching."""
+
+    @pytest.fixture
+    def client(self) -> ZammadClient:
+        with patch("mcp_zammad.client.ZammadAPI") as mock_api:
+            mock_api.return_value = Mock()
+            return ZammadClient(url="https://test.zammad.com/api/v1", http_token="test-token")
+
+    def test_search_results_fill_index(self, client: ZammadClient) -> None:
+        """Test that a ticket seen in a search is later fetched without searching."""
+        client.api.ticket.search.return_value = [{"id": 7, "number": "79004"}]
+        client.search_tickets(query="printer")
+        client.api.ticket.search.reset_mock()
+
+        client.api.ticket.find.return_value = {"id": 7, "number": "79004"}
+        result = client.get_ticket_by_number("79004", include_articles=False)
+
+        assert result["id"] == 7
+        client.api.ticket.search.assert_not_called()
+        client.api.ticket.find.assert_called_once_with(7)
+
+    def test_stale_entry_falls_back_to_search(self, client: ZammadClient) -> None:
+        """Test that an indexed ticket which no longer exists is looked up again."""
+        client.ticket_index.put("79004", 7)
+        client.api.ticket.find.side_effect = [Exception("404 Not Found"), {"id": 8, "number": "79004"}]
+        client.api.ticket.search.return_value = [{"id": 8, "number": "79004"}]
+
+        result = client.get_ticket_by_number("79004", include_articles=False)
+
+        assert result["id"] == 8
+        assert client.ticket_index.get("79004") == 8
+
+    def test_observer_errors_are_contained(self, client: ZammadClient) -> None:
+        """Test that a failing observer doesn't break the client call or other observers."""
+        seen: list[dict] = []
+        client.add_ticket_observer(Mock(side_effect=RuntimeError("boom")))
+        client.add_ticket_observer(seen.extend)
+        client.api.ticket.create.return_value = {"id": 9, "number": "79005"}
+
+        client.create_ticket(title="T", group="Support", customer="c@example.com", article_body="Body")
+
+        assert seen == [{"id": 9, "number": "79005"}]
+        assert client.ticket_index.get("79005") == 9
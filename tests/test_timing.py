@@ -0,0 +1,112 @@
+"""Tests for Server-Timing headers and the slow-call log."""
+
+import logging
+import re
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_zammad.async_client import AsyncZammadClient
+from mcp_zammad.http_server import HTTPMCPServer
+from mcp_zammad.server import ZammadMCPServer
+from mcp_zammad.timing import REDACTED, log_if_slow, redact, time_call, timed
+
+BASE_URL = "https://test.zammad.com/api/v1"
+
+TICKET = {
+    "id": 1,
+    "number": "12345",
+    "title": "Printer on fire",
+    "group_id": 1,
+    "state_id": 1,
+    "priority_id": 2,
+    "customer_id": 1,
+    "created_by_id": 1,
+    "updated_by_id": 1,
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-01T00:00:00Z",
+}
+
+
+def test_phases_roll_up_to_the_enclosing_timing() -> None:
+    """Test that a call's phases count towards its request, and that timed() is a no-op outside a call."""
+    with timed("upstream"):
+        pass
+
+    with time_call() as request:
+        with time_call() as call:
+            with timed("upstream"):
+                pass
+            with timed("upstream"):
+                pass
+        with timed("serialize"):
+            pass
+
+    assert call.phases().keys() == {"upstream"}
+    assert call.phases()["upstream"]["count"] == 2
+    assert request.phases()["upstream"]["count"] == 2
+    assert request.phases()["serialize"]["count"] == 1
+    assert re.fullmatch(
+        r'upstream;dur=[\d.]+;desc="2 requests", validate;dur=0\.0;desc="0 models", '
+        r'serialize;dur=[\d.]+;desc="1 results", total;dur=[\d.]+',
+        request.header(),
+    )
+
+
+def test_redact_replaces_secret_values() -> None:
+    """Test that secret-looking keys are redacted at any depth and other values kept."""
+    arguments = {
+        "ticket_id": 42,
+        "http_token": "abc",
+        "nested": [{"Password": "hunter2", "body": "Hello"}],
+    }
+
+    assert redact(arguments) == {
+        "ticket_id": 42,
+        "http_token": REDACTED,
+        "nested": [{"Password": REDACTED, "body": "Hello"}],
+    }
+
+
+def test_log_if_slow_respects_threshold(caplog: pytest.LogCaptureFixture) -> None:
+    """Test that only calls over the threshold are logged, and 0 disables the log."""
+    with time_call() as timing:
+        pass
+
+    with caplog.at_level(logging.WARNING, logger="mcp_zammad.slow_calls"):
+        log_if_slow("tool", "get_ticket", {}, timing, threshold_ms=60_000)
+        log_if_slow("tool", "get_ticket", {}, timing, threshold_ms=0)
+        assert not caplog.records
+
+        timing.start -= 2
+        log_if_slow("tool", "get_ticket", {"api_key": "s3cr3t"}, timing, threshold_ms=1000)
+
+    assert len(caplog.records) == 1
+    assert "Slow tool call get_ticket" in caplog.text
+    assert REDACTED in caplog.text
+    assert "s3cr3t" not in caplog.text
+
+
+def test_http_call_reports_server_timing_and_logs_slow_calls(caplog: pytest.LogCaptureFixture) -> None:
+    """Test the Server-Timing breakdown of a tool call and its slow-call log entry."""
+    server = ZammadMCPServer()
+    transport = httpx.MockTransport(lambda _: httpx.Response(200, json=TICKET))
+    server.client = AsyncZammadClient(url=BASE_URL, http_token="test-token", transport=transport)
+    client = TestClient(HTTPMCPServer(server, slow_call_ms=0.001).app)
+    call = {
+        "method": "tools/call",
+        "params": {"name": "get_ticket", "arguments": {"ticket_id": 1, "include_articles": False}},
+    }
+
+    with caplog.at_level(logging.WARNING, logger="mcp_zammad.slow_calls"):
+        response = client.post("/mcp/call", json=call)
+
+    assert response.status_code == 200
+    assert response.json()["error"] is None
+    timing = response.headers["Server-Timing"]
+    assert 'desc="1 requests"' in timing
+    assert 'desc="1 models"' in timing
+    assert 'desc="1 results"' in timing
+    assert "Slow tool call get_ticket" in caplog.text
+    assert '"ticket_id": 1' in caplog.text
@@ -0,0 +1,52 @@
+"""Tests for optional OpenTelemetry tracing."""
+
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_zammad import tracing
+from mcp_zammad.http_server import HTTPMCPServer
+from mcp_zammad.server import ZammadMCPServer
+
+
+def test_helpers_are_no_ops_while_tracing_is_off() -> None:
+    """Test that spans cost nothing and yield None until an exporter is configured."""
+    assert not tracing.tracing_enabled()
+
+    with tracing.span("tool get_ticket", {"mcp.name": "get_ticket"}) as current:
+        tracing.set_attributes(current, {"http.response.status_code": 200})
+    with tracing.server_span("POST /mcp/call", {"traceparent": "00-" + "1" * 32 + "-" + "2" * 16 + "-01"}) as request:
+        pass
+
+    assert current is None
+    assert request is None
+
+
+def test_unknown_exporter_disables_tracing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that an unset or unknown exporter leaves tracing off."""
+    monkeypatch.delenv("ZAMMAD_TRACE_EXPORTER", raising=False)
+    assert tracing.configure_tracing() is False
+
+    monkeypatch.setenv("ZAMMAD_TRACE_EXPORTER", "jaeger")
+    assert tracing.configure_tracing() is False
+    assert not tracing.tracing_enabled()
+
+
+def test_missing_sdk_disables_tracing(monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture) -> None:
+    """Test that tracing stays off with an error when the tracing extra is not installed."""
+    monkeypatch.setitem(sys.modules, "opentelemetry.sdk", None)
+
+    assert tracing.configure_tracing("file") is False
+    assert "mcp-zammad[tracing]" in caplog.text
+    assert not tracing.tracing_enabled()
+
+
+def test_http_requests_pass_through_tracing_middleware() -> None:
+    """Test that the tracing middleware leaves responses untouched while tracing is off."""
+    client = TestClient(HTTPMCPServer(ZammadMCPServer()).app)
+
+    response = client.get("/health", headers={"traceparent": "00-" + "1" * 32 + "-" + "2" * 16 + "-01"})
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "healthy"}
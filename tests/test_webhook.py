@@ -0,0 +1,168 @@
+"""Tests for the Zammad webhook endpoint and payload handling."""
+
+import json
+from typing import Any
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from mcp_zammad.async_client import AsyncZammadClient
+from mcp_zammad.http_server import HTTPMCPServer
+from mcp_zammad.mirror import ZammadMirror
+from mcp_zammad.server import ZammadMCPServer
+from mcp_zammad.webhook import parse_payload, sign, verify_signature
+
+BASE_URL = "https://test.zammad.com/api/v1"
+SECRET = "webhook-token"
+
+# Shaped like the default payload of a Zammad trigger webhook (trimmed)
+RECORDED_PAYLOAD: dict[str, Any] = {
+    "ticket": {
+        "id": 7,
+        "group_id": 1,
+        "priority_id": 2,
+        "state_id": 2,
+        "organization_id": 3,
+        "number": "31007",
+        "title": "Printer on fire",
+        "owner_id": 4,
+        "customer_id": 5,
+        "created_by_id": 5,
+        "updated_by_id": 4,
+        "created_at": "2024-03-01T09:00:00.000Z",
+        "updated_at": "2024-03-01T10:15:00.000Z",
+        "close_escalation_at": "2024-03-02T09:00:00.000Z",
+        "article_count": 2,
+        "group": {"id": 1, "name": "Support", "updated_at": "2023-01-01T00:00:00.000Z"},
+        "state": {"id": 2, "name": "open"},
+        "priority": {"id": 2, "name": "2 normal"},
+        "owner": {
+            "id": 4,
+            "login": "agent@example.com",
+            "email": "agent@example.com",
+            "updated_at": "2024-02-01T00:00:00.000Z",
+        },
+        "customer": {
+            "id": 5,
+            "login": "nicole@example.com",
+            "email": "nicole@example.com",
+            "updated_at": "2024-02-02T00:00:00.000Z",
+        },
+        "organization": {"id": 3, "name": "Example Corp", "updated_at": "2024-01-15T00:00:00.000Z"},
+        "created_by": {
+            "id": 5,
+            "login": "nicole@example.com",
+            "email": "nicole@example.com",
+            "updated_at": "2024-02-02T00:00:00.000Z",
+        },
+        "updated_by": {
+            "id": 4,
+            "login": "agent@example.com",
+            "email": "agent@example.com",
+            "updated_at": "2024-02-01T00:00:00.000Z",
+        },
+    },
+    "article": {
+        "id": 71,
+        "ticket_id": 7,
+        "subject": "Re: Printer on fire",
+        "body": "<p>The fire brigade is on its way.</p>",
+        "content_type": "text/html",
+        "internal": False,
+        "created_at": "2024-03-01T10:15:00.000Z",
+    },
+}
+
+
+def test_signature_verification() -> None:
+    """Test HMAC-SHA1 signing as Zammad does it."""
+    body = b'{"ticket": {}}'
+    signature = sign(SECRET, body)
+
+    assert signature.startswith("sha1=")
+    assert verify_signature(SECRET, body, signature)
+    assert not verify_signature(SECRET, body + b" ", signature)
+    assert not verify_signature("other", body, signature)
+    assert not verify_signature(SECRET, body, None)
+
+
+def test_parse_payload_flattens_nested_records() -> None:
+    """Test that the ticket takes the expanded search shape and nested records are split out."""
+    change = parse_payload(RECORDED_PAYLOAD)
+
+    ticket = change.tickets[0]
+    assert (ticket["group"], ticket["state"], ticket["priority"]) == ("Support", "open", "2 normal")
+    assert (ticket["owner"], ticket["customer"], ticket["organization"]) == (
+        "agent@example.com",
+        "nicole@example.com",
+        "Example Corp",
+    )
+    assert [article["id"] for article in change.articles] == [71]
+    assert sorted(user["id"] for user in change.users) == [4, 5]
+    assert [org["id"] for org in change.organizations] == [3]
+    assert parse_payload({"unrelated": True}).tickets == []
+
+
+@pytest.fixture
+def server() -> ZammadMCPServer:
+    server = ZammadMCPServer()
+    server.client = AsyncZammadClient(
+        url=BASE_URL,
+        http_token="test-token",
+        transport=httpx.MockTransport(lambda _: httpx.Response(500)),
+    )
+    server.client.add_ticket_observer(server.queues.observe)
+    server.client.add_ticket_observer(server.escalations.observe)
+    return server
+
+
+def post(client: TestClient, payload: Any, secret: str = SECRET, delivery: str | None = None) -> httpx.Response:
+    body = json.dumps(payload).encode()
+    headers = {"Content-Type": "application/json", "X-Hub-Signature": sign(secret, body)}
+    if delivery:
+        headers["X-Zammad-Delivery"] = delivery
+    return client.post("/webhooks/zammad", content=body, headers=headers)
+
+
+def test_webhook_updates_caches_and_mirror(server: ZammadMCPServer, tmp_path: Any) -> None:
+    """Test that a signed delivery invalidates the cache and upserts the mirror and indexes."""
+    assert server.client is not None
+    server.mirror = ZammadMirror(str(tmp_path / "mirror.db"))
+    server.client.cache.set("ticket", 7, {"id": 7, "title": "Old title", "updated_at": "2024-01-01T00:00:00Z"})
+    server.client.cache.set("user", 5, {"id": 5, "login": "nicole@example.com"})
+    client = TestClient(HTTPMCPServer(server, webhook_secret=SECRET).app)
+
+    response = post(client, RECORDED_PAYLOAD, delivery="delivery-1")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "status": "applied",
+        "applied": {"tickets": 1, "articles": 1, "users": 2, "organizations": 1},
+    }
+    assert server.client.cache.get("ticket", 7) is None
+    assert server.client.cache.get("user", 5) is None
+    assert server.client.ticket_index.get("31007") == 7
+    assert [ticket["id"] for ticket in server.mirror.search_tickets(group="Support")] == [7]
+    assert server.escalations.due()[0].ticket_id == 7
+
+    # A redelivery is acknowledged without being applied again
+    assert post(client, RECORDED_PAYLOAD, delivery="delivery-1").json() == {"status": "duplicate"}
+    server.mirror.close()
+
+
+def test_webhook_rejects_bad_requests(server: ZammadMCPServer) -> None:
+    """Test signature checks, malformed bodies and the disabled endpoint."""
+    client = TestClient(HTTPMCPServer(server, webhook_secret=SECRET).app)
+
+    assert post(client, RECORDED_PAYLOAD, secret="wrong").status_code == 401
+    unsigned = client.post("/webhooks/zammad", content=b"{}", headers={"Content-Type": "application/json"})
+    assert unsigned.status_code == 401
+    body = b"not json"
+    assert (
+        client.post("/webhooks/zammad", content=body, headers={"X-Hub-Signature": sign(SECRET, body)}).status_code
+        == 400
+    )
+
+    disabled = TestClient(HTTPMCPServer(server).app)
+    assert post(disabled, RECORDED_PAYLOAD).status_code == 404